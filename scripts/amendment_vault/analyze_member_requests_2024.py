@@ -4,144 +4,140 @@ Amendment Vault 2024 Trust Report Generator
 
 Analyzes member_requests_2024.json for duplicate records and data quality issues.
 Generates a comprehensive markdown report with duplicate detection and statistics.
+
+The records and their fingerprints are queried from the SQLite amendment
+vault (vault_db.py), which is loaded from the year files first if needed.
 """
 
-import json
+import argparse
+import sqlite3
+import sys
 from pathlib import Path
-from collections import defaultdict
-from typing import Dict, List, Any, Tuple
+from typing import Dict, Any, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from near_duplicates import DEFAULT_THRESHOLD, find_near_duplicates, report_lines
+from vault_db import open_vault, to_record
 
 # Paths
 REPO_ROOT = Path(__file__).parent.parent.parent
-DATA_FILE = REPO_ROOT / "data" / "amendments" / "member_requests_2024.json"
 REPORT_FILE = REPO_ROOT / "AMENDMENT_VAULT_2024_TRUST_REPORT.md"
 
+SESSION_YEAR = 2024
+BILLS = ["HB30", "SB30"]
+
+# Fingerprint: billNumber, itemNumber, normalized patronName, deltaGF and
+# deltaNGF rounded to the dollar, normalized descriptionShort (first 200
+# chars); computed by vault_db.py when the records are loaded
+FINGERPRINT_POLICY = "trust_report_200"
+
+# Records of the session (optionally one bill) with their fingerprint, the
+# record's occurrence among its duplicates in file order and the group size
+FINGERPRINT_STATS_SQL = """
+WITH fingerprinted AS (
+    SELECT r.net_amount,
+           ROW_NUMBER() OVER (PARTITION BY f.fingerprint ORDER BY r.record_order) AS occurrence,
+           COUNT(*) OVER (PARTITION BY f.fingerprint) AS copies
+    FROM amendment_vault_member_requests r
+    JOIN amendment_vault_fingerprints f ON f.record_id = r.id AND f.policy = :policy
+    WHERE r.session_year = :session_year
+      AND (:bill_number IS NULL OR r.bill_number = :bill_number)
+)
+SELECT COUNT(*) AS totalRecordsAll,
+       COALESCE(SUM(net_amount), 0) AS totalNetAmountAll,
+       COALESCE(SUM(occurrence = 1), 0) AS uniqueRecordsCount,
+       COALESCE(SUM(CASE WHEN occurrence = 1 THEN net_amount END), 0) AS totalNetAmountUnique,
+       COALESCE(SUM(occurrence = 1 AND copies > 1), 0) AS dupFingerprintCount,
+       COALESCE(SUM(occurrence > 1), 0) AS totalDuplicateRows
+FROM fingerprinted
+"""
 
-def normalize_text(text: str) -> str:
-    """Normalize text for fingerprinting: lowercase, trim, collapse spaces"""
-    if not text:
-        return ""
-    # Convert to lowercase, strip, collapse multiple spaces
-    normalized = " ".join(text.lower().strip().split())
-    return normalized
+# Most suspicious duplicate groups: occurrence count (desc), then total
+# netAmount (desc), then the first group in file order
+TOP_DUPLICATES_SQL = """
+SELECT f.fingerprint,
+       COUNT(*) AS occurrenceCount,
+       SUM(r.net_amount) AS sumNetAmount
+FROM amendment_vault_member_requests r
+JOIN amendment_vault_fingerprints f ON f.record_id = r.id AND f.policy = :policy
+WHERE r.session_year = :session_year
+GROUP BY f.fingerprint
+HAVING COUNT(*) > 1
+ORDER BY occurrenceCount DESC, ABS(sumNetAmount) DESC, MIN(r.record_order)
+LIMIT :limit
+"""
 
+DUPLICATE_RECORDS_SQL = """
+SELECT r.*
+FROM amendment_vault_fingerprints f
+JOIN amendment_vault_member_requests r ON r.id = f.record_id
+WHERE f.policy = :policy AND f.fingerprint = :fingerprint AND r.session_year = :session_year
+ORDER BY r.record_order
+"""
 
-def create_fingerprint(record: Dict[str, Any]) -> str:
-    """
-    Create a fingerprint for duplicate detection.
-    
-    Combines:
-    - billNumber
-    - itemNumber
-    - patronName (normalized)
-    - deltaGF (rounded)
-    - deltaNGF (rounded)
-    - descriptionShort (normalized, first 200 chars)
-    """
-    bill_number = record.get("billNumber", "")
-    item_number = str(record.get("itemNumber", ""))
-    patron_name = normalize_text(record.get("patronName", ""))
-    
-    # Round dollar amounts to nearest whole number
-    delta_gf = round(record.get("deltaGF", 0))
-    delta_ngf = round(record.get("deltaNGF", 0))
-    
-    # Normalize and truncate description
-    desc = normalize_text(record.get("descriptionShort", ""))
-    desc_truncated = desc[:200]
-    
-    # Build fingerprint
-    fingerprint = "|".join([
-        bill_number,
-        item_number,
-        patron_name,
-        str(delta_gf),
-        str(delta_ngf),
-        desc_truncated
-    ])
-    
-    return fingerprint
+# Every record of every session, with its fingerprint, in file order
+ALL_RECORDS_SQL = """
+SELECT r.*, f.fingerprint
+FROM amendment_vault_member_requests r
+JOIN amendment_vault_fingerprints f ON f.record_id = r.id AND f.policy = :policy
+ORDER BY r.session_year, r.record_order
+"""
+
+
+def fingerprint_stats(conn: sqlite3.Connection, bill_number: Optional[str] = None) -> Dict[str, Any]:
+    """Record, netAmount and duplicate totals of the session or of one bill"""
+    row = conn.execute(FINGERPRINT_STATS_SQL, {
+        "policy": FINGERPRINT_POLICY,
+        "session_year": SESSION_YEAR,
+        "bill_number": bill_number,
+    }).fetchone()
+    return dict(row)
 
 
-def analyze_data(records: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Analyze records for duplicates and compute statistics"""
+def analyze_data(conn: sqlite3.Connection, near_threshold: float = DEFAULT_THRESHOLD) -> Dict[str, Any]:
+    """Analyze the session's records for duplicates and compute statistics"""
     
     # Global totals
-    total_records = len(records)
-    total_net_amount_all = sum(r.get("netAmount", 0) for r in records)
-    
-    # Build fingerprint index
-    fingerprint_to_records = defaultdict(list)
-    for record in records:
-        fp = create_fingerprint(record)
-        fingerprint_to_records[fp].append(record)
-    
-    # Fingerprint stats
-    distinct_fingerprints = len(fingerprint_to_records)
-    duplicate_fingerprints = {fp: recs for fp, recs in fingerprint_to_records.items() if len(recs) > 1}
-    duplicate_fingerprint_count = len(duplicate_fingerprints)
-    total_duplicate_rows = sum(len(recs) - 1 for recs in duplicate_fingerprints.values())
+    overall = fingerprint_stats(conn)
     
     # Per-bill analysis
-    bill_stats = {}
-    for bill_number in ["HB30", "SB30"]:
-        bill_records = [r for r in records if r.get("billNumber") == bill_number]
-        
-        # Build fingerprints for this bill
-        bill_fingerprints = defaultdict(list)
-        for record in bill_records:
-            fp = create_fingerprint(record)
-            bill_fingerprints[fp].append(record)
-        
-        # Compute stats
-        total_records_all = len(bill_records)
-        total_net_amount_all = sum(r.get("netAmount", 0) for r in bill_records)
-        unique_records_count = len(bill_fingerprints)
-        
-        # Total netAmount counting only one record per fingerprint
-        total_net_amount_unique = sum(
-            recs[0].get("netAmount", 0) for recs in bill_fingerprints.values()
-        )
-        
-        dup_fingerprints = {fp: recs for fp, recs in bill_fingerprints.items() if len(recs) > 1}
-        dup_fingerprint_count = len(dup_fingerprints)
-        total_dup_rows = sum(len(recs) - 1 for recs in dup_fingerprints.values())
-        
-        bill_stats[bill_number] = {
-            "totalRecordsAll": total_records_all,
-            "totalNetAmountAll": total_net_amount_all,
-            "uniqueRecordsCount": unique_records_count,
-            "totalNetAmountUnique": total_net_amount_unique,
-            "dupFingerprintCount": dup_fingerprint_count,
-            "totalDuplicateRows": total_dup_rows,
-        }
+    bill_stats = {bill_number: fingerprint_stats(conn, bill_number) for bill_number in BILLS}
     
     # Find top 10 most suspicious duplicate groups
-    # Sort by: occurrence count (desc), then total netAmount (desc)
-    duplicate_groups = []
-    for fp, recs in duplicate_fingerprints.items():
-        occurrence_count = len(recs)
-        sum_net_amount = sum(r.get("netAmount", 0) for r in recs)
-        
-        duplicate_groups.append({
-            "fingerprint": fp,
-            "records": recs,
-            "occurrenceCount": occurrence_count,
-            "sumNetAmount": sum_net_amount,
+    top_10_duplicates = []
+    for group in conn.execute(TOP_DUPLICATES_SQL, {
+        "policy": FINGERPRINT_POLICY,
+        "session_year": SESSION_YEAR,
+        "limit": 10,
+    }).fetchall():
+        records = conn.execute(DUPLICATE_RECORDS_SQL, {
+            "policy": FINGERPRINT_POLICY,
+            "fingerprint": group["fingerprint"],
+            "session_year": SESSION_YEAR,
+        }).fetchall()
+        top_10_duplicates.append({
+            "fingerprint": group["fingerprint"],
+            "records": [to_record(row) for row in records],
+            "occurrenceCount": group["occurrenceCount"],
+            "sumNetAmount": group["sumNetAmount"],
         })
     
-    # Sort by occurrence count (desc), then sumNetAmount (desc)
-    duplicate_groups.sort(key=lambda x: (-x["occurrenceCount"], -abs(x["sumNetAmount"])))
-    top_10_duplicates = duplicate_groups[:10]
+    # Near-duplicates across all sessions; exact duplicates are in Section 3
+    rows = conn.execute(ALL_RECORDS_SQL, {"policy": FINGERPRINT_POLICY}).fetchall()
+    exact_keys = {row["id"]: (row["session_year"], row["fingerprint"]) for row in rows}
+    near_duplicates = find_near_duplicates([to_record(row) for row in rows], near_threshold,
+                                           exact_key=lambda r: exact_keys[r["id"]])
     
     return {
-        "totalRecords": total_records,
-        "totalNetAmountAll": total_net_amount_all,
-        "distinctFingerprints": distinct_fingerprints,
-        "duplicateFingerprintCount": duplicate_fingerprint_count,
-        "totalDuplicateRows": total_duplicate_rows,
+        "totalRecords": overall["totalRecordsAll"],
+        "totalNetAmountAll": overall["totalNetAmountAll"],
+        "distinctFingerprints": overall["uniqueRecordsCount"],
+        "duplicateFingerprintCount": overall["dupFingerprintCount"],
+        "totalDuplicateRows": overall["totalDuplicateRows"],
         "billStats": bill_stats,
         "top10Duplicates": top_10_duplicates,
+        "nearDuplicates": near_duplicates,
     }
 
 
@@ -177,7 +173,7 @@ def generate_markdown_report(analysis: Dict[str, Any]) -> str:
     lines.append("## Section 2 – Per-Bill Summary")
     lines.append("")
     
-    for bill_number in ["HB30", "SB30"]:
+    for bill_number in BILLS:
         stats = analysis["billStats"][bill_number]
         lines.append(f"### {bill_number}")
         lines.append("")
@@ -255,8 +251,13 @@ def generate_markdown_report(analysis: Dict[str, Any]) -> str:
     lines.append("---")
     lines.append("")
 
-    # Section 4: Quick Interpretation
-    lines.append("## Section 4 – Quick Interpretation")
+    # Section 4: Near-Duplicate Clusters
+    lines.extend(report_lines(analysis["nearDuplicates"], SESSION_YEAR, "Section 4 – Near-Duplicate Clusters"))
+    lines.append("---")
+    lines.append("")
+
+    # Section 5: Quick Interpretation
+    lines.append("## Section 5 – Quick Interpretation")
     lines.append("")
 
     # Determine severity
@@ -289,6 +290,12 @@ def generate_markdown_report(analysis: Dict[str, Any]) -> str:
     else:
         lines.append("Consider reviewing the parser logic to reduce duplicate extraction. ⚠️")
 
+    near_clusters = [c for c in analysis["nearDuplicates"].clusters
+                     if any(r.get("sessionYear") == SESSION_YEAR for r in c.records)]
+    if near_clusters:
+        lines.append(f"{len(near_clusters):,} near-duplicate cluster(s) (similarity >= "
+                     f"{analysis['nearDuplicates'].threshold:.2f}) involve 2024 records and are worth a manual look. ")
+
     lines.append("")
     lines.append("---")
     lines.append("")
@@ -297,7 +304,7 @@ def generate_markdown_report(analysis: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
-def main():
+def main(near_threshold: float = DEFAULT_THRESHOLD):
     """Main execution"""
     print("=" * 80)
     print("Amendment Vault 2024 Trust Report Generator")
@@ -305,23 +312,28 @@ def main():
     print()
 
     # Load data
-    print(f"Loading data from: {DATA_FILE}")
-    if not DATA_FILE.exists():
-        print(f"❌ ERROR: Data file not found: {DATA_FILE}")
+    print("Loading data from the amendment vault")
+    conn = open_vault()
+    record_count = conn.execute(
+        "SELECT COUNT(*) FROM amendment_vault_member_requests WHERE session_year = ?", (SESSION_YEAR,)
+    ).fetchone()[0]
+    if not record_count:
+        print(f"❌ ERROR: No {SESSION_YEAR} records in the amendment vault (member_requests_{SESSION_YEAR}.json)")
         return 1
 
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        records = json.load(f)
-
-    print(f"✓ Loaded {len(records):,} records")
+    print(f"✓ Loaded {record_count:,} records")
     print()
 
     # Analyze
     print("Analyzing data for duplicates...")
-    analysis = analyze_data(records)
+    analysis = analyze_data(conn, near_threshold)
+    conn.close()
     print(f"✓ Found {analysis['distinctFingerprints']:,} distinct fingerprints")
     print(f"✓ Found {analysis['duplicateFingerprintCount']:,} duplicate fingerprints")
     print(f"✓ Total duplicate rows: {analysis['totalDuplicateRows']:,}")
+    near = analysis["nearDuplicates"]
+    print(f"✓ Found {len(near.clusters):,} near-duplicate clusters across all sessions "
+          f"(similarity >= {near.threshold:.2f}, {near.candidate_pairs:,} candidate pairs, {near.seconds:.1f} s)")
     print()
 
     # Generate report
@@ -346,5 +358,9 @@ def main():
 
 
 if __name__ == "__main__":
-    exit(main())
+    parser = argparse.ArgumentParser(description="Generate the 2024 Amendment Vault trust report")
+    parser.add_argument("--near-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Jaccard similarity for near-duplicates (default: {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+    exit(main(near_threshold=args.near_threshold))
 
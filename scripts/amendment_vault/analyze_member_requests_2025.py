@@ -4,122 +4,94 @@ Amendment Vault 2025 Trust Report Generator
 
 Analyzes member_requests_2025.json for duplicate records and data quality issues.
 Generates a comprehensive markdown report with duplicate detection and statistics.
+
+Fingerprints and duplicate groups come from the dedup index next to the data
+(fingerprints.py), which is brought up to date first if needed.
 """
 
-import json
+import argparse
+import sys
 from pathlib import Path
-from collections import defaultdict
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fingerprints import FingerprintIndex, load_index, read_records, year_files
+from near_duplicates import DEFAULT_THRESHOLD, find_near_duplicates, report_lines
 
 # Paths
 REPO_ROOT = Path(__file__).parent.parent.parent
-DATA_FILE = REPO_ROOT / "data" / "amendments" / "member_requests_2025.json"
 REPORT_FILE = REPO_ROOT / "AMENDMENT_VAULT_2025_TRUST_REPORT.md"
 
+SESSION_YEAR = 2025
+BILLS = ["HB1600", "SB800"]
 
-def normalize_text(text: str) -> str:
-    """Normalize text for fingerprinting: lowercase, trim, collapse spaces"""
-    if not text:
-        return ""
-    # Convert to lowercase, strip, collapse multiple spaces
-    normalized = " ".join(text.lower().strip().split())
-    return normalized
+# Fingerprint: billNumber, itemNumber, normalized patronName, deltaGF and
+# deltaNGF rounded to the dollar, normalized descriptionShort (first 200
+# chars); looked up in the dedup index (fingerprints.py)
+FINGERPRINT_POLICY = "trust_report_200"
 
 
-def create_fingerprint(record: Dict[str, Any]) -> str:
+def analyze_data(records: List[Dict[str, Any]], index: FingerprintIndex,
+                 all_records: List[Dict[str, Any]], near_threshold: float = DEFAULT_THRESHOLD) -> Dict[str, Any]:
     """
-    Create a fingerprint for duplicate detection.
-    
-    Combines:
-    - billNumber
-    - itemNumber
-    - patronName (normalized)
-    - deltaGF (rounded)
-    - deltaNGF (rounded)
-    - descriptionShort (normalized, first 200 chars)
+    Analyze records for duplicates and compute statistics.
+
+    `records` are the session's; near-duplicates are searched in
+    `all_records`, every session's.
     """
-    bill_number = record.get("billNumber", "")
-    item_number = str(record.get("itemNumber", ""))
-    patron_name = normalize_text(record.get("patronName", ""))
-    
-    # Round dollar amounts to nearest whole number
-    delta_gf = round(record.get("deltaGF", 0))
-    delta_ngf = round(record.get("deltaNGF", 0))
     
-    # Normalize and truncate description
-    desc = normalize_text(record.get("descriptionShort", ""))
-    desc_truncated = desc[:200]
-    
-    # Build fingerprint
-    fingerprint = "|".join([
-        bill_number,
-        item_number,
-        patron_name,
-        str(delta_gf),
-        str(delta_ngf),
-        desc_truncated
-    ])
-    
-    return fingerprint
-
-
-def analyze_data(records: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Analyze records for duplicates and compute statistics"""
+    records_by_id = {r["id"]: r for r in records}
     
     # Global totals
     total_records = len(records)
     total_net_amount_all = sum(r.get("netAmount", 0) for r in records)
     
-    # Build fingerprint index
-    fingerprint_to_records = defaultdict(list)
-    for record in records:
-        fp = create_fingerprint(record)
-        fingerprint_to_records[fp].append(record)
+    # Fingerprint groups, in order of first occurrence
+    fingerprint_to_ids = index.groups(FINGERPRINT_POLICY, SESSION_YEAR)
     
     # Fingerprint stats
-    distinct_fingerprints = len(fingerprint_to_records)
-    duplicate_fingerprints = {fp: recs for fp, recs in fingerprint_to_records.items() if len(recs) > 1}
+    distinct_fingerprints = len(fingerprint_to_ids)
+    duplicate_fingerprints = {fp: ids for fp, ids in fingerprint_to_ids.items() if len(ids) > 1}
     duplicate_fingerprint_count = len(duplicate_fingerprints)
-    total_duplicate_rows = sum(len(recs) - 1 for recs in duplicate_fingerprints.values())
+    total_duplicate_rows = sum(len(ids) - 1 for ids in duplicate_fingerprints.values())
     
-    # Per-bill analysis
-    bill_stats = {}
-    for bill_number in ["HB1600", "SB800"]:
-        bill_records = [r for r in records if r.get("billNumber") == bill_number]
-        
-        # Build fingerprints for this bill
-        bill_fingerprints = defaultdict(list)
-        for record in bill_records:
-            fp = create_fingerprint(record)
-            bill_fingerprints[fp].append(record)
-        
-        # Compute stats
-        total_records_all = len(bill_records)
-        total_net_amount_all = sum(r.get("netAmount", 0) for r in bill_records)
-        unique_records_count = len(bill_fingerprints)
-        
-        # Total netAmount counting only one record per fingerprint
-        total_net_amount_unique = sum(
-            recs[0].get("netAmount", 0) for recs in bill_fingerprints.values()
-        )
-        
-        dup_fingerprints = {fp: recs for fp, recs in bill_fingerprints.items() if len(recs) > 1}
-        dup_fingerprint_count = len(dup_fingerprints)
-        total_dup_rows = sum(len(recs) - 1 for recs in dup_fingerprints.values())
-        
-        bill_stats[bill_number] = {
-            "totalRecordsAll": total_records_all,
-            "totalNetAmountAll": total_net_amount_all,
-            "uniqueRecordsCount": unique_records_count,
-            "totalNetAmountUnique": total_net_amount_unique,
-            "dupFingerprintCount": dup_fingerprint_count,
-            "totalDuplicateRows": total_dup_rows,
+    # Per-bill analysis, in one pass over the records and one over the groups
+    bill_stats = {
+        bill_number: {
+            "totalRecordsAll": 0,
+            "totalNetAmountAll": 0,
+            "uniqueRecordsCount": 0,
+            "totalNetAmountUnique": 0,
+            "dupFingerprintCount": 0,
+            "totalDuplicateRows": 0,
         }
+        for bill_number in BILLS
+    }
+    for record in records:
+        stats = bill_stats.get(record.get("billNumber"))
+        if stats is not None:
+            stats["totalRecordsAll"] += 1
+            stats["totalNetAmountAll"] += record.get("netAmount", 0)
+    
+    # The bill is part of the fingerprint, so every group is within one bill;
+    # netAmount (unique) counts only the first record per fingerprint
+    for ids in fingerprint_to_ids.values():
+        first_record = records_by_id[ids[0]]
+        stats = bill_stats.get(first_record.get("billNumber"))
+        if stats is None:
+            continue
+        stats["uniqueRecordsCount"] += 1
+        stats["totalNetAmountUnique"] += first_record.get("netAmount", 0)
+        if len(ids) > 1:
+            stats["dupFingerprintCount"] += 1
+            stats["totalDuplicateRows"] += len(ids) - 1
     
     # Find top 10 most suspicious duplicate groups
     # Sort by: occurrence count (desc), then total netAmount (desc)
     duplicate_groups = []
-    for fp, recs in duplicate_fingerprints.items():
+    for fp, ids in duplicate_fingerprints.items():
+        recs = [records_by_id[record_id] for record_id in ids]
         occurrence_count = len(recs)
         sum_net_amount = sum(r.get("netAmount", 0) for r in recs)
         
@@ -134,6 +106,12 @@ def analyze_data(records: List[Dict[str, Any]]) -> Dict[str, Any]:
     duplicate_groups.sort(key=lambda x: (-x["occurrenceCount"], -abs(x["sumNetAmount"])))
     top_10_duplicates = duplicate_groups[:10]
     
+    # Near-duplicates across all sessions; exact duplicates are in Section 3
+    near_duplicates = find_near_duplicates(
+        all_records, near_threshold,
+        exact_key=lambda r: (r["sessionYear"], index.fingerprint(r["id"], FINGERPRINT_POLICY)),
+    )
+    
     return {
         "totalRecords": total_records,
         "totalNetAmountAll": total_net_amount_all,
@@ -142,6 +120,7 @@ def analyze_data(records: List[Dict[str, Any]]) -> Dict[str, Any]:
         "totalDuplicateRows": total_duplicate_rows,
         "billStats": bill_stats,
         "top10Duplicates": top_10_duplicates,
+        "nearDuplicates": near_duplicates,
     }
 
 
@@ -177,7 +156,7 @@ def generate_markdown_report(analysis: Dict[str, Any]) -> str:
     lines.append("## Section 2 – Per-Bill Summary")
     lines.append("")
 
-    for bill_number in ["HB1600", "SB800"]:
+    for bill_number in BILLS:
         stats = analysis["billStats"][bill_number]
         lines.append(f"### {bill_number}")
         lines.append("")
@@ -255,8 +234,13 @@ def generate_markdown_report(analysis: Dict[str, Any]) -> str:
     lines.append("---")
     lines.append("")
 
-    # Section 4: Quick Interpretation
-    lines.append("## Section 4 – Quick Interpretation")
+    # Section 4: Near-Duplicate Clusters
+    lines.extend(report_lines(analysis["nearDuplicates"], SESSION_YEAR, "Section 4 – Near-Duplicate Clusters"))
+    lines.append("---")
+    lines.append("")
+
+    # Section 5: Quick Interpretation
+    lines.append("## Section 5 – Quick Interpretation")
     lines.append("")
 
     # Determine severity
@@ -289,6 +273,12 @@ def generate_markdown_report(analysis: Dict[str, Any]) -> str:
     else:
         lines.append("Consider reviewing the parser logic to reduce duplicate extraction. ⚠️")
 
+    near_clusters = [c for c in analysis["nearDuplicates"].clusters
+                     if any(r.get("sessionYear") == SESSION_YEAR for r in c.records)]
+    if near_clusters:
+        lines.append(f"{len(near_clusters):,} near-duplicate cluster(s) (similarity >= "
+                     f"{analysis['nearDuplicates'].threshold:.2f}) involve 2025 records and are worth a manual look. ")
+
     lines.append("")
     lines.append("---")
     lines.append("")
@@ -297,7 +287,7 @@ def generate_markdown_report(analysis: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
-def main():
+def main(near_threshold: float = DEFAULT_THRESHOLD):
     """Main execution"""
     print("=" * 80)
     print("Amendment Vault 2025 Trust Report Generator")
@@ -305,23 +295,30 @@ def main():
     print()
 
     # Load data
-    print(f"Loading data from: {DATA_FILE}")
-    if not DATA_FILE.exists():
-        print(f"❌ ERROR: Data file not found: {DATA_FILE}")
+    files = year_files()
+    data_file = files.get(SESSION_YEAR)
+    if data_file is None:
+        print(f"❌ ERROR: Data file not found: member_requests_{SESSION_YEAR}.json")
         return 1
+    print(f"Loading data from: {data_file}")
 
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        records = json.load(f)
+    records_by_year = {year: read_records(path) for year, path in files.items()}
+    records = records_by_year[SESSION_YEAR]
+    all_records = [record for year_records in records_by_year.values() for record in year_records]
+    index = load_index(records_by_year=records_by_year)
 
     print(f"✓ Loaded {len(records):,} records")
     print()
 
     # Analyze
     print("Analyzing data for duplicates...")
-    analysis = analyze_data(records)
+    analysis = analyze_data(records, index, all_records, near_threshold)
     print(f"✓ Found {analysis['distinctFingerprints']:,} distinct fingerprints")
     print(f"✓ Found {analysis['duplicateFingerprintCount']:,} duplicate fingerprints")
     print(f"✓ Total duplicate rows: {analysis['totalDuplicateRows']:,}")
+    near = analysis["nearDuplicates"]
+    print(f"✓ Found {len(near.clusters):,} near-duplicate clusters across all sessions "
+          f"(similarity >= {near.threshold:.2f}, {near.candidate_pairs:,} candidate pairs, {near.seconds:.1f} s)")
     print()
 
     # Generate report
@@ -346,7 +343,11 @@ def main():
 
 
 if __name__ == "__main__":
-    exit(main())
+    parser = argparse.ArgumentParser(description="Generate the 2025 Amendment Vault trust report")
+    parser.add_argument("--near-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Jaccard similarity for near-duplicates (default: {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+    exit(main(near_threshold=args.near_threshold))
 
 
 # ============================================================================
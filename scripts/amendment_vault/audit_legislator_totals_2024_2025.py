@@ -8,107 +8,68 @@ This script computes per-legislator totals using the same business rules as the
 - isLanguageOnly == False
 - Dedupe by fingerprint (matching TypeScript logic)
 
+Records are queried from the SQLite amendment vault (vault_db.py), which is
+loaded from data/amendments/member_requests_<year> first if needed.
+
 Outputs:
 - CSV: data/amendments/legislator_member_request_totals_2024_2025.csv
 - Stdout: Top 20 legislators by totalNetAmount for each year
 """
 
-import json
 import csv
+import sys
 from pathlib import Path
-from collections import defaultdict
 
-def build_fingerprint(record: dict) -> str:
-    """
-    Build deduplication fingerprint matching TypeScript logic in aggregation.ts
-    """
-    bill = record.get('billNumber', '')
-    item = record.get('itemNumber', '')
-    patron = record.get('patronName', '').lower().strip()
-    
-    # Round amounts to nearest 1000
-    gf = round(record.get('deltaGF', 0) / 1000) * 1000
-    ngf = round(record.get('deltaNGF', 0) / 1000) * 1000
-    
-    # First 50 chars of description
-    desc = record.get('descriptionShort', '') or record.get('descriptionFull', '')
-    desc_prefix = desc[:50].lower().strip()
-    
-    return f"{bill}|{item}|{patron}|{gf}|{ngf}|{desc_prefix}"
+sys.path.insert(0, str(Path(__file__).parent))
 
-def dedupe_records(records: list) -> list:
-    """Deduplicate records by fingerprint"""
-    seen = set()
-    deduped = []
-    
-    for record in records:
-        fp = build_fingerprint(record)
-        if fp not in seen:
-            seen.add(fp)
-            deduped.append(record)
-    
-    return deduped
+from vault_db import open_vault
+
+SESSION_YEARS = (2024, 2025)
+YEAR_PLACEHOLDERS = ', '.join('?' for _ in SESSION_YEARS)
+
+# Frontend business rules, then one record per (session, patron, fingerprint):
+# the first in file order, as in aggregation.ts
+LEGISLATOR_TOTALS_SQL = f"""
+WITH eligible AS (
+    SELECT r.session_year, r.patron_name, r.net_amount, r.record_order,
+           ROW_NUMBER() OVER (
+               PARTITION BY r.session_year, r.patron_name, f.fingerprint
+               ORDER BY r.record_order
+           ) AS occurrence
+    FROM amendment_vault_member_requests r
+    JOIN amendment_vault_fingerprints f ON f.record_id = r.id AND f.policy = 'frontend_1000_50'
+    WHERE r.session_year IN ({YEAR_PLACEHOLDERS})
+      AND r.stage = 'member_request'
+      AND r.is_language_only = 0
+      AND r.net_amount > 0
+)
+SELECT session_year AS sessionYear,
+       patron_name AS patronName,
+       COUNT(*) AS amendmentCount,
+       SUM(net_amount) AS totalNetAmount,
+       MAX(net_amount) AS largestAmendment,
+       MIN(net_amount) AS smallestAmendment
+FROM eligible
+WHERE occurrence = 1
+GROUP BY session_year, patron_name
+ORDER BY session_year, totalNetAmount DESC, MIN(record_order)
+"""
 
 def main():
-    # Load both JSON files
-    data_2024_path = Path('data/amendments/member_requests_2024.json')
-    data_2025_path = Path('data/amendments/member_requests_2025.json')
-    
     print("Loading amendment data...")
-    with open(data_2024_path, 'r') as f:
-        data_2024 = json.load(f)
-    with open(data_2025_path, 'r') as f:
-        data_2025 = json.load(f)
-    
-    print(f"Total records: {len(data_2024) + len(data_2025):,}")
-    
-    # Group by (sessionYear, patronName)
-    legislator_data = defaultdict(lambda: {
-        'sessionYear': 0,
-        'patronName': '',
-        'records': [],
-    })
-    
-    for record in data_2024 + data_2025:
-        # Apply frontend business rules
-        if record.get('stage') != 'member_request':
-            continue
-        if record.get('isLanguageOnly', False):
-            continue
-        if record.get('netAmount', 0) <= 0:
-            continue
-        
-        session_year = record.get('sessionYear')
-        patron_name = record.get('patronName', '')
-        
-        key = (session_year, patron_name)
-        legislator_data[key]['sessionYear'] = session_year
-        legislator_data[key]['patronName'] = patron_name
-        legislator_data[key]['records'].append(record)
-    
-    # Compute totals for each legislator
-    results = []
-    
-    for key, data in legislator_data.items():
-        # Deduplicate
-        deduped = dedupe_records(data['records'])
-        
-        if not deduped:
-            continue
-        
-        amounts = [r['netAmount'] for r in deduped]
-        
-        results.append({
-            'sessionYear': data['sessionYear'],
-            'patronName': data['patronName'],
-            'amendmentCount': len(deduped),
-            'totalNetAmount': sum(amounts),
-            'largestAmendment': max(amounts),
-            'smallestAmendment': min(amounts),
-        })
-    
-    # Sort by sessionYear, then totalNetAmount descending
-    results.sort(key=lambda x: (x['sessionYear'], -x['totalNetAmount']))
+    conn = open_vault()
+    
+    total_records = conn.execute(
+        f"SELECT COUNT(*) FROM amendment_vault_member_requests "
+        f"WHERE session_year IN ({YEAR_PLACEHOLDERS})",
+        SESSION_YEARS,
+    ).fetchone()[0]
+    print(f"Total records: {total_records:,}")
+    
+    # Per-legislator totals over deduplicated records, sorted by sessionYear,
+    # then totalNetAmount descending
+    results = [dict(row) for row in conn.execute(LEGISLATOR_TOTALS_SQL, SESSION_YEARS)]
+    conn.close()
     
     # Write CSV
     csv_path = Path('data/amendments/legislator_member_request_totals_2024_2025.csv')
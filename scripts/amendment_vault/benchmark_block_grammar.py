@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Amendment Vault - Block Grammar Benchmark
+
+Times parse_amendment_block() (patron/item header, GF/NGF year amounts,
+Language and Explanation spans) over the parsed corpus in
+data/amendments/member_requests_*.json.
+
+The JSON records do not keep the raw PDF text, so each record is turned back
+into a block in the Member Request layout:
+
+    Chief Patron: <patron> Item <item> #<n>h
+    <agency>
+    $<fy1> $<fy2> GF $<fy1> $<fy2> NGF      (or "Language")
+    Explanation: (<description>)
+
+and parsing it must give back the record's patron, item, agency, second-year
+GF/NGF amounts and description. Mismatches are counted and reported.
+
+Usage:
+    python scripts/amendment_vault/benchmark_block_grammar.py [--repeat R]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from parse_member_requests import OUTPUT_DIR, parse_amendment_block
+
+
+def rebuild_block(record: Dict[str, Any], sequence: int) -> str:
+    """Member Request text for a parsed record"""
+    lines = [f"Chief Patron: {record['patronName']} Item {record['itemNumber']} #{sequence}h"]
+    if record['agencyName']:
+        lines.append(record['agencyName'])
+    if record['isLanguageOnly']:
+        lines.append("Language")
+    else:
+        # Only second-year amounts are kept in the records
+        lines.append(f"$0 ${record['deltaGF']:,.0f} GF $0 ${record['deltaNGF']:,.0f} NGF")
+    if record['descriptionFull']:
+        lines.append(f"Explanation: ({record['descriptionFull']})")
+    return "\n".join(lines) + "\n"
+
+
+def expected_fields(record: Dict[str, Any]) -> Tuple:
+    return (record['patronName'], record['itemNumber'], record['agencyName'] or "",
+            record['deltaGF'], record['deltaNGF'], record['descriptionFull'])
+
+
+def parsed_fields(block: str) -> Tuple:
+    fields = parse_amendment_block(block)
+    if fields is None:
+        return ()
+    return (fields.patron_name, fields.item_number, fields.agency_name,
+            fields.fy2_gf, fields.fy2_ngf, fields.explanation)
+
+
+def load_corpus() -> List[Dict[str, Any]]:
+    records = []
+    for json_path in sorted(OUTPUT_DIR.glob("member_requests_[0-9]*.json")):
+        with open(json_path, 'r', encoding='utf-8') as f:
+            file_records = json.load(f)
+        print(f"📂 {json_path.name}: {len(file_records):,} records")
+        records.extend(file_records)
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the amendment block grammar')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed passes over the corpus (the fastest is kept)')
+    args = parser.parse_args()
+
+    records = load_corpus()
+    if not records:
+        print(f"✗ No member_requests_*.json files in {OUTPUT_DIR}")
+        return 1
+
+    blocks = [rebuild_block(record, i) for i, record in enumerate(records, 1)]
+    total_bytes = sum(len(block.encode('utf-8')) for block in blocks)
+
+    mismatches = [i for i, (record, block) in enumerate(zip(records, blocks))
+                  if parsed_fields(block) != expected_fields(record)]
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        for block in blocks:
+            parse_amendment_block(block)
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+
+    print()
+    print(f"📄 {len(blocks):,} blocks, {total_bytes / 1e6:.2f} MB")
+    print(f"⏱️  best {best * 1000:.1f} ms per pass, median {statistics.median(timings) * 1000:.1f} ms "
+          f"({best / len(blocks) * 1e6:.1f} µs per block, {len(blocks) / best:,.0f} blocks/s)")
+
+    if mismatches:
+        print(f"❌ {len(mismatches):,} block(s) did not parse back to their record, e.g.:")
+        for i in mismatches[:5]:
+            print(f"   {records[i]['id']}: {parsed_fields(blocks[i])} != {expected_fields(records[i])}")
+        return 1
+    print("✅ Every block parsed back to its record")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
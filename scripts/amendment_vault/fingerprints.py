@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Amendment Vault - Fingerprints and Dedup Index
+
+The duplicate checks of the amendment analytics each use their own record
+fingerprint. They are named policies here:
+
+- trust_report_200: trust reports (analyze_member_requests_<year>.py);
+  amounts to the dollar, normalized descriptionShort (200 chars), per session
+- frontend_1000_50: legislator totals (audit_legislator_totals_2024_2025.py,
+  aggregation.ts business rules); amounts to the nearest 1000, first 50
+  characters of the description, per session
+- recipient_audit: funding recipient audits (audit_top_recipients_for_legislator.py,
+  scripts/verify_legislator_recipients.py); amounts to the dollar, 200
+  characters of the description, across sessions
+
+Every record's fingerprint under every policy is computed once and stored in
+data/amendments/member_requests_fingerprints.json, next to the
+member_requests_<year> files it indexes. Each session is keyed by the SHA-256
+of its year file and the policy versions, so only changed sessions are
+fingerprinted again. FingerprintIndex serves fingerprint, group and dedup
+lookups from dicts in O(1) per record.
+
+Usage:
+    python scripts/amendment_vault/fingerprints.py [--data-dir DIR] [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+OUTPUT_DIR = REPO_ROOT / "data" / "amendments"
+INDEX_NAME = "member_requests_fingerprints.json"
+INDEX_FORMAT = "fingerprint-index-1"
+
+# ============================================================================
+# Normalization
+# ============================================================================
+
+
+def normalize_patron_name(name: str) -> str:
+    """Normalize patron name for matching (same logic as frontend)."""
+    return name.lower().strip().replace("  ", " ")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for fingerprinting: lowercase, trim, collapse spaces"""
+    if not text:
+        return ""
+    return " ".join(text.lower().strip().split())
+
+
+# ============================================================================
+# Policies
+# ============================================================================
+
+
+def trust_report_fingerprint(record: Dict[str, Any]) -> str:
+    """
+    Duplicate detection in the trust reports: bill, item, patron, GF/NGF
+    rounded to the dollar and the normalized descriptionShort (200 chars).
+    """
+    return "|".join([
+        record.get("billNumber", ""),
+        str(record.get("itemNumber", "")),
+        normalize_text(record.get("patronName", "")),
+        str(round(record.get("deltaGF", 0))),
+        str(round(record.get("deltaNGF", 0))),
+        normalize_text(record.get("descriptionShort", ""))[:200],
+    ])
+
+
+def legislator_totals_fingerprint(record: Dict[str, Any]) -> str:
+    """
+    Dedup for the legislator totals audit: GF/NGF rounded to the nearest
+    1000 and the first 50 characters of the description.
+    """
+    bill = record.get('billNumber', '')
+    item = record.get('itemNumber', '')
+    patron = record.get('patronName', '').lower().strip()
+    gf = round(record.get('deltaGF', 0) / 1000) * 1000
+    ngf = round(record.get('deltaNGF', 0) / 1000) * 1000
+    desc = record.get('descriptionShort', '') or record.get('descriptionFull', '')
+    desc_prefix = desc[:50].lower().strip()
+    return f"{bill}|{item}|{patron}|{gf}|{ngf}|{desc_prefix}"
+
+
+def recipient_audit_fingerprint(record: Dict[str, Any]) -> str:
+    """Dedup for the funding recipient audits (amounts to the dollar, 200 chars)."""
+    desc_source = record.get("descriptionShort") or record.get("descriptionFull") or ""
+    normalized_desc = desc_source.lower().strip().replace("  ", " ")[:200]
+    normalized_patron = normalize_patron_name(record.get("patronName", ""))
+    bill = record.get("billNumber", "")
+    item = record.get("itemNumber", "")
+    rounded_gf = round(record.get("deltaGF", 0))
+    rounded_ngf = round(record.get("deltaNGF", 0))
+    return f"{bill}|{item}|{normalized_patron}|{rounded_gf}|{rounded_ngf}|{normalized_desc}"
+
+
+class Policy(NamedTuple):
+    """A named fingerprint rule"""
+    name: str
+    fingerprint: Callable[[Dict[str, Any]], str]
+    per_session: bool  # duplicates only within a session
+    version: int  # bump when `fingerprint` changes; stored fingerprints are recomputed
+
+
+POLICIES: Dict[str, Policy] = {policy.name: policy for policy in [
+    Policy("trust_report_200", trust_report_fingerprint, per_session=True, version=1),
+    Policy("frontend_1000_50", legislator_totals_fingerprint, per_session=True, version=1),
+    Policy("recipient_audit", recipient_audit_fingerprint, per_session=False, version=1),
+]}
+
+POLICY_VERSIONS = {name: policy.version for name, policy in POLICIES.items()}
+
+
+def fingerprints(record: Dict[str, Any]) -> Dict[str, str]:
+    """The record's fingerprint under every policy"""
+    return {name: policy.fingerprint(record) for name, policy in POLICIES.items()}
+
+
+# ============================================================================
+# Year Files
+# ============================================================================
+
+def year_files(data_dir: Path = OUTPUT_DIR) -> Dict[int, Path]:
+    """Session year -> member_requests_<year> file (NDJSON if present, otherwise JSON)"""
+    files = {}
+    for path in sorted(data_dir.glob("member_requests_[0-9]*.*")):
+        year = path.stem.rsplit('_', 1)[-1]
+        if not year.isdigit() or path.suffix not in ('.ndjson', '.json'):
+            continue
+        if path.suffix == '.ndjson' or int(year) not in files:
+            files[int(year)] = path
+    return dict(sorted(files.items()))
+
+
+def read_records(path: Path) -> List[Dict[str, Any]]:
+    """Records of a member_requests_<year>.ndjson or .json file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix == '.ndjson':
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ============================================================================
+# Dedup Index
+# ============================================================================
+
+class FingerprintIndex:
+    """
+    Fingerprints of every record under every policy, with their groups.
+
+    `sessions` maps a session year to its records in file order, each as
+    (record id, {policy: fingerprint}). Group keys are the fingerprint, plus
+    the session year for per-session policies.
+    """
+
+    def __init__(self, sessions: Dict[int, List[Tuple[str, Dict[str, str]]]]):
+        self.sessions = dict(sorted(sessions.items()))
+        self._fingerprints: Dict[str, Dict[str, str]] = {}
+        self._years: Dict[str, int] = {}
+        # policy -> group key -> record ids in file order (sessions in year order)
+        self._groups: Dict[str, Dict[Tuple, List[str]]] = {name: {} for name in POLICIES}
+        for year, entries in self.sessions.items():
+            for record_id, record_fingerprints in entries:
+                self._fingerprints[record_id] = record_fingerprints
+                self._years[record_id] = year
+                for name, fingerprint in record_fingerprints.items():
+                    self._groups[name].setdefault(self._key(name, year, fingerprint), []).append(record_id)
+
+    @staticmethod
+    def _key(policy: str, session_year: int, fingerprint: str) -> Tuple:
+        return (session_year, fingerprint) if POLICIES[policy].per_session else (fingerprint,)
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def __contains__(self, record_id: str) -> bool:
+        return record_id in self._fingerprints
+
+    def fingerprint(self, record_id: str, policy: str) -> str:
+        """The record's fingerprint under `policy`"""
+        return self._fingerprints[record_id][policy]
+
+    def group(self, record_id: str, policy: str) -> List[str]:
+        """Ids of the records sharing the record's fingerprint (itself included), in file order"""
+        key = self._key(policy, self._years[record_id], self._fingerprints[record_id][policy])
+        return self._groups[policy][key]
+
+    def is_duplicate(self, record_id: str, policy: str) -> bool:
+        """Whether an earlier record has the same fingerprint"""
+        return self.group(record_id, policy)[0] != record_id
+
+    def groups(self, policy: str, session_year: Optional[int] = None) -> Dict[str, List[str]]:
+        """
+        Fingerprint -> record ids under `policy`, in order of first occurrence.
+
+        Per-session policies need `session_year`; for the others it limits
+        the groups to those first seen in that session.
+        """
+        if POLICIES[policy].per_session:
+            if session_year is None:
+                raise ValueError(f"{policy} groups are per session; pass session_year")
+            return {key[1]: ids for key, ids in self._groups[policy].items() if key[0] == session_year}
+        return {key[0]: ids for key, ids in self._groups[policy].items()
+                if session_year is None or self._years[ids[0]] == session_year}
+
+    def dedupe(self, records: Iterable[Dict[str, Any]], policy: str) -> List[Dict[str, Any]]:
+        """
+        The first of `records` with each fingerprint, in their order.
+
+        Fingerprints are looked up, not recomputed. Records not in the index
+        (e.g. not written to a year file yet) are fingerprinted on the fly.
+        """
+        seen = set()
+        deduped = []
+        for record in records:
+            record_id = record.get("id")
+            if record_id in self._fingerprints:
+                key = self._key(policy, self._years[record_id], self._fingerprints[record_id][policy])
+            else:
+                key = self._key(policy, record.get("sessionYear"), POLICIES[policy].fingerprint(record))
+            if key not in seen:
+                seen.add(key)
+                deduped.append(record)
+        return deduped
+
+
+def fingerprint_session(records: Iterable[Dict[str, Any]]) -> List[Tuple[str, Dict[str, str]]]:
+    return [(record["id"], fingerprints(record)) for record in records]
+
+
+def load_index(data_dir: Path = OUTPUT_DIR, force: bool = False,
+               records_by_year: Optional[Dict[int, List[Dict[str, Any]]]] = None) -> FingerprintIndex:
+    """
+    The dedup index of the year files in `data_dir`.
+
+    Sessions whose year file or policy versions changed since the index was
+    written are fingerprinted again and the index file is rewritten.
+
+    Args:
+        data_dir: Directory with the member_requests_<year> files
+        force: Fingerprint every session again
+        records_by_year: Already loaded records of some sessions, used instead
+            of reading their year file again when they need fingerprinting
+    """
+    index_path = data_dir / INDEX_NAME
+    stored = {}
+    if index_path.exists() and not force:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("format") == INDEX_FORMAT and data.get("policies") == POLICY_VERSIONS:
+            stored = data["sessions"]
+
+    sessions = {}
+    entries = {}
+    changed = False
+    for year, path in year_files(data_dir).items():
+        sha256 = file_sha256(path)
+        entry = stored.get(str(year))
+        if entry is None or entry["sha256"] != sha256:
+            records = (records_by_year or {}).get(year)
+            if records is None:
+                records = read_records(path)
+            entry = {
+                "path": path.name,
+                "sha256": sha256,
+                "records": [[record_id, [fps[name] for name in POLICIES]]
+                            for record_id, fps in fingerprint_session(records)],
+            }
+            changed = True
+        entries[str(year)] = entry
+        sessions[year] = [(record_id, dict(zip(POLICIES, values))) for record_id, values in entry["records"]]
+    changed = changed or set(entries) != set(stored)
+
+    if changed:
+        tmp_path = index_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "generatedAt": datetime.now().isoformat(),
+                "format": INDEX_FORMAT,
+                "policies": POLICY_VERSIONS,
+                "sessions": entries,
+            }, f, ensure_ascii=False, separators=(',', ':'))
+        tmp_path.replace(index_path)
+
+    return FingerprintIndex(sessions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the fingerprint dedup index of the parsed member requests')
+    parser.add_argument('--data-dir', type=Path, default=OUTPUT_DIR,
+                        help='Directory with the member_requests_<year> files (default: data/amendments)')
+    parser.add_argument('--force', action='store_true', help='Fingerprint every session again')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    index = load_index(args.data_dir, force=args.force)
+    elapsed = time.perf_counter() - started
+
+    print(f"✓ {args.data_dir / INDEX_NAME}: {len(index):,} records in {elapsed * 1000:.0f} ms")
+    for name, policy in POLICIES.items():
+        scope = "per session" if policy.per_session else "across sessions"
+        for year in (index.sessions if policy.per_session else [None]):
+            groups = index.groups(name, year).values()
+            duplicates = sum(len(ids) - 1 for ids in groups)
+            label = f"{name} {year}" if year else name
+            print(f"   {label:24} {len(groups):>6,} fingerprints, {duplicates:>5,} duplicate rows ({scope})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Amendment Vault - Near-Duplicate Detection
+
+Fingerprints (fingerprints.py) only catch exact duplicates. The same request
+reworded, or filed in both the House and Senate bill with slightly different
+amounts, gets a different fingerprint. Comparing every pair of records is
+quadratic across sessions, so near-duplicates are found with MinHash and
+locality-sensitive hashing (LSH):
+
+- each record becomes a feature set: word shingles (SHINGLE_SIZE words) of
+  its normalized descriptionFull, plus its patron and item number
+- a MinHash signature of NUM_PERM values estimates the Jaccard similarity of
+  two feature sets; a feature's NUM_PERM hash values come from a single
+  SHAKE-128 digest, memoized because most shingles recur across records
+- signatures are cut into bands of rows; records sharing a band fall in the
+  same bucket and become candidate pairs, with bands and rows chosen so that
+  pairs at or above the similarity threshold are very likely to share one
+- candidates are checked against their exact Jaccard similarity and the
+  matches are joined into clusters
+
+Work grows with the number of records plus candidate pairs, which stay few
+at useful thresholds. The trust reports show the clusters in their
+"Near-Duplicate Clusters" section.
+
+Usage:
+    python scripts/amendment_vault/near_duplicates.py [--threshold T] [--num-perm N]
+        [--shingle-size K] [--session YEAR] [--brute-force]
+
+--brute-force also compares every pair directly and reports how many of the
+near-duplicate pairs LSH found, to tune the parameters.
+"""
+
+import argparse
+import hashlib
+import sys
+import time
+from array import array
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, NamedTuple, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fingerprints import normalize_text, read_records, year_files
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+# Jaccard similarity of two feature sets for them to be near-duplicates
+DEFAULT_THRESHOLD = 0.8
+
+# MinHash signature length; more permutations estimate similarity better but
+# cost proportionally more
+NUM_PERM = 128
+
+# Words per description shingle
+SHINGLE_SIZE = 3
+
+# Weight of missed pairs against extra candidates when choosing LSH bands;
+# candidates are checked exactly, so a miss costs more than a false candidate
+FALSE_NEGATIVE_WEIGHT = 0.9
+
+# Clusters shown in a trust report section
+REPORT_CLUSTERS = 10
+
+# ============================================================================
+# Features and Signatures
+# ============================================================================
+
+
+def features(record: Dict[str, Any], shingle_size: int = SHINGLE_SIZE) -> FrozenSet[str]:
+    """
+    Description shingles plus patron and item features of a record.
+
+    Records whose description is shorter than one shingle get an empty set
+    and are never near-duplicates.
+    """
+    words = normalize_text(record.get("descriptionFull") or record.get("descriptionShort") or "").split()
+    if len(words) < shingle_size:
+        return frozenset()
+    shingles = {" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)}
+    shingles.add(f"patron:{normalize_text(record.get('patronName', ''))}")
+    shingles.add(f"item:{record.get('itemNumber', '')}")
+    return frozenset(shingles)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    intersection = len(a & b)
+    return intersection / (len(a) + len(b) - intersection)
+
+
+class MinHasher:
+    """MinHash signatures with `num_perm` independent 32-bit hash functions"""
+
+    def __init__(self, num_perm: int = NUM_PERM):
+        self.num_perm = num_perm
+        self._hashes: Dict[str, array] = {}
+
+    def _feature_hashes(self, feature: str) -> array:
+        hashes = self._hashes.get(feature)
+        if hashes is None:
+            hashes = array('I')
+            hashes.frombytes(hashlib.shake_128(feature.encode('utf-8')).digest(4 * self.num_perm))
+            self._hashes[feature] = hashes
+        return hashes
+
+    def signature(self, feature_set: FrozenSet[str]) -> Tuple[int, ...]:
+        """Minimum of each hash function over the features"""
+        return tuple(map(min, zip(*(self._feature_hashes(f) for f in feature_set))))
+
+
+def collision_probability(similarity: float, bands: int, rows: int) -> float:
+    """Chance that two sets of this Jaccard similarity share at least one band"""
+    return 1 - (1 - similarity ** rows) ** bands
+
+
+def lsh_params(threshold: float, num_perm: int = NUM_PERM,
+               false_negative_weight: float = FALSE_NEGATIVE_WEIGHT) -> Tuple[int, int]:
+    """
+    (bands, rows) with bands * rows <= num_perm that minimize the weighted
+    false positive area (pairs below `threshold` that still collide) plus
+    false negative area (pairs above it that never do), both integrated
+    over similarity.
+    """
+    steps = 100
+
+    def area(low: float, high: float, f: Callable[[float], float]) -> float:
+        width = (high - low) / steps
+        return sum(f(low + (k + 0.5) * width) for k in range(steps)) * width
+
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        false_positives = area(0.0, threshold, lambda s: collision_probability(s, bands, rows))
+        false_negatives = area(threshold, 1.0, lambda s: 1 - collision_probability(s, bands, rows))
+        cost = (1 - false_negative_weight) * false_positives + false_negative_weight * false_negatives
+        if best is None or cost < best[0]:
+            best = (cost, bands, rows)
+    return best[1], best[2]
+
+
+# ============================================================================
+# Clustering
+# ============================================================================
+
+class NearDuplicateCluster(NamedTuple):
+    records: List[Dict[str, Any]]  # in input order
+    min_similarity: float  # over the matched pairs joining the cluster
+    max_similarity: float
+
+
+class NearDuplicateResult(NamedTuple):
+    clusters: List[NearDuplicateCluster]  # largest first
+    records: int  # records with a feature set
+    exact_duplicates: int  # records collapsed into an earlier record with the same exact key
+    candidate_pairs: int  # pairs sharing an LSH bucket
+    matched_pairs: int  # candidates at or above the threshold
+    threshold: float
+    num_perm: int
+    shingle_size: int
+    bands: int
+    rows: int
+    seconds: float
+
+
+def find_near_duplicates(records: List[Dict[str, Any]],
+                         threshold: float = DEFAULT_THRESHOLD,
+                         num_perm: int = NUM_PERM,
+                         shingle_size: int = SHINGLE_SIZE,
+                         exact_key: Optional[Callable[[Dict[str, Any]], Hashable]] = None) -> NearDuplicateResult:
+    """
+    Clusters of records whose feature sets have a Jaccard similarity of at
+    least `threshold`, across every record given (all sessions).
+
+    Args:
+        records: Records to compare
+        threshold: Minimum Jaccard similarity of a matched pair
+        num_perm: MinHash signature length
+        shingle_size: Words per description shingle
+        exact_key: Records with the same key (e.g. the trust report fingerprint)
+            are exact duplicates, reported elsewhere; only the first of them
+            is clustered
+
+    Returns:
+        NearDuplicateResult with the clusters, sorted by size, then total
+        |netAmount|, then first record
+    """
+    started = time.perf_counter()
+    bands, rows = lsh_params(threshold, num_perm)
+    hasher = MinHasher(num_perm)
+
+    feature_sets = [features(record, shingle_size) for record in records]
+    indexed = [i for i, feature_set in enumerate(feature_sets) if feature_set]
+
+    # Exact duplicates collapse into their first record, so they can neither
+    # join a cluster through a third record nor count towards its size
+    representatives = indexed
+    if exact_key:
+        seen = set()
+        representatives = []
+        for i in indexed:
+            key = exact_key(records[i])
+            if key is not None and key in seen:
+                continue
+            seen.add(key)
+            representatives.append(i)
+
+    # LSH buckets: band number + that band's slice of the signature
+    buckets: Dict[Tuple, List[int]] = {}
+    for i in representatives:
+        signature = hasher.signature(feature_sets[i])
+        for band in range(bands):
+            key = (band,) + signature[band * rows:(band + 1) * rows]
+            buckets.setdefault(key, []).append(i)
+
+    # Union-find over matched pairs
+    parent = list(range(len(records)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    checked = set()
+    similarities: Dict[int, List[float]] = {}
+    matched_pairs = 0
+    for members in buckets.values():
+        for a, b in combinations(members, 2):
+            if (a, b) in checked:
+                continue
+            checked.add((a, b))
+            similarity = jaccard(feature_sets[a], feature_sets[b])
+            if similarity < threshold:
+                continue
+            matched_pairs += 1
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[root_b] = root_a
+                similarities.setdefault(root_a, []).extend(similarities.pop(root_b, []))
+            similarities.setdefault(root_a, []).append(similarity)
+
+    members_by_root: Dict[int, List[int]] = {}
+    for i in representatives:
+        root = find(i)
+        if root in similarities:
+            members_by_root.setdefault(root, []).append(i)
+
+    clusters = [
+        NearDuplicateCluster([records[i] for i in members], min(similarities[root]), max(similarities[root]))
+        for root, members in sorted(members_by_root.items(), key=lambda item: item[1][0])
+    ]
+    clusters.sort(key=lambda c: (-len(c.records), -sum(abs(r.get("netAmount", 0)) for r in c.records)))
+
+    return NearDuplicateResult(
+        clusters=clusters,
+        records=len(indexed),
+        exact_duplicates=len(indexed) - len(representatives),
+        candidate_pairs=len(checked),
+        matched_pairs=matched_pairs,
+        threshold=threshold,
+        num_perm=num_perm,
+        shingle_size=shingle_size,
+        bands=bands,
+        rows=rows,
+        seconds=time.perf_counter() - started,
+    )
+
+
+# ============================================================================
+# Report Section
+# ============================================================================
+
+def cluster_label(cluster: NearDuplicateCluster, shown: int = 3) -> str:
+    """Patrons and items of a cluster, e.g. 'Coyner, Hope +2 more – Item 390, 391'"""
+    def join(values: List[str]) -> str:
+        unique = list(dict.fromkeys(values))
+        more = f" +{len(unique) - shown} more" if len(unique) > shown else ""
+        return ", ".join(unique[:shown]) + more
+
+    patrons = join([r.get("patronName") or "N/A" for r in cluster.records])
+    items = join([str(r.get("itemNumber") or "N/A") for r in cluster.records])
+    return f"{patrons} – Item {items}"
+
+
+def report_lines(result: NearDuplicateResult, session_year: int,
+                 section_title: str, limit: int = REPORT_CLUSTERS) -> List[str]:
+    """Markdown section of a session's trust report: the clusters with a record of that session"""
+    clusters = [c for c in result.clusters if any(r.get("sessionYear") == session_year for r in c.records)]
+
+    lines = []
+    lines.append(f"## {section_title}")
+    lines.append("")
+    lines.append(f"**Method:** MinHash ({result.num_perm} permutations) + LSH ({result.bands} bands × "
+                 f"{result.rows} rows) over {result.shingle_size}-word shingles of `descriptionFull` "
+                 f"plus patron and item, across all sessions ({result.records:,} records)")
+    lines.append(f"**Similarity Threshold:** {result.threshold:.2f} (Jaccard)")
+    lines.append(f"**Candidate Pairs Checked:** {result.candidate_pairs:,}")
+    lines.append(f"**Near-Duplicate Clusters with {session_year} Records:** {len(clusters):,} "
+                 f"({sum(len(c.records) for c in clusters):,} records)")
+    lines.append("")
+    lines.append(f"Exact fingerprint duplicates ({result.exact_duplicates:,} records) are collapsed into "
+                 f"their first record before clustering and are not counted as near-duplicates.")
+    lines.append("")
+
+    if not clusters:
+        lines.append("**No near-duplicate clusters found.** ✅")
+        lines.append("")
+        return lines
+
+    for i, cluster in enumerate(clusters[:limit], 1):
+        sessions = sorted({r.get("sessionYear") for r in cluster.records})
+        bills = sorted({r.get("billNumber", "N/A") for r in cluster.records})
+
+        lines.append(f"### {i}. {cluster_label(cluster)}")
+        lines.append("")
+        lines.append(f"**Records:** {len(cluster.records)} ({', '.join(bills)}; "
+                     f"{', '.join(str(year) for year in sessions)})")
+        if cluster.min_similarity == cluster.max_similarity:
+            lines.append(f"**Similarity:** {cluster.min_similarity:.2f}")
+        else:
+            lines.append(f"**Similarity:** {cluster.min_similarity:.2f}–{cluster.max_similarity:.2f}")
+        lines.append("")
+
+        for j, record in enumerate(cluster.records[:3], 1):
+            desc = record.get("descriptionShort") or record.get("descriptionFull") or ""
+            desc_truncated = desc[:150] + "..." if len(desc) > 150 else desc
+            desc_truncated = desc_truncated.replace("\n", " ")
+            lines.append(f"{j}. **{record.get('billNumber', 'N/A')} ({record.get('sessionYear')})** – "
+                         f"{record.get('patronName', 'N/A')} – Item {record.get('itemNumber', 'N/A')} – "
+                         f"${record.get('netAmount', 0):,.0f}")
+            lines.append(f"   - Description: {desc_truncated}")
+            lines.append("")
+
+        if len(cluster.records) > 3:
+            lines.append(f"   _(... and {len(cluster.records) - 3} more near-duplicate(s))_")
+            lines.append("")
+
+    if len(clusters) > limit:
+        lines.append(f"_({len(clusters) - limit} more cluster(s) not shown)_")
+        lines.append("")
+
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find near-duplicate member requests with MinHash + LSH')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Minimum Jaccard similarity (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--num-perm', type=int, default=NUM_PERM,
+                        help=f'MinHash signature length (default: {NUM_PERM})')
+    parser.add_argument('--shingle-size', type=int, default=SHINGLE_SIZE,
+                        help=f'Words per description shingle (default: {SHINGLE_SIZE})')
+    parser.add_argument('--session', type=int, default=None, help='Only show clusters with records of this session')
+    parser.add_argument('--brute-force', action='store_true',
+                        help='Also compare every pair and report how many near-duplicate pairs LSH found')
+    args = parser.parse_args()
+
+    records = []
+    for year, path in year_files().items():
+        file_records = read_records(path)
+        print(f"📂 {path.name}: {len(file_records):,} records")
+        records.extend(file_records)
+    if not records:
+        print("✗ No member request records found")
+        return 1
+
+    result = find_near_duplicates(records, args.threshold, args.num_perm, args.shingle_size)
+    print()
+    print(f"⏱️  {result.records:,} records in {result.seconds * 1000:.0f} ms "
+          f"({result.bands} bands × {result.rows} rows, {result.candidate_pairs:,} candidate pairs)")
+    print(f"🔗 {result.matched_pairs:,} near-duplicate pairs in {len(result.clusters):,} clusters "
+          f"(Jaccard >= {args.threshold:.2f})")
+
+    if args.brute_force:
+        started = time.perf_counter()
+        feature_sets = [features(r, args.shingle_size) for r in records]
+        indexed = [i for i, feature_set in enumerate(feature_sets) if feature_set]
+        pairs = sum(1 for a, b in combinations(indexed, 2)
+                    if jaccard(feature_sets[a], feature_sets[b]) >= args.threshold)
+        elapsed = time.perf_counter() - started
+        recall = result.matched_pairs / pairs if pairs else 1.0
+        print(f"🐢 Brute force: {pairs:,} pairs in {elapsed:.1f} s; LSH found {recall:.1%}")
+
+    print()
+    if args.session:
+        for line in report_lines(result, args.session, "Near-Duplicate Clusters"):
+            print(line)
+    else:
+        for i, cluster in enumerate(result.clusters[:REPORT_CLUSTERS], 1):
+            bills = sorted({f"{r.get('billNumber')} {r.get('sessionYear')}" for r in cluster.records})
+            print(f"{i:2}. {len(cluster.records)} records, similarity {cluster.min_similarity:.2f}–"
+                  f"{cluster.max_similarity:.2f}: {cluster_label(cluster)} ({', '.join(bills)})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
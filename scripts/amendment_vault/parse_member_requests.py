@@ -2,26 +2,60 @@
 """
 Amendment Vault - Member Request PDF Parser
 
-Parses Member Request PDFs (HB30, SB30, HB1600, SB800) into structured AmendmentVaultRecord format.
+Parses Member Request PDFs (HB30, SB30, HB1600, SB800, and any other session
+found under the PDF directory) into structured AmendmentVaultRecord format.
 
 Usage:
-    python scripts/amendment_vault/parse_member_requests.py
+    python scripts/amendment_vault/parse_member_requests.py [--workers N] [--no-page-cache] [--words]
+        [--ndjson-only] [--pdf-dir DIR] [--force]
+
+PDFs are discovered anywhere under the PDF directory; bill number, session
+year and stage come from file and directory names (e.g.
+"2022/Caboose/HB29 Member Requests.pdf"). Ingestion is incremental:
+data/amendments/ingest_manifest.json records each PDF's SHA-256 and parser
+version, only new or changed PDFs are parsed, and their records are upserted
+by id over the stored ones. Records of unchanged PDFs are carried over.
+
+Text extraction (the slow part: pdfplumber's layout analysis is pure Python)
+runs page-parallel: every discovered PDF is split into page ranges and all
+ranges are extracted together in a process pool, then each PDF's pages are
+reassembled in order. Extracted pages are cached in data/pdf_page_cache by
+PDF hash, page and extractor version, so re-running the parser on unchanged
+PDFs (e.g. after a regex change) does no PDF layout work at all.
+
+Records are streamed to NDJSON while the PDFs are parsed, one compact JSON
+object per line, alongside per-bill and per-patron shards and a manifest.
 
 Output:
-    - data/amendments/member_requests_2024.json (HB30 + SB30)
-    - data/amendments/member_requests_2025.json (HB1600 + SB800)
+    - data/amendments/member_requests_<year>.json, e.g. 2024 (HB30 + SB30)
+      and 2025 (HB1600 + SB800)
     - CSV files for inspection (optional)
+    - data/amendments/member_requests_<year>.ndjson (same records, one per line)
+    - data/amendments/shards/bills/<bill>-<year>.ndjson
+    - data/amendments/shards/patrons/<patron>.ndjson (all sessions)
+    - data/amendments/member_requests_manifest.json (every NDJSON file with
+      its record count, netAmount total, size and SHA-256)
+    - data/amendments/member_requests_fingerprints.json (dedup fingerprints
+      of every record, see fingerprints.py)
 """
 
 import os
 import re
 import json
 import csv
+import hashlib
+import shutil
+from collections import OrderedDict
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, NamedTuple, Optional, Tuple
 from decimal import Decimal
 
+from fingerprints import INDEX_NAME, POLICIES, load_index
+from recipient_extraction import RecipientExtractor
+
 # Try to import pdfplumber (install with: pip install pdfplumber)
 try:
     import pdfplumber
@@ -40,7 +74,9 @@ REPO_ROOT = Path(__file__).parent.parent.parent
 PDF_DIR = REPO_ROOT / "Amendment Member Requests"
 OUTPUT_DIR = REPO_ROOT / "data" / "amendments"
 
-# Bill configurations: (bill_number, chamber, session_year)
+# Bill configurations: (bill_number, chamber, session_year). Session years
+# of the bills in the original flat layout, whose PDFs have no year in their
+# path; PDFs of any other session need the year in a file or directory name
 BILL_CONFIGS = [
     ("HB30", "House", 2024),
     ("SB30", "Senate", 2024),
@@ -48,43 +84,379 @@ BILL_CONFIGS = [
     ("SB800", "Senate", 2025),
 ]
 
+# Amendment stages recognized in PDF file and directory names (checked in
+# this order, nearest name first), and the stages this parser can read
+STAGE_KEYWORDS = [
+    ("conference report", "conference_report"),
+    ("member request", "member_request"),
+]
+PARSED_STAGES = {"member_request"}
+
+# What was ingested from each PDF (SHA-256, parser version, record count).
+# PDFs whose entry still matches are not parsed again; their records are
+# carried over from the NDJSON store. Bump PARSER_VERSION when the block
+# grammar or the record fields change, so the next run re-parses every PDF.
+INGEST_MANIFEST_PATH = OUTPUT_DIR / "ingest_manifest.json"
+PARSER_VERSION = "member-request-1"
+
+# Pages extracted per pool task; small enough to balance the workers, large
+# enough that reopening the PDF in each task is cheap by comparison
+PAGES_PER_CHUNK = 25
+
+# Extracted page text is cached by (PDF SHA-256, page number, extractor
+# version), so re-running the parser after a regex change skips pdfplumber.
+# Bump the suffix when extract_page_range() changes what it stores.
+PAGE_CACHE_DIR = REPO_ROOT / "data" / "pdf_page_cache"
+EXTRACTOR_VERSION = f"pdfplumber-{pdfplumber.__version__}-text1" if HAS_PDFPLUMBER else None
+
 # ============================================================================
 # PDF Discovery
 # ============================================================================
 
-def discover_pdfs() -> List[Tuple[Path, str, str, int]]:
+class PdfSource(NamedTuple):
+    """A budget amendment PDF and what its path says about it"""
+    path: Path
+    bill_number: str
+    chamber: str
+    session_year: int
+    stage: str
+
+
+# "HB30", "SB 800", "hb1600_..."
+BILL_NUMBER_RE = re.compile(r'(?<![A-Za-z])([HS])B[\s_-]*(\d+)(?!\d)', re.IGNORECASE)
+SESSION_YEAR_RE = re.compile(r'(?<!\d)(20\d{2})(?!\d)')
+
+
+def describe_pdf(pdf_path: Path, pdf_dir: Path = PDF_DIR) -> Optional[PdfSource]:
+    """
+    Read bill number, chamber, session year and stage from a PDF's file name
+    and the directories between it and `pdf_dir`, nearest name first, e.g.
+    "2022/Caboose/HB29 Member Requests.pdf" -> HB29, House, 2022, member_request.
+
+    Returns:
+        PdfSource, or None if the bill, year or stage cannot be told
     """
-    Discover all Member Request PDFs in the PDF directory.
+    relative = pdf_path.relative_to(pdf_dir)
+    names = [relative.stem, *reversed(relative.parts[:-1]), pdf_dir.name]
+
+    bill_number = session_year = stage = None
+    for name in names:
+        bill_match = BILL_NUMBER_RE.search(name)
+        if bill_number is None and bill_match:
+            bill_number = f"{bill_match.group(1).upper()}B{int(bill_match.group(2))}"
+        # Bill numbers like HB2015 are not years
+        year_match = SESSION_YEAR_RE.search(BILL_NUMBER_RE.sub(' ', name))
+        if session_year is None and year_match:
+            session_year = int(year_match.group(1))
+        words = re.sub(r'[\s_-]+', ' ', name.lower())
+        if stage is None:
+            stage = next((s for keyword, s in STAGE_KEYWORDS if keyword in words), None)
+
+    if bill_number is None or stage is None:
+        return None
+    if session_year is None:
+        session_year = next((year for bill, _, year in BILL_CONFIGS if bill == bill_number), None)
+        if session_year is None:
+            return None
+    chamber = "House" if bill_number.startswith("H") else "Senate"
+    return PdfSource(pdf_path, bill_number, chamber, session_year, stage)
+
+
+def discover_pdfs(pdf_dir: Path = PDF_DIR) -> List[PdfSource]:
+    """
+    Discover all budget amendment PDFs under the PDF directory, at any depth.
 
     Returns:
-        List of tuples: (pdf_path, bill_number, chamber, session_year)
+        PdfSources ordered by session year, House first, then bill number
     """
     discovered = []
 
-    if not PDF_DIR.exists():
-        print(f"⚠ PDF directory not found: {PDF_DIR}")
+    if not pdf_dir.exists():
+        print(f"⚠ PDF directory not found: {pdf_dir}")
         return discovered
 
-    # Search for PDFs matching our bill patterns
-    for bill_number, chamber, session_year in BILL_CONFIGS:
-        # Try multiple possible locations/naming patterns
-        possible_paths = [
-            PDF_DIR / bill_number / f"{bill_number} Member Requests.pdf",
-            PDF_DIR / f"{bill_number} Member Requests.pdf",
-            PDF_DIR / f"{bill_number} Member Request.pdf",
-            PDF_DIR / bill_number / f"{bill_number}_Member_Requests.pdf",
-            PDF_DIR / f"{bill_number}_Member_Requests.pdf",
-        ]
+    seen = {}
+    for pdf_path in sorted(p for p in pdf_dir.rglob('*') if p.suffix.lower() == '.pdf' and p.is_file()):
+        source = describe_pdf(pdf_path, pdf_dir)
+        if source is None:
+            print(f"  ⚠ Skipping {pdf_path.relative_to(pdf_dir)}: bill, session year or stage not in its path")
+            continue
+        key = (source.bill_number, source.session_year, source.stage)
+        if key in seen:
+            print(f"  ⚠ Skipping {pdf_path.relative_to(pdf_dir)}: same bill, session and stage as {seen[key].name}")
+            continue
+        seen[key] = pdf_path
+        discovered.append(source)
+
+    discovered.sort(key=lambda s: (s.session_year, s.chamber != "House", int(s.bill_number[2:]), s.stage))
+    for source in discovered:
+        print(f"  ✓ Found {source.bill_number} ({source.session_year}, {source.stage}): {source.path.name}")
+
+    return discovered
+
+
+def source_pdf_path(pdf_path: Path) -> str:
+    """How records and the ingest manifest refer to a PDF: relative to the repo when inside it"""
+    try:
+        return str(pdf_path.relative_to(REPO_ROOT))
+    except ValueError:
+        return str(pdf_path)
+
+# ============================================================================
+# PDF Text Extraction
+# ============================================================================
+
+class PageTextCache:
+    """
+    On-disk cache of extracted page text (and optionally word boxes).
+
+    Layout: <directory>/<sha[:2]>/<sha>/<extractor_version>/
+        pages.json         {"page_count": N}
+        p0001.txt          page text ("" for pages without text)
+        p0001.words.json   pdfplumber extract_words() output, if requested
 
-        for pdf_path in possible_paths:
-            if pdf_path.exists():
-                discovered.append((pdf_path, bill_number, chamber, session_year))
-                print(f"  ✓ Found {bill_number} ({session_year}): {pdf_path.name}")
-                break
+    Entries are content-addressed, so an edited PDF (new hash) or a new
+    extractor version simply misses. Files are written atomically, so
+    pool workers can fill the cache concurrently.
+    """
+
+    def __init__(self, directory: Path = PAGE_CACHE_DIR, extractor_version: Optional[str] = EXTRACTOR_VERSION):
+        self.directory = Path(directory)
+        self.extractor_version = extractor_version
+
+    def _dir(self, pdf_sha: str) -> Path:
+        return self.directory / pdf_sha[:2] / pdf_sha / self.extractor_version
+
+    def _write(self, path: Path, content: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(content, encoding='utf-8')
+        tmp_path.replace(path)
+
+    def page_count(self, pdf_sha: str) -> Optional[int]:
+        try:
+            return json.loads((self._dir(pdf_sha) / "pages.json").read_text(encoding='utf-8'))['page_count']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set_page_count(self, pdf_sha: str, page_count: int):
+        self._write(self._dir(pdf_sha) / "pages.json", json.dumps({'page_count': page_count}))
+
+    def get_text(self, pdf_sha: str, page_num: int) -> Optional[str]:
+        try:
+            return (self._dir(pdf_sha) / f"p{page_num:04d}.txt").read_text(encoding='utf-8')
+        except OSError:
+            return None
+
+    def get_words(self, pdf_sha: str, page_num: int) -> Optional[List[Dict[str, Any]]]:
+        try:
+            return json.loads((self._dir(pdf_sha) / f"p{page_num:04d}.words.json").read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    def has_words(self, pdf_sha: str, page_num: int) -> bool:
+        return (self._dir(pdf_sha) / f"p{page_num:04d}.words.json").exists()
+
+    def put(self, pdf_sha: str, page_num: int, text: str, words: Optional[List[Dict[str, Any]]] = None):
+        # Words first: a page counts as cached once its text file exists
+        if words is not None:
+            self._write(self._dir(pdf_sha) / f"p{page_num:04d}.words.json", json.dumps(words, default=float))
+        self._write(self._dir(pdf_sha) / f"p{page_num:04d}.txt", text)
+
+
+def pdf_sha256(pdf_path: Path) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def count_pdf_pages(pdf_path: Path) -> int:
+    """Number of pages in a PDF"""
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_page_range(pdf_path: Path, first_page: int, last_page: int,
+                       cache: Optional[PageTextCache] = None, pdf_sha: Optional[str] = None,
+                       include_words: bool = False) -> List[Tuple[int, str]]:
+    """
+    Extract the text of pages first_page..last_page (1-based, inclusive).
+
+    Runs in pool workers, so it opens the PDF itself. With a cache, each
+    page is stored as soon as it is extracted (an interrupted run keeps
+    its finished pages).
+
+    Returns:
+        List of (page_number, page_text); page_text is "" for pages without text
+    """
+    pages = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_num in range(first_page, last_page + 1):
+            page = pdf.pages[page_num - 1]
+            page_text = page.extract_text() or ""
+            if cache is not None:
+                words = page.extract_words() if include_words else None
+                cache.put(pdf_sha, page_num, page_text, words)
+            pages.append((page_num, page_text))
+            # Drop the page's parsed objects; a chunk can be large
+            page.close()
+    return pages
+
+
+def assemble_pdf_text(page_texts: List[Tuple[int, str]]) -> Tuple[str, Dict[int, int]]:
+    """
+    Join per-page text in page order.
+
+    Returns:
+        (full_text, page_map) where page_map maps the character offset at which
+        each page's text starts to its page number (pages without text are skipped)
+    """
+    parts = []
+    page_map = {}  # Map character position to page number
+    char_pos = 0
+
+    for page_num, page_text in sorted(page_texts):
+        if page_text:
+            page_map[char_pos] = page_num
+            parts.append(page_text)
+            parts.append("\n")
+            char_pos += len(page_text) + 1
+
+    return "".join(parts), page_map
+
+
+def _page_ranges(page_nums: List[int], chunk: int) -> List[Tuple[int, int]]:
+    """Split ascending page numbers into runs of consecutive pages, at most `chunk` long"""
+    ranges = []
+    for page_num in page_nums:
+        if ranges and ranges[-1][1] == page_num - 1 and ranges[-1][1] - ranges[-1][0] + 1 < chunk:
+            ranges[-1] = (ranges[-1][0], page_num)
         else:
-            print(f"  ⚠ {bill_number} ({session_year}) PDF not found")
+            ranges.append((page_num, page_num))
+    return ranges
+
+
+def _run_tasks(pool: Optional[ProcessPoolExecutor], func, tasks: List[Tuple]):
+    """Yield (task, result, error) for each task, in the pool or (pool None) in this process"""
+    if pool is None:
+        for task in tasks:
+            try:
+                yield task, func(*task), None
+            except Exception as e:
+                yield task, None, e
+        return
 
-    return discovered
+    futures = {pool.submit(func, *task): task for task in tasks}
+    for future in as_completed(futures):
+        try:
+            yield futures[future], future.result(), None
+        except Exception as e:
+            yield futures[future], None, e
+
+
+def extract_pdf_texts(pdf_paths: List[Path], workers: Optional[int] = None,
+                      pages_per_chunk: int = PAGES_PER_CHUNK,
+                      cache: Optional[PageTextCache] = None,
+                      include_words: bool = False) -> Dict[Path, Optional[Tuple[str, Dict[int, int]]]]:
+    """
+    Extract the text of several PDFs at once in a process pool.
+
+    Each PDF is split into page ranges of at most `pages_per_chunk` pages and
+    all ranges of all PDFs are queued together, so a long PDF does not hold
+    up the others and the work spreads over every core. Pages already in
+    `cache` are read from it; a PDF whose pages are all cached is never opened.
+
+    Args:
+        pdf_paths: PDFs to extract
+        workers: Worker processes (None: one per core; 1: extract in this process)
+        pages_per_chunk: Largest page range per task
+        cache: Page text cache to read and fill (None: always extract)
+        include_words: Also cache word boxes (pages cached without them are re-extracted)
+
+    Returns:
+        pdf_path -> (full_text, page_map) as from assemble_pdf_text(), or None
+        if the PDF could not be read
+    """
+    workers = workers or os.cpu_count() or 1
+    page_texts: Dict[Path, List[Tuple[int, str]]] = {path: [] for path in pdf_paths}
+    failed = set()
+
+    shas: Dict[Path, Optional[str]] = {}
+    page_counts: Dict[Path, int] = {}
+    for pdf_path in pdf_paths:
+        try:
+            shas[pdf_path] = pdf_sha256(pdf_path) if cache is not None else None
+        except OSError as e:
+            print(f"     ✗ ERROR opening {pdf_path.name}: {e}")
+            failed.add(pdf_path)
+            continue
+        if cache is not None and cache.page_count(shas[pdf_path]) is not None:
+            page_counts[pdf_path] = cache.page_count(shas[pdf_path])
+
+    # Pages to extract, and cached pages
+    missing: Dict[Path, List[int]] = {}
+
+    def plan(pdf_path: Path):
+        sha = shas[pdf_path]
+        missing[pdf_path] = []
+        for page_num in range(1, page_counts[pdf_path] + 1):
+            text = cache.get_text(sha, page_num) if cache is not None else None
+            if text is None or (include_words and not cache.has_words(sha, page_num)):
+                missing[pdf_path].append(page_num)
+            else:
+                page_texts[pdf_path].append((page_num, text))
+
+    for pdf_path in page_counts:
+        plan(pdf_path)
+
+    to_count = [path for path in pdf_paths if path not in failed and path not in page_counts]
+    if not to_count and not any(missing.values()):
+        workers = 1  # Everything cached: no pool needed
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for (pdf_path,), total_pages, error in _run_tasks(pool, count_pdf_pages, [(path,) for path in to_count]):
+            if error is not None:
+                print(f"     ✗ ERROR opening {pdf_path.name}: {error}")
+                failed.add(pdf_path)
+                continue
+            page_counts[pdf_path] = total_pages
+            if cache is not None:
+                cache.set_page_count(shas[pdf_path], total_pages)
+            plan(pdf_path)
+
+        for pdf_path in pdf_paths:
+            if pdf_path in page_counts:
+                cached = page_counts[pdf_path] - len(missing[pdf_path])
+                print(f"     {pdf_path.name}: {page_counts[pdf_path]} pages "
+                      f"({cached} cached, {len(missing[pdf_path])} to extract)")
+
+        # Smaller chunks when there are few pages per worker
+        total = sum(len(pages) for pages in missing.values())
+        chunk = max(1, min(pages_per_chunk, -(-total // (workers * 4))))
+
+        tasks = [(pdf_path, first_page, last_page, cache, shas[pdf_path], include_words)
+                 for pdf_path, pages in missing.items()
+                 for first_page, last_page in _page_ranges(pages, chunk)]
+        for task, pages, error in _run_tasks(pool, extract_page_range, tasks):
+            pdf_path = task[0]
+            if error is not None:
+                if pdf_path not in failed:
+                    print(f"     ✗ ERROR extracting {pdf_path.name}: {error}")
+                failed.add(pdf_path)
+                continue
+            page_texts[pdf_path].extend(pages)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return {
+        pdf_path: None if pdf_path in failed else assemble_pdf_text(page_texts[pdf_path])
+        for pdf_path in pdf_paths
+    }
 
 # ============================================================================
 # Category Mapping (simplified version - matches category_mapping.ts logic)
@@ -140,6 +512,143 @@ def map_to_spending_category(agency_name: str = "", secretariat_code: str = "")
     # Default
     return "independent_agencies"
 
+# ============================================================================
+# Amendment Block Grammar
+# ============================================================================
+#
+# An amendment block reads:
+#     Chief Patron: Reid Item 1 #1h
+#     [Department line]
+#     [Agency Name]
+#     $X $Y GF   (first year, second year; or "$Y GF", "... NGF", "Language")
+#     Language: ...
+#     Explanation: (...)
+#
+# Every pattern is compiled once and starts with a literal ("Chief Patron:",
+# "$", "Explanation:"), so the regex engine jumps straight to candidates
+# instead of trying alternatives at every character of the block.
+
+PATRON_RE = re.compile(r'Chief Patron:\s*([^\s]+(?:\s+[^\s]+)*?)\s+Item\s+(\d+[A-Za-z]*)\s+#(\S+)')
+
+# "$X GF" or "$X $Y GF" (first year, second year); likewise NGF
+AMOUNT_RE = re.compile(r'\$([\d,]+)(?:\s+\$([\d,]+))?\s+(N?GF)')
+
+EXPLANATION_RE = re.compile(r'Explanation:\s*\(([^)]+)\)')
+
+
+class BlockFields(NamedTuple):
+    """Fields read from one amendment block"""
+    patron_name: str
+    item_number: str
+    amendment_id: str
+    agency_name: str
+    department_name: str
+    fy1_gf: float
+    fy2_gf: float
+    fy1_ngf: float
+    fy2_ngf: float
+    language: str  # Text after "Language:" up to the explanation, "" if none
+    explanation: str  # Text inside "Explanation: (...)", "" if none
+
+
+def _dollars(digits: str) -> float:
+    """'1,234' -> 1234.0 (digits and commas only, as matched by AMOUNT_RE)"""
+    return float(digits.replace(',', '') or 0)
+
+
+def extract_patron_and_item(text: str) -> tuple[str, str, str]:
+    """
+    Extract patron name, item number, and amendment ID from text like:
+    'Chief Patron: Reid Item 1 #1h'
+    Returns: (patron_name, item_number, amendment_id)
+    """
+    patron_match = PATRON_RE.search(text)
+    if patron_match:
+        return patron_match.group(1).strip(), patron_match.group(2).strip(), patron_match.group(3).strip()
+    return "", "", ""
+
+
+def extract_dollar_amounts(text: str) -> tuple[float, float, float, float]:
+    """
+    Extract GF and NGF dollar amounts from text like:
+    '$500,000 $500,000 GF' or '$0 $50,000 GF' or 'Language'
+
+    Per fund, the first "$X $Y" pair wins; failing that, the first single
+    "$Y" amount is taken as the second year.
+
+    Returns: (fy1_gf, fy2_gf, fy1_ngf, fy2_ngf)
+    where fy1 = first year, fy2 = second year
+    """
+    pairs = {}
+    singles = {}
+    for first, second, fund in AMOUNT_RE.findall(text):
+        if second:
+            pairs.setdefault(fund, (first, second))
+        else:
+            singles.setdefault(fund, first)
+
+    amounts = []
+    for fund in ('GF', 'NGF'):
+        if fund in pairs:
+            amounts += [_dollars(pairs[fund][0]), _dollars(pairs[fund][1])]
+        elif fund in singles:
+            amounts += [0.0, _dollars(singles[fund])]
+        else:
+            amounts += [0.0, 0.0]
+    return tuple(amounts)
+
+
+def parse_amendment_block(text: str) -> Optional[BlockFields]:
+    """
+    Read an amendment block's fields.
+
+    Returns:
+        BlockFields, or None if the first line names neither a patron nor an item
+    """
+    # Only the first five lines are read line by line
+    lines = text.split('\n', 5)
+
+    # Extract patron and item from the first line
+    patron_name, item_number, amendment_id = extract_patron_and_item(lines[0])
+    if not patron_name and not item_number:
+        return None
+
+    # Extract agency/department name (usually on line 2 or 3)
+    agency_name = ""
+    department_name = ""
+    amount_line = None
+
+    for line_idx in range(1, min(5, len(lines))):
+        line = lines[line_idx].strip()
+        if not line or line.startswith('Language:') or line.startswith('Explanation:'):
+            continue
+        # Check if line contains dollar amounts or "Language" keyword
+        if '$' in line or line == 'Language':
+            # Previous line might be agency, this line has amounts
+            if line_idx > 1:
+                agency_name = lines[line_idx - 1].strip()
+            amount_line = line
+            break
+        elif 'Department' in line or 'FY' in line:
+            department_name = line
+        elif not agency_name and line and len(line) > 3:
+            # Potential agency name
+            agency_name = line
+
+    # Amounts come from the amount line, or failing that from the whole block
+    amounts = extract_dollar_amounts(amount_line if amount_line is not None else text)
+
+    explanation_match = EXPLANATION_RE.search(text)
+    explanation = explanation_match.group(1).strip() if explanation_match else ""
+    explanation_start = explanation_match.start() if explanation_match else len(text)
+
+    language_start = text.find('Language:', 0, explanation_start)
+    language = text[language_start + len('Language:'):explanation_start].strip() if language_start >= 0 else ""
+
+    return BlockFields(patron_name, item_number, amendment_id, agency_name, department_name,
+                       *amounts, language, explanation)
+
+
 # ============================================================================
 # PDF Parsing Logic
 # ============================================================================
@@ -170,229 +679,64 @@ def generate_amendment_id(bill_number: str, session_year: int, item_number: str,
     base = f"{bill_number}-{session_year}-member-{item_number}-{sequence:03d}"
     return base
 
-def extract_patron_and_item(text: str) -> tuple[str, str, str]:
-    """
-    Extract patron name, item number, and amendment ID from text like:
-    'Chief Patron: Reid Item 1 #1h'
-    Returns: (patron_name, item_number, amendment_id)
-    """
-    patron_match = re.search(r'Chief Patron:\s*([^\s]+(?:\s+[^\s]+)*?)\s+Item\s+(\d+[A-Za-z]*)\s+#(\S+)', text)
-    if patron_match:
-        return patron_match.group(1).strip(), patron_match.group(2).strip(), patron_match.group(3).strip()
-    return "", "", ""
-
-
-def extract_dollar_amounts(text: str) -> tuple[float, float, float, float]:
-    """
-    Extract GF and NGF dollar amounts from text like:
-    '$500,000 $500,000 GF' or '$0 $50,000 GF' or 'Language'
-
-    Returns: (fy1_gf, fy2_gf, fy1_ngf, fy2_ngf)
-    where fy1 = first year, fy2 = second year
-    """
-    fy1_gf = 0.0
-    fy2_gf = 0.0
-    fy1_ngf = 0.0
-    fy2_ngf = 0.0
-
-    # Pattern: $X $Y GF (where X is first year, Y is second year)
-    gf_pattern = r'\$[\d,]+\s+\$[\d,]+\s+GF'
-    gf_match = re.search(gf_pattern, text)
-    if gf_match:
-        amounts = re.findall(r'\$([\d,]+)', gf_match.group())
-        if len(amounts) >= 2:
-            fy1_gf = parse_currency(amounts[0])
-            fy2_gf = parse_currency(amounts[1])
-    else:
-        # Try single amount pattern: $X GF
-        single_gf_pattern = r'\$([\d,]+)\s+GF'
-        single_gf_match = re.search(single_gf_pattern, text)
-        if single_gf_match:
-            # Ambiguous - could be first or second year
-            # Check context for "first year" or "second year"
-            amount = parse_currency(single_gf_match.group(1))
-            if 'second year' in text.lower():
-                fy2_gf = amount
-            else:
-                # Default to second year for consistency
-                fy2_gf = amount
-
-    # Pattern: $X $Y NGF (where X is first year, Y is second year)
-    ngf_pattern = r'\$[\d,]+\s+\$[\d,]+\s+NGF'
-    ngf_match = re.search(ngf_pattern, text)
-    if ngf_match:
-        amounts = re.findall(r'\$([\d,]+)', ngf_match.group())
-        if len(amounts) >= 2:
-            fy1_ngf = parse_currency(amounts[0])
-            fy2_ngf = parse_currency(amounts[1])
-    else:
-        # Try single amount pattern: $X NGF
-        single_ngf_pattern = r'\$([\d,]+)\s+NGF'
-        single_ngf_match = re.search(single_ngf_pattern, text)
-        if single_ngf_match:
-            amount = parse_currency(single_ngf_match.group(1))
-            if 'second year' in text.lower():
-                fy2_ngf = amount
-            else:
-                fy2_ngf = amount
-
-    return fy1_gf, fy2_gf, fy1_ngf, fy2_ngf
+# Shared by every PDF in a run, so repeated explanations are extracted once
+RECIPIENT_EXTRACTOR = RecipientExtractor()
 
 
 def extract_recipient_from_description(description: str) -> Tuple[Optional[str], Optional[str], Optional[float]]:
     """
     Given the full explanation/description text for an amendment, attempt to extract
-    the intended funding recipient.
+    the intended funding recipient (see recipient_extraction.py for the rules).
 
     Return:
         (primary_recipient_name, raw_snippet, confidence)
+    """
+    return RECIPIENT_EXTRACTOR.extract(description)
 
-    STRICT RULES (v2 - tightened for accuracy):
-    - ONLY accept candidates that contain at least one STRONG_ORG_KEYWORD
-    - REJECT candidates that start with fragment/action phrases
-    - REJECT candidates with clause glue words unless they have strong org signals
-    - Confidence: 0.95 for strong org signals, 0.80 for weaker program names
-    """
-    if not description or not description.strip():
-        return None, None, None
-
-    # Normalize whitespace
-    text = re.sub(r'\s+', ' ', description.strip())
-
-    # STRONG organization/program keywords (REQUIRED for acceptance)
-    STRONG_ORG_KEYWORDS = [
-        "City", "County", "Town", "Village", "Borough",
-        "School Board", "Public Schools", "School Division", "School District",
-        "University", "College", "Community College", "Institute",
-        "Hospital", "Clinic", "Center",
-        "Authority", "Commission", "Corporation", "Foundation", "Association",
-        "Department", "Agency", "Board", "Council",
-        "Fund", "Trust", "Program", "Grant", "Scholarship", "Initiative"
-    ]
-
-    # STRONG high-confidence org signals (for 0.95 confidence)
-    STRONG_HIGH_CONF = [
-        "City", "County", "Town", "School Board", "Public Schools",
-        "University", "College", "Community College",
-        "Hospital", "Center", "Authority", "Commission",
-        "Department", "Agency", "Board"
-    ]
-
-    # BLACKLIST: reject candidates starting with these (case-insensitive)
-    START_BLACKLIST = [
-        "this ", "that ", "these ", "those ", "such ",
-        "the cost of ", "the cost ", "the provision of ",
-        "implement ", "to implement ", "provide ", "to provide ",
-        "establish ", "to establish ", "support ", "to support ",
-        "fund ", "to fund ", "expand ", "to expand ",
-        "improve ", "to improve ", "reduce ", "to reduce ",
-        "continue ", "to continue ", "create ", "to create ",
-        "enable ", "to enable ", "allow ", "to allow ",
-        "assist ", "to assist ", "help ", "to help "
-    ]
-
-    # Clause glue words that indicate sentence fragments
-    CLAUSE_GLUE = [" while ", " which ", " that ", " in order to "]
-
-    # Stop phrases (where to end extraction)
-    stop_phrases = [
-        r'\bto support\b', r'\bto provide\b', r'\bto establish\b',
-        r'\bto administer\b', r'\bto be used\b', r'\bfor the purpose of\b',
-        r'\bto fund\b', r'\bto assist\b', r'\bto help\b',
-        r'\bto enable\b', r'\bto allow\b', r'\bto create\b',
-    ]
-
-    # Patterns to look for: "to [the] <Recipient>" or "for [the] <Recipient>"
-    intro_patterns = [
-        r'\bto the\s+([A-Z][^.;]*)',
-        r'\bto\s+([A-Z][^.;]*)',
-        r'\bfor the\s+([A-Z][^.;]*)',
-        r'\bfor\s+([A-Z][^.;]*)',
-        r'\bprovides?\s+(?:funding\s+)?(?:to|for)\s+(?:the\s+)?([A-Z][^.;]*)',
-    ]
-
-    candidates = []
-
-    for pattern in intro_patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            raw_candidate = match.group(1).strip()
-
-            # Apply stop phrases to truncate
-            truncated = raw_candidate
-            for stop_phrase in stop_phrases:
-                stop_match = re.search(stop_phrase, truncated, re.IGNORECASE)
-                if stop_match:
-                    truncated = truncated[:stop_match.start()].strip()
-                    break
-
-            # Also stop at sentence boundaries
-            for delimiter in ['.', ';', ',']:
-                if delimiter in truncated:
-                    truncated = truncated.split(delimiter)[0].strip()
-
-            # Clean up trailing punctuation and whitespace
-            truncated = re.sub(r'[,;:\s]+$', '', truncated).strip()
-
-            # Skip if too short or too long
-            if len(truncated) < 3 or len(truncated) > 150:
-                continue
-
-            # STRICT FILTER A: Check if starts with blacklisted phrase
-            truncated_lower = truncated.lower()
-            is_blacklisted = any(truncated_lower.startswith(bl) for bl in START_BLACKLIST)
-            if is_blacklisted:
-                continue
-
-            # STRICT FILTER B: Must contain at least one STRONG_ORG_KEYWORD
-            has_org_keyword = any(
-                re.search(r'\b' + re.escape(keyword) + r'\b', truncated, re.IGNORECASE)
-                for keyword in STRONG_ORG_KEYWORDS
-            )
-            if not has_org_keyword:
-                continue
 
-            # STRICT FILTER C: Reject if contains clause glue AND is long/complex
-            has_clause_glue = any(glue in truncated_lower for glue in CLAUSE_GLUE)
-            word_count = len(truncated.split())
-            if has_clause_glue and word_count > 15:
-                continue
+# Each amendment starts at a "Chief Patron:" line and runs to the next one
+CHIEF_PATRON_RE = re.compile(r'Chief Patron:\s*([^\n]+)')
 
-            # STRICT FILTER D: Must start with capitalized word or "the" + capitalized
-            if not (truncated[0].isupper() or truncated_lower.startswith("the ")):
-                continue
 
-            # CONFIDENCE SCORING
-            # Check for strong high-confidence keywords
-            has_strong_signal = any(
-                re.search(r'\b' + re.escape(keyword) + r'\b', truncated, re.IGNORECASE)
-                for keyword in STRONG_HIGH_CONF
-            )
+class AmendmentBlock(NamedTuple):
+    """One amendment's text, cut from a PDF's full text"""
+    text: str
+    start: int  # Character offset in the full text
+    page: int  # Page the block starts on
 
-            if has_strong_signal:
-                confidence = 0.95
-            else:
-                confidence = 0.80
 
-            # Store candidate with confidence
-            candidates.append((truncated, match.group(0), confidence))
+def split_amendment_blocks(full_text: str, page_map: Dict[int, int]) -> Iterator[AmendmentBlock]:
+    """
+    Split a PDF's full text into amendment blocks, in order.
 
-    # If no candidates found, return None
-    if not candidates:
-        return None, None, None
+    The page offsets are sorted once and each block's page is found by
+    bisection, so splitting stays linear in the number of blocks however
+    many pages the PDF has.
 
-    # Sort by confidence (descending), then by length (prefer longer, more specific names)
-    candidates.sort(key=lambda x: (x[2], len(x[0])), reverse=True)
+    Args:
+        full_text: Text from assemble_pdf_text()
+        page_map: Character offset -> page number, from assemble_pdf_text()
+    """
+    page_starts = sorted(page_map)
+    page_nums = [page_map[pos] for pos in page_starts]
 
-    # Return the best candidate
-    best_recipient, raw_snippet, confidence = candidates[0]
+    def block(start: int, end: int) -> AmendmentBlock:
+        idx = bisect_right(page_starts, start) - 1
+        return AmendmentBlock(full_text[start:end], start, page_nums[idx] if idx >= 0 else 1)
 
-    return best_recipient, raw_snippet, confidence
+    start = None
+    for match in CHIEF_PATRON_RE.finditer(full_text):
+        if start is not None:
+            yield block(start, match.start())
+        start = match.start()
+    if start is not None:
+        yield block(start, len(full_text))
 
 
-def parse_member_request_pdf(pdf_path: Path, bill_number: str, chamber: str, session_year: int) -> List[Dict[str, Any]]:
+def iter_member_request_records(pdf_path: Path, bill_number: str, chamber: str, session_year: int,
+                                extracted: Optional[Tuple[str, Dict[int, int]]] = None) -> Iterator[Dict[str, Any]]:
     """
-    Parse a Member Request PDF into amendment records
+    Parse a Member Request PDF, yielding amendment records as they are built
 
     The PDFs are in text format with patterns like:
     Chief Patron: [Name] Item [Number] #[ID]
@@ -400,180 +744,348 @@ def parse_member_request_pdf(pdf_path: Path, bill_number: str, chamber: str, ses
     [Agency Name] $X $Y GF (or Language)
     Language: ...
     Explanation: ...
+
+    `extracted` is the PDF's (full_text, page_map) from extract_pdf_texts();
+    without it the text is extracted here, one page after another.
     """
     if not HAS_PDFPLUMBER:
         print(f"  ⚠ Skipping {pdf_path.name} - pdfplumber not installed")
-        return []
+        return
 
     if not pdf_path.exists():
         print(f"  ✗ ERROR: PDF not found: {pdf_path}")
-        return []
+        return
 
     print(f"  📄 Parsing {pdf_path.name}...")
 
-    records = []
+    if extracted is None:
+        extracted = extract_pdf_texts([pdf_path], workers=1)[pdf_path]
+        if extracted is None:
+            return
+    full_text, page_map = extracted
+    print(f"     Pages with text: {len(page_map)}")
+
+    record_count = 0
     sequence = 0
 
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            total_pages = len(pdf.pages)
-            print(f"     Total pages: {total_pages}")
-
-            # Extract all text from all pages
-            full_text = ""
-            page_map = {}  # Map character position to page number
-            char_pos = 0
-
-            for page_num, page in enumerate(pdf.pages, start=1):
-                page_text = page.extract_text()
-                if page_text:
-                    page_start = char_pos
-                    full_text += page_text + "\n"
-                    char_pos += len(page_text) + 1
-                    page_map[page_start] = page_num
-
-            # Split into amendment blocks by "Chief Patron:" pattern
-            amendment_pattern = r'Chief Patron:\s*([^\n]+)'
-            matches = list(re.finditer(amendment_pattern, full_text))
-
-            print(f"     Found {len(matches)} 'Chief Patron' entries")
-
-            for idx, match in enumerate(matches):
-                # Get the text block for this amendment
-                start_pos = match.start()
-                end_pos = matches[idx + 1].start() if idx + 1 < len(matches) else len(full_text)
-                amendment_text = full_text[start_pos:end_pos]
-
-                # Determine page number
-                page_num = 1
-                for pos, pnum in sorted(page_map.items(), reverse=True):
-                    if start_pos >= pos:
-                        page_num = pnum
-                        break
-
-                # Extract patron and item from the first line
-                first_line = amendment_text.split('\n')[0]
-                patron_name, item_number, amendment_id = extract_patron_and_item(first_line)
-
-                if not patron_name and not item_number:
-                    continue
-
-                # Extract agency/department name (usually on line 2 or 3)
-                lines = amendment_text.split('\n')
-                agency_name = ""
-                department_name = ""
-
-                # Look for department/agency in first few lines
-                fy1_gf, fy2_gf, fy1_ngf, fy2_ngf = 0.0, 0.0, 0.0, 0.0
-                amounts_found = False
-
-                for line_idx in range(1, min(5, len(lines))):
-                    line = lines[line_idx].strip()
-                    if not line or line.startswith('Language:') or line.startswith('Explanation:'):
-                        continue
-                    # Check if line contains dollar amounts or "Language" keyword
-                    if '$' in line or line == 'Language':
-                        # Previous line might be agency, this line has amounts
-                        if line_idx > 1:
-                            agency_name = lines[line_idx - 1].strip()
-                        # Extract dollar amounts from this line
-                        fy1_gf, fy2_gf, fy1_ngf, fy2_ngf = extract_dollar_amounts(line)
-                        amounts_found = True
-                        break
-                    elif 'Department' in line or 'FY' in line:
-                        department_name = line
-                    elif not agency_name and line and len(line) > 3:
-                        # Potential agency name
-                        agency_name = line
-
-                # If we didn't find amounts yet, look for them in the full text
-                if not amounts_found:
-                    fy1_gf, fy2_gf, fy1_ngf, fy2_ngf = extract_dollar_amounts(amendment_text)
-
-                # Extract explanation text
-                explanation_match = re.search(r'Explanation:\s*\(([^)]+)\)', amendment_text, re.DOTALL)
-                explanation = explanation_match.group(1).strip() if explanation_match else ""
-
-                # Compute derived fields
-                # We track second-year amounts only
-                delta_gf = fy2_gf
-                delta_ngf = fy2_ngf
-                net_amount = delta_gf + delta_ngf
-
-                # isLanguageOnly = true ONLY if there's no funding in ANY year
-                # If there's first-year funding but no second-year, it's NOT language-only
-                total_fy1 = fy1_gf + fy1_ngf
-                total_fy2 = fy2_gf + fy2_ngf
-                is_language_only = (total_fy1 == 0 and total_fy2 == 0)
-
-                is_increase = net_amount > 0
-
-                # Map to spending category
-                spending_category_id = map_to_spending_category(agency_name or department_name)
-
-                # Extract funding recipient from explanation
-                primary_recipient_name, recipient_raw_text, recipient_confidence = extract_recipient_from_description(
-                    explanation
-                )
-
-                # Generate unique ID
-                sequence += 1
-                record_id = generate_amendment_id(bill_number, session_year, item_number or f"unknown-{sequence}", sequence)
-
-                # Build record
-                record = {
-                    "id": record_id,
-                    "stage": "member_request",
-                    "billNumber": bill_number,
-                    "sessionYear": session_year,
-                    "chamber": chamber,
-
-                    "patronName": patron_name,
-                    "patronLISId": None,
-                    "legislatorId": None,
-                    "districtCode": None,
-
-                    "itemNumber": item_number,
-                    "subItem": None,
-                    "agencyCode": None,
-                    "agencyName": agency_name if agency_name else None,
-
-                    "secretariatCode": None,
-                    "spendingCategoryId": spending_category_id,
-
-                    "fiscalYear": None,
-                    "deltaGF": delta_gf,
-                    "deltaNGF": delta_ngf,
-                    "netAmount": net_amount,
-
-                    "isIncrease": is_increase,
-                    "isLanguageOnly": is_language_only,
-
-                    "descriptionShort": explanation[:140] if explanation else "",
-                    "descriptionFull": explanation,
-
-                    "primaryRecipientName": primary_recipient_name,
-                    "recipientRawText": recipient_raw_text,
-                    "recipientConfidence": recipient_confidence,
-
-                    "sourcePdfPath": str(pdf_path.relative_to(REPO_ROOT)),
-                    "sourcePage": page_num,
-                    "sourceLineHint": patron_name if patron_name else item_number,
-
-                    "createdAt": datetime.now().astimezone().isoformat(),
-                    "updatedAt": None,
-                }
-
-                records.append(record)
-
-            print(f"     ✓ Extracted {len(records)} amendments")
+        # Split into amendment blocks by "Chief Patron:" pattern
+        block_count = 0
+        for amendment_text, _, page_num in split_amendment_blocks(full_text, page_map):
+            block_count += 1
+
+            fields = parse_amendment_block(amendment_text)
+            if fields is None:
+                continue
+
+            patron_name, item_number = fields.patron_name, fields.item_number
+            agency_name, department_name = fields.agency_name, fields.department_name
+            fy1_gf, fy2_gf, fy1_ngf, fy2_ngf = fields.fy1_gf, fields.fy2_gf, fields.fy1_ngf, fields.fy2_ngf
+            explanation = fields.explanation
+
+            # Compute derived fields
+            # We track second-year amounts only
+            delta_gf = fy2_gf
+            delta_ngf = fy2_ngf
+            net_amount = delta_gf + delta_ngf
+
+            # isLanguageOnly = true ONLY if there's no funding in ANY year
+            # If there's first-year funding but no second-year, it's NOT language-only
+            total_fy1 = fy1_gf + fy1_ngf
+            total_fy2 = fy2_gf + fy2_ngf
+            is_language_only = (total_fy1 == 0 and total_fy2 == 0)
+
+            is_increase = net_amount > 0
+
+            # Map to spending category
+            spending_category_id = map_to_spending_category(agency_name or department_name)
+
+            # Extract funding recipient from explanation
+            primary_recipient_name, recipient_raw_text, recipient_confidence = extract_recipient_from_description(
+                explanation
+            )
+
+            # Generate unique ID
+            sequence += 1
+            record_id = generate_amendment_id(bill_number, session_year, item_number or f"unknown-{sequence}", sequence)
+
+            # Build record
+            record = {
+                "id": record_id,
+                "stage": "member_request",
+                "billNumber": bill_number,
+                "sessionYear": session_year,
+                "chamber": chamber,
+
+                "patronName": patron_name,
+                "patronLISId": None,
+                "legislatorId": None,
+                "districtCode": None,
+
+                "itemNumber": item_number,
+                "subItem": None,
+                "agencyCode": None,
+                "agencyName": agency_name if agency_name else None,
+
+                "secretariatCode": None,
+                "spendingCategoryId": spending_category_id,
+
+                "fiscalYear": None,
+                "deltaGF": delta_gf,
+                "deltaNGF": delta_ngf,
+                "netAmount": net_amount,
+
+                "isIncrease": is_increase,
+                "isLanguageOnly": is_language_only,
+
+                "descriptionShort": explanation[:140] if explanation else "",
+                "descriptionFull": explanation,
+
+                "primaryRecipientName": primary_recipient_name,
+                "recipientRawText": recipient_raw_text,
+                "recipientConfidence": recipient_confidence,
+
+                "sourcePdfPath": source_pdf_path(pdf_path),
+                "sourcePage": page_num,
+                "sourceLineHint": patron_name if patron_name else item_number,
+
+                "createdAt": datetime.now().astimezone().isoformat(),
+                "updatedAt": None,
+            }
+
+            record_count += 1
+            yield record
+
+        print(f"     Found {block_count} 'Chief Patron' entries")
+        print(f"     ✓ Extracted {record_count} amendments")
 
     except Exception as e:
         print(f"     ✗ ERROR parsing {pdf_path.name}: {e}")
         import traceback
         traceback.print_exc()
 
-    return records
+
+def parse_member_request_pdf(pdf_path: Path, bill_number: str, chamber: str, session_year: int,
+                             extracted: Optional[Tuple[str, Dict[int, int]]] = None) -> List[Dict[str, Any]]:
+    """Parse a Member Request PDF into a list of amendment records (see iter_member_request_records)"""
+    return list(iter_member_request_records(pdf_path, bill_number, chamber, session_year, extracted))
+
+# ============================================================================
+# Record Output (NDJSON stream and shards)
+# ============================================================================
+
+# Records are streamed as they are parsed to one NDJSON file per session year
+# (member_requests_<year>.ndjson) and to compact per-bill and per-patron
+# shards, indexed by a small manifest, so consumers can read just the slice
+# they need instead of parsing a whole year of indented JSON.
+SHARD_DIR = OUTPUT_DIR / "shards"
+MANIFEST_PATH = OUTPUT_DIR / "member_requests_manifest.json"
+
+# Shard files kept open at once; the least recently written is closed (and
+# reopened for appending) beyond this
+MAX_OPEN_SHARDS = 64
+
+
+def patron_slug(patron_name: str) -> str:
+    """File-name slug for a patron ("Van Valkenburg" -> "van-valkenburg")"""
+    return re.sub(r'[^a-z0-9]+', '-', (patron_name or '').lower()).strip('-') or 'unknown'
+
+
+class MemberRequestWriter:
+    """
+    Streams amendment records to NDJSON as they are parsed.
+
+    Every record is written as one compact JSON line to:
+    - member_requests_<year>.ndjson (all records of a session year)
+    - shards/bills/<bill>-<year>.ndjson
+    - shards/patrons/<patron-slug>.ndjson (all sessions)
+
+    Files are written under temporary names and moved into place by close(),
+    which also writes the manifest (path, record count, dollar totals, size
+    and SHA-256 of every file), so an interrupted run leaves the previous
+    output intact.
+    """
+
+    def __init__(self, output_dir: Path = OUTPUT_DIR, shard_dir: Path = SHARD_DIR,
+                 manifest_path: Path = MANIFEST_PATH):
+        self.output_dir = Path(output_dir)
+        self.shard_dir = Path(shard_dir)
+        self.manifest_path = Path(manifest_path)
+        self._tmp_shard_dir = self.shard_dir.with_name(self.shard_dir.name + ".tmp")
+        if self._tmp_shard_dir.exists():
+            shutil.rmtree(self._tmp_shard_dir)
+        (self._tmp_shard_dir / "bills").mkdir(parents=True)
+        (self._tmp_shard_dir / "patrons").mkdir(parents=True)
+
+        self._open_files: "OrderedDict[Path, Any]" = OrderedDict()
+        self._patron_paths: Dict[str, str] = {}  # patronName -> shard path
+        self.years: Dict[int, Dict[str, Any]] = {}
+        self.bills: Dict[str, Dict[str, Any]] = {}
+        self.patrons: Dict[str, Dict[str, Any]] = {}
+
+    def _append(self, tmp_path: Path, line: str):
+        handle = self._open_files.pop(tmp_path, None)
+        if handle is None:
+            if len(self._open_files) >= MAX_OPEN_SHARDS:
+                _, oldest = self._open_files.popitem(last=False)
+                oldest.close()
+            handle = open(tmp_path, 'a', encoding='utf-8')
+        self._open_files[tmp_path] = handle
+        handle.write(line)
+
+    def _patron_path(self, patron_name: str) -> str:
+        """Shard path for a patron, unique even when two names share a slug"""
+        if patron_name not in self._patron_paths:
+            taken = set(self._patron_paths.values())
+            slug = patron_slug(patron_name)
+            path, n = f"shards/patrons/{slug}.ndjson", 1
+            while path in taken:
+                n += 1
+                path = f"shards/patrons/{slug}-{n}.ndjson"
+            self._patron_paths[patron_name] = path
+        return self._patron_paths[patron_name]
+
+    def _tmp_path(self, path: str) -> Path:
+        if path.startswith("shards/"):
+            return self._tmp_shard_dir / path[len("shards/"):]
+        return self.output_dir / (path + ".tmp")
+
+    def write(self, record: Dict[str, Any]):
+        """Append one record to its year file and its bill and patron shards"""
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+        year = record['sessionYear']
+        bill_key = f"{record['billNumber']}-{year}"
+        patron_name = record['patronName'] or ""
+
+        entries = [
+            self.years.setdefault(year, {"path": f"member_requests_{year}.ndjson"}),
+            self.bills.setdefault(bill_key, {"path": f"shards/bills/{bill_key}.ndjson",
+                                             "billNumber": record['billNumber'],
+                                             "sessionYear": year,
+                                             "chamber": record['chamber']}),
+            self.patrons.setdefault(patron_name, {"path": self._patron_path(patron_name),
+                                                  "sessionYears": []}),
+        ]
+        if year not in entries[2]["sessionYears"]:
+            entries[2]["sessionYears"].append(year)
+
+        for entry in entries:
+            self._append(self._tmp_path(entry["path"]), line)
+            entry["records"] = entry.get("records", 0) + 1
+            entry["netAmount"] = entry.get("netAmount", 0.0) + record['netAmount']
+
+    def close(self) -> Dict[str, Any]:
+        """Move the files into place and write the manifest; returns the manifest"""
+        for handle in self._open_files.values():
+            handle.close()
+        self._open_files.clear()
+
+        for entry in [*self.years.values(), *self.bills.values(), *self.patrons.values()]:
+            tmp_path = self._tmp_path(entry["path"])
+            entry["bytes"] = tmp_path.stat().st_size
+            entry["sha256"] = pdf_sha256(tmp_path)
+
+        for entry in self.years.values():
+            self._tmp_path(entry["path"]).replace(self.output_dir / entry["path"])
+        if self.shard_dir.exists():
+            shutil.rmtree(self.shard_dir)
+        self._tmp_shard_dir.rename(self.shard_dir)
+
+        manifest = {
+            "generatedAt": datetime.now().astimezone().isoformat(),
+            "format": "ndjson",
+            "years": {str(year): entry for year, entry in sorted(self.years.items())},
+            "bills": dict(sorted(self.bills.items())),
+            "patrons": dict(sorted(self.patrons.items())),
+        }
+        tmp_manifest = self.manifest_path.with_suffix('.json.tmp')
+        with open(tmp_manifest, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        tmp_manifest.replace(self.manifest_path)
+        return manifest
+
+
+def read_ndjson(path: Path) -> Iterator[Dict[str, Any]]:
+    """Records of an NDJSON file, one at a time"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+# ============================================================================
+# Incremental Ingestion
+# ============================================================================
+
+def ingest_entry(source: PdfSource, sha256: str) -> Dict[str, Any]:
+    """Ingest manifest entry for a PDF (records is filled in once it is parsed)"""
+    return {
+        "sha256": sha256,
+        "billNumber": source.bill_number,
+        "chamber": source.chamber,
+        "sessionYear": source.session_year,
+        "stage": source.stage,
+        "parserVersion": PARSER_VERSION if source.stage in PARSED_STAGES else None,
+        "records": 0,
+        "ingestedAt": datetime.now().astimezone().isoformat(),
+    }
+
+
+def is_ingested(previous: Optional[Dict[str, Any]], current: Dict[str, Any], stored_count: int) -> bool:
+    """True if a PDF's previous entry still holds: same file, metadata and parser, and its records are in the store"""
+    if previous is None:
+        return False
+    same = all(previous.get(field) == current[field]
+               for field in ("sha256", "billNumber", "sessionYear", "stage", "parserVersion"))
+    return same and previous.get("records") == stored_count
+
+
+def load_ingest_manifest(path: Path = INGEST_MANIFEST_PATH) -> Dict[str, Dict[str, Any]]:
+    """sourcePdfPath -> ingest entry, from the previous run"""
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get("pdfs", {})
+
+
+def save_ingest_manifest(entries: Dict[str, Dict[str, Any]], path: Path = INGEST_MANIFEST_PATH):
+    tmp_path = path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"parserVersion": PARSER_VERSION, "pdfs": dict(sorted(entries.items()))},
+                  f, indent=2, ensure_ascii=False)
+    tmp_path.replace(path)
+
+
+def load_stored_records(output_dir: Path = OUTPUT_DIR) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Records already in the store, grouped by sourcePdfPath: every
+    member_requests_<year>.ndjson, or the year's JSON file where there is no
+    NDJSON yet.
+    """
+    stored: Dict[str, List[Dict[str, Any]]] = {}
+    for year_path in sorted({path.with_suffix('') for path in output_dir.glob("member_requests_[0-9]*.*json")}):
+        ndjson_path = year_path.with_suffix('.ndjson')
+        if ndjson_path.exists():
+            records = read_ndjson(ndjson_path)
+        else:
+            with open(year_path.with_suffix('.json'), 'r', encoding='utf-8') as f:
+                records = json.load(f)
+        for record in records:
+            stored.setdefault(record['sourcePdfPath'], []).append(record)
+    return stored
+
+
+def upsert_record(record: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    A freshly parsed record merged over the stored one with the same id: an
+    unchanged record is kept as stored, a changed one keeps its createdAt and
+    gets updatedAt.
+    """
+    if previous is None:
+        return record
+    timestamps = ("createdAt", "updatedAt")
+    if all(record.get(k) == previous.get(k) for k in record.keys() | previous.keys() if k not in timestamps):
+        return previous
+    return {**record, "createdAt": previous["createdAt"], "updatedAt": record["createdAt"]}
 
 # ============================================================================
 # Main Execution
@@ -630,8 +1142,19 @@ def print_statistics(records: List[Dict[str, Any]], indent: str = ""):
     print(f"{indent}Language-Only Amendments: {language_only_count}")
 
 
-def main():
-    """Main entry point"""
+def main(workers: Optional[int] = None, use_page_cache: bool = True, include_words: bool = False,
+         write_json: bool = True, pdf_dir: Path = PDF_DIR, force: bool = False):
+    """
+    Main entry point
+
+    Args:
+        workers: Processes for text extraction (None: one per core)
+        use_page_cache: Read and fill the extracted page text cache
+        include_words: Also cache pdfplumber word boxes per page
+        write_json: Also write the indented per-year JSON and CSV files
+        pdf_dir: Directory tree to discover PDFs in
+        force: Parse every PDF, even those already ingested unchanged
+    """
     print("=" * 80)
     print("Amendment Vault - Member Request PDF Parser")
     print("=" * 80)
@@ -649,8 +1172,8 @@ def main():
         return 1
 
     # Check PDF directory exists
-    if not PDF_DIR.exists():
-        print(f"✗ ERROR: PDF directory not found: {PDF_DIR}")
+    if not pdf_dir.exists():
+        print(f"✗ ERROR: PDF directory not found: {pdf_dir}")
         return 1
 
     # Ensure output directory exists
@@ -660,55 +1183,140 @@ def main():
     print()
 
     # Discover all PDFs
-    discovered_pdfs = discover_pdfs()
+    discovered_pdfs = discover_pdfs(pdf_dir)
 
     if not discovered_pdfs:
         print("✗ ERROR: No Member Request PDFs found")
         return 1
 
+    # Only new and changed PDFs are parsed; the rest keep their stored records
+    previous_entries = load_ingest_manifest()
+    stored = load_stored_records()
+    to_parse = []
+    entries = {}
     print()
-    print("Parsing PDFs...")
-    print()
+    print("Checking fingerprints...")
+    for source in discovered_pdfs:
+        key = source_pdf_path(source.path)
+        entry = ingest_entry(source, pdf_sha256(source.path))
+        entries[key] = entry
+        previous = previous_entries.get(key)
+        if source.stage not in PARSED_STAGES:
+            # Tracked, so it is parsed once there is a parser for its stage
+            print(f"  ⚠ {source.bill_number} ({source.session_year}): no parser for {source.stage} PDFs yet")
+            if previous and previous['sha256'] == entry['sha256']:
+                entries[key] = previous
+            continue
+        if force or not is_ingested(previous, entry, len(stored.get(key, ()))):
+            to_parse.append(source)
+            print(f"  • {source.bill_number} ({source.session_year}): {'changed' if previous else 'new'}")
+        else:
+            entries[key] = previous
+    removed = [key for key in previous_entries if key not in entries]
+    for key in removed:
+        print(f"  • {key}: removed")
+    print(f"  {len(to_parse)} to parse, {len(discovered_pdfs) - len(to_parse)} unchanged or skipped, "
+          f"{len(removed)} removed")
 
-    # Group records by session year
-    records_by_year = {}
+    print()
+    print(f"Extracting text ({workers or os.cpu_count()} worker(s))...")
+    print()
 
-    # Parse each discovered PDF
-    for pdf_path, bill_number, chamber, session_year in discovered_pdfs:
-        print(f"  Processing {bill_number} ({session_year})...")
-        records = parse_member_request_pdf(pdf_path, bill_number, chamber, session_year)
+    # Extract the pages of every PDF to parse at once
+    cache = PageTextCache() if use_page_cache else None
+    extracted = extract_pdf_texts([source.path for source in to_parse], workers=workers,
+                                  cache=cache, include_words=include_words)
 
-        if session_year not in records_by_year:
-            records_by_year[session_year] = []
-        records_by_year[session_year].extend(records)
+    print()
+    print("Parsing PDFs...")
+    print()
 
-        print(f"    ✓ Parsed {len(records)} amendments")
+    # Stream records to the NDJSON year files and shards as they are parsed,
+    # upserting by record id over what the store held for the same PDF
+    changed_years = {previous_entries[key]['sessionYear'] for key in removed}
+    writer = MemberRequestWriter()
+    parse_paths = {source.path for source in to_parse}
+    for source in discovered_pdfs:
+        key = source_pdf_path(source.path)
+        stored_records = stored.get(key, [])
+        if source.path not in parse_paths or extracted[source.path] is None:
+            if source.path in parse_paths:
+                # Keep the old records (if any) and retry on the next run
+                print(f"  ⚠ Keeping {len(stored_records)} stored record(s) for {source.bill_number} ({source.session_year})")
+                entries.pop(key, None)
+            for record in stored_records:
+                writer.write(record)
+            continue
+
+        print(f"  Processing {source.bill_number} ({source.session_year})...")
+        previous_records = {record['id']: record for record in stored_records}
+        count = 0
+        for record in iter_member_request_records(source.path, source.bill_number, source.chamber,
+                                                  source.session_year, extracted=extracted[source.path]):
+            writer.write(upsert_record(record, previous_records.get(record['id'])))
+            count += 1
+        entries[key]['records'] = count
+        changed_years.add(source.session_year)
+
+        print(f"    ✓ Parsed {count} amendments")
         print()
 
-    # Write separate JSON files per session year
+    manifest = writer.close()
+    save_ingest_manifest(entries)
+
+    print("Recipient extraction:")
+    for line in RECIPIENT_EXTRACTOR.report(indent="  "):
+        print(line)
+    print()
+
     print("=" * 80)
     print("Writing output files...")
     print("=" * 80)
     print()
 
-    for session_year, records in sorted(records_by_year.items()):
-        print(f"Session {session_year}: {len(records)} amendments")
+    print(f"✓ Manifest: {MANIFEST_PATH} ({len(manifest['bills'])} bill shard(s), "
+          f"{len(manifest['patrons'])} patron shard(s) in {SHARD_DIR})")
+    print(f"✓ Ingest manifest: {INGEST_MANIFEST_PATH} ({len(entries)} PDF(s))")
+    print()
 
-        # Write JSON output
+    # Sessions whose PDFs are all gone have no records left
+    for session_year in sorted(changed_years - set(writer.years)):
+        for suffix in ('.ndjson', '.json', '.csv'):
+            stale_path = OUTPUT_DIR / f"member_requests_{session_year}{suffix}"
+            if stale_path.exists():
+                stale_path.unlink()
+                print(f"✓ Removed {stale_path} (no PDFs left for {session_year})")
+
+    # Only one session year's records are held in memory at a time, and only
+    # years with new or changed PDFs are written again
+    year_counts = {}
+    for session_year in sorted(writer.years):
+        ndjson_path = OUTPUT_DIR / writer.years[session_year]["path"]
+        year_counts[session_year] = writer.years[session_year]["records"]
         json_path = OUTPUT_DIR / f"member_requests_{session_year}.json"
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(records, f, indent=2, ensure_ascii=False)
-        print(f"  ✓ JSON: {json_path}")
-
-        # Write CSV output (optional, for inspection)
-        if records:
-            csv_path = OUTPUT_DIR / f"member_requests_{session_year}.csv"
-            fieldnames = list(records[0].keys())
-            with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(records)
-            print(f"  ✓ CSV: {csv_path}")
+        print(f"Session {session_year}: {year_counts[session_year]} amendments")
+        print(f"  ✓ NDJSON: {ndjson_path}")
+        if session_year not in changed_years and (json_path.exists() or not write_json):
+            print("  ✓ Unchanged")
+            print()
+            continue
+
+        records = list(read_ndjson(ndjson_path))
+        if write_json:
+            # Write JSON output
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(records, f, indent=2, ensure_ascii=False)
+            print(f"  ✓ JSON: {json_path}")
+
+            # Write CSV output (optional, for inspection)
+            if records:
+                csv_path = OUTPUT_DIR / f"member_requests_{session_year}.csv"
+                fieldnames = list(records[0].keys())
+                with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+                    csv_writer = csv.DictWriter(f, fieldnames=fieldnames)
+                    csv_writer.writeheader()
+                    csv_writer.writerows(records)
+                print(f"  ✓ CSV: {csv_path}")
 
         # Print statistics for this year
         print()
@@ -717,13 +1325,19 @@ def main():
         print_statistics(records, indent="  ")
         print()
 
+    # Fingerprints of the changed sessions under every dedup policy
+    index = load_index(OUTPUT_DIR)
+    print(f"✓ Fingerprint index: {OUTPUT_DIR / INDEX_NAME} ({len(index):,} records, "
+          f"{len(POLICIES)} policies)")
+    print()
+
     print("=" * 80)
     print("✅ PARSING COMPLETE")
     print("=" * 80)
     print()
     print("Summary:")
-    for session_year, records in sorted(records_by_year.items()):
-        print(f"  • {session_year}: {len(records)} amendments")
+    for session_year, count in year_counts.items():
+        print(f"  • {session_year}: {count} amendments")
     print()
     print("Next steps:")
     print("1. Review the JSON outputs to verify data quality")
@@ -735,9 +1349,26 @@ def main():
     return 0
 
 if __name__ == "__main__":
+    import argparse
     import sys
+    parser = argparse.ArgumentParser(description='Parse Member Request PDFs into amendment records')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processes for page-parallel text extraction (default: one per core)')
+    parser.add_argument('--no-page-cache', action='store_true',
+                        help='Extract every page again instead of reading data/pdf_page_cache')
+    parser.add_argument('--words', action='store_true',
+                        help='Also cache word boxes (pdfplumber extract_words) for each page')
+    parser.add_argument('--ndjson-only', action='store_true',
+                        help='Skip the indented member_requests_<year>.json and CSV files')
+    parser.add_argument('--pdf-dir', type=Path, default=PDF_DIR,
+                        help='Directory tree of amendment PDFs (default: "Amendment Member Requests")')
+    parser.add_argument('--force', action='store_true',
+                        help='Parse every PDF again, not just new and changed ones')
+    args = parser.parse_args()
     try:
-        exit_code = main()
+        exit_code = main(workers=args.workers, use_page_cache=not args.no_page_cache,
+                         include_words=args.words, write_json=not args.ndjson_only,
+                         pdf_dir=args.pdf_dir.resolve(), force=args.force)
         sys.exit(exit_code or 0)
     except KeyboardInterrupt:
         print("\n\n⚠ Interrupted by user")
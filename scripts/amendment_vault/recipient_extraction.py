@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Amendment Vault - Recipient Extraction
+
+Finds the intended funding recipient in an amendment explanation, e.g.
+"This amendment provides $250,000 to the City of Norfolk to support ..."
+-> ("City of Norfolk", "to the City of Norfolk to support ...", 0.95).
+
+RecipientExtractor is the engine behind parse_member_requests.py's
+extract_recipient_from_description():
+- every keyword set (stop phrases, start blacklist, organization keywords,
+  clause glue) is compiled once into a single trie-shaped regular expression
+  instead of being scanned keyword by keyword on every call
+- results are memoized by explanation text, both as given and with
+  whitespace normalized (identical explanations are common across bills and
+  sessions, often wrapped differently in the PDFs), and so is the screening
+  of each candidate phrase
+- time spent in each stage (normalize, match, screen, rank) is accumulated
+  in `stage_seconds`
+
+extract_batch() runs many explanations at once, optionally across processes,
+which keeps re-scoring every historical session cheap.
+
+Usage:
+    python scripts/amendment_vault/recipient_extraction.py [FILE ...] [--workers N]
+
+With no FILE, every data/amendments/member_requests_<year> file is read
+(NDJSON if present, otherwise JSON). Prints how many recipients were found,
+how many differ from the ones stored in the records, and the time per stage.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+OUTPUT_DIR = REPO_ROOT / "data" / "amendments"
+
+# Explanations per process task in extract_batch()
+BATCH_CHUNK_SIZE = 500
+
+# ============================================================================
+# Extraction Rules
+# ============================================================================
+
+# STRICT RULES (v2 - tightened for accuracy):
+# - ONLY accept candidates that contain at least one STRONG_ORG_KEYWORD
+# - REJECT candidates that start with fragment/action phrases
+# - REJECT candidates with clause glue words unless they have strong org signals
+# - Confidence: 0.95 for strong org signals, 0.80 for weaker program names
+
+# STRONG organization/program keywords (REQUIRED for acceptance)
+STRONG_ORG_KEYWORDS = [
+    "City", "County", "Town", "Village", "Borough",
+    "School Board", "Public Schools", "School Division", "School District",
+    "University", "College", "Community College", "Institute",
+    "Hospital", "Clinic", "Center",
+    "Authority", "Commission", "Corporation", "Foundation", "Association",
+    "Department", "Agency", "Board", "Council",
+    "Fund", "Trust", "Program", "Grant", "Scholarship", "Initiative"
+]
+
+# STRONG high-confidence org signals (for 0.95 confidence)
+STRONG_HIGH_CONF = [
+    "City", "County", "Town", "School Board", "Public Schools",
+    "University", "College", "Community College",
+    "Hospital", "Center", "Authority", "Commission",
+    "Department", "Agency", "Board"
+]
+
+# BLACKLIST: reject candidates starting with these (case-insensitive)
+START_BLACKLIST = [
+    "this ", "that ", "these ", "those ", "such ",
+    "the cost of ", "the cost ", "the provision of ",
+    "implement ", "to implement ", "provide ", "to provide ",
+    "establish ", "to establish ", "support ", "to support ",
+    "fund ", "to fund ", "expand ", "to expand ",
+    "improve ", "to improve ", "reduce ", "to reduce ",
+    "continue ", "to continue ", "create ", "to create ",
+    "enable ", "to enable ", "allow ", "to allow ",
+    "assist ", "to assist ", "help ", "to help "
+]
+
+# Clause glue words that indicate sentence fragments
+CLAUSE_GLUE = [" while ", " which ", " that ", " in order to "]
+
+# Stop phrases (where to end extraction), matched as whole words; the first
+# phrase in this list that occurs in a candidate cuts it, at that phrase's
+# first occurrence
+STOP_PHRASES = [
+    "to support", "to provide", "to establish",
+    "to administer", "to be used", "for the purpose of",
+    "to fund", "to assist", "to help",
+    "to enable", "to allow", "to create",
+]
+
+# Patterns to look for: "to [the] <Recipient>" or "for [the] <Recipient>"
+INTRO_PATTERNS = [
+    r'\bto the\s+([A-Z][^.;]*)',
+    r'\bto\s+([A-Z][^.;]*)',
+    r'\bfor the\s+([A-Z][^.;]*)',
+    r'\bfor\s+([A-Z][^.;]*)',
+    r'\bprovides?\s+(?:funding\s+)?(?:to|for)\s+(?:the\s+)?([A-Z][^.;]*)',
+]
+
+# Candidate length limits (characters, after truncation)
+MIN_CANDIDATE_LENGTH = 3
+MAX_CANDIDATE_LENGTH = 150
+
+# Candidates with clause glue are rejected above this many words
+MAX_GLUE_WORDS = 15
+
+# ============================================================================
+# Compiled Pattern Sets
+# ============================================================================
+
+def _trie_alternation(phrases: Sequence[str]) -> str:
+    """
+    Regex source matching any of `phrases` (lowercased), as a character trie:
+    "city|county|college" becomes "c(?:ity|o(?:llege|unty))", so the regex
+    engine tries each shared prefix once instead of once per phrase.
+    """
+    trie: Dict[str, dict] = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase.lower():
+            node = node.setdefault(char, {})
+        node[''] = {}  # a phrase ends here
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+def _keyword_re(keywords: Sequence[str]) -> re.Pattern:
+    """One whole-word, case-insensitive pattern matching any of `keywords`"""
+    return re.compile(r'\b' + _trie_alternation(keywords) + r'\b', re.IGNORECASE)
+
+
+def _stop_phrase_re(phrases: Sequence[str]) -> Tuple[re.Pattern, Tuple[int, ...]]:
+    """
+    One whole-word, case-insensitive pattern for all stop phrases, grouped by
+    first word ("to (?:(support)|(provide)|...)|for (?:(the purpose of))").
+
+    Returns:
+        (pattern, list position of the phrase captured by each group)
+    """
+    by_first_word: Dict[str, List[int]] = {}
+    for i, phrase in enumerate(phrases):
+        by_first_word.setdefault(phrase.split(' ', 1)[0], []).append(i)
+
+    branches, positions = [], []
+    for first_word, indexes in by_first_word.items():
+        rests = '|'.join('(' + re.escape(phrases[i][len(first_word) + 1:]) + ')' for i in indexes)
+        branches.append(f'{re.escape(first_word)} (?:{rests})')
+        positions.extend(indexes)
+    return re.compile(r'\b(?:' + '|'.join(branches) + r')\b', re.IGNORECASE), tuple(positions)
+
+
+WHITESPACE_RE = re.compile(r'\s+')
+INTRO_RES = [re.compile(pattern, re.IGNORECASE) for pattern in INTRO_PATTERNS]
+STOP_RE, STOP_POSITIONS = _stop_phrase_re(STOP_PHRASES)
+TRAILING_PUNCT_RE = re.compile(r'[,;:\s]+$')
+# Matched against lowercased candidates
+START_BLACKLIST_RE = re.compile(_trie_alternation(START_BLACKLIST))
+CLAUSE_GLUE_RE = re.compile(_trie_alternation(CLAUSE_GLUE))
+ORG_KEYWORD_RE = _keyword_re(STRONG_ORG_KEYWORDS)
+HIGH_CONF_RE = _keyword_re(STRONG_HIGH_CONF)
+
+STAGES = ('normalize', 'match', 'screen', 'rank')
+
+RecipientResult = Tuple[Optional[str], Optional[str], Optional[float]]
+NO_RECIPIENT: RecipientResult = (None, None, None)
+
+# ============================================================================
+# Extraction Engine
+# ============================================================================
+
+class RecipientExtractor:
+    """
+    Memoizing recipient extractor.
+
+    `stats` counts explanations, memo hits and candidate phrases screened;
+    `stage_seconds` holds the time spent in each of STAGES (for batches run
+    across processes, summed over the workers).
+    """
+
+    def __init__(self):
+        self._memo: Dict[str, RecipientResult] = {}
+        self._screened: Dict[str, Optional[Tuple[str, float]]] = {}
+        self.stats = {'explanations': 0, 'memo_hits': 0, 'candidates': 0}
+        self.stage_seconds = dict.fromkeys(STAGES, 0.0)
+
+    def _screen(self, raw_candidate: str) -> Optional[Tuple[str, float]]:
+        """
+        Truncate a candidate phrase and apply the strict filters.
+
+        Returns:
+            (recipient_name, confidence), or None if the candidate is rejected
+        """
+        if raw_candidate in self._screened:
+            return self._screened[raw_candidate]
+
+        # Apply stop phrases to truncate
+        truncated = raw_candidate
+        stop_at, stop_position = None, len(STOP_PHRASES)
+        for match in STOP_RE.finditer(truncated):
+            position = STOP_POSITIONS[match.lastindex - 1]
+            if position < stop_position:
+                stop_at, stop_position = match.start(), position
+        if stop_at is not None:
+            truncated = truncated[:stop_at].strip()
+
+        # Also stop at sentence boundaries
+        for delimiter in ['.', ';', ',']:
+            if delimiter in truncated:
+                truncated = truncated.split(delimiter)[0].strip()
+
+        # Clean up trailing punctuation and whitespace
+        truncated = TRAILING_PUNCT_RE.sub('', truncated).strip()
+
+        result = None
+        truncated_lower = truncated.lower()
+        if (
+            MIN_CANDIDATE_LENGTH <= len(truncated) <= MAX_CANDIDATE_LENGTH
+            # STRICT FILTER A: Check if starts with blacklisted phrase
+            and not START_BLACKLIST_RE.match(truncated_lower)
+            # STRICT FILTER B: Must contain at least one STRONG_ORG_KEYWORD
+            and ORG_KEYWORD_RE.search(truncated)
+            # STRICT FILTER C: Reject if contains clause glue AND is long/complex
+            and not (CLAUSE_GLUE_RE.search(truncated_lower) and len(truncated.split()) > MAX_GLUE_WORDS)
+            # STRICT FILTER D: Must start with capitalized word or "the" + capitalized
+            and (truncated[0].isupper() or truncated_lower.startswith("the "))
+        ):
+            # CONFIDENCE SCORING
+            result = (truncated, 0.95 if HIGH_CONF_RE.search(truncated) else 0.80)
+
+        self._screened[raw_candidate] = result
+        return result
+
+    def extract(self, description: str) -> RecipientResult:
+        """
+        Given the full explanation/description text for an amendment, attempt to extract
+        the intended funding recipient.
+
+        Return:
+            (primary_recipient_name, raw_snippet, confidence)
+        """
+        if not description or not description.strip():
+            return NO_RECIPIENT
+
+        self.stats['explanations'] += 1
+        result = self._memo.get(description)
+        if result is not None:
+            self.stats['memo_hits'] += 1
+            return result
+
+        started = time.perf_counter()
+        text = WHITESPACE_RE.sub(' ', description.strip())
+        normalized = time.perf_counter()
+        self.stage_seconds['normalize'] += normalized - started
+
+        result = self._memo.get(text)
+        if result is not None:
+            self.stats['memo_hits'] += 1
+            self._memo[description] = result
+            return result
+
+        matches = [(match.group(1).strip(), match.group(0))
+                   for pattern in INTRO_RES for match in pattern.finditer(text)]
+        matched = time.perf_counter()
+
+        candidates = []
+        for raw_candidate, snippet in matches:
+            screened = self._screen(raw_candidate)
+            if screened is not None:
+                candidates.append((screened[0], snippet, screened[1]))
+        self.stats['candidates'] += len(matches)
+        screened_at = time.perf_counter()
+
+        # Highest confidence, then the longest (more specific) name; the
+        # earliest candidate wins ties
+        if candidates:
+            recipient, raw_snippet, confidence = max(candidates, key=lambda c: (c[2], len(c[0])))
+            result = (recipient, raw_snippet, confidence)
+        else:
+            result = NO_RECIPIENT
+        done = time.perf_counter()
+
+        self.stage_seconds['match'] += matched - normalized
+        self.stage_seconds['screen'] += screened_at - matched
+        self.stage_seconds['rank'] += done - screened_at
+
+        self._memo[description] = self._memo[text] = result
+        return result
+
+    def extract_batch(self, descriptions: Sequence[str], workers: Optional[int] = 1,
+                      chunk_size: int = BATCH_CHUNK_SIZE) -> List[RecipientResult]:
+        """
+        Extract recipients for many explanations.
+
+        Args:
+            descriptions: Explanation texts
+            workers: Processes for explanations not already memoized (None: one
+                per core, 1: in this process)
+            chunk_size: Explanations per process task
+
+        Returns:
+            One (primary_recipient_name, raw_snippet, confidence) per description
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers > 1:
+            # Group what is not memoized yet by normalized text, so identical
+            # explanations are extracted once whatever their line wrapping
+            started = time.perf_counter()
+            pending: Dict[str, List[str]] = {}
+            for description in dict.fromkeys(descriptions):
+                if not description or not description.strip() or description in self._memo:
+                    continue
+                text = WHITESPACE_RE.sub(' ', description.strip())
+                if text in self._memo:
+                    self._memo[description] = self._memo[text]
+                else:
+                    pending.setdefault(text, []).append(description)
+            self.stage_seconds['normalize'] += time.perf_counter() - started
+
+            if len(pending) > chunk_size:
+                texts = list(pending)
+                chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+                with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+                    for chunk, (results, stats, stage_seconds) in zip(chunks, pool.map(_extract_chunk, chunks)):
+                        for text, result in zip(chunk, results):
+                            self._memo[text] = result
+                            for description in pending[text]:
+                                self._memo[description] = result
+                        for key, value in stats.items():
+                            self.stats[key] += value
+                        for stage, seconds in stage_seconds.items():
+                            self.stage_seconds[stage] += seconds
+
+                # Everything else in the batch was answered from the memo
+                answered = sum(1 for d in descriptions if d and d.strip())
+                self.stats['explanations'] += answered - len(texts)
+                self.stats['memo_hits'] += answered - len(texts)
+                return [self._memo.get(d, NO_RECIPIENT) if d and d.strip() else NO_RECIPIENT
+                        for d in descriptions]
+
+        return [self.extract(d) for d in descriptions]
+
+    def report(self, indent: str = "") -> List[str]:
+        """Summary lines: explanations, memo hits and time per stage"""
+        explanations = self.stats['explanations']
+        hits = self.stats['memo_hits']
+        total = sum(self.stage_seconds.values())
+        lines = [f"{indent}{explanations:,} explanation(s), {hits:,} memo hit(s) "
+                 f"({hits / explanations if explanations else 0:.0%}), "
+                 f"{self.stats['candidates']:,} candidate phrase(s) screened"]
+        for stage in STAGES:
+            seconds = self.stage_seconds[stage]
+            lines.append(f"{indent}  {stage:10} {seconds * 1000:9.1f} ms "
+                         f"({seconds / total if total else 0:.0%})")
+        return lines
+
+
+def _extract_chunk(descriptions: List[str]) -> Tuple[List[RecipientResult], Dict[str, int], Dict[str, float]]:
+    """Process pool task: extract one chunk with a fresh extractor"""
+    extractor = RecipientExtractor()
+    results = [extractor.extract(d) for d in descriptions]
+    return results, extractor.stats, extractor.stage_seconds
+
+# ============================================================================
+# Main Execution
+# ============================================================================
+
+def load_records(path: Path) -> List[Dict[str, Any]]:
+    """Records of a member_requests_<year>.ndjson or .json file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix == '.ndjson':
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-extract funding recipients from parsed amendment records')
+    parser.add_argument('files', nargs='*', type=Path,
+                        help='member_requests_<year>.ndjson or .json files (default: all in data/amendments)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processes for extraction (default: one per core)')
+    args = parser.parse_args()
+
+    paths = args.files
+    if not paths:
+        for json_path in sorted(OUTPUT_DIR.glob("member_requests_[0-9]*.json")):
+            ndjson_path = json_path.with_suffix('.ndjson')
+            paths.append(ndjson_path if ndjson_path.exists() else json_path)
+
+    records = []
+    for path in paths:
+        file_records = load_records(path)
+        print(f"📂 {path.name}: {len(file_records):,} records")
+        records.extend(file_records)
+    if not records:
+        print(f"✗ No member request records found in {OUTPUT_DIR}")
+        return 1
+
+    extractor = RecipientExtractor()
+    started = time.perf_counter()
+    results = extractor.extract_batch([r.get('descriptionFull') or "" for r in records], workers=args.workers)
+    elapsed = time.perf_counter() - started
+
+    found = sum(1 for name, _, _ in results if name)
+    changed = [(r, result) for r, result in zip(records, results)
+               if (r.get('primaryRecipientName'), r.get('recipientRawText'), r.get('recipientConfidence')) != result]
+
+    print()
+    print(f"⏱️  {len(records):,} records in {elapsed * 1000:.0f} ms")
+    print(f"🎯 Recipients found: {found:,}")
+    for line in extractor.report(indent="   "):
+        print(line)
+
+    if changed:
+        print(f"⚠️  {len(changed):,} record(s) differ from their stored recipient, e.g.:")
+        for record, (name, _, confidence) in changed[:5]:
+            print(f"   {record['id']}: {record.get('primaryRecipientName')!r} -> {name!r} ({confidence})")
+    else:
+        print("✅ Every record matches its stored recipient")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
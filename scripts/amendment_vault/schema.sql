@@ -3,18 +3,23 @@
 -- ============================================================================
 -- 
 -- This schema defines the canonical structure for Member Request amendments
--- parsed from HB1600 and SB800 PDFs.
+-- parsed from the budget bill PDFs of every ingested session (HB30/SB30,
+-- HB1600/SB800, caboose bills, ...).
 --
 -- Purpose: Support aggregation queries for legislator amendment focus by
 -- spending category (for Spotlight Map pie charts).
 --
+-- vault_db.py creates these tables in data/amendments/amendment_vault.sqlite
+-- and loads them from the member_requests_<year> files; the audit scripts
+-- query that database.
+--
 -- ============================================================================
 
 CREATE TABLE IF NOT EXISTS amendment_vault_member_requests (
   -- ===== Identity =====
   id TEXT PRIMARY KEY,
   stage TEXT NOT NULL DEFAULT 'member_request',
-  bill_number TEXT NOT NULL CHECK (bill_number IN ('HB1600', 'SB800')),
+  bill_number TEXT NOT NULL CHECK (bill_number GLOB '[HS]B[0-9]*'),
   session_year INTEGER NOT NULL,
   chamber TEXT NOT NULL CHECK (chamber IN ('House', 'Senate')),
 
@@ -48,6 +53,11 @@ CREATE TABLE IF NOT EXISTS amendment_vault_member_requests (
   description_short TEXT,
   description_full TEXT,
 
+  -- ===== Funding Recipient =====
+  primary_recipient_name TEXT,
+  recipient_raw_text TEXT,
+  recipient_confidence REAL,
+
   -- ===== Source Tracking =====
   source_pdf_path TEXT NOT NULL,
   source_page INTEGER,
@@ -55,7 +65,32 @@ CREATE TABLE IF NOT EXISTS amendment_vault_member_requests (
 
   -- ===== Timestamps =====
   created_at TEXT,
-  updated_at TEXT
+  updated_at TEXT,
+
+  -- ===== Loader =====
+  -- Patron name lowercased and trimmed, for case-insensitive lookups
+  patron_key TEXT NOT NULL DEFAULT '',
+  -- Position in the member_requests_<year> file (audits keep the first of duplicates)
+  record_order INTEGER NOT NULL DEFAULT 0
+);
+
+-- Dedup fingerprints, one per record and policy (see POLICIES in fingerprints.py)
+CREATE TABLE IF NOT EXISTS amendment_vault_fingerprints (
+  record_id TEXT NOT NULL REFERENCES amendment_vault_member_requests(id) ON DELETE CASCADE,
+  policy TEXT NOT NULL,
+  fingerprint TEXT NOT NULL,
+  PRIMARY KEY (record_id, policy)
+);
+
+-- Year file each session was loaded from, to reload only changed files
+CREATE TABLE IF NOT EXISTS amendment_vault_sources (
+  session_year INTEGER PRIMARY KEY,
+  path TEXT NOT NULL,
+  size INTEGER NOT NULL,
+  mtime_ns INTEGER NOT NULL,
+  policies TEXT NOT NULL,
+  record_count INTEGER NOT NULL,
+  loaded_at TEXT NOT NULL
 );
 
 -- ============================================================================
@@ -69,6 +104,14 @@ CREATE INDEX IF NOT EXISTS idx_legislator_id
 CREATE INDEX IF NOT EXISTS idx_patron_name 
   ON amendment_vault_member_requests(patron_name);
 
+-- Index for case-insensitive patron lookups (recipient audits)
+CREATE INDEX IF NOT EXISTS idx_patron_key 
+  ON amendment_vault_member_requests(patron_key, session_year);
+
+-- Index for per-session legislator totals
+CREATE INDEX IF NOT EXISTS idx_session_patron 
+  ON amendment_vault_member_requests(session_year, patron_name);
+
 -- Index for spending category aggregation
 CREATE INDEX IF NOT EXISTS idx_spending_category 
   ON amendment_vault_member_requests(spending_category_id);
@@ -85,6 +128,10 @@ CREATE INDEX IF NOT EXISTS idx_bill_number
 CREATE INDEX IF NOT EXISTS idx_legislator_session_category 
   ON amendment_vault_member_requests(legislator_id, session_year, spending_category_id);
 
+-- Index for duplicate lookups by fingerprint
+CREATE INDEX IF NOT EXISTS idx_fingerprint 
+  ON amendment_vault_fingerprints(policy, fingerprint);
+
 -- ============================================================================
 -- Sample Aggregation Queries
 -- ============================================================================
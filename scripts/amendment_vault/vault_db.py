@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Amendment Vault - SQLite Store
+
+Keeps the parsed Member Request records in a local SQLite database
+(data/amendments/amendment_vault.sqlite) built from schema.sql, so the audit
+scripts can run indexed SQL queries instead of loading and scanning every
+member_requests_<year>.json file on each run.
+
+- each member_requests_<year> file (NDJSON if present, otherwise JSON) is
+  bulk-upserted by record id with executemany, in a single transaction and
+  with the database in WAL mode; records no longer in the file are deleted
+- a file is loaded again only when its size or modification time changed
+  (tracked in amendment_vault_sources), so open_vault() is cheap once the
+  database is current
+- every record's fingerprints (fingerprints.py policies) are copied from the
+  dedup index next to the data into amendment_vault_fingerprints, indexed
+  by policy and fingerprint; a policy version change reloads every session
+- the database is derived data: a schema change (SCHEMA_VERSION) or --force
+  rebuilds it from the year files
+
+Usage:
+    python scripts/amendment_vault/vault_db.py [--db PATH] [--data-dir DIR] [--force]
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fingerprints import (POLICIES, POLICY_VERSIONS, FingerprintIndex, load_index, normalize_patron_name,
+                          read_records, year_files)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+OUTPUT_DIR = REPO_ROOT / "data" / "amendments"
+DB_PATH = OUTPUT_DIR / "amendment_vault.sqlite"
+SCHEMA_PATH = Path(__file__).parent / "schema.sql"
+
+# Bump when schema.sql changes; older databases are rebuilt
+SCHEMA_VERSION = 2
+
+RECORDS_TABLE = "amendment_vault_member_requests"
+FINGERPRINTS_TABLE = "amendment_vault_fingerprints"
+SOURCES_TABLE = "amendment_vault_sources"
+
+# Record field -> column
+COLUMNS = [
+    ("id", "id"),
+    ("stage", "stage"),
+    ("billNumber", "bill_number"),
+    ("sessionYear", "session_year"),
+    ("chamber", "chamber"),
+    ("patronName", "patron_name"),
+    ("patronLISId", "patron_lis_id"),
+    ("legislatorId", "legislator_id"),
+    ("districtCode", "district_code"),
+    ("itemNumber", "item_number"),
+    ("subItem", "sub_item"),
+    ("agencyCode", "agency_code"),
+    ("agencyName", "agency_name"),
+    ("secretariatCode", "secretariat_code"),
+    ("spendingCategoryId", "spending_category_id"),
+    ("fiscalYear", "fiscal_year"),
+    ("deltaGF", "delta_gf"),
+    ("deltaNGF", "delta_ngf"),
+    ("netAmount", "net_amount"),
+    ("isIncrease", "is_increase"),
+    ("isLanguageOnly", "is_language_only"),
+    ("descriptionShort", "description_short"),
+    ("descriptionFull", "description_full"),
+    ("primaryRecipientName", "primary_recipient_name"),
+    ("recipientRawText", "recipient_raw_text"),
+    ("recipientConfidence", "recipient_confidence"),
+    ("sourcePdfPath", "source_pdf_path"),
+    ("sourcePage", "source_page"),
+    ("sourceLineHint", "source_line_hint"),
+    ("createdAt", "created_at"),
+    ("updatedAt", "updated_at"),
+]
+
+# Columns filled by the loader rather than copied from a record field
+DERIVED_COLUMNS = ["patron_key", "record_order"]
+
+# ============================================================================
+# Database
+# ============================================================================
+
+_RECORD_COLUMNS = [column for _, column in COLUMNS] + DERIVED_COLUMNS
+
+UPSERT_RECORD_SQL = (
+    f"INSERT INTO {RECORDS_TABLE} ({', '.join(_RECORD_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _RECORD_COLUMNS)}) "
+    f"ON CONFLICT(id) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in _RECORD_COLUMNS[1:])
+)
+
+UPSERT_FINGERPRINT_SQL = (
+    f"INSERT INTO {FINGERPRINTS_TABLE} (record_id, policy, fingerprint) VALUES (?, ?, ?) "
+    f"ON CONFLICT(record_id, policy) DO UPDATE SET fingerprint = excluded.fingerprint"
+)
+
+
+def connect(db_path: Path = DB_PATH) -> sqlite3.Connection:
+    """
+    Open the vault database, creating or rebuilding its tables from schema.sql
+    when it is new or was built by an older SCHEMA_VERSION.
+
+    Rows come back as sqlite3.Row (accessible by column name).
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA foreign_keys = ON")
+
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        with conn:
+            for table in (FINGERPRINTS_TABLE, SOURCES_TABLE, RECORDS_TABLE):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.executescript(SCHEMA_PATH.read_text(encoding='utf-8'))
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def record_row(record: Dict[str, Any], order: int) -> tuple:
+    """Column values for a record, in _RECORD_COLUMNS order"""
+    values = [record.get(field) for field, _ in COLUMNS]
+    values.append(normalize_patron_name(record.get("patronName") or ""))
+    values.append(order)
+    return tuple(values)
+
+
+def upsert_records(conn: sqlite3.Connection, records: List[Dict[str, Any]], index: FingerprintIndex) -> int:
+    """
+    Bulk-upsert records and their fingerprints by id.
+
+    Runs inside the caller's transaction. record_order is each record's
+    position in `records`, which the audits use to keep the first of a set
+    of duplicates. Fingerprints come from `index`.
+
+    Returns:
+        Number of records written
+    """
+    conn.executemany(UPSERT_RECORD_SQL, (record_row(r, i) for i, r in enumerate(records)))
+    conn.executemany(UPSERT_FINGERPRINT_SQL, (
+        (r["id"], policy, index.fingerprint(r["id"], policy))
+        for r in records
+        for policy in POLICIES
+    ))
+    return len(records)
+
+
+def replace_session(conn: sqlite3.Connection, session_year: int, records: List[Dict[str, Any]],
+                    index: FingerprintIndex) -> int:
+    """Upsert a session's records and delete its rows that are no longer in `records`"""
+    count = upsert_records(conn, records, index)
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS loaded_ids (id TEXT PRIMARY KEY)")
+    conn.execute("DELETE FROM loaded_ids")
+    conn.executemany("INSERT OR IGNORE INTO loaded_ids (id) VALUES (?)", ((r["id"],) for r in records))
+    conn.execute(
+        f"DELETE FROM {RECORDS_TABLE} WHERE session_year = ? AND id NOT IN (SELECT id FROM loaded_ids)",
+        (session_year,),
+    )
+    return count
+
+
+# ============================================================================
+# Loading
+# ============================================================================
+
+def sync(conn: sqlite3.Connection, data_dir: Path = OUTPUT_DIR, force: bool = False) -> Dict[int, int]:
+    """
+    Bring the database up to date with the year files in one transaction.
+
+    Only years whose file (path, size or modification time) or fingerprint
+    policies changed are loaded again. Years whose file is gone are deleted.
+
+    Returns:
+        Session year -> records loaded, for every year loaded or deleted (0)
+    """
+    files = year_files(data_dir)
+    policies = json.dumps(POLICY_VERSIONS, sort_keys=True)
+    loaded = {row["session_year"]: row for row in conn.execute(f"SELECT * FROM {SOURCES_TABLE}")}
+
+    changed = {}
+    for year, path in files.items():
+        stat = path.stat()
+        previous = loaded.get(year)
+        if (force or previous is None or previous["path"] != str(path)
+                or previous["size"] != stat.st_size or previous["mtime_ns"] != stat.st_mtime_ns
+                or previous["policies"] != policies):
+            changed[year] = (path, stat)
+    removed = [year for year in loaded if year not in files]
+    if not changed and not removed:
+        return {}
+
+    records_by_year = {year: read_records(path) for year, (path, _) in changed.items()}
+    index = load_index(data_dir, records_by_year=records_by_year)
+
+    counts = {}
+    with conn:
+        for year in removed:
+            conn.execute(f"DELETE FROM {RECORDS_TABLE} WHERE session_year = ?", (year,))
+            conn.execute(f"DELETE FROM {SOURCES_TABLE} WHERE session_year = ?", (year,))
+            counts[year] = 0
+        for year, (path, stat) in changed.items():
+            counts[year] = replace_session(conn, year, records_by_year[year], index)
+            conn.execute(
+                f"INSERT OR REPLACE INTO {SOURCES_TABLE} "
+                f"(session_year, path, size, mtime_ns, policies, record_count, loaded_at) "
+                f"VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (year, str(path), stat.st_size, stat.st_mtime_ns, policies, counts[year],
+                 datetime.now().isoformat()),
+            )
+    return counts
+
+
+def open_vault(db_path: Path = DB_PATH, data_dir: Path = OUTPUT_DIR) -> sqlite3.Connection:
+    """Connection to the vault database, synced with the year files first"""
+    conn = connect(db_path)
+    sync(conn, data_dir)
+    return conn
+
+
+def session_years(conn: sqlite3.Connection) -> List[int]:
+    """Session years in the database"""
+    return [row[0] for row in conn.execute(f"SELECT session_year FROM {SOURCES_TABLE} ORDER BY session_year")]
+
+
+def to_record(row: sqlite3.Row) -> Dict[str, Any]:
+    """Record dict (camelCase fields) for a row of the records table"""
+    keys = row.keys()
+    record = {field: row[column] for field, column in COLUMNS if column in keys}
+    for field in ("isIncrease", "isLanguageOnly"):
+        if field in record and record[field] is not None:
+            record[field] = bool(record[field])
+    return record
+
+
+# ============================================================================
+# Queries
+# ============================================================================
+
+# A patron's member request increases (frontend business rules), each marked
+# with its occurrence among records sharing a fingerprint, in file order
+PATRON_INCREASES_SQL = f"""
+SELECT r.*,
+       ROW_NUMBER() OVER (
+           PARTITION BY f.fingerprint ORDER BY r.session_year, r.record_order
+       ) AS occurrence
+FROM {RECORDS_TABLE} r
+JOIN {FINGERPRINTS_TABLE} f ON f.record_id = r.id AND f.policy = ?
+WHERE r.patron_key = ?
+  AND r.stage = 'member_request'
+  AND r.is_language_only = 0
+  AND r.net_amount > 0
+ORDER BY r.session_year, r.record_order
+"""
+
+
+def patron_increases(conn: sqlite3.Connection, patron_name: str,
+                     policy: str = "recipient_audit") -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Member request increases of a patron across every session.
+
+    Args:
+        conn: Vault connection
+        patron_name: Patron name, matched after normalize_patron_name()
+        policy: Fingerprint policy used to drop duplicates
+
+    Returns:
+        (number of matching records, deduplicated records) where the first
+        record of each fingerprint in file order is kept
+    """
+    rows = conn.execute(PATRON_INCREASES_SQL, (policy, normalize_patron_name(patron_name))).fetchall()
+    return len(rows), [to_record(row) for row in rows if row["occurrence"] == 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load parsed member requests into the SQLite amendment vault')
+    parser.add_argument('--db', type=Path, default=DB_PATH, help=f'Database file (default: {DB_PATH})')
+    parser.add_argument('--data-dir', type=Path, default=OUTPUT_DIR,
+                        help='Directory with the member_requests_<year> files (default: data/amendments)')
+    parser.add_argument('--force', action='store_true', help='Reload every year file even if unchanged')
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    started = time.perf_counter()
+    counts = sync(conn, args.data_dir, force=args.force)
+    elapsed = time.perf_counter() - started
+
+    if not counts:
+        print(f"✓ {args.db.name} is up to date")
+    for year, count in counts.items():
+        if count:
+            print(f"📥 {year}: {count:,} records upserted")
+        else:
+            print(f"🗑️  {year}: removed (no member_requests_{year} file)")
+    if counts:
+        print(f"⏱️  {elapsed * 1000:.0f} ms")
+
+    total = conn.execute(f"SELECT COUNT(*) FROM {RECORDS_TABLE}").fetchone()[0]
+    print(f"🗄️  {args.db}: {total:,} records in sessions {', '.join(map(str, session_years(conn))) or 'none'}")
+    conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
 """Quick analysis of NGO grants by expense type"""
 
-import csv
-import gzip
 from collections import Counter, defaultdict
 
+from transfer_payments import iter_rows, equals
+
 csv_file = "frontend/public/decoder/transfer_payments_full.csv.gz"
 
 print("=" * 100)
@@ -21,21 +21,22 @@ stats = {}
 for exp_type in priority_types:
     stats[exp_type] = {'count': 0, 'vendors': set(), 'amount': 0, 'samples': []}
 
-with gzip.open(csv_file, 'rt') as f:
-    reader = csv.DictReader(f)
-    
-    for row in reader:
-        exp_type = row['expense_type']
-        if exp_type in priority_types:
-            vendor = row['vendor_name']
-            amount = float(row['amount']) if row['amount'] else 0
-            
-            stats[exp_type]['count'] += 1
-            stats[exp_type]['vendors'].add(vendor)
-            stats[exp_type]['amount'] += amount
-            
-            if len(stats[exp_type]['samples']) < 10:
-                stats[exp_type]['samples'].append((vendor, amount))
+rows = iter_rows(
+    csv_file,
+    columns=['expense_type', 'vendor_name', 'amount'],
+    where=[equals('expense_type', *priority_types)],
+)
+for row in rows:
+    exp_type = row['expense_type']
+    vendor = row['vendor_name']
+    amount = float(row['amount']) if row['amount'] else 0
+
+    stats[exp_type]['count'] += 1
+    stats[exp_type]['vendors'].add(vendor)
+    stats[exp_type]['amount'] += amount
+
+    if len(stats[exp_type]['samples']) < 10:
+        stats[exp_type]['samples'].append((vendor, amount))
 
 print("\n📊 PRIORITY NGO EXPENSE TYPES:\n")
 for exp_type in priority_types:
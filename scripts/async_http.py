@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Rate-limited asyncio HTTP client with an on-disk response cache.
+
+Used by the scrapers (fetch_990_links.py) to fetch many pages politely:
+- at most `concurrency` requests are in flight
+- a token bucket caps the sustained request rate (with an optional burst)
+- connection errors, timeouts, 429 and 5xx responses are retried with
+  exponential backoff and jitter, honouring Retry-After
+- 200 responses are cached on disk by URL; cached pages are revalidated with
+  If-None-Match / If-Modified-Since, so unchanged pages cost a bodiless 304
+
+Requests run in worker threads (asyncio.to_thread + urllib), so only the
+standard library is needed.
+
+Usage:
+    from async_http import AsyncFetcher, HttpCache
+
+    fetcher = AsyncFetcher(concurrency=4, rate=1.25, cache=HttpCache())
+    response = await fetcher.fetch(url)
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+from email.message import Message
+from email.utils import parsedate_to_datetime
+from http.client import HTTPException
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+# Paths
+BASE_DIR = Path(__file__).parent.parent
+HTTP_CACHE_DIR = BASE_DIR / "data" / "http_cache"
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+
+# Responses worth retrying; anything else is returned to the caller as is
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Longest Retry-After we are willing to sleep for
+MAX_RETRY_AFTER = 120.0
+
+
+class Response(NamedTuple):
+    """A fetched (or cached) response."""
+    url: str
+    status: int
+    body: bytes
+    source: str  # 'network', 'revalidated' (304 from a cached copy) or 'cache'
+
+    def text(self, encoding: str = 'utf-8') -> str:
+        return self.body.decode(encoding)
+
+
+class FetchError(Exception):
+    """No usable response after all retries."""
+
+    def __init__(self, url: str, reason: str):
+        super().__init__(f"{url}: {reason}")
+        self.url = url
+        self.reason = reason
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, up to `burst` at once."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and take it (no-op if rate <= 0)."""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HttpCache:
+    """On-disk response cache: a body file and a JSON metadata file per URL."""
+
+    def __init__(self, directory: Path = HTTP_CACHE_DIR):
+        self.directory = Path(directory)
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        folder = self.directory / key[:2]
+        return folder / f'{key}.json', folder / f'{key}.body'
+
+    def get(self, url: str) -> Optional[Tuple[Dict, bytes]]:
+        """(metadata, body) for `url`, or None if not cached."""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if meta.get('url') != url or len(body) != meta.get('length'):
+            return None
+        return meta, body
+
+    def put(self, url: str, body: bytes, headers: Message):
+        """Store a 200 response with its validators."""
+        meta_path, body_path = self._paths(url)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+            'length': len(body),
+        }
+        # Body first, metadata last: a crash in between leaves a mismatched
+        # length, which get() treats as a miss
+        tmp_body = body_path.with_suffix('.body.tmp')
+        tmp_body.write_bytes(body)
+        tmp_body.replace(body_path)
+        self._write_meta(meta_path, meta)
+
+    def touch(self, url: str, meta: Dict, headers: Message):
+        """Record a successful revalidation (and any new validators)."""
+        meta = dict(meta, fetched_at=time.time())
+        if headers.get('ETag'):
+            meta['etag'] = headers['ETag']
+        if headers.get('Last-Modified'):
+            meta['last_modified'] = headers['Last-Modified']
+        self._write_meta(self._paths(url)[0], meta)
+
+    @staticmethod
+    def _write_meta(meta_path: Path, meta: Dict):
+        tmp_meta = meta_path.with_suffix('.json.tmp')
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        tmp_meta.replace(meta_path)
+
+
+def _retry_after(headers: Message) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    value = headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+class AsyncFetcher:
+    """Concurrency-capped, rate-limited, retrying GET client."""
+
+    def __init__(self,
+                 concurrency: int = 4,
+                 rate: float = 1.0,
+                 burst: int = 1,
+                 retries: int = 3,
+                 backoff: float = 1.0,
+                 timeout: float = 15.0,
+                 cache: Optional[HttpCache] = None,
+                 max_age: float = 0.0,
+                 user_agent: str = USER_AGENT):
+        """
+        Args:
+            concurrency: Most requests in flight at once
+            rate: Sustained requests per second (<= 0: unlimited)
+            burst: Requests allowed back to back before the rate applies
+            retries: Extra attempts after a retriable failure
+            backoff: First retry delay in seconds (doubles per attempt, with jitter)
+            timeout: Per-request socket timeout in seconds
+            cache: Response cache (None: no caching or revalidation)
+            max_age: Serve cached pages younger than this without a request
+            user_agent: User-Agent header
+        """
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = cache
+        self.max_age = max_age
+        self.user_agent = user_agent
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._bucket = TokenBucket(rate, burst)
+        self.stats = {'network': 0, 'revalidated': 0, 'cache': 0, 'retries': 0, 'failures': 0}
+
+    def _request(self, url: str, headers: Dict[str, str]) -> Tuple[int, bytes, Message]:
+        """
+        Blocking GET (runs in a worker thread).
+
+        Response headers are returned as the HTTPMessage, whose lookups
+        ignore case, so a server sending `etag` or `retry-after` still works.
+        """
+        try:
+            with urlopen(Request(url, headers=headers), timeout=self.timeout) as response:
+                return response.status, response.read(), response.headers
+        except HTTPError as e:
+            # 304 and every error status arrive here; the body may be empty
+            try:
+                body = e.read() if e.fp else b''
+            finally:
+                e.close()
+            return e.code, body, e.headers if e.headers is not None else Message()
+
+    async def fetch(self, url: str) -> Response:
+        """
+        GET `url`, revalidating or serving a cached copy when possible.
+
+        Returns:
+            Response (any non-retriable status, e.g. 404, is returned as is)
+
+        Raises:
+            FetchError: connection failures or retriable statuses outlasted the retries
+        """
+        cached = self.cache.get(url) if self.cache else None
+        if cached and self.max_age > 0 and time.time() - cached[0]['fetched_at'] < self.max_age:
+            self.stats['cache'] += 1
+            return Response(url, 200, cached[1], 'cache')
+
+        headers = {'User-Agent': self.user_agent}
+        if cached:
+            if cached[0].get('etag'):
+                headers['If-None-Match'] = cached[0]['etag']
+            if cached[0].get('last_modified'):
+                headers['If-Modified-Since'] = cached[0]['last_modified']
+
+        reason = ''
+        for attempt in range(self.retries + 1):
+            wait = None
+            async with self._semaphore:
+                await self._bucket.acquire()
+                try:
+                    status, body, response_headers = await asyncio.to_thread(self._request, url, headers)
+                except (URLError, OSError, HTTPException) as e:
+                    # HTTPException: IncompleteRead, RemoteDisconnected, BadStatusLine, ...
+                    status, reason = None, str(getattr(e, 'reason', e)) or type(e).__name__
+
+            if status == 304 and cached:
+                self.cache.touch(url, cached[0], response_headers)
+                self.stats['revalidated'] += 1
+                return Response(url, 200, cached[1], 'revalidated')
+
+            if status is not None and status not in RETRY_STATUSES:
+                if status == 200 and self.cache:
+                    self.cache.put(url, body, response_headers)
+                self.stats['network'] += 1
+                return Response(url, status, body, 'network')
+
+            if status is not None:
+                reason = f"HTTP {status}"
+                wait = _retry_after(response_headers)
+            if attempt == self.retries:
+                break
+
+            # Sleep outside the semaphore so other requests can use the slot
+            self.stats['retries'] += 1
+            if wait is None:
+                wait = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.0)
+            await asyncio.sleep(wait)
+
+        self.stats['failures'] += 1
+        raise FetchError(url, reason)
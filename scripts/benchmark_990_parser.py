@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ProPublica page extraction in fetch_990_links.py.
+
+Times extract_990_page() on:
+- every page in the ProPublica HTTP cache (data/http_cache/propublica), if
+  fetch_990_links.py has been run
+- generated pages in ProPublica's layout (header and navigation, profile,
+  one large filing section per year back to 2001, footer)
+
+Reports mean/p50/p95 milliseconds per page, throughput, and how much of each
+page is scanned before extraction stops (the section after the fifth filing).
+With --baseline the same pages are also run through html.parser with no
+handlers, i.e. the cost of just tokenizing the whole page the way the old
+parser did.
+
+Usage:
+    python scripts/benchmark_990_parser.py [--pages N] [--repeat R] [--budget-ms MS] [--baseline]
+
+Exits with status 1 if --budget-ms is given and the p95 time per page exceeds it.
+"""
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Callable, List
+
+# Add parent directory to path to import from fetch_990_links
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fetch_990_links import HTTP_CACHE_DIR, MAX_FILINGS, extract_990_page
+
+SECTION_RE = re.compile(r"""id=['"]filing\d{4}['"]""")
+FORMS = ['990', '990-EZ', '990-PF']
+
+
+def generate_page(rng: random.Random, ein: str) -> str:
+    """A page in ProPublica's organization layout, with every filing year back to 2001."""
+    parts = [
+        '<!DOCTYPE html><html><head><title>Nonprofit Explorer</title>'
+        '<link href="/nonprofits/assets/application.css" rel="stylesheet">'
+        '<script>window.dataLayer = window.dataLayer || []; var tmpl = "<h5>990</h5>";</script></head><body>',
+        '<nav>' + ''.join(f'<a href="/nonprofits/section/{i}">Section {i}</a>' for i in range(60)) + '</nav>',
+        f'<div class="profile"><h1 class="text-hed">SAMPLE ORGANIZATION {ein}</h1>'
+        f'<h3>Summary</h3><p>EIN: {ein[:2]}-{ein[2:]}</p><p>Classification (NTEE) Human Services</p></div>',
+    ]
+    form = rng.choice(FORMS)
+    for year in range(2024, 2000, -1):
+        rows = ''.join(
+            f'<tr><td class="label">Line item {i}</td><td class="value">${rng.randint(0, 10**7):,}</td>'
+            f'<td class="pct">{rng.random():.1%}</td></tr>'
+            for i in range(rng.randint(40, 80))
+        )
+        section = [
+            f"<section class='single-filing-period' id='filing{year}'>",
+            f'<div class="year-label">{year}</div>',
+        ]
+        if year > 2011:  # Older years are paper returns with no e-file data
+            section.append(f'<span class="filed-on">Filed on Nov. {rng.randint(1, 28)}, {year + 1}</span>')
+        section.append(f'<h5>{form}</h5>')
+        section.append(f'<section class="revenue"><h4>Revenue</h4><table>{rows}</table></section>')
+        section.append(f'<section class="expenses"><h4>Expenses</h4><table>{rows}</table></section>')
+        if year > 2011:
+            section.append(f'<a class="btn" href="/nonprofits/organizations/{ein}/{year + 1}{rng.randint(10**11, 10**12 - 1)}/full">'
+                           'View Filing</a>')
+        else:
+            section.append(f'<a href="/nonprofits/download-filing?path=paper%2F{ein}_{year}12_990.pdf">PDF</a>')
+        section.append('</section>')
+        parts.append(''.join(section))
+    parts.append('<footer>' + ''.join(f'<a href="/about/{i}">About {i}</a>' for i in range(30)) + '</footer></body></html>')
+    return ''.join(parts)
+
+
+def load_pages(count: int) -> List[str]:
+    """Cached ProPublica pages, topped up with generated ones to `count` pages."""
+    pages = []
+    if HTTP_CACHE_DIR.exists():
+        for body_path in sorted(HTTP_CACHE_DIR.glob('*/*.body')):
+            pages.append(body_path.read_bytes().decode('utf-8', errors='replace'))
+    print(f"📂 {len(pages)} cached page(s) from {HTTP_CACHE_DIR}")
+
+    rng = random.Random(990)
+    generated = max(0, count - len(pages))
+    pages.extend(generate_page(rng, f"{540000000 + i:09d}") for i in range(generated))
+    print(f"🧪 {generated} generated page(s)")
+    return pages
+
+
+def scanned_bytes(html: str) -> int:
+    """Bytes of `html` before the section extraction stops at (the whole page if none)."""
+    sections = list(SECTION_RE.finditer(html))
+    if len(sections) > MAX_FILINGS:
+        return sections[MAX_FILINGS].start()
+    return len(html)
+
+
+def time_pages(pages: List[str], parse: Callable[[str], object], repeat: int) -> List[float]:
+    """Best-of-`repeat` milliseconds per page."""
+    timings = []
+    for html in pages:
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            parse(html)
+            best = min(best, time.perf_counter() - started)
+        timings.append(best * 1000)
+    return timings
+
+
+def report(label: str, pages: List[str], timings: List[float]):
+    total_mb = sum(len(html.encode('utf-8')) for html in pages) / 1e6
+    p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+    print(f"\n{label}")
+    print(f"   mean {statistics.mean(timings):.3f} ms  p50 {statistics.median(timings):.3f} ms  p95 {p95:.3f} ms")
+    print(f"   {total_mb / (sum(timings) / 1000):.1f} MB/s of page HTML")
+    return p95
+
+
+def html_parser_baseline(html: str):
+    parser = HTMLParser()
+    parser.feed(html)
+    parser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ProPublica page extraction')
+    parser.add_argument('--pages', type=int, default=200, help='Pages to time (cached pages first)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per page (the fastest is kept)')
+    parser.add_argument('--budget-ms', type=float, help='Fail if p95 ms per page exceeds this')
+    parser.add_argument('--baseline', action='store_true', help='Also time html.parser over whole pages')
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages)
+    if not pages:
+        print("❌ No pages to benchmark")
+        return 1
+
+    sizes = [len(html) for html in pages]
+    scanned = sum(scanned_bytes(html) for html in pages) / sum(sizes)
+    print(f"📄 {len(pages)} pages, mean {statistics.mean(sizes) / 1000:.0f} KB; "
+          f"{scanned:.1%} of bytes scanned before extraction stops")
+
+    p95 = report("extract_990_page", pages, time_pages(pages, extract_990_page, args.repeat))
+    if args.baseline:
+        report("html.parser (whole page, no handlers)", pages, time_pages(pages, html_parser_baseline, args.repeat))
+
+    if args.budget_ms is not None:
+        if p95 > args.budget_ms:
+            print(f"\n❌ p95 {p95:.3f} ms per page is over the {args.budget_ms} ms budget")
+            return 1
+        print(f"\n✅ p95 {p95:.3f} ms per page is within the {args.budget_ms} ms budget")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
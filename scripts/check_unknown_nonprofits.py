@@ -6,19 +6,25 @@ This script:
 1. Loads vendor data from the decoder CSV
 2. Loads IRS matches to identify already-verified nonprofits
 3. Identifies vendors classified as "Unknown" (not verified, no for-profit indicators)
-4. Searches ProPublica for each unknown vendor to see if they're actually nonprofits
+4. Searches ProPublica for the top unknown vendors by spending to see if they're
+   actually nonprofits (external_lookup.py: concurrent, rate limited, highest
+   spending first; answers are cached, so a rerun only searches new vendors)
 5. Reports findings
+
+Usage:
+    python scripts/check_unknown_nonprofits.py [--limit N] [--no-cache]
 """
 
+import argparse
+import asyncio
 import json
 import csv
-import time
-import re
 from pathlib import Path
-from urllib.request import urlopen, Request
-from urllib.error import HTTPError, URLError
 from urllib.parse import quote
 
+from external_lookup import HOST_LIMITS, LookupService, LookupSource
+from vendor_classifier import classify_vendors
+
 # Configuration
 SCRIPT_DIR = Path(__file__).parent
 REPO_ROOT = SCRIPT_DIR.parent
@@ -26,77 +32,56 @@ DECODER_CSV = REPO_ROOT / 'frontend/public/decoder/program_vendor_decoder_extern
 IRS_MATCHES_FILE = REPO_ROOT / 'frontend/public/data/vendor_irs_matches.json'
 OUTPUT_FILE = REPO_ROOT / 'frontend/public/data/unknown_nonprofit_discoveries.json'
 PROPUBLICA_SEARCH_BASE = 'https://projects.propublica.org/nonprofits/api/v2/search.json'
-RATE_LIMIT_DELAY = 1.0  # seconds between requests
+CHECK_COUNT = 100  # Unknown vendors to check, highest spending first
 
-# For-profit keywords (same as frontend logic)
-FOR_PROFIT_KEYWORDS = [
-    'INC', 'LLC', 'CORP', 'LTD', 'LP', 'CORPORATION', 'INCORPORATED',
-    'LIMITED', 'COMPANY', 'CO', 'PLLC', 'PC'
-]
+def propublica_search_url(vendor_name: str) -> str:
+    """ProPublica search URL for a vendor name."""
+    return f"{PROPUBLICA_SEARCH_BASE}?q={quote(vendor_name.strip())}"
 
-def classify_entity_type(vendor_name: str, is_irs_verified: bool) -> str:
+def parse_propublica_search(body: bytes) -> dict | None:
     """
-    Classify entity type using same logic as frontend.
-    Returns: 'nonprofit', 'for-profit', or 'unknown'
+    Read a ProPublica search response.
+    Returns organization data for the first (best) result, None if there are no results.
     """
-    if is_irs_verified:
-        return 'nonprofit'
-    
-    name_upper = vendor_name.upper()
-    
-    # Check for for-profit indicators
-    for keyword in FOR_PROFIT_KEYWORDS:
-        # Use word boundary matching
-        pattern = rf'\b{re.escape(keyword)}\b'
-        if re.search(pattern, name_upper):
-            return 'for-profit'
-    
-    return 'unknown'
+    data = json.loads(body.decode('utf-8'))
+
+    # Check if we got any results
+    if data.get('total_results', 0) > 0 and data.get('organizations'):
+        org = data['organizations'][0]
+        return {
+            'ein': org.get('ein'),
+            'name': org.get('name'),
+            'city': org.get('city'),
+            'state': org.get('state'),
+            'subsection': org.get('subsection'),
+            'ntee_code': org.get('ntee_code'),
+            'propublica_url': f"https://projects.propublica.org/nonprofits/organizations/{org.get('ein')}"
+        }
+
+    return None
 
-def search_propublica(vendor_name: str) -> dict | None:
+PROPUBLICA_SEARCH = LookupSource('propublica_search', propublica_search_url, parse_propublica_search)
+
+async def check_vendors(service: LookupService, vendors: list) -> dict:
     """
-    Search ProPublica for a vendor name.
-    Returns organization data if found, None otherwise.
+    Search ProPublica for each vendor, highest spending first.
+    Returns vendor_name -> LookupResult.
     """
-    # Clean vendor name for search
-    search_term = vendor_name.strip()
-    url = f"{PROPUBLICA_SEARCH_BASE}?q={quote(search_term)}"
-    
-    try:
-        req = Request(url, headers={
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
-        
-        with urlopen(req, timeout=15) as response:
-            data = json.loads(response.read().decode('utf-8'))
-            
-            # Check if we got any results
-            if data.get('total_results', 0) > 0 and data.get('organizations'):
-                # Return the first result (best match)
-                org = data['organizations'][0]
-                return {
-                    'ein': org.get('ein'),
-                    'name': org.get('name'),
-                    'city': org.get('city'),
-                    'state': org.get('state'),
-                    'subsection': org.get('subsection'),
-                    'ntee_code': org.get('ntee_code'),
-                    'propublica_url': f"https://projects.propublica.org/nonprofits/organizations/{org.get('ein')}"
-                }
-            
-            return None
-            
-    except HTTPError as e:
-        if e.code == 404:
-            return None
-        print(f"  ❌ HTTP Error {e.code}")
-        return None
-        
-    except (URLError, Exception) as e:
-        print(f"  ❌ Search failed: {e}")
-        return None
-
-def main():
+    amounts = {v['vendor_name']: v['total_amount'] for v in vendors}
+    results = {}
+    async for result in service.lookup_all(PROPUBLICA_SEARCH, amounts.items()):
+        results[result.query] = result
+        label = f"[{len(results)}/{len(amounts)}] {result.query:50} (${amounts[result.query]:>12,.0f})"
+        cached = " (cached)" if result.source == 'cache' else ""
+        if result.status == 'found':
+            print(f"{label} ✅ FOUND: {result.data['name']} (EIN: {result.data['ein']}){cached}")
+        elif result.status == 'not_found':
+            print(f"{label} ⚠️  Not found{cached}")
+        else:
+            print(f"{label} ❌ Search failed: {result.reason}")
+    return results
+
+def main(check_count: int = CHECK_COUNT, use_cache: bool = True):
     print("=" * 70)
     print("Unknown Entity Nonprofit Discovery Tool")
     print("=" * 70)
@@ -133,12 +118,10 @@ def main():
     
     # Classify vendors
     print("🔍 Classifying vendors...")
+    entity_types = classify_vendors(unique_vendors, irs_verified=irs_matches)
     unknown_vendors = []
     for vendor_name, total_amount in unique_vendors.items():
-        is_verified = vendor_name in irs_matches
-        entity_type = classify_entity_type(vendor_name, is_verified)
-        
-        if entity_type == 'unknown':
+        if entity_types[vendor_name] == 'unknown':
             unknown_vendors.append({
                 'vendor_name': vendor_name,
                 'total_amount': total_amount
@@ -151,40 +134,39 @@ def main():
     print(f"   Total spending: ${sum(v['total_amount'] for v in unknown_vendors):,.0f}")
     print()
     
-    # Ask user how many to check
-    print(f"How many unknown vendors would you like to check on ProPublica?")
-    print(f"(Checking all {len(unknown_vendors):,} would take ~{len(unknown_vendors) * RATE_LIMIT_DELAY / 60:.0f} minutes)")
+    check_count = min(check_count, len(unknown_vendors))
+    to_check = unknown_vendors[:check_count]
+
+    service = LookupService(use_cache=use_cache)
+    uncached = sum(1 for v in to_check if service.cached(PROPUBLICA_SEARCH, v['vendor_name']) is None)
+    rate = HOST_LIMITS['projects.propublica.org'].rate
+    print(f"🔍 Checking top {check_count} unknown vendors on ProPublica...")
+    print(f"   {check_count - uncached:,} answered from earlier runs; "
+          f"{uncached:,} to search (~{uncached / rate / 60:.0f} minutes)")
     print()
-    
+
+    try:
+        results = asyncio.run(check_vendors(service, to_check))
+    finally:
+        service.close()
+
+    # Report in spending order
     discoveries = []
     not_found = []
-    
-    # Check top 100 by default (can be changed)
-    check_count = min(100, len(unknown_vendors))
-    
-    print(f"🔍 Checking top {check_count} unknown vendors on ProPublica...")
-    print()
-    
-    for i, vendor in enumerate(unknown_vendors[:check_count], 1):
+    errors = []
+    for vendor in to_check:
         vendor_name = vendor['vendor_name']
-        total_amount = vendor['total_amount']
-        
-        print(f"[{i}/{check_count}] {vendor_name:50} (${total_amount:>12,.0f})", end="")
-        
-        result = search_propublica(vendor_name)
-        
-        if result:
-            print(f" ✅ FOUND: {result['name']} (EIN: {result['ein']})")
+        result = results[vendor_name]
+        if result.status == 'found':
             discoveries.append({
                 'vendor_name': vendor_name,
-                'total_amount': total_amount,
-                'propublica_data': result
+                'total_amount': vendor['total_amount'],
+                'propublica_data': result.data
             })
-        else:
-            print(" ⚠️  Not found")
+        elif result.status == 'not_found':
             not_found.append(vendor_name)
-        
-        time.sleep(RATE_LIMIT_DELAY)
+        else:
+            errors.append(vendor_name)
     
     print()
     print("=" * 70)
@@ -193,6 +175,8 @@ def main():
     print(f"Checked: {check_count:,} unknown vendors")
     print(f"Found on ProPublica: {len(discoveries):,} ({len(discoveries)/check_count*100:.1f}%)")
     print(f"Not found: {len(not_found):,} ({len(not_found)/check_count*100:.1f}%)")
+    if errors:
+        print(f"Failed (retried next run): {len(errors):,}")
     print()
     
     if discoveries:
@@ -210,7 +194,9 @@ def main():
         'discoveries_count': len(discoveries),
         'not_found_count': len(not_found),
         'discoveries': discoveries,
-        'not_found': not_found
+        'not_found': not_found,
+        'error_count': len(errors),
+        'errors': errors
     }
     
     with open(OUTPUT_FILE, 'w') as f:
@@ -219,5 +205,11 @@ def main():
     print(f"💾 Results saved to: {OUTPUT_FILE}")
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='Search ProPublica for unknown vendors that may be nonprofits')
+    parser.add_argument('--limit', type=int, default=CHECK_COUNT,
+                        help=f'Unknown vendors to check, highest spending first (default {CHECK_COUNT})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Search every vendor again instead of reusing earlier answers')
+    args = parser.parse_args()
+    main(check_count=args.limit, use_cache=not args.no_cache)
 
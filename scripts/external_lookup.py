@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Shared external lookups (ProPublica search, SAM.gov) for vendor discovery.
+
+check_unknown_nonprofits.py and identify_forprofit_vendors.py look up one
+vendor name at a time against outside services. This module runs those
+lookups for them:
+- concurrently, with a concurrency cap and token-bucket rate limit per host
+  (async_http.AsyncFetcher, one per host)
+- highest-spend vendors first: pending lookups wait in a priority queue
+- through a persistent result cache, one JSONL file per source under
+  data/http_cache/lookups. Matches are kept for FOUND_TTL_DAYS and "not
+  found" answers (negative caching) for NOT_FOUND_TTL_DAYS; failed lookups
+  are never cached, so the next run retries them
+
+A repeated discovery run only sends requests for new vendors and expired
+entries.
+
+Usage:
+    from external_lookup import LookupService, LookupSource
+
+    service = LookupService()
+    async for result in service.lookup_all(source, [(vendor_name, spend), ...]):
+        ...
+    service.close()
+"""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, FrozenSet, Iterable, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+from async_http import HTTP_CACHE_DIR, AsyncFetcher, FetchError
+
+# Paths
+LOOKUP_CACHE_DIR = HTTP_CACHE_DIR / "lookups"
+
+FOUND_TTL_DAYS = 90
+NOT_FOUND_TTL_DAYS = 30
+RETRIES = 3
+
+
+class HostLimit(NamedTuple):
+    """Politeness limits for one host."""
+    concurrency: int
+    rate: float  # sustained requests per second
+
+
+HOST_LIMITS = {
+    'projects.propublica.org': HostLimit(concurrency=2, rate=1.0),
+    'api.sam.gov': HostLimit(concurrency=2, rate=2.0),
+}
+DEFAULT_HOST_LIMIT = HostLimit(concurrency=2, rate=1.0)
+
+
+class LookupSource(NamedTuple):
+    """An external service that answers one query (a vendor name) per request."""
+    name: str  # Cache namespace, e.g. 'propublica_search'
+    build_url: Callable[[str], str]
+    parse: Callable[[bytes], Optional[Dict]]  # Response body -> match, or None if no match
+    not_found_statuses: FrozenSet[int] = frozenset({404})
+
+
+class LookupResult(NamedTuple):
+    query: str
+    status: str  # 'found', 'not_found' or 'error'
+    data: Optional[Dict]
+    source: str  # 'cache' or 'network'
+    reason: str = ''
+
+
+class LookupCache:
+    """
+    Results of one source, appended to a JSONL file as they arrive.
+
+    The last line for a query wins. A torn final line (interrupted run) is
+    cut off on load, and the file is rewritten without superseded lines when
+    they make up most of it.
+    """
+
+    def __init__(self, source_name: str, directory: Path = LOOKUP_CACHE_DIR):
+        self.path = Path(directory) / f'{source_name}.jsonl'
+        self.entries: Dict[str, Dict] = {}
+        self._lines = 0
+        self._file = None
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        good_size = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self.entries[entry['query']] = entry
+                self._lines += 1
+                good_size += len(line)
+        if good_size < self.path.stat().st_size:
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_size)
+
+    def get(self, query: str, now: Optional[float] = None) -> Optional[Dict]:
+        """Unexpired entry for `query` ({'query', 'status', 'data', 'fetched_at'}), or None."""
+        entry = self.entries.get(query)
+        if entry is None:
+            return None
+        ttl_days = FOUND_TTL_DAYS if entry['status'] == 'found' else NOT_FOUND_TTL_DAYS
+        if (now or time.time()) - entry['fetched_at'] >= ttl_days * 86400:
+            return None
+        return entry
+
+    def put(self, query: str, status: str, data: Optional[Dict]):
+        """Record a 'found' or 'not_found' answer."""
+        entry = {'query': query, 'status': status, 'data': data, 'fetched_at': time.time()}
+        self.entries[query] = entry
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+        self._lines += 1
+
+    def close(self):
+        """Close the file, compacting it if most lines are superseded."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._lines > 2 * len(self.entries) + 100:
+            tmp_path = self.path.with_suffix('.jsonl.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for entry in self.entries.values():
+                    f.write(json.dumps(entry) + '\n')
+            tmp_path.replace(self.path)
+            self._lines = len(self.entries)
+
+
+class LookupService:
+    """Runs lookups against any number of sources with per-host limits and caching."""
+
+    def __init__(self,
+                 host_limits: Optional[Dict[str, HostLimit]] = None,
+                 retries: int = RETRIES,
+                 cache_dir: Path = LOOKUP_CACHE_DIR,
+                 use_cache: bool = True):
+        """
+        Args:
+            host_limits: hostname -> HostLimit (defaults to HOST_LIMITS)
+            retries: Extra attempts after a retriable failure (429, 5xx, connection errors)
+            cache_dir: Directory of the per-source result caches
+            use_cache: Read cached results (new results are cached either way)
+        """
+        self.host_limits = dict(HOST_LIMITS if host_limits is None else host_limits)
+        self.retries = retries
+        self.cache_dir = Path(cache_dir)
+        self.use_cache = use_cache
+        self._fetchers: Dict[str, AsyncFetcher] = {}
+        self._caches: Dict[str, LookupCache] = {}
+        self.stats = {'cache': 0, 'network': 0, 'errors': 0}
+
+    def _fetcher(self, url: str) -> AsyncFetcher:
+        """The fetcher (and so the rate limit) for `url`'s host."""
+        host = urlsplit(url).hostname or ''
+        if host not in self._fetchers:
+            limit = self.host_limits.get(host, DEFAULT_HOST_LIMIT)
+            self._fetchers[host] = AsyncFetcher(concurrency=limit.concurrency, rate=limit.rate,
+                                                retries=self.retries)
+        return self._fetchers[host]
+
+    def cache(self, source: LookupSource) -> LookupCache:
+        if source.name not in self._caches:
+            self._caches[source.name] = LookupCache(source.name, self.cache_dir)
+        return self._caches[source.name]
+
+    def cached(self, source: LookupSource, query: str) -> Optional[LookupResult]:
+        """Cached result for `query`, or None if it has to be looked up."""
+        if not self.use_cache:
+            return None
+        entry = self.cache(source).get(query)
+        if entry is None:
+            return None
+        self.stats['cache'] += 1
+        return LookupResult(query, entry['status'], entry['data'], 'cache')
+
+    async def lookup(self, source: LookupSource, query: str) -> LookupResult:
+        """Look up one query, from the cache if possible."""
+        result = self.cached(source, query)
+        if result is not None:
+            return result
+
+        url = source.build_url(query)
+        try:
+            response = await self._fetcher(url).fetch(url)
+        except FetchError as e:
+            self.stats['errors'] += 1
+            return LookupResult(query, 'error', None, 'network', e.reason)
+        except Exception as e:
+            self.stats['errors'] += 1
+            return LookupResult(query, 'error', None, 'network', f"{type(e).__name__}: {e}")
+
+        if response.status in source.not_found_statuses:
+            data = None
+        elif response.status != 200:
+            self.stats['errors'] += 1
+            return LookupResult(query, 'error', None, 'network', f"HTTP {response.status}")
+        else:
+            try:
+                data = source.parse(response.body)
+            except Exception as e:
+                # Parsers index into the JSON, so an unexpected shape raises
+                # KeyError/TypeError as well as ValueError
+                self.stats['errors'] += 1
+                return LookupResult(query, 'error', None, 'network', f"Bad response: {type(e).__name__}: {e}")
+
+        status = 'found' if data is not None else 'not_found'
+        self.cache(source).put(query, status, data)
+        self.stats['network'] += 1
+        return LookupResult(query, status, data, 'network')
+
+    async def lookup_all(self, source: LookupSource,
+                         items: Iterable[Tuple[str, float]]) -> AsyncIterator[LookupResult]:
+        """
+        Look up many queries, yielding results as they complete.
+
+        Args:
+            source: Service to query
+            items: (query, priority) pairs; higher priority (vendor spend) is
+                looked up first. Duplicate queries are looked up once.
+
+        Cached results are yielded first, then network results in roughly
+        priority order (requests run concurrently, up to the host's limit).
+        """
+        pending: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        seen = set()
+        for order, (query, priority) in enumerate(items):
+            if query in seen:
+                continue
+            seen.add(query)
+            result = self.cached(source, query)
+            if result is not None:
+                yield result
+            else:
+                pending.put_nowait((-priority, order, query))
+
+        if pending.empty():
+            return
+
+        results: asyncio.Queue = asyncio.Queue()
+        workers_count = min(pending.qsize(), self._fetcher(source.build_url('')).concurrency)
+
+        async def worker():
+            # Every dequeued query must put a result, or the consumer below
+            # waits forever
+            while not pending.empty():
+                _, _, query = pending.get_nowait()
+                try:
+                    result = await self.lookup(source, query)
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    result = LookupResult(query, 'error', None, 'network', f"{type(e).__name__}: {e}")
+                results.put_nowait(result)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(workers_count)]
+        try:
+            for _ in range(pending.qsize()):
+                yield await results.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def close(self):
+        """Flush and close the result caches."""
+        for cache in self._caches.values():
+            cache.close()
@@ -16,6 +16,8 @@ from pathlib import Path
 from datetime import datetime
 from typing import List, Dict
 
+from transfer_payments import iter_rows, contains
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -76,23 +78,25 @@ def extract_transfer_payments_from_file(csv_file: Path) -> List[Dict]:
     print(f"   Processing: {csv_file.name}...", end=" ")
     
     try:
-        with open(csv_file, 'r', encoding='utf-8', errors='ignore') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            
-            for row in reader:
-                # Filter for TRANSFER PAYMENTS category only
-                category = row.get('CATEGORY_NAME', '')
-                if category and 'TRANSFER' in category.upper():
-                    # Extract all 14 CARDINAL fields
-                    record = {}
-                    for cardinal_field, output_field in zip(CARDINAL_FIELDS, OUTPUT_FIELDS):
-                        value = row.get(cardinal_field, '')
-                        # Clean up None values and whitespace
-                        record[output_field] = value.strip() if value else ''
-                    
-                    records.append(record)
-                    count += 1
+        # Filter for TRANSFER PAYMENTS category only; the predicate is checked
+        # on the raw bytes so non-transfer rows are never decoded or parsed
+        rows = iter_rows(
+            csv_file,
+            columns=CARDINAL_FIELDS,
+            where=[contains('CATEGORY_NAME', 'TRANSFER', ignore_case=True)],
+            errors='ignore',
+        )
+        count = 0
+
+        for row in rows:
+            # Extract all 14 CARDINAL fields
+            record = {}
+            for cardinal_field, output_field in zip(CARDINAL_FIELDS, OUTPUT_FIELDS):
+                # Clean up whitespace
+                record[output_field] = row[cardinal_field].strip()
+
+            records.append(record)
+            count += 1
         
         print(f"✓ ({count:,} transfer payments)")
         
@@ -3,127 +3,270 @@
 Fetch IRS Form 990 filing data from ProPublica Nonprofit Explorer website.
 
 This script uses a hybrid approach:
-1. Loads verified nonprofit EINs from vendor_irs_matches.json
+1. Loads verified nonprofit EINs from vendor_irs_matches.json and picks the
+   ones due for a refresh (filing_schedule.py: new EINs, EINs past the TTL,
+   EINs in filing season); everyone else keeps their existing data
+   (with --changed-only, just the matches that are new or changed since the
+   last match_vendors_to_irs.py run; with --full, every EIN)
 2. First tries ProPublica API for basic data
 3. Falls back to scraping ProPublica website HTML to get complete filing list with PDF links
 4. Saves complete filing data including tax years, PDF URLs, and filing dates
 
+Pages are fetched concurrently (async_http.AsyncFetcher): a few requests in
+flight, a token-bucket rate limit, retries with backoff, and an on-disk cache
+revalidated with ETag/Last-Modified. Each EIN is fetched once however many
+vendor names matched it. Results are appended to PROGRESS_FILE as they
+arrive, so an interrupted run resumes where it stopped.
+
 ProPublica API: https://projects.propublica.org/nonprofits/api
 ProPublica Website: https://projects.propublica.org/nonprofits/organizations/{EIN}
+
+Usage:
+    python scripts/fetch_990_links.py [--full | --changed-only] [--ttl-days D]
+                                      [--concurrency N] [--rate R]
 """
 
+import argparse
+import asyncio
 import json
 import time
 import re
+from datetime import datetime
 from pathlib import Path
-from urllib.request import urlopen, Request
-from urllib.error import HTTPError, URLError
-from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from html import unescape
+
+from async_http import AsyncFetcher, FetchError, HttpCache
+from filing_schedule import (DEFAULT_TTL_DAYS, SEASON_TTL_DAYS, fiscal_year_end_month, load_refresh_state,
+                             record_fetch, refresh_reason, save_refresh_state)
 
 # Configuration
 IRS_MATCHES_FILE = Path('frontend/public/data/vendor_irs_matches.json')
 OUTPUT_FILE = Path('frontend/public/data/form_990_links.json')
+MATCH_CHANGES_FILE = Path('data/irs/vendor_irs_match_changes.json')
+PROGRESS_FILE = Path('data/irs/form_990_links.progress.jsonl')
+REFRESH_STATE_FILE = Path('data/irs/form_990_refresh_state.json')
+HTTP_CACHE_DIR = Path('data/http_cache/propublica')
 PROPUBLICA_API_BASE = 'https://projects.propublica.org/nonprofits/api/v2'
 PROPUBLICA_WEB_BASE = 'https://projects.propublica.org/nonprofits/organizations'
-RATE_LIMIT_DELAY = 0.8  # seconds between requests (be nice to ProPublica)
+RATE_LIMIT = 1.25  # sustained requests per second (be nice to ProPublica)
+CONCURRENCY = 4  # requests in flight
+RETRIES = 3
+
+
+# ============================================================================
+# Page extraction
+# ============================================================================
+
+PROPUBLICA_SITE = 'https://projects.propublica.org'
+MAX_FILINGS = 5  # Keep only the most recent filings
+FORM_TYPES = {'990': 0, '990-EZ': 1, '990-PF': 2}
+
+# One tokenizer for everything read from a page (name, filings, links).
+# Filings come in two layouts, both read from the same token stream:
+# - filing sections (what ProPublica serves today):
+#     <section class="single-filing-period" id='filing2024'>
+#     <span class="filed-on">Filed on Sept. 30, 2025</span>, <h5>990</h5>,
+#     <a href="/nonprofits/organizations/{EIN}/{object_id}/full">
+# - headings: <h3>/<h4> "Fiscal Year Ending Dec. 2024", then "Filed on"
+#   text, a form-type text node and a download-filing/PDF link
+# If the heading layout yields any filing it wins, as it always has.
+PAGE_TOKEN_RE = re.compile(r"""
+    <h1[^>]*>(?P<name>[^<]+)</h1>
+  | id=['"]filing(?P<section>\d{4})['"]
+  | <(?P<heading>[hH][34])\b[^>]*(?=>)
+  | <[aA]\b[^>]*?\s[hH][rR][eE][fF]\s*=\s*(?:"(?P<href_dq>[^"]*)"|'(?P<href_sq>[^']*)'|(?P<href_uq>[^\s>]+))
+  | Filed\ on\s+[^<]*
+  | >(?P<form>\s*(?:Form\ )?990(?:-EZ|-PF)?\s*)(?=<)
+""", re.VERBOSE)
+HEADING_END_RE = re.compile(r'</h[34]\s*>', re.IGNORECASE)
+TAG_RE = re.compile(r'<[^>]*>')
+YEAR_RE = re.compile(r'\d{4}')
+FILED_DATE_RE = re.compile(r'Filed on\s+([A-Za-z]+\.?\s+\d{1,2},\s+\d{4})')
+FILED_WORD_RE = re.compile(r'Filed on\s+(.+?)(?:\s|$)')
+VIEW_FILING_RE = re.compile(r'/nonprofits/organizations/\d+/\d+/full')
+DOWNLOAD_FILING_RE = re.compile(r'/nonprofits/download-filing\?.+')
+
+
+def _section_filing(section: Dict) -> Dict:
+    """Filing dict for a closed filing section."""
+    forms = section['forms']
+    filing = {
+        'tax_year': section['tax_year'],
+        'form_type': 1 if '990-EZ' in forms else 2 if '990-PF' in forms else 0,  # Default to 990
+    }
+    if section['filed_date']:
+        filing['filed_date'] = section['filed_date']
+    if section['view_url']:
+        # The filing page is where users can view/download; use it as the pdf_url
+        filing['filing_url'] = PROPUBLICA_SITE + section['view_url']
+        filing['pdf_url'] = filing['filing_url']
+    if section['download_url']:
+        # Direct PDF download link (rare)
+        filing['pdf_url'] = PROPUBLICA_SITE + section['download_url']
+    return filing
+
+
+def extract_990_page(html: str, max_filings: int = MAX_FILINGS) -> Tuple[Optional[str], List[Dict]]:
+    """
+    Read the organization name and most recent filings from a ProPublica page
+    in one pass.
 
+    Pages list filing sections newest first, so scanning stops at the section
+    after the `max_filings`-th once the name is known. If the years seen so
+    far are out of order the whole page is read instead. A year that appears
+    in more than one section repeats the data of its first section.
 
-class ProPublicaFilingParser(HTMLParser):
+    Returns:
+        (name from the page's <h1> or None, filings sorted newest first)
     """
-    HTML parser to extract Form 990 filing information from ProPublica nonprofit pages.
+    name = None
+
+    # Filing-section layout
+    section_years: List[int] = []
+    first_sections: Dict[int, Dict] = {}
+    section = None
+    ordered = True
+
+    # Heading layout
+    heading_filings: List[Dict] = []
+    current = {}
+
+    for m in PAGE_TOKEN_RE.finditer(html):
+        kind = m.lastgroup
+        text = m.group(0)
+
+        if kind == 'name':
+            if name is None:
+                name = m.group('name').strip()
+
+        elif kind == 'section':
+            year = int(m.group('section'))
+            if section_years and year > section_years[-1]:
+                ordered = False
+            if (ordered and len(section_years) >= max_filings and name is not None
+                    and not heading_filings and not current):
+                break
+            section_years.append(year)
+            # A repeated year keeps its first section's data
+            section = None
+            if year not in first_sections:
+                section = first_sections[year] = {
+                    'tax_year': year, 'forms': set(), 'filed_date': None,
+                    'view_url': None, 'download_url': None,
+                }
+
+        elif kind == 'heading':
+            start = m.end() + 1
+            end = HEADING_END_RE.search(html, start)
+            for segment in TAG_RE.split(html[start:end.start() if end else len(html)]):
+                segment = unescape(segment).strip()
+                if 'Fiscal Year Ending' in segment:
+                    year = YEAR_RE.search(segment)
+                    if year:
+                        if current:
+                            heading_filings.append(current)
+                        current = {'tax_year': int(year.group(0))}
+                    break
+
+        elif kind in ('href_dq', 'href_sq', 'href_uq'):
+            href = m.group(kind)
+            if section is not None and text.endswith(f'href="{href}"'):
+                if section['view_url'] is None and VIEW_FILING_RE.fullmatch(href):
+                    section['view_url'] = href
+                if section['download_url'] is None and DOWNLOAD_FILING_RE.fullmatch(href):
+                    section['download_url'] = href
+            if current:
+                href = unescape(href)
+                # PDF links look like: /nonprofits/download-filing?path=...
+                if 'download-filing' in href or '.pdf' in href.lower():
+                    current['pdf_url'] = PROPUBLICA_SITE + href if href.startswith('/') else href
+
+        elif kind == 'form':
+            form = m.group('form')
+            if section is not None and form in FORM_TYPES and html.startswith('<h5', m.start() - 3) \
+                    and html.startswith('</h5>', m.end()):
+                section['forms'].add(form)
+            if current:
+                form = unescape(form).strip().replace('Form ', '')
+                if form in FORM_TYPES:
+                    current['form_type'] = FORM_TYPES[form]
+
+        else:  # "Filed on ..." text
+            if section is not None and section['filed_date'] is None:
+                filed = FILED_DATE_RE.search(text)
+                if filed:
+                    section['filed_date'] = filed.group(1)
+            if current:
+                filed = FILED_WORD_RE.search(unescape(text).rstrip())
+                if filed:
+                    current['filed_date'] = filed.group(1).strip()
+
+    if current:
+        heading_filings.append(current)
+
+    if heading_filings:
+        filings = heading_filings
+    else:
+        filings = [_section_filing(first_sections[year]) for year in section_years]
+
+    filings = sorted(filings, key=lambda x: x.get('tax_year', 0), reverse=True)[:max_filings]
+    return name, filings
+
+
+def parse_990_page(html: str, ein: str, vendor_name: str, url: str) -> dict:
+    """
+    Extract 990 filing data from a ProPublica organization page.
+
+    Args:
+        html: Page HTML
+        ein: Employer Identification Number (9 digits, no hyphens)
+        vendor_name: Name of the vendor/nonprofit (used if the page has no <h1>)
+        url: Page URL
 
-    Extracts:
-    - Tax years (fiscal year ending)
-    - Filing dates (when the form was filed)
-    - PDF download links
-    - Form types (990, 990-EZ, 990-PF)
+    Returns:
+        Dictionary with 990 filing data
     """
+    name, filings = extract_990_page(html)
+    org_name = name if name is not None else vendor_name
 
-    def __init__(self):
-        super().__init__()
-        self.filings = []
-        self.current_filing = {}
-        self.in_filing_section = False
-        self.in_fiscal_year = False
-        self.in_filed_date = False
-        self.capture_text = False
-
-    def handle_starttag(self, tag, attrs):
-        attrs_dict = dict(attrs)
-
-        # Detect fiscal year heading (e.g., "Fiscal Year Ending Dec. 2024")
-        if tag == 'h3' or tag == 'h4':
-            self.in_fiscal_year = True
-            self.capture_text = True
-
-        # Detect "Filed on" text
-        if tag == 'p' or tag == 'div':
-            # Check if this might contain filing date
-            pass
-
-        # Detect PDF download links
-        if tag == 'a':
-            href = attrs_dict.get('href', '')
-            # ProPublica PDF links look like: /nonprofits/download-filing?path=...
-            if 'download-filing' in href or '.pdf' in href.lower():
-                if self.current_filing:
-                    self.current_filing['pdf_url'] = f"https://projects.propublica.org{href}" if href.startswith('/') else href
-
-    def handle_data(self, data):
-        data = data.strip()
-        if not data:
-            return
-
-        # Extract fiscal year (e.g., "Fiscal Year Ending Dec. 2024")
-        if self.in_fiscal_year and 'Fiscal Year Ending' in data:
-            match = re.search(r'(\d{4})', data)
-            if match:
-                tax_year = int(match.group(1))
-                # Save previous filing if exists
-                if self.current_filing and 'tax_year' in self.current_filing:
-                    self.filings.append(self.current_filing)
-                # Start new filing
-                self.current_filing = {'tax_year': tax_year}
-            self.in_fiscal_year = False
-
-        # Extract filing date (e.g., "Filed on Sept. 30, 2025")
-        if 'Filed on' in data:
-            # Extract the date after "Filed on"
-            date_match = re.search(r'Filed on\s+(.+?)(?:\s|$)', data)
-            if date_match and self.current_filing:
-                self.current_filing['filed_date'] = date_match.group(1).strip()
-
-        # Extract form type from headings like "990" or "990-EZ"
-        if data in ['990', '990-EZ', '990-PF', 'Form 990', 'Form 990-EZ', 'Form 990-PF']:
-            if self.current_filing:
-                form_type = data.replace('Form ', '')
-                if form_type == '990':
-                    self.current_filing['form_type'] = 0
-                elif form_type == '990-EZ':
-                    self.current_filing['form_type'] = 1
-                elif form_type == '990-PF':
-                    self.current_filing['form_type'] = 2
-
-    def handle_endtag(self, tag):
-        if tag in ['h3', 'h4']:
-            self.in_fiscal_year = False
-            self.capture_text = False
-
-    def get_filings(self):
-        # Add the last filing if exists
-        if self.current_filing and 'tax_year' in self.current_filing:
-            self.filings.append(self.current_filing)
-        return self.filings
+    return {
+        'ein': ein,
+        'name': org_name,
+        'propublica_url': url,
+        'filings': filings,
+        'filings_count': len(filings),
+        'data_source': 'website_scrape'
+    }
 
-def scrape_990_filings_from_website(ein: str, vendor_name: str) -> dict | None:
+
+async def fetch_990_page(fetcher: AsyncFetcher, ein: str,
+                         base_url: str = PROPUBLICA_WEB_BASE) -> Tuple[str, Optional[str]]:
     """
-    Scrape 990 filing data from ProPublica website HTML.
+    Fetch an organization's ProPublica page.
 
     This is more reliable than the API because:
     1. Website has the most recent filings (API lags behind)
     2. Website has actual PDF download links (API often has null)
     3. Website shows filing dates (API only has tax years)
 
+    Returns:
+        (page URL, HTML or None if ProPublica has no page for the EIN)
+
+    Raises:
+        FetchError: the page could not be fetched after retries
+    """
+    url = f"{base_url}/{ein}"
+    response = await fetcher.fetch(url)
+    if response.status != 200:
+        return url, None
+    return url, response.text()
+
+
+def scrape_990_filings_from_website(ein: str, vendor_name: str) -> dict | None:
+    """
+    Scrape 990 filing data for a single EIN (no cache, no rate limit).
+
     Args:
         ein: Employer Identification Number (9 digits, no hyphens)
         vendor_name: Name of the vendor/nonprofit
@@ -132,139 +275,178 @@ def scrape_990_filings_from_website(ein: str, vendor_name: str) -> dict | None:
         Dictionary with 990 filing data, or None if not found
     """
     ein_clean = ein.replace('-', '')
-    url = f"{PROPUBLICA_WEB_BASE}/{ein_clean}"
+
+    async def fetch_one():
+        return await fetch_990_page(AsyncFetcher(concurrency=1, rate=0), ein_clean)
 
     try:
-        # Add User-Agent header to avoid being blocked
-        req = Request(url, headers={
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
-
-        with urlopen(req, timeout=15) as response:
-            html = response.read().decode('utf-8')
-
-            # Parse HTML to extract filing information
-            parser = ProPublicaFilingParser()
-            parser.feed(html)
-            filings = parser.get_filings()
-
-            # If parser didn't find filings, try regex fallback
-            if not filings:
-                filings = extract_filings_with_regex(html)
-
-            # Extract organization name from HTML
-            org_name = vendor_name
-            name_match = re.search(r'<h1[^>]*>([^<]+)</h1>', html)
-            if name_match:
-                org_name = name_match.group(1).strip()
-
-            # Keep only last 5 years of filings
-            filings = sorted(filings, key=lambda x: x.get('tax_year', 0), reverse=True)[:5]
-
-            return {
-                'ein': ein_clean,
-                'name': org_name,
-                'propublica_url': url,
-                'filings': filings,
-                'filings_count': len(filings),
-                'data_source': 'website_scrape'
-            }
-
-    except HTTPError as e:
-        if e.code == 404:
-            print(f"⚠️  Not found on ProPublica website")
-        else:
-            print(f"❌ HTTP Error {e.code}")
+        url, html = asyncio.run(fetch_one())
+    except FetchError as e:
+        print(f"❌ Scrape failed: {e.reason}")
         return None
 
-    except (URLError, Exception) as e:
-        print(f"❌ Scrape failed: {e}")
+    if html is None:
+        print(f"⚠️  Not found on ProPublica website")
         return None
+    return parse_990_page(html, ein_clean, vendor_name, url)
 
 
-def extract_filings_with_regex(html: str) -> list:
+def load_progress(key: Dict, path: Path = PROGRESS_FILE) -> Dict[str, Dict]:
     """
-    Extract filings using regex by finding fiscal year sections.
+    Read per-vendor results appended by an earlier, interrupted run.
 
-    ProPublica's HTML structure:
-    - Each filing starts with <section class="single-filing-period" id='filing2024'>
-    - Year is in <div class="year-label">2024</div>
-    - Filing date is in <span class="filed-on">Filed on Sept. 30, 2025</span>
-    - View Filing link: <a href="/nonprofits/organizations/{EIN}/{object_id}/full">
+    A torn final line is cut off so that new results can be appended after
+    the last complete one. Results recorded under a different key (another
+    ProPublica base URL) are ignored.
 
-    The sections are large and contain nested sections, so we need to be careful
-    about matching the right content for each filing year.
+    Returns:
+        vendor_name -> {'ein', 'status', 'data'}
     """
-    filings = []
-
-    # Strategy: Find all filing IDs first, then extract data for each
-    filing_ids = re.findall(r'id=[\'"]filing(\d{4})[\'"]', html)
-
-    for tax_year_str in filing_ids:
-        tax_year = int(tax_year_str)
-
-        # Find the section for this specific year
-        # We'll extract a chunk of HTML starting from this filing ID
-        pattern = rf'id=[\'"]filing{tax_year}[\'"].*?(?=id=[\'"]filing\d{{4}}[\'"]|$)'
-        match = re.search(pattern, html, re.DOTALL)
-
-        if not match:
-            continue
-
-        section_html = match.group(0)
+    done: Dict[str, Dict] = {}
+    if not path.exists():
+        return done
+
+    with open(path, 'rb') as f:
+        try:
+            if json.loads(f.readline()) != key:
+                return done
+        except ValueError:
+            return done
+
+        good_size = f.tell()
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            done[entry['vendor']] = entry
+            good_size += len(line)
+
+    if good_size < path.stat().st_size:
+        with open(path, 'r+b') as f:
+            f.truncate(good_size)
+    return done
+
+
+async def fetch_990_filings(fetcher: AsyncFetcher, ein: str, vendor_names: List[str],
+                            base_url: str = PROPUBLICA_WEB_BASE) -> Dict[str, Dict]:
+    """
+    Fetch one EIN's page and parse it for every vendor matched to that EIN.
 
-        filing = {
-            'tax_year': tax_year,
-            'form_type': 0  # Default to 990
+    Returns:
+        vendor_name -> {'ein', 'status', 'data'} where status is 'found',
+        'no_filings', 'not_found' (no ProPublica page) or 'error'
+    """
+    try:
+        url, html = await fetch_990_page(fetcher, ein, base_url)
+    except FetchError as e:
+        return {v: {'ein': ein, 'status': 'error', 'data': None, 'reason': e.reason} for v in vendor_names}
+
+    if html is None:
+        return {v: {'ein': ein, 'status': 'not_found', 'data': None} for v in vendor_names}
+
+    results = {}
+    for vendor_name in vendor_names:
+        data = parse_990_page(html, ein, vendor_name, url)
+        results[vendor_name] = {
+            'ein': ein,
+            'status': 'found' if data['filings_count'] > 0 else 'no_filings',
+            'data': data,
         }
+    return results
 
-        # Extract filing date (month may or may not have a period)
-        filed_date_match = re.search(r'Filed on\s+([A-Za-z]+\.?\s+\d{1,2},\s+\d{4})', section_html)
-        if filed_date_match:
-            filing['filed_date'] = filed_date_match.group(1)
 
-        # Look for View Filing link
-        view_filing_match = re.search(r'href="(/nonprofits/organizations/\d+/\d+/full)"', section_html)
-        if view_filing_match:
-            filing['filing_url'] = f"https://projects.propublica.org{view_filing_match.group(1)}"
-            # Use the filing page URL as the pdf_url (it's not a direct PDF, but it's where users can view/download)
-            filing['pdf_url'] = filing['filing_url']
+async def fetch_all(irs_matches: Dict[str, Dict], done: Dict[str, Dict], fetcher: AsyncFetcher,
+                    progress, base_url: str = PROPUBLICA_WEB_BASE) -> Dict[str, Dict]:
+    """
+    Fetch every vendor not already in `done`, one request per distinct EIN.
 
-        # Try to find direct PDF download link (rare, but check anyway)
-        pdf_match = re.search(r'href="(/nonprofits/download-filing\?[^"]+)"', section_html)
-        if pdf_match:
-            filing['pdf_url'] = f"https://projects.propublica.org{pdf_match.group(1)}"
+    Each finished EIN is appended to `progress` (one line per vendor) as it
+    completes.
+    """
+    vendors_by_ein: Dict[str, List[str]] = {}
+    for vendor_name, irs_data in irs_matches.items():
+        if vendor_name not in done:
+            vendors_by_ein.setdefault(irs_data['ein'].replace('-', ''), []).append(vendor_name)
 
-        # Detect form type from the <h5> heading
-        if re.search(r'<h5>990-EZ</h5>', section_html):
-            filing['form_type'] = 1
-        elif re.search(r'<h5>990-PF</h5>', section_html):
-            filing['form_type'] = 2
-        elif re.search(r'<h5>990</h5>', section_html):
-            filing['form_type'] = 0
+    total = len(irs_matches)
+    counts = {'found': 0, 'no_filings': 0, 'not_found': 0, 'error': 0}
+    for entry in done.values():
+        counts[entry['status']] += 1
 
-        filings.append(filing)
+    start_time = time.time()
+    tasks = [asyncio.ensure_future(fetch_990_filings(fetcher, ein, vendor_names, base_url))
+             for ein, vendor_names in vendors_by_ein.items()]
+
+    for finished, task in enumerate(asyncio.as_completed(tasks), 1):
+        results = await task
+        for vendor_name, entry in results.items():
+            done[vendor_name] = entry
+            counts[entry['status']] += 1
+            progress.write(json.dumps({'vendor': vendor_name, **entry}) + '\n')
+
+            label = f"[{len(done)}/{total}] {vendor_name[:50]:<50} (EIN: {entry['ein']})"
+            if entry['status'] == 'found':
+                # Show filing years found
+                years = [str(f.get('tax_year', '?')) for f in entry['data']['filings']]
+                print(f"{label} ✅ {entry['data']['filings_count']} filing(s): {', '.join(years)}")
+            elif entry['status'] == 'no_filings':
+                print(f"{label} ⚠️  No filings")
+            elif entry['status'] == 'not_found':
+                print(f"{label} ⚠️  Not found on ProPublica website")
+            else:
+                print(f"{label} ❌ Scrape failed: {entry['reason']}")
+        progress.flush()
+
+        # Progress indicator every 50 organizations
+        if finished % 50 == 0:
+            elapsed = time.time() - start_time
+            rate = finished / elapsed
+            remaining = (len(tasks) - finished) / rate if rate > 0 else 0
+            print(f"\n📊 Progress: {len(done)}/{total} ({len(done)/total*100:.1f}%) - "
+                  f"Found: {counts['found']}, No filings: {counts['no_filings']}, "
+                  f"Not found: {counts['not_found']}, Errors: {counts['error']}")
+            print(f"   ⏱️  Elapsed: {elapsed/60:.1f}m, Estimated remaining: {remaining/60:.1f}m\n")
+
+    return done
 
-    return filings
+def same_ein(data: Optional[Dict], ein: str) -> bool:
+    """Whether saved 990 data belongs to `ein` (hyphens ignored)."""
+    return bool(data) and str(data.get('ein', '')).replace('-', '') == ein.replace('-', '')
 
+def save_output(form_990_data: Dict[str, Dict]):
+    """Write form_990_links.json."""
+    print(f"💾 Saving results to: {OUTPUT_FILE}")
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(OUTPUT_FILE, 'w') as f:
+        json.dump(form_990_data, f, indent=2)
 
-def fetch_990_filings_hybrid(ein: str, vendor_name: str) -> dict | None:
+def main(changed_only: bool = False,
+         full: bool = False,
+         ttl_days: float = DEFAULT_TTL_DAYS,
+         season_ttl_days: float = SEASON_TTL_DAYS,
+         concurrency: int = CONCURRENCY,
+         rate: float = RATE_LIMIT,
+         retries: int = RETRIES,
+         base_url: str = PROPUBLICA_WEB_BASE,
+         use_cache: bool = True):
     """
-    Hybrid approach: Try API first (fast), fall back to website scraping (complete).
+    Main execution function.
 
     Args:
-        ein: Employer Identification Number (9 digits, no hyphens)
-        vendor_name: Name of the vendor/nonprofit
-
-    Returns:
-        Dictionary with 990 filing data, or None if not found
+        changed_only: Only fetch vendors listed as new/changed in MATCH_CHANGES_FILE
+                      and keep the existing 990 data for everyone else
+        full: Fetch every EIN regardless of the refresh schedule
+        ttl_days: Re-fetch EINs last fetched longer ago than this
+        season_ttl_days: Re-fetch EINs in filing season last fetched longer ago than this
+        concurrency: Most requests in flight at once
+        rate: Sustained requests per second
+        retries: Retries per page for connection errors, 429 and 5xx
+        base_url: ProPublica organization page base URL (override for testing)
+        use_cache: Revalidate cached pages instead of downloading them again
     """
-    # Always use website scraping for most complete and up-to-date data
-    # The API is often incomplete (missing PDFs, missing recent filings)
-    return scrape_990_filings_from_website(ein, vendor_name)
-
-def main():
-    """Main execution function."""
     print("=" * 80)
     print("IRS Form 990 Filing Data Fetcher (Hybrid Website Scraper)")
     print("=" * 80)
@@ -278,57 +460,130 @@ def main():
     with open(IRS_MATCHES_FILE, 'r') as f:
         irs_matches = json.load(f)
 
-    total_vendors = len(irs_matches)
-    print(f"✅ Loaded {total_vendors:,} verified nonprofits")
+    print(f"✅ Loaded {len(irs_matches):,} verified nonprofits")
     print()
 
-    # Fetch 990 data for each nonprofit
+    existing = {}
+    if OUTPUT_FILE.exists():
+        with open(OUTPUT_FILE, 'r') as f:
+            existing = json.load(f)
+    refresh_state = load_refresh_state(REFRESH_STATE_FILE)
+    now = datetime.now()
+
     form_990_data = {}
-    success_count = 0
-    not_found_count = 0
-    error_count = 0
+    if changed_only:
+        print(f"📂 Loading match changes from: {MATCH_CHANGES_FILE}")
+        with open(MATCH_CHANGES_FILE, 'r') as f:
+            changes = json.load(f)
+        refresh = set(changes['new']) | set(changes['changed'])
+
+        # Keep existing data for vendors that are still matched to the same EIN
+        form_990_data = {
+            vendor_name: data for vendor_name, data in existing.items()
+            if vendor_name in irs_matches and vendor_name not in refresh
+        }
+        irs_matches = {v: d for v, d in irs_matches.items() if v in refresh}
+        print(f"✅ {len(irs_matches):,} new/changed matches to fetch, "
+              f"keeping {len(form_990_data):,} existing entries")
+        print()
+    elif not full:
+        # Only EINs that are new, past the TTL or in filing season
+        due = {}
+        reasons = {'new': 0, 'stale': 0, 'season': 0, 'missing': 0, 'changed': 0}
+        for vendor_name, irs_data in irs_matches.items():
+            ein = irs_data['ein'].replace('-', '')
+            entry = refresh_state.get(ein)
+            reason = refresh_reason(entry, fiscal_year_end_month(irs_data), now, ttl_days, season_ttl_days)
+            # Saved data for another EIN (the vendor was re-matched) is never kept,
+            # even when the new EIN is fresh because another vendor fetched it
+            kept = existing.get(vendor_name)
+            if kept is not None and not same_ein(kept, ein):
+                kept = None
+                if reason is None and entry['status'] == 'found':
+                    reason = 'changed'
+            if reason is None and entry['status'] == 'found' and kept is None:
+                reason = 'missing'
+            if reason:
+                due[vendor_name] = irs_data
+                reasons[reason] += 1
+            elif kept is not None:
+                form_990_data[vendor_name] = kept
+        irs_matches = due
+        print(f"🗓️  Refresh plan (TTL {ttl_days:g} days, {season_ttl_days:g} in filing season): "
+              f"{reasons['new']:,} new, {reasons['stale']:,} stale, {reasons['season']:,} in filing season, "
+              f"{reasons['missing']:,} missing from output, {reasons['changed']:,} re-matched to another EIN")
+        print(f"✅ {len(irs_matches):,} vendors to fetch, keeping {len(form_990_data):,} existing entries")
+        print()
+
+    if not irs_matches:
+        if form_990_data != existing:
+            save_output(form_990_data)
+        print("🎉 Nothing to fetch.")
+        return
 
-    print("🔍 Scraping 990 filing data from ProPublica website...")
-    print(f"   (This will take ~30-35 minutes for {total_vendors:,} nonprofits)")
-    print(f"   Rate limit: {RATE_LIMIT_DELAY}s between requests")
-    print()
+    total_vendors = len(irs_matches)
 
-    start_time = time.time()
+    # Resume from results recorded by an interrupted run (failed fetches are retried)
+    key = {'propublica_web_base': base_url}
+    done = {
+        vendor_name: entry for vendor_name, entry in load_progress(key, PROGRESS_FILE).items()
+        if vendor_name in irs_matches and entry['status'] != 'error'
+        and entry['ein'] == irs_matches[vendor_name]['ein'].replace('-', '')
+    }
+    if done:
+        print(f"♻️  Resuming: {len(done):,} vendors already fetched in {PROGRESS_FILE.name}")
 
-    for idx, (vendor_name, irs_data) in enumerate(irs_matches.items(), 1):
-        ein = irs_data['ein']
+    pending_eins = {d['ein'].replace('-', '') for v, d in irs_matches.items() if v not in done}
 
-        # Progress indicator every 50 items
-        if idx % 50 == 0:
-            elapsed = time.time() - start_time
-            rate = idx / elapsed
-            remaining = (total_vendors - idx) / rate if rate > 0 else 0
-            print(f"\n📊 Progress: {idx}/{total_vendors} ({idx/total_vendors*100:.1f}%) - "
-                  f"Found: {success_count}, Not found: {not_found_count}, Errors: {error_count}")
-            print(f"   ⏱️  Elapsed: {elapsed/60:.1f}m, Estimated remaining: {remaining/60:.1f}m\n")
+    print("🔍 Scraping 990 filing data from ProPublica website...")
+    print(f"   {len(pending_eins):,} organizations to fetch for {total_vendors - len(done):,} vendors "
+          + (f"(at least ~{len(pending_eins) / rate / 60:.0f} minutes uncached)" if rate > 0 else "(no rate limit)"))
+    print(f"   Rate limit: {rate} requests/s, {concurrency} in flight, {retries} retries")
+    print()
 
-        print(f"[{idx}/{total_vendors}] {vendor_name[:50]:<50} (EIN: {ein})...", end=" ")
+    start_time = time.time()
 
-        # Fetch 990 data using hybrid approach
-        data = fetch_990_filings_hybrid(ein, vendor_name)
+    cache = HttpCache(HTTP_CACHE_DIR) if use_cache else None
+    PROGRESS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    mode = 'a' if done else 'w'
 
-        if data and data['filings_count'] > 0:
-            form_990_data[vendor_name] = data
-            success_count += 1
-            # Show filing years found
-            years = [str(f.get('tax_year', '?')) for f in data['filings']]
-            print(f"✅ {data['filings_count']} filing(s): {', '.join(years)}")
-        elif data and data['filings_count'] == 0:
-            not_found_count += 1
-            print("⚠️  No filings")
-        else:
-            error_count += 1
+    async def run():
+        fetcher = AsyncFetcher(concurrency=concurrency, rate=rate, retries=retries, cache=cache)
+        with open(PROGRESS_FILE, mode, encoding='utf-8') as progress:
+            if mode == 'w':
+                progress.write(json.dumps(key) + '\n')
+            await fetch_all(irs_matches, done, fetcher, progress, base_url)
+        return fetcher.stats
 
-        # Rate limiting - be respectful to ProPublica
-        time.sleep(RATE_LIMIT_DELAY)
+    stats = asyncio.run(run())
 
     total_time = time.time() - start_time
 
+    # Record completed fetches for the refresh schedule (failures stay due)
+    for vendor_name, irs_data in irs_matches.items():
+        entry = done[vendor_name]
+        if entry['status'] != 'error':
+            record_fetch(refresh_state, entry['ein'], entry['status'], entry['data'],
+                         fiscal_year_end_month(irs_data), now)
+    save_refresh_state(refresh_state, REFRESH_STATE_FILE)
+
+    counts = {'found': 0, 'no_filings': 0, 'not_found': 0, 'error': 0}
+    kept_on_error = 0
+    for vendor_name in irs_matches:
+        entry = done[vendor_name]
+        counts[entry['status']] += 1
+        if entry['status'] == 'found':
+            form_990_data[vendor_name] = entry['data']
+        elif entry['status'] == 'error':
+            # A failed refresh keeps the last good data for the same EIN
+            previous = existing.get(vendor_name)
+            if same_ein(previous, entry['ein']):
+                form_990_data[vendor_name] = previous
+                kept_on_error += 1
+    success_count = counts['found']
+    not_found_count = counts['no_filings']
+    error_count = counts['not_found'] + counts['error']
+
     print()
     print("=" * 80)
     print("Summary")
@@ -338,6 +593,8 @@ def main():
     print(f"⚠️  No filings found:        {not_found_count:,} ({not_found_count/total_vendors*100:.1f}%)")
     print(f"❌ Errors:                  {error_count:,} ({error_count/total_vendors*100:.1f}%)")
     print(f"⏱️  Total time:              {total_time/60:.1f} minutes")
+    print(f"🌐 Requests: {stats['network']:,} fetched, {stats['revalidated']:,} unchanged (304), "
+          f"{stats['retries']:,} retries, {stats['failures']:,} failed")
     print()
 
     # Calculate statistics
@@ -350,19 +607,44 @@ def main():
 
     print("📊 Filing Statistics:")
     print(f"   Total filings found:     {total_filings:,}")
-    print(f"   Filings with PDF links:  {filings_with_pdfs:,} ({filings_with_pdfs/total_filings*100:.1f}%)")
+    print(f"   Filings with PDF links:  {filings_with_pdfs:,} ({filings_with_pdfs/max(total_filings, 1)*100:.1f}%)")
     print()
 
     # Save results
-    print(f"💾 Saving results to: {OUTPUT_FILE}")
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(form_990_data, f, indent=2)
+    save_output(form_990_data)
 
     print(f"✅ Saved 990 data for {len(form_990_data):,} nonprofits")
+    if counts['error']:
+        # Keep the progress file so a rerun only retries the failures
+        print(f"   {counts['error']:,} vendors failed to fetch; rerun to retry them"
+              + (f" ({kept_on_error:,} keep their previous data)" if kept_on_error else ""))
+    else:
+        PROGRESS_FILE.unlink()
     print()
     print("🎉 Done! Your data now includes the most recent filings with PDF links.")
 
 if __name__ == '__main__':
-    main()
-
+    parser = argparse.ArgumentParser(description='Fetch Form 990 filing data from ProPublica')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--changed-only', action='store_true',
+                      help='only fetch vendors whose IRS match is new or changed')
+    mode.add_argument('--full', action='store_true',
+                      help='fetch every EIN, ignoring the refresh schedule')
+    parser.add_argument('--ttl-days', type=float, default=DEFAULT_TTL_DAYS,
+                        help=f're-fetch EINs older than this (default: {DEFAULT_TTL_DAYS})')
+    parser.add_argument('--season-ttl-days', type=float, default=SEASON_TTL_DAYS,
+                        help=f're-fetch EINs in filing season older than this (default: {SEASON_TTL_DAYS})')
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY,
+                        help=f'requests in flight (default: {CONCURRENCY})')
+    parser.add_argument('--rate', type=float, default=RATE_LIMIT,
+                        help=f'sustained requests per second (default: {RATE_LIMIT})')
+    parser.add_argument('--retries', type=int, default=RETRIES,
+                        help=f'retries per page on errors, 429 and 5xx (default: {RETRIES})')
+    parser.add_argument('--base-url', default=PROPUBLICA_WEB_BASE,
+                        help='ProPublica organization page base URL (e.g. a local stub server)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='download every page instead of revalidating cached copies')
+    args = parser.parse_args()
+    main(changed_only=args.changed_only, full=args.full, ttl_days=args.ttl_days,
+         season_ttl_days=args.season_ttl_days, concurrency=args.concurrency, rate=args.rate,
+         retries=args.retries, base_url=args.base_url, use_cache=not args.no_cache)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Refresh schedule for the ProPublica Form 990 data.
+
+Filings change at most a few times a year, so fetch_990_links.py only
+re-fetches an EIN when:
+- it has never been fetched (a new match)
+- its last fetch is older than the TTL (default 90 days)
+- it is in filing season: the return for a recently ended fiscal year is due
+  or on extension, is not in the data yet, and the last fetch is older than
+  the in-season TTL (default 7 days)
+
+Per EIN, the state file records when it was last fetched, the fetch status,
+the latest tax year seen and the fiscal-year-end month. Fiscal-year ends come
+from the BMF accounting period (the match record's fiscal_year_end_month);
+December is assumed when it is unknown.
+
+Usage:
+    from filing_schedule import load_refresh_state, refresh_reason
+
+    state = load_refresh_state(path)
+    reason = refresh_reason(state.get(ein), fiscal_year_end_month(irs_record), datetime.now())
+"""
+
+import json
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_TTL_DAYS = 90
+SEASON_TTL_DAYS = 7
+DEFAULT_FISCAL_YEAR_END_MONTH = 12
+
+# Months after the fiscal-year end in which a new return tends to show up on
+# ProPublica: the original due date (15th day of the 5th month) and the
+# extended due date six months later, each plus a couple of months of
+# e-file publication lag
+FILING_SEASON_MONTHS = frozenset({5, 6, 7, 11, 12, 13})
+
+
+def load_refresh_state(path: Path) -> Dict[str, Dict]:
+    """
+    Load the per-EIN refresh state.
+
+    Returns:
+        ein -> {'fetched_at', 'status', 'latest_tax_year', 'fiscal_year_end_month'}
+    """
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_refresh_state(state: Dict[str, Dict], path: Path):
+    """Write the refresh state atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(state.items())), f, indent=2)
+    tmp_path.replace(path)
+
+
+def fiscal_year_end_month(irs_record: Dict) -> int:
+    """Month (1-12) an organization's fiscal year ends, from its IRS record."""
+    value = str(irs_record.get('fiscal_year_end_month') or '').strip()
+    if value.isdigit() and 1 <= int(value) <= 12:
+        return int(value)
+    return DEFAULT_FISCAL_YEAR_END_MONTH
+
+
+def in_filing_season(fye_month: int, latest_tax_year: Optional[int], today: date) -> bool:
+    """
+    Whether a return that is not in the data yet could be appearing now.
+
+    Fiscal years are labelled by the calendar year they end in (as ProPublica
+    labels filings). The two most recent fiscal-year ends are checked, so a
+    return on extension is still awaited after the next fiscal year has ended.
+    """
+    # The fiscal year ending in fye_month is over once that month has passed
+    last_end_year = today.year if today.month > fye_month else today.year - 1
+    for end_year in (last_end_year, last_end_year - 1):
+        if latest_tax_year is not None and latest_tax_year >= end_year:
+            continue
+        months_after = (today.year - end_year) * 12 + today.month - fye_month
+        if months_after in FILING_SEASON_MONTHS:
+            return True
+    return False
+
+
+def refresh_reason(entry: Optional[Dict], fye_month: int, now: datetime,
+                   ttl_days: float = DEFAULT_TTL_DAYS,
+                   season_ttl_days: float = SEASON_TTL_DAYS) -> Optional[str]:
+    """
+    Why an EIN should be fetched again, or None if its data is fresh enough.
+
+    Returns:
+        'new', 'stale' (older than the TTL), 'season' (filing season and older
+        than the in-season TTL) or None
+    """
+    if entry is None:
+        return 'new'
+    age = now - datetime.fromisoformat(entry['fetched_at'])
+    if age >= timedelta(days=ttl_days):
+        return 'stale'
+    if age >= timedelta(days=season_ttl_days) and in_filing_season(fye_month, entry.get('latest_tax_year'), now.date()):
+        return 'season'
+    return None
+
+
+def record_fetch(state: Dict[str, Dict], ein: str, status: str, data: Optional[Dict],
+                 fye_month: int, now: datetime):
+    """Record a completed fetch of `ein` (failed fetches should not be recorded)."""
+    tax_years = [f['tax_year'] for f in (data or {}).get('filings', []) if f.get('tax_year')]
+    state[ein] = {
+        'fetched_at': now.isoformat(timespec='seconds'),
+        'status': status,
+        'latest_tax_year': max(tax_years, default=None),
+        'fiscal_year_end_month': fye_month,
+    }
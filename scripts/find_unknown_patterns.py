@@ -3,54 +3,30 @@
 Find common patterns in Unknown entities to identify more exclusions.
 """
 
-import csv
-import gzip
 import json
-from collections import defaultdict, Counter
+from collections import Counter
+
+from transfer_payments import NGO_GRANT_EXPENSE_TYPE
+from vendor_classifier import classify_vendors
+from vendor_cube import load_cube, vendor_rollups
 
 # Load vendor data
-vendor_records = defaultdict(list)
-with gzip.open('frontend/public/decoder/transfer_payments_full.csv.gz', 'rt', encoding='utf-8') as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        if row.get('expense_type') == 'Grnt-Nongovernmental Org':
-            vendor_records[row['vendor_name']].append(row)
+vendor_rollups_ngo = vendor_rollups(load_cube(), expense_types={NGO_GRANT_EXPENSE_TYPE})
 
 # Load IRS matches
 with open('frontend/public/data/vendor_irs_matches.json', 'r') as f:
     irs_matches = json.load(f)
 
 # Classify entities
-def classify_entity_type(vendor_name: str, irs_verified: bool) -> str:
-    """Classify entity type (simplified version)."""
-    if irs_verified:
-        return 'nonprofit'
-    
-    name_upper = vendor_name.upper()
-    
-    # For-profit keywords
-    forprofit_keywords = [
-        'LLC', 'INC', 'CORP', 'LTD', 'LP', 'PLLC', 'PC', 'LLP', 'PA',
-        'CONSULTING', 'SOLUTIONS', 'TECHNOLOGIES', 'CONSTRUCTION', 'MANAGEMENT'
-    ]
-    
-    for keyword in forprofit_keywords:
-        if keyword in name_upper:
-            return 'for-profit'
-    
-    return 'unknown'
+entity_types = classify_vendors(vendor_rollups_ngo, irs_verified=irs_matches)
 
 # Find unknown entities
 unknown_entities = []
-for vendor_name, records in vendor_records.items():
-    irs_verified = vendor_name in irs_matches
-    entity_type = classify_entity_type(vendor_name, irs_verified)
-    
-    if entity_type == 'unknown':
-        total = sum(float(r.get('amount', 0) or 0) for r in records)
+for vendor_name, rollup in vendor_rollups_ngo.items():
+    if entity_types[vendor_name] == 'unknown':
         unknown_entities.append({
             'name': vendor_name,
-            'total': total
+            'total': rollup['total']
         })
 
 print(f'📊 Total Unknown Entities: {len(unknown_entities)}\n')
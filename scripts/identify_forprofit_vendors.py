@@ -11,17 +11,24 @@ Strategy:
 - Check high-spending "Unknown" vendors first
 - Use SAM.gov to get official business type
 - Save results for manual review
+
+SAM.gov lookups go through external_lookup.py (concurrent, rate limited,
+highest spending first, answers cached between runs).
+
+Usage:
+    python scripts/identify_forprofit_vendors.py [--limit N] [--no-cache]
 """
 
+import argparse
+import asyncio
 import json
 import csv
-import time
-import re
 from pathlib import Path
-from urllib.request import urlopen, Request
-from urllib.error import HTTPError, URLError
 from urllib.parse import quote
 
+from external_lookup import LookupService, LookupSource
+from vendor_classifier import has_business_pattern, has_legal_entity_suffix
+
 # Configuration
 SCRIPT_DIR = Path(__file__).parent
 REPO_ROOT = SCRIPT_DIR.parent
@@ -31,100 +38,63 @@ OUTPUT_FILE = REPO_ROOT / 'frontend/public/data/forprofit_discoveries.json'
 
 # SAM.gov API (no key required for basic entity search)
 SAM_API_BASE = 'https://api.sam.gov/entity-information/v3/entities'
-RATE_LIMIT_DELAY = 0.5  # seconds between requests
-
-# Enhanced for-profit keywords
-FOR_PROFIT_KEYWORDS = [
-    'INC', 'LLC', 'CORP', 'LTD', 'LP', 'CORPORATION', 'INCORPORATED',
-    'LIMITED', 'COMPANY', 'CO', 'PLLC', 'PC', 'LLP', 'PA'
-]
-
-# Additional business patterns
-BUSINESS_PATTERNS = [
-    r'\b(CONSULTING|CONSULTANTS)\b',
-    r'\b(SOLUTIONS|SERVICES)\b',
-    r'\b(GROUP|PARTNERS|ASSOCIATES)\b',
-    r'\b(TECHNOLOGIES|TECHNOLOGY)\b',
-    r'\b(SYSTEMS|SOFTWARE)\b',
-    r'\b(ENTERPRISES|INDUSTRIES)\b',
-    r'\b(HOLDINGS|INVESTMENTS)\b',
-    r'\b(& SONS|& DAUGHTERS|& BROS)\b',
-    r'\b(CONSTRUCTION|CONTRACTORS)\b',
-    r'\b(MANAGEMENT|CONSULTING)\b',
-]
-
-def classify_entity_type(vendor_name: str, is_irs_verified: bool) -> str:
-    """Classify entity type using same logic as frontend."""
-    if is_irs_verified:
-        return 'nonprofit'
-    
-    name_upper = vendor_name.upper()
-    
-    # Check for for-profit indicators
-    for keyword in FOR_PROFIT_KEYWORDS:
-        pattern = rf'\b{re.escape(keyword)}\b'
-        if re.search(pattern, name_upper):
-            return 'for-profit'
-    
-    return 'unknown'
+CHECK_COUNT = 50  # Unknown vendors to check on SAM.gov, highest spending first
 
-def has_business_pattern(vendor_name: str) -> bool:
-    """Check if vendor name matches common business patterns."""
-    name_upper = vendor_name.upper()
-    for pattern in BUSINESS_PATTERNS:
-        if re.search(pattern, name_upper):
-            return True
-    return False
+def sam_gov_url(vendor_name: str) -> str:
+    """
+    SAM.gov entity search URL for a vendor name.
+    SAM.gov API requires exact or partial name match
+    (using the public API endpoint, no key required for basic search).
+    """
+    return f"{SAM_API_BASE}?legalBusinessName={quote(vendor_name.strip())}&includeSections=entityRegistration"
 
-def search_sam_gov(vendor_name: str) -> dict | None:
+def parse_sam_gov(body: bytes) -> dict | None:
     """
-    Search SAM.gov for vendor information.
-    Returns business type and other details if found.
+    Read a SAM.gov entity search response.
+    Returns business type and other details if found, None otherwise.
     """
-    # Clean vendor name for search
-    search_term = vendor_name.strip()
-    
-    # SAM.gov API requires exact or partial name match
-    # Using the public API endpoint (no key required for basic search)
-    url = f"{SAM_API_BASE}?legalBusinessName={quote(search_term)}&includeSections=entityRegistration"
-    
-    try:
-        req = Request(url, headers={
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-            'Accept': 'application/json'
-        })
-        
-        with urlopen(req, timeout=15) as response:
-            data = json.loads(response.read().decode('utf-8'))
-            
-            # Check if we got results
-            if data.get('totalRecords', 0) > 0 and data.get('entityData'):
-                entity = data['entityData'][0]
-                reg = entity.get('entityRegistration', {})
-                
-                return {
-                    'legal_business_name': reg.get('legalBusinessName'),
-                    'dba_name': reg.get('dbaName'),
-                    'uei': entity.get('entityEFTIndicator'),
-                    'cage_code': reg.get('cageCode'),
-                    'business_types': reg.get('businessTypes', []),
-                    'sam_url': f"https://sam.gov/entity/{entity.get('entityEFTIndicator')}"
-                }
-            
-            return None
-            
-    except HTTPError as e:
-        if e.code == 404 or e.code == 400:
-            return None
-        print(f"  ⚠️  HTTP Error {e.code}")
-        return None
-        
-    except (URLError, Exception) as e:
-        # SAM.gov API might not be accessible or might require API key
-        # Silently fail and continue
-        return None
-
-def main():
+    data = json.loads(body.decode('utf-8'))
+
+    # Check if we got results
+    if data.get('totalRecords', 0) > 0 and data.get('entityData'):
+        entity = data['entityData'][0]
+        reg = entity.get('entityRegistration', {})
+
+        return {
+            'legal_business_name': reg.get('legalBusinessName'),
+            'dba_name': reg.get('dbaName'),
+            'uei': entity.get('entityEFTIndicator'),
+            'cage_code': reg.get('cageCode'),
+            'business_types': reg.get('businessTypes', []),
+            'sam_url': f"https://sam.gov/entity/{entity.get('entityEFTIndicator')}"
+        }
+
+    return None
+
+# SAM.gov answers 400 for names it cannot search, which is as good as no match
+SAM_GOV = LookupSource('sam_gov', sam_gov_url, parse_sam_gov, not_found_statuses=frozenset({400, 404}))
+
+async def check_sam_gov(service: LookupService, vendors: list) -> dict:
+    """
+    Look up each vendor on SAM.gov, highest spending first.
+    Returns vendor_name -> LookupResult.
+    """
+    amounts = {v['vendor_name']: v['total_amount'] for v in vendors}
+    results = {}
+    async for result in service.lookup_all(SAM_GOV, amounts.items()):
+        results[result.query] = result
+        label = f"[{len(results)}/{len(amounts)}] {result.query:50}"
+        cached = " (cached)" if result.source == 'cache' else ""
+        if result.status == 'found':
+            print(f"{label} ✅ FOUND{cached}")
+        elif result.status == 'not_found':
+            print(f"{label} ⚠️  Not in SAM.gov{cached}")
+        else:
+            # SAM.gov might not be accessible or might require an API key
+            print(f"{label} ❌ Lookup failed: {result.reason}")
+    return results
+
+def main(check_count: int = CHECK_COUNT, use_cache: bool = True):
     print("=" * 70)
     print("For-Profit Vendor Identification Tool")
     print("=" * 70)
@@ -163,10 +133,10 @@ def main():
     print("🔍 Classifying vendors...")
     unknown_vendors = []
     for vendor_name, total_amount in unique_vendors.items():
+        # Legal entity suffixes already settle the type; business-pattern
+        # names stay in the pool so phase 1 can review them
         is_verified = vendor_name in irs_matches
-        entity_type = classify_entity_type(vendor_name, is_verified)
-        
-        if entity_type == 'unknown':
+        if not is_verified and not has_legal_entity_suffix(vendor_name):
             unknown_vendors.append({
                 'vendor_name': vendor_name,
                 'total_amount': total_amount,
@@ -200,32 +170,31 @@ def main():
     print("(This may take a few minutes...)")
     print()
 
-    sam_discoveries = []
-    check_count = min(50, len(unknown_vendors))
-
-    for i, vendor in enumerate(unknown_vendors[:check_count], 1):
-        vendor_name = vendor['vendor_name']
-        total_amount = vendor['total_amount']
+    check_count = min(check_count, len(unknown_vendors))
 
-        # Skip obvious non-businesses
-        if any(x in vendor_name.upper() for x in ['CITY OF', 'COUNTY OF', 'TOWN OF', 'COMMONWEALTH']):
-            continue
+    # Skip obvious non-businesses
+    to_check = [v for v in unknown_vendors[:check_count]
+                if not any(x in v['vendor_name'].upper() for x in ['CITY OF', 'COUNTY OF', 'TOWN OF', 'COMMONWEALTH'])]
 
-        print(f"[{i}/{check_count}] {vendor_name:50}", end="")
-
-        result = search_sam_gov(vendor_name)
+    service = LookupService(use_cache=use_cache)
+    try:
+        results = asyncio.run(check_sam_gov(service, to_check))
+    finally:
+        service.close()
 
-        if result:
-            print(f" ✅ FOUND")
+    # Report in spending order
+    sam_discoveries = []
+    sam_errors = 0
+    for vendor in to_check:
+        result = results[vendor['vendor_name']]
+        if result.status == 'found':
             sam_discoveries.append({
-                'vendor_name': vendor_name,
-                'total_amount': total_amount,
-                'sam_data': result
+                'vendor_name': vendor['vendor_name'],
+                'total_amount': vendor['total_amount'],
+                'sam_data': result.data
             })
-        else:
-            print(f" ⚠️  Not in SAM.gov")
-
-        time.sleep(RATE_LIMIT_DELAY)
+        elif result.status == 'error':
+            sam_errors += 1
 
     print()
     print("=" * 70)
@@ -241,6 +210,8 @@ def main():
     print("PHASE 2 - SAM.gov Discoveries:")
     print(f"  Checked: {check_count:,} vendors")
     print(f"  Found in SAM.gov: {len(sam_discoveries):,}")
+    if sam_errors:
+        print(f"  Failed (retried next run): {sam_errors:,}")
     if sam_discoveries:
         print(f"  Total spending: ${sum(d['total_amount'] for d in sam_discoveries):,.0f}")
     print()
@@ -265,5 +236,11 @@ def main():
     print("   that should be reclassified from 'Unknown' to 'For-Profit'")
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='Identify for-profit companies among unknown vendors')
+    parser.add_argument('--limit', type=int, default=CHECK_COUNT,
+                        help=f'Unknown vendors to check on SAM.gov, highest spending first (default {CHECK_COUNT})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Look up every vendor again instead of reusing earlier answers')
+    args = parser.parse_args()
+    main(check_count=args.limit, use_cache=not args.no_cache)
 
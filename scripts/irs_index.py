@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Token inverted index over the IRS nonprofit database.
+
+Built once per run from IRS nonprofit records. Maps every token of a
+record's normalized_name to the ids (list positions) of the records that
+contain it, with an IDF weight per token. Candidate generation for a vendor
+then touches only the postings of the vendor's own tokens, so its cost
+depends on how many nonprofits share those tokens, not on the corpus size.
+
+Usage:
+    from irs_index import IrsTokenIndex
+
+    index = IrsTokenIndex(irs_nonprofits)
+    candidates = index.candidates(normalized_vendor.split())
+
+The same index can be loaded prebuilt from the memory-mapped reference file
+(irs_reference.IrsReference.token_index()). Records there are grouped into
+state blocks (Virginia first, then neighbours, then the rest of the country);
+lookups can be limited to one block.
+"""
+
+import heapq
+import math
+from bisect import bisect_left
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional
+
+# Most candidates handed to the fuzzy scorer per vendor
+MAX_CANDIDATES = 1000
+
+# Tokens with more postings than this in a block (FOUNDATION, CHURCH, ... on
+# the national BMF) never add candidates; they only re-weight candidates found
+# through rarer tokens, so per-vendor work stays bounded as the corpus grows
+MAX_POSTINGS = 50_000
+
+
+class IndexBlock(NamedTuple):
+    """Contiguous range of record ids [start, end) sharing a state group."""
+    label: str
+    start: int
+    end: int
+
+
+class IrsTokenIndex:
+    """Exact-name lookup plus token postings with IDF weights."""
+
+    def __init__(self, irs_nonprofits: List[Dict]):
+        """
+        Args:
+            irs_nonprofits: IRS records with a 'normalized_name' field
+        """
+        self.records = irs_nonprofits
+        self.exact: Dict[str, List[int]] = {}
+        self.tokens: List[FrozenSet[str]] = []
+        self.postings: Dict[str, List[int]] = {}
+
+        for record_id, nonprofit in enumerate(irs_nonprofits):
+            normalized = nonprofit['normalized_name']
+            self.exact.setdefault(normalized, []).append(record_id)
+
+            record_tokens = frozenset(normalized.split())
+            self.tokens.append(record_tokens)
+            for token in record_tokens:
+                self.postings.setdefault(token, []).append(record_id)
+
+        total = len(irs_nonprofits)
+        self.idf: Dict[str, float] = {
+            token: math.log(total / len(ids)) for token, ids in self.postings.items()
+        }
+        self.blocks: List[IndexBlock] = [IndexBlock('all', 0, total)]
+
+    @classmethod
+    def from_parts(cls, records, exact, tokens, postings, idf,
+                   blocks: Optional[List[IndexBlock]] = None) -> 'IrsTokenIndex':
+        """
+        Wrap an index that was built ahead of time (see irs_reference.py).
+
+        Each part only needs the lookups used here: records[i], tokens[i],
+        `in`/[] on exact, postings and idf, and len() on records and postings.
+        exact and postings values are ascending record ids.
+        """
+        index = cls.__new__(cls)
+        index.records = records
+        index.exact = exact
+        index.tokens = tokens
+        index.postings = postings
+        index.idf = idf
+        index.blocks = blocks or [IndexBlock('all', 0, len(records))]
+        return index
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _in_block(self, ids, block: Optional[IndexBlock]):
+        """The part of an ascending id list that falls inside `block`."""
+        if block is None or (block.start == 0 and block.end >= len(self.records)):
+            return ids
+        return ids[bisect_left(ids, block.start):bisect_left(ids, block.end)]
+
+    def exact_id(self, normalized: str, block: Optional[IndexBlock] = None) -> Optional[int]:
+        """First record (in `block`, if given) whose normalized name is `normalized`."""
+        if normalized not in self.exact:
+            return None
+        ids = self._in_block(self.exact[normalized], block)
+        return ids[0] if len(ids) else None
+
+    def candidate_ids(self, tokens: Iterable[str], max_candidates: int = MAX_CANDIDATES,
+                      block: Optional[IndexBlock] = None,
+                      max_postings: Optional[int] = MAX_POSTINGS) -> List[int]:
+        """
+        Ids of records (in `block`, if given) sharing at least one of
+        `tokens`, in corpus order.
+
+        When the union of postings fits in `max_candidates` every record is
+        returned. Otherwise tokens are taken rarest first: they add their
+        postings until the pool is full, after which commoner tokens only
+        re-weight records already in the pool. The pool is then cut to the
+        `max_candidates` records with the highest summed IDF. Tokens with
+        more than `max_postings` postings in the block only re-weight.
+        """
+        postings = {t: self._in_block(self.postings[t], block) for t in {t for t in tokens if t in self.postings}}
+        terms = sorted((t for t in postings if len(postings[t])), key=lambda t: len(postings[t]))
+        if not terms:
+            return []
+
+        union = self._bounded_union(postings, terms, max_candidates)
+        if union is not None:
+            return sorted(union)
+
+        scores: Dict[int, float] = {}
+        for term in terms:
+            ids = postings[term]
+            weight = self.idf[term]
+            if len(scores) < max_candidates and (max_postings is None or len(ids) <= max_postings):
+                for record_id in ids:
+                    scores[record_id] = scores.get(record_id, 0.0) + weight
+            elif len(ids) < len(scores):
+                for record_id in ids:
+                    if record_id in scores:
+                        scores[record_id] += weight
+            else:
+                for record_id in scores:
+                    if term in self.tokens[record_id]:
+                        scores[record_id] += weight
+
+        if len(scores) > max_candidates:
+            top = heapq.nlargest(max_candidates, scores, key=lambda i: (scores[i], -i))
+            return sorted(top)
+        return sorted(scores)
+
+    @staticmethod
+    def _bounded_union(postings: Dict, terms: List[str], limit: int) -> Optional[set]:
+        """Union of the postings of `terms`, or None as soon as it exceeds `limit`."""
+        union = set()
+        if sum(len(postings[t]) for t in terms) <= limit:
+            for term in terms:
+                union.update(postings[term])
+            return union
+        for term in terms:
+            for record_id in postings[term]:
+                union.add(record_id)
+                if len(union) > limit:
+                    return None
+        return union
+
+    def candidates(self, tokens: Iterable[str], max_candidates: int = MAX_CANDIDATES,
+                   block: Optional[IndexBlock] = None) -> List[Dict]:
+        """Records sharing at least one of `tokens`; see candidate_ids()."""
+        return [self.records[i] for i in self.candidate_ids(tokens, max_candidates, block)]
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Compact, memory-mapped IRS nonprofit reference.
+
+Written by process_irs_data.py and read by match_vendors_to_irs.py in place
+of irs_nonprofits_va.json. One uncompressed file holds:
+
+- the record columns (EIN, name, normalized name, city, state, ZIP, NTEE
+  code, status and fiscal-year-end month as UTF-8 blobs with uint32 offsets;
+  asset and income amounts as int64), with records grouped into STATE_BLOCKS
+  and sorted by name within each block
+- record ids sorted by normalized name, for exact-name lookups
+- the token inverted index: sorted tokens and their posting lists
+
+Opening the file parses a small JSON header and memory-maps the rest, so the
+matcher starts without decoding tens of thousands of JSON objects. Records,
+postings and exact-name hits are decoded only when they are looked up.
+
+Usage:
+    from irs_reference import IrsReference
+
+    with IrsReference(IRS_REFERENCE_FILE) as reference:
+        token_index = reference.token_index()
+"""
+
+import json
+import math
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Sequence
+
+from irs_index import IndexBlock, IrsTokenIndex
+
+# Paths
+BASE_DIR = Path(__file__).parent.parent
+IRS_REFERENCE_FILE = BASE_DIR / "data" / "irs" / "irs_nonprofits.irsref"
+
+MAGIC = b'IRSREF1\n'
+FORMAT_VERSION = 3
+ALIGNMENT = 8
+
+# Record fields, in the order irs_nonprofits_va.json used
+STRING_COLUMNS = ['ein', 'name', 'normalized_name', 'city', 'state', 'zip', 'ntee_code']
+INT_COLUMNS = ['asset_amount', 'income_amount']
+TRAILING_STRING_COLUMNS = ['status', 'fiscal_year_end_month']
+SUBSECTION = '501(c)(3)'
+
+# State groups searched in this order by the matcher: CARDINAL vendors are
+# most often Virginia organizations, then DC/MD-based ones. Records from any
+# other state form a final 'national' block.
+STATE_BLOCKS = [('VA',), ('DC', 'MD')]
+
+
+def _aligned(offset: int) -> int:
+    return offset + (-offset % ALIGNMENT)
+
+
+# ============================================================================
+# Build
+# ============================================================================
+
+class StringColumnBuilder:
+    """Append-only UTF-8 string column: one blob plus uint32 end offsets."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array('I', [0])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def append(self, value: str):
+        self.data += value.encode('utf-8')
+        self.offsets.append(len(self.data))
+
+    def __getitem__(self, i: int) -> str:
+        return self.data[self.offsets[i]:self.offsets[i + 1]].decode('utf-8')
+
+    def permuted(self, order: Sequence[int]) -> 'StringColumnBuilder':
+        """Copy of the column with rows rearranged into `order`."""
+        column = StringColumnBuilder()
+        data, offsets = self.data, self.offsets
+        for i in order:
+            column.data += data[offsets[i]:offsets[i + 1]]
+            column.offsets.append(len(column.data))
+        return column
+
+
+def write_reference(path: Path,
+                    strings: Dict[str, StringColumnBuilder],
+                    ints: Dict[str, array],
+                    snapshot: str,
+                    sources: List[str],
+                    state_blocks: List[Sequence[str]] = STATE_BLOCKS) -> Dict:
+    """
+    Group records into state blocks, sort them by name within each block,
+    build the exact-name order and token index, and write the reference file.
+
+    Args:
+        path: Output file
+        strings: Every column in STRING_COLUMNS + TRAILING_STRING_COLUMNS, in input order
+        ints: Every column in INT_COLUMNS ('q' arrays), in input order
+        snapshot: Content hash of the source BMF files
+        sources: Source file names
+        state_blocks: State groups, in search order (other states go last)
+
+    Returns:
+        Summary dict with record, token and per-block counts
+    """
+    names = strings['name']
+    states = strings['state']
+    count = len(names)
+
+    block_of = {state: b for b, group in enumerate(state_blocks) for state in group}
+    labels = ['/'.join(group) for group in state_blocks] + ['national']
+    record_blocks = [block_of.get(states[i], len(state_blocks)) for i in range(count)]
+
+    # Records sorted by block, then name (matching order is defined by this)
+    order = sorted(range(count), key=lambda i: (record_blocks[i], names[i]))
+    sizes = [0] * len(labels)
+    for b in record_blocks:
+        sizes[b] += 1
+    index_blocks = []
+    start = 0
+    for label, size in zip(labels, sizes):
+        if size:
+            index_blocks.append({'label': label, 'start': start, 'end': start + size})
+        start += size
+    strings = {column: builder.permuted(order) for column, builder in strings.items()}
+    ints = {column: array('q', (values[i] for i in order)) for column, values in ints.items()}
+
+    normalized = [strings['normalized_name'][i] for i in range(count)]
+    norm_order = array('I', sorted(range(count), key=normalized.__getitem__))
+
+    postings: Dict[str, array] = {}
+    for record_id, name in enumerate(normalized):
+        for token in set(name.split()):
+            ids = postings.get(token)
+            if ids is None:
+                ids = postings[token] = array('I')
+            ids.append(record_id)
+
+    tokens = StringColumnBuilder()
+    posting_offsets = array('I', [0])
+    posting_ids = array('I')
+    for token in sorted(postings):
+        tokens.append(token)
+        posting_ids.extend(postings[token])
+        posting_offsets.append(len(posting_ids))
+
+    blocks = []
+    for column in STRING_COLUMNS + TRAILING_STRING_COLUMNS:
+        blocks.append((f'{column}.offsets', 'I', strings[column].offsets.tobytes()))
+        blocks.append((f'{column}.data', 'B', bytes(strings[column].data)))
+    for column in INT_COLUMNS:
+        blocks.append((column, 'q', ints[column].tobytes()))
+    blocks.append(('norm_order', 'I', norm_order.tobytes()))
+    blocks.append(('tokens.offsets', 'I', tokens.offsets.tobytes()))
+    blocks.append(('tokens.data', 'B', bytes(tokens.data)))
+    blocks.append(('postings.offsets', 'I', posting_offsets.tobytes()))
+    blocks.append(('postings.ids', 'I', posting_ids.tobytes()))
+
+    # Layout: magic, header length, JSON header, then blocks at offsets
+    # relative to the (aligned) end of the header
+    block_meta = []
+    offset = 0
+    for name, typecode, block in blocks:
+        offset = _aligned(offset)
+        block_meta.append({'name': name, 'typecode': typecode, 'offset': offset, 'length': len(block)})
+        offset += len(block)
+
+    header = json.dumps({
+        'version': FORMAT_VERSION,
+        'byteorder': sys.byteorder,
+        'records': count,
+        'tokens': len(tokens),
+        'snapshot': snapshot,
+        'sources': sources,
+        'state_blocks': index_blocks,
+        'built_at': datetime.now().astimezone().isoformat(),
+        'blocks': block_meta,
+    }, separators=(',', ':')).encode('utf-8')
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        data_start = _aligned(f.tell())
+        for meta, (_, _, block) in zip(block_meta, blocks):
+            f.write(b'\0' * (data_start + meta['offset'] - f.tell()))
+            f.write(block)
+    tmp_path.replace(path)
+
+    return {'records': count, 'tokens': len(tokens), 'state_blocks': index_blocks}
+
+
+# ============================================================================
+# Read
+# ============================================================================
+
+class IrsReference:
+    """Memory-mapped reader for an IRS reference file."""
+
+    def __init__(self, path: Path = IRS_REFERENCE_FILE):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not an IRS reference file")
+        (header_len,) = struct.unpack_from('<Q', self._mmap, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(self._mmap[start:start + header_len])
+        if header['byteorder'] != sys.byteorder:
+            self.close()
+            raise ValueError(f"{self.path} was built on a {header['byteorder']}-endian machine")
+
+        self.records: int = header['records']
+        self.snapshot: str = header['snapshot']
+        self.sources: List[str] = header['sources']
+        self.blocks: List[IndexBlock] = [
+            IndexBlock(b['label'], b['start'], b['end'])
+            for b in header.get('state_blocks') or [{'label': 'all', 'start': 0, 'end': self.records}]
+        ]
+        data_start = _aligned(start + header_len)
+        view = memoryview(self._mmap)
+        self._blocks = {}
+        for meta in header['blocks']:
+            begin = data_start + meta['offset']
+            self._blocks[meta['name']] = view[begin:begin + meta['length']].cast(meta['typecode'])
+        view.release()
+
+    def __reduce__(self):
+        # Worker processes started with spawn reopen the file instead of pickling the map
+        return (IrsReference, (self.path,))
+
+    def __len__(self) -> int:
+        return self.records
+
+    def __enter__(self) -> 'IrsReference':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the memory map and file handle."""
+        for block in getattr(self, '_blocks', {}).values():
+            block.release()
+        self._blocks = {}
+        if getattr(self, '_mmap', None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def string(self, column: str, i: int) -> str:
+        """Value of string column `column` for record `i`."""
+        offsets = self._blocks[f'{column}.offsets']
+        return self._blocks[f'{column}.data'][offsets[i]:offsets[i + 1]].tobytes().decode('utf-8')
+
+    def record(self, i: int) -> Dict:
+        """Record `i` as the dict irs_nonprofits_va.json used to hold."""
+        record = {column: self.string(column, i) for column in STRING_COLUMNS}
+        for column in INT_COLUMNS:
+            record[column] = self._blocks[column][i]
+        for column in TRAILING_STRING_COLUMNS:
+            # Absent from references built before the column existed
+            if f'{column}.offsets' in self._blocks:
+                record[column] = self.string(column, i)
+        record['subsection'] = SUBSECTION
+        return record
+
+    def token_index(self) -> IrsTokenIndex:
+        """IrsTokenIndex over the prebuilt, memory-mapped index."""
+        return IrsTokenIndex.from_parts(
+            records=_RecordsView(self),
+            exact=_ExactView(self),
+            tokens=_TokensView(self),
+            postings=_PostingsView(self),
+            idf=_IdfView(self),
+            blocks=self.blocks,
+        )
+
+
+class _RecordsView:
+    """Sequence of record dicts, decoded on access."""
+
+    def __init__(self, reference: IrsReference):
+        self.reference = reference
+
+    def __len__(self) -> int:
+        return len(self.reference)
+
+    def __getitem__(self, i: int) -> Dict:
+        return self.reference.record(i)
+
+    def __iter__(self):
+        return (self.reference.record(i) for i in range(len(self.reference)))
+
+
+class _TokensView:
+    """Sequence of per-record token sets, decoded on access."""
+
+    def __init__(self, reference: IrsReference):
+        self.reference = reference
+
+    def __len__(self) -> int:
+        return len(self.reference)
+
+    def __getitem__(self, i: int) -> FrozenSet[str]:
+        return frozenset(self.reference.string('normalized_name', i).split())
+
+
+class _ExactView:
+    """normalized_name -> ids of records with that name (ascending), by binary search."""
+
+    def __init__(self, reference: IrsReference):
+        self.reference = reference
+
+    def _range(self, normalized: str):
+        reference = self.reference
+        order = reference._blocks['norm_order']
+        key = lambda i: reference.string('normalized_name', i)
+        lo = bisect_left(order, normalized, key=key)
+        hi = bisect_right(order, normalized, lo=lo, key=key)
+        return order[lo:hi]
+
+    def __contains__(self, normalized: str) -> bool:
+        return len(self._range(normalized)) > 0
+
+    def __getitem__(self, normalized: str) -> memoryview:
+        ids = self._range(normalized)
+        if not len(ids):
+            raise KeyError(normalized)
+        return ids
+
+
+class _PostingsView:
+    """token -> record ids (a memoryview slice), by binary search over sorted tokens."""
+
+    def __init__(self, reference: IrsReference):
+        self.reference = reference
+
+    def _position(self, token: str) -> int:
+        reference = self.reference
+        count = len(self)
+        key = lambda i: reference.string('tokens', i)
+        pos = bisect_left(range(count), token, key=key)
+        if pos < count and key(pos) == token:
+            return pos
+        return -1
+
+    def __len__(self) -> int:
+        return len(self.reference._blocks['tokens.offsets']) - 1
+
+    def __contains__(self, token: str) -> bool:
+        return self._position(token) >= 0
+
+    def __getitem__(self, token: str) -> memoryview:
+        pos = self._position(token)
+        if pos < 0:
+            raise KeyError(token)
+        offsets = self.reference._blocks['postings.offsets']
+        return self.reference._blocks['postings.ids'][offsets[pos]:offsets[pos + 1]]
+
+
+class _IdfView:
+    """token -> log(N / document frequency)."""
+
+    def __init__(self, reference: IrsReference):
+        self.postings = _PostingsView(reference)
+        self.total = len(reference)
+
+    def __getitem__(self, token: str) -> float:
+        return math.log(self.total / len(self.postings[token]))
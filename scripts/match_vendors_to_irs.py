@@ -4,83 +4,116 @@ Match CARDINAL vendor names to IRS nonprofit database.
 
 This script:
 1. Loads CARDINAL transfer payment vendors
-2. Loads IRS 501(c)(3) nonprofit database
+2. Loads IRS 501(c)(3) nonprofit database (the memory-mapped reference built
+   by process_irs_data.py, or the legacy irs_nonprofits_va.json)
 3. Performs fuzzy matching to identify verified nonprofits
 4. Outputs matched results for frontend integration
+
+Scoring uses rapidfuzz when installed. Run with --compat to reproduce the
+difflib-only match decisions exactly (for regression checks).
+
+Usage:
+    python scripts/match_vendors_to_irs.py [--workers N] [--compat] [--rematch]
 """
 
-import csv
-import gzip
+import argparse
+import hashlib
 import json
+import multiprocessing
+import os
 import re
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import AbstractSet, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
 from difflib import SequenceMatcher
 
+from irs_index import IndexBlock, IrsTokenIndex
+from irs_reference import IRS_REFERENCE_FILE, IrsReference
+from transfer_payments import iter_rows
+
+# Optional C-backed scorer (install with: pip install rapidfuzz)
+try:
+    from rapidfuzz import fuzz, process
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
 # Paths
 BASE_DIR = Path(__file__).parent.parent
 CARDINAL_FILE = BASE_DIR / "frontend" / "public" / "decoder" / "transfer_payments_full.csv.gz"
+IRS_REFERENCE = IRS_REFERENCE_FILE
 IRS_FILE = BASE_DIR / "frontend" / "public" / "data" / "irs_nonprofits_va.json"
 OUTPUT_FILE = BASE_DIR / "frontend" / "public" / "data" / "vendor_irs_matches.json"
-
+CHECKPOINT_FILE = BASE_DIR / "data" / "irs" / "vendor_irs_matches.checkpoint.jsonl"
+MATCH_CACHE_FILE = BASE_DIR / "data" / "irs" / "vendor_irs_match_cache.json"
+MATCH_CHANGES_FILE = BASE_DIR / "data" / "irs" / "vendor_irs_match_changes.json"
+
+# Bump whenever normalization, candidate generation, validation, scoring or
+# the IRS record fields change, so cached matches from older logic are not reused
+MATCHER_VERSION = 3
+
+# Above this many IRS records, name features are computed lazily per candidate
+# instead of for every record up front
+PRECOMPUTE_IRS_FEATURES_LIMIT = 200_000
+
+# Vendors per work unit; each finished chunk is appended to CHECKPOINT_FILE
+CHUNK_SIZE = 200
+
+# Remove common prefixes and suffixes that don't affect identity
+# Based on client feedback: these variations should match
+PREFIX_SUFFIX_RE = re.compile('|'.join([
+    r'\bTHE TRUSTEES OF\b',
+    r'\bTRUSTEES OF\b',
+    r'\bBOARD OF\b',
+    r'\bINCORPORATED\b',
+    r'\bINC\.?\b',
+    r'\bCORPORATION\b',
+    r'\bCORP\.?\b',
+    r'\bLIMITED\b',
+    r'\bLTD\.?\b',
+    r'\bL\.L\.C\.?\b',
+    r'\bLLC\b',
+    r'\bCOMPANY\b',
+    r'\bCO\.?\b',
+    r'\bTHE\b',
+    r'\bFOUNDATION\b',
+    r'\bFDN\b',
+]))
+
+# Normalize common word variations
+# College <-> University, National <-> Natl, etc.
+WORD_REPLACEMENTS = {
+    'UNIVERSITY': 'COLLEGE',
+    'NATIONAL': 'NATL',
+    'CAPITAL': 'CAP',
+    'SOUTHEASTERN': 'SE',
+    'SOUTHEAST': 'SE',
+    'NORTHEASTERN': 'NE',
+    'NORTHEAST': 'NE',
+    'SOUTHWESTERN': 'SW',
+    'SOUTHWEST': 'SW',
+    'NORTHWESTERN': 'NW',
+    'NORTHWEST': 'NW',
+}
+WORD_REPLACEMENT_RE = re.compile(r'\b(?:' + '|'.join(WORD_REPLACEMENTS) + r')\b')
+PUNCTUATION_RE = re.compile(r'[^\w\s]')
+WHITESPACE_RE = re.compile(r'\s+')
+
+@lru_cache(maxsize=None)
 def normalize_name(name: str) -> str:
     """Normalize organization name for matching."""
     if not name:
         return ""
 
-    normalized = name.upper()
-
-    # Remove common prefixes and suffixes that don't affect identity
-    # Based on client feedback: these variations should match
-    prefixes_suffixes = [
-        r'\bTHE TRUSTEES OF\b',
-        r'\bTRUSTEES OF\b',
-        r'\bBOARD OF\b',
-        r'\bINCORPORATED\b',
-        r'\bINC\.?\b',
-        r'\bCORPORATION\b',
-        r'\bCORP\.?\b',
-        r'\bLIMITED\b',
-        r'\bLTD\.?\b',
-        r'\bL\.L\.C\.?\b',
-        r'\bLLC\b',
-        r'\bCOMPANY\b',
-        r'\bCO\.?\b',
-        r'\bTHE\b',
-        r'\bFOUNDATION\b',
-        r'\bFDN\b',
-    ]
-
-    for pattern in prefixes_suffixes:
-        normalized = re.sub(pattern, '', normalized)
-
-    # Normalize common word variations
-    # College <-> University, National <-> Natl, etc.
-    word_replacements = {
-        r'\bUNIVERSITY\b': 'COLLEGE',
-        r'\bCOLLEGE\b': 'COLLEGE',
-        r'\bNATIONAL\b': 'NATL',
-        r'\bNATL\b': 'NATL',
-        r'\bCAPITAL\b': 'CAP',
-        r'\bCAP\b': 'CAP',
-        r'\bSOUTHEASTERN\b': 'SE',
-        r'\bSOUTHEAST\b': 'SE',
-        r'\bNORTHEASTERN\b': 'NE',
-        r'\bNORTHEAST\b': 'NE',
-        r'\bSOUTHWESTERN\b': 'SW',
-        r'\bSOUTHWEST\b': 'SW',
-        r'\bNORTHWESTERN\b': 'NW',
-        r'\bNORTHWEST\b': 'NW',
-    }
-
-    for pattern, replacement in word_replacements.items():
-        normalized = re.sub(pattern, replacement, normalized)
+    normalized = PREFIX_SUFFIX_RE.sub('', name.upper())
+    normalized = WORD_REPLACEMENT_RE.sub(lambda m: WORD_REPLACEMENTS[m.group(0)], normalized)
 
     # Remove punctuation except spaces
-    normalized = re.sub(r'[^\w\s]', ' ', normalized)
+    normalized = PUNCTUATION_RE.sub(' ', normalized)
 
     # Remove extra whitespace
-    normalized = re.sub(r'\s+', ' ', normalized).strip()
+    normalized = WHITESPACE_RE.sub(' ', normalized).strip()
 
     return normalized
 
@@ -88,22 +121,45 @@ def calculate_similarity(str1: str, str2: str) -> float:
     """Calculate similarity ratio between two strings."""
     return SequenceMatcher(None, str1, str2).ratio()
 
-def calculate_partial_similarity(str1: str, str2: str) -> float:
+def score_full_similarity(query: str, choices: List[str]) -> List[float]:
+    """
+    Full string similarity of `query` against every choice, in one call.
+
+    With rapidfuzz this is the normalized Indel similarity (LCS based), computed
+    in C. It is never lower than difflib's ratio for the same pair, which lets
+    compatibility mode use it as an upper bound. Without rapidfuzz it falls
+    back to calculate_similarity().
+    """
+    if not HAS_RAPIDFUZZ:
+        return [calculate_similarity(query, choice) for choice in choices]
+
+    scores = [0.0] * len(choices)
+    for _, score, j in process.extract(query, choices, scorer=fuzz.ratio, limit=None):
+        scores[j] = score / 100
+    return scores
+
+def calculate_partial_similarity(str1: str, str2: str,
+                                 words1: Optional[AbstractSet[str]] = None,
+                                 words2: Optional[AbstractSet[str]] = None) -> float:
     """
     Calculate partial similarity - checks if one string is contained in the other.
     This handles cases like:
     - "Senior Connections" vs "Senior Connections The Capital Area Agency On Aging"
     - "Institute for Advanced Learning and" vs "Institute for Advanced Learning and Research Foundation"
+
+    Pass `words1`/`words2` when the word sets are already known to skip re-splitting.
     """
-    words1 = set(str1.split())
-    words2 = set(str2.split())
+    if words1 is None:
+        words1 = set(str1.split())
+    if words2 is None:
+        words2 = set(str2.split())
 
     # If one is empty, no match
     if not words1 or not words2:
         return 0.0
 
     # Calculate word overlap
-    common_words = words1.intersection(words2)
+    common_words = words1 & words2
 
     # Percentage of smaller set that overlaps
     smaller_set_size = min(len(words1), len(words2))
@@ -118,6 +174,21 @@ def calculate_partial_similarity(str1: str, str2: str) -> float:
 
     return overlap_ratio
 
+FOUNDATION_RE = re.compile(r'\bFOUNDATION\b')
+INSURANCE_RE = re.compile(r'\bINSURANCE\b')
+LLC_RE = re.compile(r'\bL\.?L\.?C\.?\b')
+CORP_RE = re.compile(r'\bCORP(ORATION)?\b')
+INC_RE = re.compile(r'\bINC\b')
+
+# Very common words that don't indicate identity
+# Including geographic/generic terms like USA, VIRGINIA, WASHINGTON, etc.
+COMMON_WORDS = frozenset({
+    'OF', 'THE', 'AND', 'FOR', 'IN', 'A', 'AN', 'AT',
+    'USA', 'US', 'VIRGINIA', 'VA', 'AMERICA', 'AMERICAN',
+    'WASHINGTON', 'DC', 'D', 'C',  # Washington DC variations
+    'ALLIANCE', 'FOUNDATION', 'FUND', 'CENTER', 'CENTRE',  # Generic org words
+})
+
 def get_entity_type(name: str) -> Optional[str]:
     """
     Extract legal entity type from organization name.
@@ -133,27 +204,55 @@ def get_entity_type(name: str) -> Optional[str]:
     name_upper = name.upper()
 
     # Check for foundation (nonprofits) - must be exact word
-    if re.search(r'\bFOUNDATION\b', name_upper):
+    if FOUNDATION_RE.search(name_upper):
         return 'foundation'
 
     # Check for insurance company (for-profit)
-    if re.search(r'\bINSURANCE\b', name_upper):
+    if INSURANCE_RE.search(name_upper):
         return 'insurance'
 
     # Check for LLC
-    if re.search(r'\bL\.?L\.?C\.?\b', name_upper):
+    if LLC_RE.search(name_upper):
         return 'llc'
 
     # Check for Corp
-    if re.search(r'\bCORP(ORATION)?\b', name_upper):
+    if CORP_RE.search(name_upper):
         return 'corp'
 
     # Check for Inc (but not if it's part of "INC" in "INCORPORATED")
-    if re.search(r'\bINC\b', name_upper) and 'FOUNDATION' not in name_upper:
+    if INC_RE.search(name_upper) and 'FOUNDATION' not in name_upper:
         return 'inc'
 
     return None
 
+class NameFeatures(NamedTuple):
+    """Per-name matching features, computed once per distinct name."""
+    normalized: str
+    significant_words: FrozenSet[str]  # normalized words minus COMMON_WORDS, 3+ chars
+    entity_type: Optional[str]
+    mentions_foundation: bool
+
+@lru_cache(maxsize=None)
+def name_features(name: str) -> NameFeatures:
+    """Compute (and memoize) the matching features of a vendor or IRS name."""
+    normalized = normalize_name(name)
+    return NameFeatures(
+        normalized=normalized,
+        significant_words=frozenset(
+            w for w in normalized.split() if w not in COMMON_WORDS and len(w) >= 3
+        ),
+        entity_type=get_entity_type(name),
+        mentions_foundation='FOUNDATION' in name.upper(),
+    )
+
+def precompute_name_features(names: Iterable[str]) -> int:
+    """Warm the feature cache for a batch of names; returns how many were computed."""
+    count = 0
+    for name in names:
+        name_features(name)
+        count += 1
+    return count
+
 def has_significant_name_overlap(vendor_name: str, irs_name: str) -> bool:
     """
     Check if vendor and IRS names have significant word overlap.
@@ -161,33 +260,19 @@ def has_significant_name_overlap(vendor_name: str, irs_name: str) -> bool:
     This prevents matching completely unrelated organizations.
     For example: "Nestle USA INC" should NOT match "WINDLE USA"
     """
-    # Normalize and get words
-    vendor_words = set(normalize_name(vendor_name).split())
-    irs_words = set(normalize_name(irs_name).split())
-
-    # Remove very common words that don't indicate identity
-    # Including geographic/generic terms like USA, VIRGINIA, WASHINGTON, etc.
-    common_words = {
-        'OF', 'THE', 'AND', 'FOR', 'IN', 'A', 'AN', 'AT',
-        'USA', 'US', 'VIRGINIA', 'VA', 'AMERICA', 'AMERICAN',
-        'WASHINGTON', 'DC', 'D', 'C',  # Washington DC variations
-        'ALLIANCE', 'FOUNDATION', 'FUND', 'CENTER', 'CENTRE',  # Generic org words
-    }
-    vendor_words = {w for w in vendor_words if w not in common_words and len(w) >= 3}
-    irs_words = {w for w in irs_words if w not in common_words and len(w) >= 3}
+    return _significant_overlap(name_features(vendor_name), name_features(irs_name))
+
+def _significant_overlap(vendor: NameFeatures, irs: NameFeatures) -> bool:
+    vendor_words = vendor.significant_words
+    irs_words = irs.significant_words
 
     if not vendor_words or not irs_words:
         return False
 
-    # Calculate overlap
-    common = vendor_words.intersection(irs_words)
-
     # Require at least 60% overlap of the smaller set (increased from 50%)
     # This is stricter to avoid false positives
-    smaller_set_size = min(len(vendor_words), len(irs_words))
-    overlap_ratio = len(common) / smaller_set_size if smaller_set_size > 0 else 0
-
-    return overlap_ratio >= 0.6
+    common = vendor_words & irs_words
+    return len(common) / min(len(vendor_words), len(irs_words)) >= 0.6
 
 def is_valid_entity_match(vendor_name: str, irs_name: str) -> bool:
     """
@@ -196,18 +281,18 @@ def is_valid_entity_match(vendor_name: str, irs_name: str) -> bool:
     Prevents matching for-profit companies to nonprofit foundations.
     For example: "Nestle USA INC" should NOT match "NESTLE USA FOUNDATION"
     """
+    return features_match(name_features(vendor_name), name_features(irs_name))
+
+def features_match(vendor: NameFeatures, irs: NameFeatures) -> bool:
+    """is_valid_entity_match() on precomputed features."""
     # First check if names have significant overlap
-    if not has_significant_name_overlap(vendor_name, irs_name):
+    if not _significant_overlap(vendor, irs):
         return False
 
-    vendor_type = get_entity_type(vendor_name)
-    irs_type = get_entity_type(irs_name)
-
-    # If neither has a clear entity type, allow the match
-    if vendor_type is None and irs_type is None:
-        return True
+    vendor_type = vendor.entity_type
+    irs_type = irs.entity_type
 
-    # If only one has an entity type, allow the match
+    # If either has no clear entity type, allow the match
     # (e.g., "Big Brothers Big Sisters" vs "Big Brothers Big Sisters Foundation")
     if vendor_type is None or irs_type is None:
         return True
@@ -219,38 +304,42 @@ def is_valid_entity_match(vendor_name: str, irs_name: str) -> bool:
         return True
 
     # Allow foundation + inc combination (foundations can be incorporated)
-    if (vendor_type == 'foundation' and irs_type == 'inc') or \
-       (vendor_type == 'inc' and irs_type == 'foundation'):
+    if {vendor_type, irs_type} == {'foundation', 'inc'}:
         # Only if BOTH names contain "foundation"
-        if 'FOUNDATION' in vendor_name.upper() and 'FOUNDATION' in irs_name.upper():
+        if vendor.mentions_foundation and irs.mentions_foundation:
             return True
 
     # Otherwise, entity types must match
     return False
 
-def find_best_match(vendor_name: str, irs_index: Dict, irs_nonprofits: List[Dict], threshold: float = 0.70) -> Optional[Dict]:
+def find_best_match(vendor_name: str, token_index: IrsTokenIndex, threshold: float = 0.70,
+                    compat: bool = False, block: Optional[IndexBlock] = None) -> Optional[Dict]:
     """
     Find best IRS nonprofit match for a vendor name using optimized search.
 
     Args:
         vendor_name: CARDINAL vendor name
-        irs_index: Dictionary mapping normalized names to nonprofit records
-        irs_nonprofits: List of IRS nonprofit records (for fuzzy fallback)
+        token_index: Exact-name and token index over the IRS nonprofit records
         threshold: Minimum similarity score (0.0 to 1.0)
+        compat: Reproduce the difflib scores and decisions exactly
+                (rapidfuzz is then only used to prune candidates)
+        block: Only consider records in this state block (default: all)
 
     Returns:
         Best matching nonprofit record or None
     """
-    normalized_vendor = normalize_name(vendor_name)
+    vendor = name_features(vendor_name)
+    normalized_vendor = vendor.normalized
 
     if not normalized_vendor:
         return None
 
     # Try exact match first
-    if normalized_vendor in irs_index:
-        match = irs_index[normalized_vendor][0]
+    exact_id = token_index.exact_id(normalized_vendor, block)
+    if exact_id is not None:
+        match = token_index.records[exact_id]
         # Validate entity type compatibility
-        if not is_valid_entity_match(vendor_name, match['name']):
+        if not features_match(vendor, name_features(match['name'])):
             return None
         return {
             **match,
@@ -268,43 +357,72 @@ def find_best_match(vendor_name: str, irs_index: Dict, irs_nonprofits: List[Dict
     if not significant_words:
         significant_words = vendor_words
 
-    # Filter candidates: must share at least one significant word
-    candidates = []
-    for nonprofit in irs_nonprofits:
-        irs_name = nonprofit['normalized_name']
-        irs_words = set(irs_name.split())
-
-        # Check if any significant word overlaps
-        if any(word in irs_words for word in significant_words):
-            candidates.append(nonprofit)
+    # Candidates must share at least one significant word; the index caps
+    # them at the best-weighted 1000 when common words pull in more
+    candidate_ids = token_index.candidate_ids(significant_words, block=block)
+    if not candidate_ids:
+        return None
+    candidates = [token_index.records[i] for i in candidate_ids]
+
+    # Score every candidate with BOTH methods
+    # Method 1: Full string similarity (good for close matches)
+    # Method 2: Partial/word overlap similarity (good for truncated/extra words)
+    vendor_word_set = set(vendor_words)
+    partial_scores = [
+        calculate_partial_similarity(normalized_vendor, nonprofit['normalized_name'],
+                                     vendor_word_set, token_index.tokens[i])
+        for i, nonprofit in zip(candidate_ids, candidates)
+    ]
+    candidate_names = [nonprofit['normalized_name'] for nonprofit in candidates]
+
+    if compat or not HAS_RAPIDFUZZ:
+        # rapidfuzz Indel ratios bound difflib ratios from above
+        full_bounds = (score_full_similarity(normalized_vendor, candidate_names)
+                       if HAS_RAPIDFUZZ else [1.0] * len(candidates))
+        return _best_match_compat(vendor, candidates,
+                                  full_bounds, partial_scores, threshold)
+
+    full_scores = score_full_similarity(normalized_vendor, candidate_names)
+
+    # Highest score wins; ties go to the earlier candidate
+    scores = [max(full, partial) for full, partial in zip(full_scores, partial_scores)]
+    for j in sorted(range(len(candidates)), key=lambda j: -scores[j]):
+        if scores[j] < threshold:
+            break
+        # Validate entity type compatibility only for candidates that could win
+        if features_match(vendor, name_features(candidates[j]['name'])):
+            return {
+                **candidates[j],
+                'match_score': round(scores[j], 3),
+                'match_method': 'full' if full_scores[j] > partial_scores[j] else 'partial'
+            }
 
-    # If too many candidates, use only first word filter
-    if len(candidates) > 1000:
-        first_word = vendor_words[0]
-        candidates = [np for np in irs_nonprofits
-                     if first_word in np['normalized_name']]
+    return None
 
-    # If still too many, skip
-    if len(candidates) > 1000:
-        return None
+def _best_match_compat(vendor: NameFeatures, candidates: List[Dict],
+                       full_bounds: List[float], partial_scores: List[float],
+                       threshold: float) -> Optional[Dict]:
+    """
+    Pick the best candidate exactly as the difflib-only matcher did.
 
-    # Fuzzy match against candidates using BOTH methods
+    `full_bounds` are upper bounds on the difflib ratio (1.0 without rapidfuzz).
+    Candidates whose bound cannot beat the current best or reach the threshold
+    are skipped before the validation and difflib calls.
+    """
     best_match = None
     best_score = 0.0
     best_method = None
 
-    for nonprofit in candidates:
-        normalized_irs = nonprofit['normalized_name']
+    for nonprofit, bound, partial_score in zip(candidates, full_bounds, partial_scores):
+        upper = max(bound + 1e-9, partial_score)
+        if upper <= best_score or upper < threshold:
+            continue
 
         # Validate entity type compatibility BEFORE scoring
-        if not is_valid_entity_match(vendor_name, nonprofit['name']):
+        if not features_match(vendor, name_features(nonprofit['name'])):
             continue
 
-        # Method 1: Full string similarity (good for close matches)
-        full_score = calculate_similarity(normalized_vendor, normalized_irs)
-
-        # Method 2: Partial/word overlap similarity (good for truncated/extra words)
-        partial_score = calculate_partial_similarity(normalized_vendor, normalized_irs)
+        full_score = calculate_similarity(vendor.normalized, nonprofit['normalized_name'])
 
         # Take the better of the two scores
         score = max(full_score, partial_score)
@@ -324,74 +442,278 @@ def find_best_match(vendor_name: str, irs_index: Dict, irs_nonprofits: List[Dict
 
     return None
 
-def match_vendors():
-    """Match CARDINAL vendors to IRS nonprofits."""
+def match_vendor(vendor_name: str, token_index: IrsTokenIndex, compat: bool = False) -> Optional[Dict]:
+    """
+    Match one vendor: exact normalized-name match first, then fuzzy.
+
+    Both steps walk the index's state blocks in order (Virginia, then
+    neighbours, then national) and stop at the first block with a match, so a
+    Virginia organization is preferred over a same-named one elsewhere. An
+    exact match in any block still beats a fuzzy one.
+
+    Returns:
+        Match record with 'match_score' and 'match_type', or None
+    """
+    normalized_vendor = normalize_name(vendor_name)
+
+    # Try exact match first
+    for block in token_index.blocks:
+        exact_id = token_index.exact_id(normalized_vendor, block)
+        if exact_id is not None:
+            # Exact match found
+            irs_match = token_index.records[exact_id]  # Take first if multiple
+            return {
+                **irs_match,
+                'match_score': 1.0,
+                'match_type': 'exact'
+            }
+
+    # Try fuzzy match with optimized search (lowered threshold to 0.70)
+    for block in token_index.blocks:
+        best_match = find_best_match(vendor_name, token_index, threshold=0.70, compat=compat, block=block)
+        if best_match:
+            return {
+                **best_match,
+                'match_type': 'fuzzy'
+            }
+    return None
+
+# Worker state: set once per process by _init_worker. Under fork the index is
+# inherited copy-on-write from the parent instead of being pickled per task.
+_worker_index: Optional[IrsTokenIndex] = None
+_worker_compat = False
+
+def _init_worker(token_index: IrsTokenIndex, compat: bool):
+    global _worker_index, _worker_compat
+    _worker_index = token_index
+    _worker_compat = compat
+
+def _match_chunk(chunk: List[str]) -> List[Tuple[str, Optional[Dict]]]:
+    return [(vendor_name, match_vendor(vendor_name, _worker_index, _worker_compat)) for vendor_name in chunk]
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_irs_index() -> Tuple[IrsTokenIndex, str]:
+    """
+    Load the IRS nonprofit index.
+
+    Prefers the memory-mapped reference from process_irs_data.py (prebuilt
+    index, nothing decoded up front) and falls back to building the index from
+    the legacy irs_nonprofits_va.json.
+
+    Returns:
+        (token index, IRS snapshot hash)
+    """
+    if IRS_REFERENCE.exists():
+        reference = IrsReference(IRS_REFERENCE)
+        print(f"✅ Mapped {len(reference):,} IRS 501(c)(3) nonprofits from {IRS_REFERENCE.name}")
+        return reference.token_index(), reference.snapshot
+
+    with open(IRS_FILE, 'r', encoding='utf-8') as f:
+        irs_nonprofits = json.load(f)
+    print(f"✅ Loaded {len(irs_nonprofits):,} IRS 501(c)(3) nonprofits from {IRS_FILE.name}")
+    print("🔍 Creating search index...")
+    return IrsTokenIndex(irs_nonprofits), file_sha256(IRS_FILE)
+
+def run_key(compat: bool, irs_snapshot: str) -> Dict:
+    """
+    Identifies what a match result depends on besides the vendor name:
+    the IRS snapshot, the matcher logic and the scorer in use.
+    """
+    return {
+        'irs_snapshot': irs_snapshot,
+        'matcher_version': MATCHER_VERSION,
+        'scorer': 'compat' if compat else ('rapidfuzz' if HAS_RAPIDFUZZ else 'difflib'),
+    }
+
+def load_match_cache(key: Dict, path: Path = MATCH_CACHE_FILE) -> Dict[str, Optional[Dict]]:
+    """
+    Load cached match results if they were computed under the same run key.
+
+    Returns:
+        vendor_name -> match record (None for no match); empty if the cache is
+        missing or was built from another IRS snapshot or matcher version
+    """
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        cache = json.load(f)
+    if cache.get('key') != key:
+        return {}
+    return cache['matches']
+
+def save_match_cache(key: Dict, results: Dict[str, Optional[Dict]], path: Path = MATCH_CACHE_FILE):
+    """Persist every vendor's match result (including no-match) under `key`."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'key': key, 'matches': results}, f)
+    tmp_path.replace(path)
+
+def diff_matches(previous: Dict[str, Dict], current: Dict[str, Dict]) -> Dict[str, List[str]]:
+    """
+    Compare two vendor_irs_matches.json payloads.
+
+    Returns:
+        'new': vendors matched now but not before
+        'changed': vendors now matched to a different EIN
+        'removed': vendors no longer matched
+    """
+    return {
+        'new': sorted(v for v in current if v not in previous),
+        'changed': sorted(v for v in current if v in previous and current[v]['ein'] != previous[v]['ein']),
+        'removed': sorted(v for v in previous if v not in current),
+    }
+
+def load_checkpoint(key: Dict, path: Path = CHECKPOINT_FILE) -> Dict[str, Optional[Dict]]:
+    """
+    Read finished vendors from a checkpoint written under the same run key.
+
+    A torn final line left by an interrupted run is cut off so that new
+    results can be appended after the last complete one.
+
+    Returns:
+        vendor_name -> match record (None for no match); empty if there is no
+        usable checkpoint
+    """
+    done: Dict[str, Optional[Dict]] = {}
+    if not path.exists():
+        return done
+
+    with open(path, 'rb') as f:
+        try:
+            if json.loads(f.readline()) != key:
+                return done
+        except ValueError:
+            return done
+
+        good_size = f.tell()
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            done[entry['vendor']] = entry['match']
+            good_size += len(line)
+
+    if good_size < path.stat().st_size:
+        with open(path, 'r+b') as f:
+            f.truncate(good_size)
+    return done
+
+def match_vendors(compat: bool = False, workers: int = 1, chunk_size: int = CHUNK_SIZE,
+                  use_cache: bool = True):
+    """
+    Match CARDINAL vendors to IRS nonprofits.
+
+    Results are cached in MATCH_CACHE_FILE keyed by vendor name under the run
+    key (IRS snapshot hash, MATCHER_VERSION, scorer), so reruns only match
+    vendors that are new; a new IRS snapshot or matcher version rematches
+    everything. Results are also appended to CHECKPOINT_FILE as each chunk of
+    vendors finishes, so an interrupted run resumes where it stopped.
+
+    Vendors whose match is new or changed since the previous
+    vendor_irs_matches.json are listed in MATCH_CHANGES_FILE for
+    fetch_990_links.py.
+
+    Args:
+        compat: Keep the difflib match decisions (see find_best_match)
+        workers: Worker processes (1 = match in this process)
+        chunk_size: Vendors per work unit / checkpoint write
+        use_cache: Reuse cached results (False rematches every vendor)
+    """
     
     print("=" * 80)
     print("MATCHING CARDINAL VENDORS TO IRS NONPROFITS")
     print("=" * 80)
+    if not HAS_RAPIDFUZZ:
+        print("⚠️  rapidfuzz not installed, scoring with difflib (pip install rapidfuzz)")
+    elif compat:
+        print("🔒 Compatibility mode: difflib scores, rapidfuzz pruning")
     
-    # Load IRS nonprofits
+    # Load IRS nonprofits with exact-name and token indexes for all vendors
     print("📂 Loading IRS nonprofit database...")
-    with open(IRS_FILE, 'r', encoding='utf-8') as f:
-        irs_nonprofits = json.load(f)
-    print(f"✅ Loaded {len(irs_nonprofits):,} IRS 501(c)(3) nonprofits")
-    
-    # Create lookup index by normalized name for faster matching
-    print("🔍 Creating search index...")
-    irs_index = {}
-    for nonprofit in irs_nonprofits:
-        normalized = nonprofit['normalized_name']
-        if normalized not in irs_index:
-            irs_index[normalized] = []
-        irs_index[normalized].append(nonprofit)
+    token_index, irs_snapshot = load_irs_index()
+    print(f"✅ Indexed {len(token_index.postings):,} distinct name tokens")
+    if len(token_index.blocks) > 1:
+        print("   State blocks: " + " → ".join(
+            f"{block.label} ({block.end - block.start:,})" for block in token_index.blocks))
     
     # Load CARDINAL vendors
     print("📂 Loading CARDINAL vendor data...")
     vendors = set()
-    with gzip.open(CARDINAL_FILE, 'rt', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            vendor_name = row.get('vendor_name', '').strip()
-            if vendor_name:
-                vendors.add(vendor_name)
+    for row in iter_rows(CARDINAL_FILE, columns=['vendor_name']):
+        vendor_name = row['vendor_name'].strip()
+        if vendor_name:
+            vendors.add(vendor_name)
     
     print(f"✅ Found {len(vendors):,} unique CARDINAL vendors")
+
+    # Reuse cached results and resume from a checkpoint written under the same key
+    key = run_key(compat, irs_snapshot)
+    cached = load_match_cache(key, MATCH_CACHE_FILE) if use_cache else {}
+    results = {v: cached[v] for v in vendors if v in cached}
+    if results:
+        print(f"♻️  Reusing {len(results):,} cached results (IRS snapshot {key['irs_snapshot'][:12]})")
+    resumed = load_checkpoint(key, CHECKPOINT_FILE)
+    if resumed:
+        print(f"♻️  Resuming: {len(resumed):,} vendors already matched in {CHECKPOINT_FILE.name}")
+        results.update(resumed)
+    pending = [v for v in sorted(vendors) if v not in results]
+
+    # Normalized names, significant words and entity types, once per name.
+    # Computed before the pool starts so forked workers inherit them.
+    print("🔍 Precomputing name features...")
+    feature_count = 0
+    if len(token_index) <= PRECOMPUTE_IRS_FEATURES_LIMIT:
+        feature_count += precompute_name_features(np['name'] for np in token_index.records)
+    feature_count += precompute_name_features(pending)
+    print(f"✅ Computed features for {feature_count:,} names")
     
     # Match vendors to IRS nonprofits
-    print("\n🔗 Matching vendors to IRS nonprofits...")
-    matches = {}
-    exact_matches = 0
-    fuzzy_matches = 0
-    no_matches = 0
-    
-    for i, vendor_name in enumerate(sorted(vendors), 1):
-        if i % 500 == 0:
-            print(f"   Processed {i:,} / {len(vendors):,} vendors... (Exact: {exact_matches}, Fuzzy: {fuzzy_matches}, None: {no_matches})")
-
-        normalized_vendor = normalize_name(vendor_name)
-
-        # Try exact match first
-        if normalized_vendor in irs_index:
-            # Exact match found
-            irs_match = irs_index[normalized_vendor][0]  # Take first if multiple
-            matches[vendor_name] = {
-                **irs_match,
-                'match_score': 1.0,
-                'match_type': 'exact'
-            }
-            exact_matches += 1
+    print(f"\n🔗 Matching {len(pending):,} vendors to IRS nonprofits ({workers} worker{'s' if workers != 1 else ''})...")
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+
+    CHECKPOINT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    mode = 'a' if resumed else 'w'
+    with open(CHECKPOINT_FILE, mode, encoding='utf-8') as checkpoint:
+        if mode == 'w':
+            checkpoint.write(json.dumps(key) + '\n')
+
+        if workers > 1:
+            context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn')
+            pool = context.Pool(workers, initializer=_init_worker, initargs=(token_index, compat))
+            chunk_results = pool.imap_unordered(_match_chunk, chunks)
         else:
-            # Try fuzzy match with optimized search (lowered threshold to 0.70)
-            best_match = find_best_match(vendor_name, irs_index, irs_nonprofits, threshold=0.70)
-            if best_match:
-                matches[vendor_name] = {
-                    **best_match,
-                    'match_type': 'fuzzy'
-                }
-                fuzzy_matches += 1
-            else:
-                no_matches += 1
+            pool = None
+            _init_worker(token_index, compat)
+            chunk_results = map(_match_chunk, chunks)
+
+        try:
+            for chunk_result in chunk_results:
+                for vendor_name, match in chunk_result:
+                    results[vendor_name] = match
+                    checkpoint.write(json.dumps({'vendor': vendor_name, 'match': match}) + '\n')
+                checkpoint.flush()
+
+                done = len(results)
+                if done % 500 < chunk_size or done == len(vendors):
+                    print(f"   Processed {done:,} / {len(vendors):,} vendors...")
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    matches = {v: results[v] for v in sorted(vendors) if results.get(v)}
+    exact_matches = sum(1 for m in matches.values() if m['match_type'] == 'exact')
+    fuzzy_matches = len(matches) - exact_matches
+    no_matches = len(vendors) - len(matches)
     
     print(f"\n✅ Matching complete!")
     print(f"   Exact matches: {exact_matches:,}")
@@ -399,15 +721,43 @@ def match_vendors():
     print(f"   No matches: {no_matches:,}")
     print(f"   Total matched: {len(matches):,} / {len(vendors):,} ({len(matches)/len(vendors)*100:.1f}%)")
     
+    # Record what changed since the previous output for fetch_990_links.py
+    previous = {}
+    if OUTPUT_FILE.exists():
+        with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    changes = diff_matches(previous, matches)
+    print(f"   New since last run: {len(changes['new']):,}, "
+          f"changed: {len(changes['changed']):,}, removed: {len(changes['removed']):,}")
+
     # Save matches
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
         json.dump(matches, f, indent=2)
+    save_match_cache(key, {v: results[v] for v in sorted(vendors)}, MATCH_CACHE_FILE)
+    with open(MATCH_CHANGES_FILE, 'w', encoding='utf-8') as f:
+        json.dump({
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            **key,
+            **changes,
+        }, f, indent=2)
+    CHECKPOINT_FILE.unlink()
     
     print(f"\n✅ Saved matches to: {OUTPUT_FILE}")
     print(f"   File size: {OUTPUT_FILE.stat().st_size / 1024 / 1024:.2f} MB")
+    print(f"   Changes: {MATCH_CHANGES_FILE}")
     
     return matches
 
 if __name__ == '__main__':
-    matches = match_vendors()
-
+    parser = argparse.ArgumentParser(description='Match CARDINAL vendors to IRS nonprofits')
+    parser.add_argument('--compat', action='store_true',
+                        help="keep today's difflib match decisions (for regression checks)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='worker processes (default: all cores; 1 = single process)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help=f'vendors per work unit and checkpoint write (default: {CHUNK_SIZE})')
+    parser.add_argument('--rematch', action='store_true',
+                        help='ignore cached results and rematch every vendor')
+    args = parser.parse_args()
+    matches = match_vendors(compat=args.compat, workers=args.workers, chunk_size=args.chunk_size,
+                            use_cache=not args.rematch)
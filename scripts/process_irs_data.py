@@ -1,25 +1,53 @@
 #!/usr/bin/env python3
 """
-Process IRS Tax Exempt Organization data for Virginia nonprofits.
+Process IRS Tax Exempt Organization data into the matcher's IRS reference.
 
 This script:
-1. Reads the IRS EO BMF (Exempt Organizations Business Master File) for Virginia
-2. Filters for 501(c)(3) charitable organizations
-3. Creates a clean dataset for name matching with CARDINAL vendor data
-4. Outputs JSON file for frontend integration
+1. Streams IRS EO BMF (Exempt Organizations Business Master File) CSVs -
+   every data/irs/eo*.csv by default (eo_va.csv, eo_dc.csv, eo_md.csv, ...
+   or the national eo1.csv-eo4.csv regional files), or the files given on
+   the command line
+2. Filters for 501(c)(3) charitable organizations (first row per EIN wins)
+3. Normalizes names for matching with CARDINAL vendor data
+4. Writes the compact, memory-mapped reference (records grouped into state
+   blocks, normalized names and the prebuilt token index) read by
+   match_vendors_to_irs.py
+
+Usage:
+    python scripts/process_irs_data.py [eo_va.csv eo_dc.csv ...]
 """
 
 import csv
-import json
+import hashlib
 import re
+import sys
+from array import array
 from pathlib import Path
 from typing import Dict, List
 
+from irs_reference import (INT_COLUMNS, IRS_REFERENCE_FILE, STRING_COLUMNS, TRAILING_STRING_COLUMNS,
+                           IrsReference, StringColumnBuilder, write_reference)
+
 # Paths
 BASE_DIR = Path(__file__).parent.parent
-IRS_DATA_FILE = BASE_DIR / "data" / "irs" / "eo_va.csv"
-OUTPUT_DIR = BASE_DIR / "frontend" / "public" / "data"
-OUTPUT_FILE = OUTPUT_DIR / "irs_nonprofits_va.json"
+IRS_DATA_DIR = BASE_DIR / "data" / "irs"
+OUTPUT_FILE = IRS_REFERENCE_FILE
+
+# Remove common legal suffixes for better matching
+SUFFIX_RE = re.compile('|'.join([
+    r'\bINCORPORATED\b',
+    r'\bINC\.?\b',
+    r'\bCORPORATION\b',
+    r'\bCORP\.?\b',
+    r'\bLIMITED\b',
+    r'\bLTD\.?\b',
+    r'\bL\.L\.C\.?\b',
+    r'\bLLC\b',
+    r'\bCOMPANY\b',
+    r'\bCO\.?\b',
+]))
+PUNCTUATION_RE = re.compile(r'[^\w\s]')
+WHITESPACE_RE = re.compile(r'\s+')
 
 def normalize_name(name: str) -> str:
     """
@@ -33,124 +61,127 @@ def normalize_name(name: str) -> str:
     if not name:
         return ""
     
-    # Convert to uppercase
-    normalized = name.upper()
-    
-    # Remove common legal suffixes for better matching
-    suffixes = [
-        r'\bINCORPORATED\b',
-        r'\bINC\.?\b',
-        r'\bCORPORATION\b',
-        r'\bCORP\.?\b',
-        r'\bLIMITED\b',
-        r'\bLTD\.?\b',
-        r'\bL\.L\.C\.?\b',
-        r'\bLLC\b',
-        r'\bCOMPANY\b',
-        r'\bCO\.?\b',
-    ]
-    
-    for suffix in suffixes:
-        normalized = re.sub(suffix, '', normalized)
+    normalized = SUFFIX_RE.sub('', name.upper())
     
     # Remove punctuation except spaces
-    normalized = re.sub(r'[^\w\s]', ' ', normalized)
+    normalized = PUNCTUATION_RE.sub(' ', normalized)
     
     # Remove extra whitespace
-    normalized = re.sub(r'\s+', ' ', normalized).strip()
+    normalized = WHITESPACE_RE.sub(' ', normalized).strip()
     
     return normalized
 
-def process_irs_data():
-    """Process IRS data and create clean dataset."""
+def default_sources() -> List[Path]:
+    """All EO BMF extracts in data/irs."""
+    return sorted(IRS_DATA_DIR.glob('eo*.csv'))
+
+def sources_snapshot(paths: List[Path]) -> str:
+    """Content hash over the source files (identifies an IRS snapshot)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.name.encode('utf-8') + b'\0')
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+def process_irs_data(sources: List[Path] = None):
+    """Stream the BMF CSVs and write the IRS reference."""
     
     print("=" * 80)
     print("PROCESSING IRS TAX EXEMPT ORGANIZATION DATA")
     print("=" * 80)
     
-    if not IRS_DATA_FILE.exists():
-        print(f"❌ Error: IRS data file not found: {IRS_DATA_FILE}")
+    sources = sources or default_sources()
+    missing = [path for path in sources if not path.exists()]
+    if not sources or missing:
+        print(f"❌ Error: IRS data file not found: {missing[0] if missing else IRS_DATA_DIR / 'eo*.csv'}")
         return
     
-    nonprofits = []
+    strings: Dict[str, StringColumnBuilder] = {
+        column: StringColumnBuilder() for column in STRING_COLUMNS + TRAILING_STRING_COLUMNS
+    }
+    ints: Dict[str, array] = {column: array('q') for column in INT_COLUMNS}
+    seen_eins = set()
     total_count = 0
     c3_count = 0
     
-    with open(IRS_DATA_FILE, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        
-        for row in reader:
-            total_count += 1
-            
-            # Filter for 501(c)(3) organizations only
-            subsection = row.get('SUBSECTION', '').strip()
-            if subsection != '03':
-                continue
-            
-            c3_count += 1
-            
-            ein = row.get('EIN', '').strip()
-            name = row.get('NAME', '').strip()
-            city = row.get('CITY', '').strip()
-            state = row.get('STATE', '').strip()
-            zip_code = row.get('ZIP', '').strip()
-            
-            # NTEE code (National Taxonomy of Exempt Entities)
-            ntee_cd = row.get('NTEE_CD', '').strip()
-            
-            # Asset and income codes
-            asset_amt = row.get('ASSET_AMT', '0').strip()
-            income_amt = row.get('INCOME_AMT', '0').strip()
-            
-            # Status (01 = unconditional exemption)
-            status = row.get('STATUS', '').strip()
-            
-            # Create normalized name for matching
-            normalized_name = normalize_name(name)
-            
-            nonprofit = {
-                'ein': ein,
-                'name': name,
-                'normalized_name': normalized_name,
-                'city': city,
-                'state': state,
-                'zip': zip_code,
-                'ntee_code': ntee_cd,
-                'asset_amount': int(asset_amt) if asset_amt.isdigit() else 0,
-                'income_amount': int(income_amt) if income_amt.isdigit() else 0,
-                'status': status,
-                'subsection': '501(c)(3)',
+    for path in sources:
+        print(f"📂 Streaming {path.name}...")
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            positions = {name: i for i, name in enumerate(header)}
+            subsection_at = positions.get('SUBSECTION')
+            fields = {
+                'ein': positions.get('EIN'),
+                'name': positions.get('NAME'),
+                'city': positions.get('CITY'),
+                'state': positions.get('STATE'),
+                'zip': positions.get('ZIP'),
+                # NTEE code (National Taxonomy of Exempt Entities)
+                'ntee_code': positions.get('NTEE_CD'),
+                # Status (01 = unconditional exemption)
+                'status': positions.get('STATUS'),
+                # Accounting period: month the fiscal year ends (01-12)
+                'fiscal_year_end_month': positions.get('ACCTPD'),
             }
+            asset_at = positions.get('ASSET_AMT')
+            income_at = positions.get('INCOME_AMT')
             
-            nonprofits.append(nonprofit)
+            def field(row, index, default=''):
+                return row[index].strip() if index is not None and index < len(row) else default
+            
+            for row in reader:
+                total_count += 1
+                
+                # Filter for 501(c)(3) organizations only
+                if field(row, subsection_at) != '03':
+                    continue
+                
+                ein = field(row, fields['ein'])
+                if ein in seen_eins:
+                    continue
+                seen_eins.add(ein)
+                c3_count += 1
+                
+                name = field(row, fields['name'])
+                for column, index in fields.items():
+                    strings[column].append(field(row, index))
+                # Create normalized name for matching
+                strings['normalized_name'].append(normalize_name(name))
+                
+                # Asset and income amounts
+                asset_amt = field(row, asset_at, '0')
+                income_amt = field(row, income_at, '0')
+                ints['asset_amount'].append(int(asset_amt) if asset_amt.isdigit() else 0)
+                ints['income_amount'].append(int(income_amt) if income_amt.isdigit() else 0)
     
     print(f"✅ Processed {total_count:,} total organizations")
     print(f"✅ Found {c3_count:,} 501(c)(3) charitable organizations")
     
-    # Sort by name
-    nonprofits.sort(key=lambda x: x['name'])
-    
-    # Create output directory if it doesn't exist
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    
-    # Write to JSON file
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(nonprofits, f, indent=2)
+    summary = write_reference(OUTPUT_FILE, strings, ints,
+                              snapshot=sources_snapshot(sources),
+                              sources=[path.name for path in sources])
     
     print(f"✅ Saved to: {OUTPUT_FILE}")
+    print(f"   Records: {summary['records']:,}, index tokens: {summary['tokens']:,}")
+    for block in summary['state_blocks']:
+        print(f"   State block {block['label']}: {block['end'] - block['start']:,} records")
     print(f"   File size: {OUTPUT_FILE.stat().st_size / 1024 / 1024:.2f} MB")
     
     # Print sample entries
     print("\n" + "=" * 80)
     print("SAMPLE ENTRIES (first 10)")
     print("=" * 80)
-    for i, nonprofit in enumerate(nonprofits[:10], 1):
-        print(f"{i:2}. {nonprofit['name']}")
-        print(f"    EIN: {nonprofit['ein']}")
-        print(f"    City: {nonprofit['city']}, {nonprofit['state']} {nonprofit['zip']}")
-        print(f"    Normalized: {nonprofit['normalized_name']}")
-        print()
+    with IrsReference(OUTPUT_FILE) as reference:
+        for i in range(min(10, len(reference))):
+            nonprofit = reference.record(i)
+            print(f"{i + 1:2}. {nonprofit['name']}")
+            print(f"    EIN: {nonprofit['ein']}")
+            print(f"    City: {nonprofit['city']}, {nonprofit['state']} {nonprofit['zip']}")
+            print(f"    Normalized: {nonprofit['normalized_name']}")
+            print()
 
 if __name__ == '__main__':
-    process_irs_data()
-
+    process_irs_data([Path(arg) for arg in sys.argv[1:]])
@@ -3,99 +3,25 @@
 Show what entities are being excluded by the enhanced NGO filter.
 """
 
-import csv
-import gzip
-import json
 from collections import defaultdict
 
-# Load transfer payments
-vendor_records = defaultdict(list)
-with gzip.open('frontend/public/decoder/transfer_payments_full.csv.gz', 'rt', encoding='utf-8') as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        if row.get('expense_type') == 'Grnt-Nongovernmental Org':
-            vendor_records[row['vendor_name']].append(row)
+from transfer_payments import NGO_GRANT_EXPENSE_TYPE
+from vendor_classifier import exclusion_reason
+from vendor_cube import load_cube, vendor_rollups
 
-# Enhanced exclusion keywords
-exclude_keywords = [
-    # Authorities and Commissions
-    'AUTHORITY', 'COMMISSION', 'AIRPORT', 'RAILROAD',
-    'REDEVELOPMENT', 'HOUSING AUTHORITY', 'REDEVELOPMENT AND HOUSING',
-    'PLANNING DISTRICT', 'PLANNING DISTR', 'PDC',
-    'ECONOMIC DEVELOPMENT PARTNERSHIP', 'TOURISM',
-    'RAIL AUTHORITY', 'COMMERCIAL SPACE',
-    
-    # Insurance/Health Plans
-    'INSURANCE', 'HEALTH PLAN', 'HMO', 'CIGNA', 'SENTARA', 'KAISER', 'HEALTHKEEPERS', 'OPTIMA', 'OPTIMUM',
-    
-    # Universities and Colleges
-    'UNIVERSITY', 'COLLEGE', 'INSTITUTE OF TECHNOLOGY',
-    'VIRGINIA TECH', 'VA TECH', 'VPI', 'VIRGINIA POLYTECHNIC',
-    'VIRGINIA COMMONWEALTH UNIVERSITY', 'VCU',
-    'GEORGE MASON UNIVERSITY', 'GMU',
-    'JAMES MADISON UNIVERSITY', 'JMU',
-    'OLD DOMINION UNIVERSITY', 'ODU',
-    'WILLIAM & MARY', 'WILLIAM AND MARY',
-    'RADFORD UNIVERSITY', 'LONGWOOD UNIVERSITY',
-    'CHRISTOPHER NEWPORT UNIVERSITY', 'CNU',
-    'VIRGINIA STATE UNIVERSITY', 'VSU',
-    'NORFOLK STATE UNIVERSITY', 'NSU',
-    'UNIVERSITY OF VIRGINIA', 'UVA',
-    'VIRGINIA MILITARY INSTITUTE', 'VMI',
-    
-    # Law Enforcement
-    'SHERIFF', "SHERIFF'S OFFICE", 'POLICE DEPARTMENT',
-    
-    # Correctional/Detention Facilities
-    'DETENTION', 'CORRECTIONAL', 'JAIL', 'PRISON',
-    'JUVENILE DETENTION', 'DETENTION CENTER',
-    
-    # Libraries (often government-run)
-    'LIBRARY SYSTEM', 'REGIONAL LIBRARY', 'PUBLIC LIBRARY',
-    
-    # State/Local Government Departments
-    'DEPARTMENT OF', 'DEPT OF', 'DEPARTMENT FOR',
-    'DIVISION OF', 'OFFICE OF',
-    
-    # Other
-    'DETAILED DATA NOT YET AVAILABLE',
-    'HUNTINGTON INGALLS'
-]
-
-local_govt_patterns = [
-    'CITY OF', 'TOWN OF', 'COUNTY OF',
-    'BOARD OF SUPERVISORS', 'CIRCUIT COURT', 'PUBLIC SCHOOLS',
-    'COMMUNITY SERVICES BOARD',
-    'DIRECTOR OF FINANCE',
-    'MISCELLANEOUS ADJUSTMENT',
-    '** CONTACT AGENCY FOR MORE INFO **'
-]
+# Load transfer payments
+vendor_rollups_ngo = vendor_rollups(load_cube(), expense_types={NGO_GRANT_EXPENSE_TYPE})
 
-# Find excluded entities
+# Find excluded entities, grouped by the keyword that triggered exclusion
 excluded_by_category = defaultdict(list)
 
-for vendor_name, records in vendor_records.items():
-    name_upper = vendor_name.upper()
-    
-    # Check which keyword triggered exclusion
-    for keyword in exclude_keywords:
-        if keyword in name_upper:
-            total = sum(float(r.get('amount', 0) or 0) for r in records)
-            excluded_by_category[keyword].append({
-                'name': vendor_name,
-                'total': total
-            })
-            break
-    else:
-        # Check local govt patterns
-        for pattern in local_govt_patterns:
-            if pattern in name_upper:
-                total = sum(float(r.get('amount', 0) or 0) for r in records)
-                excluded_by_category[pattern].append({
-                    'name': vendor_name,
-                    'total': total
-                })
-                break
+for vendor_name, rollup in vendor_rollups_ngo.items():
+    reason = exclusion_reason(vendor_name)
+    if reason:
+        excluded_by_category[reason].append({
+            'name': vendor_name,
+            'total': rollup['total']
+        })
 
 # Print results
 print('🚫 Entities Excluded by Enhanced NGO Filter\n')
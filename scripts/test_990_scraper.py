@@ -10,7 +10,7 @@ from pathlib import Path
 # Add parent directory to path to import from fetch_990_links
 sys.path.insert(0, str(Path(__file__).parent))
 
-from fetch_990_links import scrape_990_filings_from_website, extract_filings_with_regex
+from fetch_990_links import scrape_990_filings_from_website
 
 def test_big_homies():
     """Test scraping Big Homies Inc (EIN: 85-2229451)"""
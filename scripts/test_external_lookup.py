@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test the shared external-lookup service against a local stub search API.
+
+The stub (http.server on 127.0.0.1) answers /search?q=NAME with a match for
+names starting with "ORG", an empty result for names starting with "NONE",
+404 for "GONE", 500 for "FAIL" and JSON of an unexpected shape for "ODD".
+It is reached both as 127.0.0.1 and as localhost, so the two act as
+separate hosts with their own limits. No network access is needed.
+
+Checks:
+1. Lookups are sent highest priority (spend) first
+2. Matches and "not found" answers are cached; failures, including parser
+   errors, are not
+3. A second run sends requests only for the failed lookups
+4. Expired cache entries are looked up again
+5. Each host stays within its own concurrency cap
+"""
+
+import asyncio
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, urlsplit
+
+# Add parent directory to path to import from external_lookup
+sys.path.insert(0, str(Path(__file__).parent))
+
+from external_lookup import FOUND_TTL_DAYS, HostLimit, LookupService, LookupSource
+
+
+class StubState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.max_in_flight = {}
+        self.requests = []  # (host, query)
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            host = self.headers.get('Host', '').split(':')[0]
+            query = parse_qs(urlsplit(self.path).query)['q'][0]
+            with state.lock:
+                state.requests.append((host, query))
+                state.in_flight[host] = state.in_flight.get(host, 0) + 1
+                state.max_in_flight[host] = max(state.max_in_flight.get(host, 0), state.in_flight[host])
+            try:
+                time.sleep(0.05)
+                self._respond(query)
+            finally:
+                with state.lock:
+                    state.in_flight[host] -= 1
+
+        def _respond(self, query: str):
+            if query.startswith('GONE'):
+                return self._send(404, b'not found')
+            if query.startswith('FAIL'):
+                return self._send(500, b'error')
+            if query.startswith('ODD'):
+                return self._send(200, json.dumps({'error': 'unexpected'}).encode('utf-8'))
+            results = [{'name': query.title()}] if query.startswith('ORG') else []
+            self._send(200, json.dumps({'results': results}).encode('utf-8'))
+
+        def _send(self, status: int, body: bytes):
+            self.send_response(status)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def parse_stub(body: bytes):
+    results = json.loads(body)['results']
+    return results[0] if results else None
+
+
+def test_lookup_service():
+    """Run lookups against the stub twice and check caching and ordering"""
+    print("=" * 70)
+    print("Testing external lookup service against a local stub API")
+    print("=" * 70)
+    print()
+
+    state = StubState()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_port
+
+    def source(name: str, host: str) -> LookupSource:
+        return LookupSource(name, lambda q: f"http://{host}:{port}/search?q={quote(q)}", parse_stub)
+
+    ip_source = source('stub_ip', '127.0.0.1')
+    local_source = source('stub_local', 'localhost')
+    limits = {'127.0.0.1': HostLimit(concurrency=1, rate=0), 'localhost': HostLimit(concurrency=3, rate=0)}
+    cache_dir = Path(tempfile.mkdtemp(prefix='lookups_'))
+
+    # Spend is deliberately not in name order
+    items = [(f"{kind} {i}", float((i * 37) % 101)) for i, kind in
+             enumerate(['ORG', 'NONE', 'GONE', 'FAIL', 'ODD'] * 4)]
+    items.append(items[0])  # duplicates are looked up once
+
+    async def run_both():
+        service = LookupService(host_limits=limits, retries=0, cache_dir=cache_dir)
+        collected = {}
+
+        async def collect(src):
+            collected[src.name] = {r.query: r async for r in service.lookup_all(src, items)}
+
+        try:
+            await asyncio.gather(collect(ip_source), collect(local_source))
+        finally:
+            service.close()
+        return collected
+
+    ok = True
+
+    def check(condition, message):
+        nonlocal ok
+        print(f"{'✅' if condition else '❌'} {message}")
+        ok = ok and condition
+
+    try:
+        # 1. First run: everything goes to the network
+        first = asyncio.run(asyncio.wait_for(run_both(), timeout=30))
+        ip_results = first['stub_ip']
+        statuses = {q: r.status for q, r in ip_results.items()}
+        ip_order = [q for host, q in state.requests if host == '127.0.0.1']
+        by_priority = [q for q, _ in sorted(dict(items).items(), key=lambda kv: -kv[1])]
+
+        check(len(ip_results) == 20 and all(r.source == 'network' for r in ip_results.values()),
+              "first run looks up all 20 distinct queries")
+        check(ip_order == by_priority, "concurrency-1 host is queried highest spend first")
+        check(all(statuses[q] == {'ORG': 'found', 'NONE': 'not_found', 'GONE': 'not_found',
+                                  'FAIL': 'error', 'ODD': 'error'}[q.split()[0]] for q in statuses),
+              "matches, empty results, 404s, failures and unparsable responses are told apart")
+        check(ip_results['ORG 0'].data == {'name': 'Org 0'}, "match data parsed from the response")
+        check(state.max_in_flight.get('127.0.0.1') == 1 and 1 < state.max_in_flight.get('localhost', 0) <= 3,
+              f"per-host caps: 127.0.0.1 {state.max_in_flight.get('127.0.0.1')}/1, "
+              f"localhost {state.max_in_flight.get('localhost')}/3")
+
+        # 2. Second run: only failures are retried
+        state.requests.clear()
+        second = asyncio.run(run_both())
+        retried = sorted(q for _, q in state.requests)
+        failed = sorted([q for q in statuses if statuses[q] == 'error'] * 2)
+        check(retried == failed, f"second run sent {len(state.requests)} request(s), all for failed lookups")
+        check({q: r.status for q, r in second['stub_ip'].items()} == statuses,
+              "second run gives the same answers from the cache")
+
+        # 3. Expired entries are looked up again
+        cache_file = cache_dir / 'stub_ip.jsonl'
+        entries = [json.loads(line) for line in cache_file.read_text().splitlines()]
+        for entry in entries:
+            if entry['query'] == 'ORG 0':
+                entry['fetched_at'] -= (FOUND_TTL_DAYS + 1) * 86400
+        cache_file.write_text(''.join(json.dumps(e) + '\n' for e in entries))
+        state.requests.clear()
+        asyncio.run(run_both())
+        check(('127.0.0.1', 'ORG 0') in state.requests, "expired match is looked up again")
+    finally:
+        server.shutdown()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print()
+    return ok
+
+
+if __name__ == '__main__':
+    success = test_lookup_service()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Test the async 990 fetcher against a local stub of ProPublica's organization pages.
+
+The stub (http.server on 127.0.0.1) serves filing pages with ETags, answers
+If-None-Match with 304, returns 404 for unknown EINs and fails some pages
+with 503/429 or a truncated body once. Header names are sent in lower
+case. No network access is needed.
+
+Checks:
+1. Every page is fetched once per EIN, retried pages succeed, 404s are recorded
+2. Requests in flight never exceed the concurrency cap and respect the rate
+3. A second run revalidates every cached page (304, no bodies re-sent)
+4. An interrupted run resumes from the progress file without refetching
+5. A scheduled run fetches only EINs past their TTL, and filing season
+   follows the fiscal-year end
+6. A refresh that fails keeps the vendor's previous data, also with no
+   rate limit
+7. A vendor re-matched to an EIN that is already fresh gets that EIN's
+   filings, not its old ones
+"""
+
+import hashlib
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add parent directory to path to import from fetch_990_links
+sys.path.insert(0, str(Path(__file__).parent))
+
+import fetch_990_links
+from filing_schedule import in_filing_season
+
+CONCURRENCY = 3
+RATE = 40.0
+
+
+def filing_page(ein: str) -> str:
+    """A page in the layout extract_990_page() reads."""
+    sections = []
+    for year in (2023, 2022, 2021):
+        sections.append(
+            f"<section class='single-filing-period' id='filing{year}'>"
+            f"<div class=\"year-label\">{year}</div>"
+            f"<span class=\"filed-on\">Filed on Nov. 15, {year + 1}</span>"
+            f"<h5>990</h5>"
+            f"<a href=\"/nonprofits/organizations/{ein}/{year}0001/full\">View Filing</a>"
+            f"</section>"
+        )
+    return f"<html><body><h1>STUB ORG {ein}</h1>{''.join(sections)}</body></html>"
+
+
+class StubState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []  # (ein, status)
+        self.failed_once = set()
+        self.always_fail = set()
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            ein = self.path.rstrip('/').rsplit('/', 1)[-1]
+            with state.lock:
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            time.sleep(0.2)
+            status = self._respond(ein)
+            with state.lock:
+                state.requests.append((ein, status))
+
+        def _respond(self, ein: str):
+            # EINs ending in 0 do not exist, 5 fail with 503 once, 7 are throttled once,
+            # 3 are cut short once; EINs in always_fail are down for good.
+            # Header names are lower case: lookups must not depend on case
+            if ein in state.always_fail:
+                return self._send(503, b'unavailable')
+            if ein.endswith('0'):
+                return self._send(404, b'not found')
+            with state.lock:
+                first = ein not in state.failed_once
+                state.failed_once.add(ein)
+            if first and ein.endswith('5'):
+                return self._send(503, b'unavailable')
+            if first and ein.endswith('7'):
+                return self._send(429, b'slow down', {'retry-after': '0'})
+
+            body = filing_page(ein).encode('utf-8')
+            etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+            if first and ein.endswith('3'):
+                # The connection closes before Content-Length bytes (IncompleteRead)
+                self._send(200, body, {'etag': etag}, length=len(body) + 100)
+                return 'truncated'
+            if self.headers.get('If-None-Match') == etag:
+                return self._send(304, b'', {'etag': etag})
+            return self._send(200, body, {'etag': etag, 'content-type': 'text/html'})
+
+        def _send(self, status: int, body: bytes, headers: dict = None, length: int = None) -> int:
+            # No longer in flight once the client can read the response
+            with state.lock:
+                state.in_flight -= 1
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body) if length is None else length))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+            return status
+
+    return Handler
+
+
+def test_fetcher():
+    """Run the fetcher three times against the stub and check each run"""
+    print("=" * 70)
+    print("Testing async 990 fetcher against a local stub server")
+    print("=" * 70)
+    print()
+
+    state = StubState()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/nonprofits/organizations"
+
+    workdir = Path(tempfile.mkdtemp(prefix='fetch990_'))
+    fetch_990_links.IRS_MATCHES_FILE = workdir / 'vendor_irs_matches.json'
+    fetch_990_links.OUTPUT_FILE = workdir / 'form_990_links.json'
+    fetch_990_links.PROGRESS_FILE = workdir / 'form_990_links.progress.jsonl'
+    fetch_990_links.HTTP_CACHE_DIR = workdir / 'http_cache'
+    fetch_990_links.REFRESH_STATE_FILE = workdir / 'form_990_refresh_state.json'
+
+    # 60 EINs, a few of them matched by two vendor names
+    eins = [f"{540000000 + i:09d}" for i in range(60)]
+    matches = {f"VENDOR {ein}": {'ein': ein} for ein in eins}
+    for ein in eins[:5]:
+        matches[f"VENDOR {ein} ALIAS"] = {'ein': ein}
+    with open(fetch_990_links.IRS_MATCHES_FILE, 'w') as f:
+        json.dump(matches, f)
+
+    def run(full=True, rate=RATE):
+        fetch_990_links.main(full=full, concurrency=CONCURRENCY, rate=rate, retries=2, base_url=base_url)
+        with open(fetch_990_links.OUTPUT_FILE) as f:
+            return json.load(f)
+
+    ok = True
+
+    def check(condition, message):
+        nonlocal ok
+        print(f"{'✅' if condition else '❌'} {message}")
+        ok = ok and condition
+
+    try:
+        # 1. Fresh run
+        started = time.time()
+        first = run()
+        elapsed = time.time() - started
+        existing = [ein for ein in eins if not ein.endswith('0')]
+        served = [ein for ein, status in state.requests if status == 200]
+        print()
+        check(sorted(served) == sorted(existing), "each existing EIN downloaded exactly once")
+        check(len(first) == len(existing) + sum(1 for e in eins[:5] if not e.endswith('0')),
+              f"{len(first)} vendors with filings (aliases share their EIN's page)")
+        sample = first[f"VENDOR {existing[0]}"]
+        check([f['tax_year'] for f in sample['filings']] == [2023, 2022, 2021]
+              and sample['name'] == f"STUB ORG {existing[0]}", "filings parsed from the stub page")
+        check(1 < state.max_in_flight <= CONCURRENCY, f"max {state.max_in_flight} requests in flight (cap {CONCURRENCY})")
+        check(elapsed >= (len(state.requests) - 1) / RATE * 0.9,
+              f"{len(state.requests)} requests took {elapsed:.2f}s (rate {RATE}/s)")
+        check(not fetch_990_links.PROGRESS_FILE.exists(), "progress file removed after a clean run")
+
+        # 2. Rerun: every cached page revalidates with a 304
+        state.requests.clear()
+        second = run()
+        print()
+        statuses = [status for _, status in state.requests]
+        check(second == first, "second run produces identical output")
+        check(statuses.count(304) == len(existing) and 200 not in statuses,
+              f"second run: {statuses.count(304)} pages unchanged (304), {statuses.count(200)} downloaded")
+
+        # 3. Resume: pretend a run stopped after half the vendors (with a torn last line)
+        fetch_990_links.OUTPUT_FILE.unlink()
+        shutil.rmtree(fetch_990_links.HTTP_CACHE_DIR)
+        key = {'propublica_web_base': base_url}
+        recorded = sorted(matches)[:30]
+        with open(fetch_990_links.PROGRESS_FILE, 'w') as f:
+            f.write(json.dumps(key) + '\n')
+            for vendor_name in recorded:
+                ein = matches[vendor_name]['ein']
+                status = 'not_found' if ein.endswith('0') else 'found'
+                data = first.get(vendor_name)
+                f.write(json.dumps({'vendor': vendor_name, 'ein': ein, 'status': status, 'data': data}) + '\n')
+            f.write('{"vendor": "torn')
+        state.requests.clear()
+        third = run()
+        print()
+        refetched = {ein for ein, _ in state.requests}
+        skipped = {matches[v]['ein'] for v in recorded} - {matches[v]['ein'] for v in matches if v not in recorded}
+        check(third == first, "resumed run produces identical output")
+        check(not (refetched & skipped), f"resumed run skipped {len(skipped)} finished EINs")
+
+        # 4. Scheduled runs: nothing is due right after a fetch; aged EINs are
+        state.requests.clear()
+        fourth = run(full=False)
+        print()
+        check(fourth == first and not state.requests, "scheduled run right after a fetch makes no requests")
+
+        with open(fetch_990_links.REFRESH_STATE_FILE) as f:
+            refresh_state = json.load(f)
+        aged = set(sorted(refresh_state)[:10])
+        for ein in aged:
+            refresh_state[ein]['fetched_at'] = (datetime.now() - timedelta(days=100)).isoformat(timespec='seconds')
+        with open(fetch_990_links.REFRESH_STATE_FILE, 'w') as f:
+            json.dump(refresh_state, f)
+        state.requests.clear()
+        fifth = run(full=False)
+        print()
+        check(fifth == first and {ein for ein, _ in state.requests} == aged,
+              f"scheduled run re-fetched only the {len(aged)} EINs past their TTL")
+
+        # 5. A refresh that fails (503 after every retry) keeps the old data
+        state.always_fail = set(eins)
+        state.requests.clear()
+        sixth = run(rate=0)
+        print()
+        check(state.requests and all(status == 503 for _, status in state.requests),
+              f"every refresh failed ({len(state.requests)} requests, no rate limit)")
+        check(sixth == first, "failed refreshes keep the previous filings")
+        state.always_fail = set()
+
+        # 6. Re-match a vendor to an EIN fetched (and fresh) for another vendor
+        moved, target = f"VENDOR {existing[0]}", existing[1]
+        matches[moved] = {'ein': f"{target[:2]}-{target[2:]}"}
+        with open(fetch_990_links.IRS_MATCHES_FILE, 'w') as f:
+            json.dump(matches, f)
+        state.requests.clear()
+        seventh = run(full=False)
+        print()
+        check(seventh[moved] == first[f"VENDOR {target}"] and seventh[moved] != first[moved],
+              "scheduled run replaces a re-matched vendor's filings with its new EIN's")
+        check({ein for ein, _ in state.requests} == {target}, "only the new EIN is requested")
+        check({v: d for v, d in seventh.items() if v != moved} == {v: d for v, d in first.items() if v != moved},
+              "other vendors keep their filings")
+
+        # December year end: the 2024 return is awaited in June 2025 (due May 15)
+        # and again in December (extension), but not in March or once it is in
+        check(in_filing_season(12, 2023, date(2025, 6, 10)), "June 2025 is filing season for a missing FY2024 return")
+        check(in_filing_season(12, 2023, date(2025, 12, 1)), "December 2025 is extension season")
+        check(not in_filing_season(12, 2023, date(2025, 3, 1)), "March 2025 is not filing season")
+        check(not in_filing_season(12, 2024, date(2025, 6, 10)), "no season once the FY2024 return is in")
+        check(in_filing_season(6, 2024, date(2025, 12, 1)), "June year end: FY2025 return awaited in December")
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print()
+    return ok
+
+
+if __name__ == '__main__':
+    success = test_fetcher()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test the transfer payments loader against csv.DictReader on small CSVs.
+
+Checks:
+1. A stray quote inside an unquoted field (JOHN 5" PIPE CO) does not merge
+   the following records into one
+2. Quoted fields with newlines and escaped quotes stay one record
+3. Projection and raw-byte predicates give the same rows as filtering
+   DictReader output, plain and gzipped
+4. The raw-byte check keeps rows whose value is escaped ("") in the file,
+   case-insensitive matches on non-ASCII letters (café / CAFÉ, strasse /
+   STRAſSE) and values joined up by errors='ignore' decoding
+"""
+
+import csv
+import gzip
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to import from transfer_payments
+sys.path.insert(0, str(Path(__file__).parent))
+
+from transfer_payments import contains, equals, iter_rows
+
+HEADER = 'vendor_name,expense_type,amount,description\n'
+
+STRAY_QUOTE_CSV = (
+    HEADER
+    + 'JOHN 5" PIPE CO,Grnt-Nongovernmental Org,100,pipes\n'
+    + 'ACME FOOD BANK,Grnt-Nongovernmental Org,200,food\n'
+    + 'CITY OF NORFOLK,Grnt-Local Govt,300,roads\n'
+)
+
+QUOTED_CSV = (
+    HEADER
+    + '"SMITH, ""BIG"" HOUSE",Grnt-Nongovernmental Org,400,"two\nlines"\n'
+    + 'JOHN 5" PIPE CO,Grnt-Nongovernmental Org,500,"5"" pipe"\n'
+    + '"FOOD ""5"" BANK","Grnt-Nongovernmental Org",600,"one ""quoted""\nand ""more\n"" lines"\n'
+    + 'LAST ROW,Grnt-Local Govt,700,""\n'
+)
+
+ESCAPED_CSV = (
+    HEADER
+    + '"JOHN 5"" PIPE, INC",Grnt-Nongovernmental Org,100,pipes\n'
+    + 'CAFÉ ÉTOILE,Grnt-Nongovernmental Org,200,bistro\n'
+    + 'STRAſSE HAUS,Grnt-Local Govt,300,roads\n'
+)
+
+
+def expected_rows(text, columns=None, where=()):
+    """Filter fully materialized csv.DictReader rows the slow way."""
+    rows = []
+    for row in csv.DictReader(text.splitlines(keepends=True)):
+        if all(p.matches(row[p.column]) for p in where):
+            rows.append({name: row.get(name, '') for name in (columns or row)})
+    return rows
+
+
+def test_transfer_payments():
+    """Compare iter_rows() with csv.DictReader on tricky CSVs"""
+    print("=" * 70)
+    print("Testing transfer payments loader against csv.DictReader")
+    print("=" * 70)
+    print()
+
+    ok = True
+
+    def check(condition, message):
+        nonlocal ok
+        print(f"{'✅' if condition else '❌'} {message}")
+        ok = ok and condition
+
+    workdir = Path(tempfile.mkdtemp(prefix='transfer_payments_'))
+    try:
+        for name, text in (('stray_quote', STRAY_QUOTE_CSV), ('quoted', QUOTED_CSV), ('escaped', ESCAPED_CSV)):
+            plain = workdir / f'{name}.csv'
+            plain.write_text(text, encoding='utf-8', newline='')
+            packed = workdir / f'{name}.csv.gz'
+            with gzip.open(packed, 'wt', encoding='utf-8', newline='') as f:
+                f.write(text)
+
+            cases = [
+                ('all rows', None, ()),
+                ('NGO grants', ['vendor_name', 'amount'], [equals('expense_type', 'Grnt-Nongovernmental Org')]),
+                ('vendors with a quote', ['vendor_name', 'missing'], [contains('vendor_name', '"')]),
+                ('descriptions with "lines"', ['amount'], [contains('description', 'LINES', ignore_case=True)]),
+                ('contains 5" PIPE', ['vendor_name'], [contains('vendor_name', '5" PIPE')]),
+                ('equals JOHN 5" PIPE, INC', ['vendor_name'], [equals('vendor_name', 'JOHN 5" PIPE, INC')]),
+                ('contains café, any case', ['vendor_name'], [contains('vendor_name', 'café', ignore_case=True)]),
+                ('contains strasse, any case', ['vendor_name'], [contains('vendor_name', 'strasse', ignore_case=True)]),
+            ]
+            for label, columns, where in cases:
+                want = expected_rows(text, columns, where)
+                for path in (plain, packed):
+                    got = list(iter_rows(path, columns=columns, where=where))
+                    check(got == want, f"{path.name}: {label} ({len(got)} of {len(want)} rows)")
+
+        rows = list(iter_rows(workdir / 'stray_quote.csv', columns=['vendor_name']))
+        check([r['vendor_name'] for r in rows] == ['JOHN 5" PIPE CO', 'ACME FOOD BANK', 'CITY OF NORFOLK'],
+              "stray quote keeps the rows after it")
+
+        escaped = workdir / 'escaped.csv'
+        quoted = list(iter_rows(escaped, columns=['vendor_name'], where=[equals('vendor_name', 'JOHN 5" PIPE, INC')]))
+        folded = list(iter_rows(escaped, columns=['vendor_name'], where=[contains('vendor_name', 'café', ignore_case=True)]))
+        check(quoted == [{'vendor_name': 'JOHN 5" PIPE, INC'}], "value with a quote matches its escaped field")
+        check(folded == [{'vendor_name': 'CAFÉ ÉTOILE'}], "case-insensitive non-ASCII value matches")
+
+        lenient = workdir / 'lenient.csv'
+        lenient.write_bytes(HEADER.encode() + b'ACME,TRANS\xffFER,100,x\nOTHER,GRANT,200,y\n')
+        rows = list(iter_rows(lenient, columns=['vendor_name'], where=[contains('expense_type', 'TRANSFER')],
+                              errors='ignore'))
+        check(rows == [{'vendor_name': 'ACME'}], "errors='ignore' keeps a value split by an undecodable byte")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print()
+    return ok
+
+
+if __name__ == '__main__':
+    success = test_transfer_payments()
+    sys.exit(0 if success else 1)
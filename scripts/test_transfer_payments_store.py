@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Round-trip test of the columnar transfer payments store on a small fixture CSV.
+
+Builds the store from a generated CSV in a temporary directory and reads it
+back. No real CARDINAL data is needed.
+
+Checks:
+1. Header: magic, version, row count, byte order, 8-byte aligned column blocks
+   and the narrowest code width per column
+2. Dictionary codes decode back to every source row
+3. vendor_rows() returns each vendor's contiguous range in source order, and
+   the index totals match the source
+4. Predicates on dictionary codes select the same rows as
+   transfer_payments.iter_rows() with the same predicates
+"""
+
+import csv
+import json
+import random
+import shutil
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to import from transfer_payments_store
+sys.path.insert(0, str(Path(__file__).parent))
+
+import transfer_payments
+from transfer_payments import contains, equals
+from transfer_payments_store import ALIGNMENT, FORMAT_VERSION, MAGIC, TransferPaymentStore, build_store, parse_amount
+
+COLUMNS = ['vendor_name', 'expense_type', 'agency', 'amount', 'description']
+VENDORS = ['ZETA SERVICES', 'Big Homies Inc', 'JOHN 5" PIPE, INC', 'CAFÉ ÉTOILE',
+           'ACME FOOD BANK', 'Legal Aid, Inc', 'MIDDLE VENDOR']
+EXPENSE_TYPES = ['Grnt-Nongovernmental Org', 'Grnt-Local Govt', 'Contractual Svcs']
+AGENCIES = ['DSS', 'VDH', 'DOE']
+ROWS = 300
+
+
+def fixture_rows():
+    """Interleaved vendors, blank and malformed amounts, 300 distinct descriptions."""
+    rng = random.Random(7)
+    rows = []
+    for i in range(ROWS):
+        amount = rng.choice([f"{rng.uniform(-500, 50000):.2f}", str(rng.randrange(1, 999)), '', 'n/a'])
+        rows.append({
+            'vendor_name': rng.choice(VENDORS),
+            'expense_type': rng.choice(EXPENSE_TYPES),
+            'agency': rng.choice(AGENCIES),
+            'amount': amount,
+            'description': f"item {i}\nline two" if i % 50 == 0 else f"item {i}",
+        })
+    return rows
+
+
+def normalized(row):
+    """A CSV row as the store returns it (amount as float)."""
+    return {name: (parse_amount(value) if name == 'amount' else value) for name, value in row.items()}
+
+
+def test_transfer_payments_store():
+    """Build the store from a fixture CSV and read it back"""
+    print("=" * 70)
+    print("Testing columnar transfer payments store round trip")
+    print("=" * 70)
+    print()
+
+    ok = True
+
+    def check(condition, message):
+        nonlocal ok
+        print(f"{'✅' if condition else '❌'} {message}")
+        ok = ok and condition
+
+    workdir = Path(tempfile.mkdtemp(prefix='transfer_payments_store_'))
+    try:
+        source = fixture_rows()
+        csv_path = workdir / 'transfer_payments_full.csv'
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(source)
+        columns_path = workdir / 'transfer_payments_full.cols'
+        index_path = workdir / 'transfer_payments_full.vendors.json'
+
+        summary = build_store(csv_path, columns_path, index_path)
+        check(summary == {'rows': ROWS, 'vendors': len(set(r['vendor_name'] for r in source)),
+                          'columns': len(COLUMNS)}, f"built {summary}")
+
+        # 1. Header and block layout
+        raw = columns_path.read_bytes()
+        (header_len,) = struct.unpack_from('<Q', raw, len(MAGIC))
+        header = json.loads(raw[len(MAGIC) + 8:len(MAGIC) + 8 + header_len])
+        data_start = len(MAGIC) + 8 + header_len
+        data_start += -data_start % ALIGNMENT
+        meta = {c['name']: c for c in header['columns']}
+        check(raw.startswith(MAGIC) and header['version'] == FORMAT_VERSION and header['rows'] == ROWS
+              and header['byteorder'] == sys.byteorder, "magic, version, row count and byte order")
+        check(all(c['offset'] % ALIGNMENT == 0 for c in header['columns'])
+              and all((data_start + c['offset']) % ALIGNMENT == 0 for c in header['columns']),
+              "every column block starts on an 8-byte boundary")
+        check(all(data_start + c['offset'] + c['length'] <= len(raw) for c in header['columns']),
+              "every column block lies inside the file")
+        check([meta[n]['typecode'] for n in COLUMNS] == ['B', 'B', 'B', 'd', 'H'],
+              "codes use the narrowest width (B for <=256 values, H for 300), amount is float64")
+        check(meta['vendor_name']['dictionary'] == sorted(meta['vendor_name']['dictionary']),
+              "vendor codes are in name order")
+
+        with TransferPaymentStore(columns_path, index_path) as store:
+            # 2. Codes decode back to the source rows
+            stored = list(store.iter_rows())
+            by_vendor = sorted((normalized(r) for r in source), key=lambda r: r['vendor_name'])
+            check(stored == by_vendor, f"{len(stored)} rows decode to the source rows, in vendor order")
+
+            # 3. Vendor ranges and totals
+            ranges_ok = totals_ok = True
+            next_offset = 0
+            for vendor in sorted(store.vendors):
+                entry = store.vendors[vendor]
+                expected = [normalized(r) for r in source if r['vendor_name'] == vendor]
+                ranges_ok &= entry['offset'] == next_offset and store.vendor_rows(vendor) == expected
+                next_offset += entry['length']
+                by_type = {}
+                for row in expected:
+                    bucket = by_type.setdefault(row['expense_type'], [0.0, 0])
+                    bucket[0] += row['amount']
+                    bucket[1] += 1
+                totals = store.vendor_totals(vendor)
+                totals_ok &= (abs(totals['total'] - sum(r['amount'] for r in expected)) < 0.01
+                              and {k: v[1] for k, v in totals['by_expense_type'].items()}
+                              == {k: v[1] for k, v in by_type.items()}
+                              and all(abs(totals['by_expense_type'][k][0] - v[0]) < 0.01
+                                      for k, v in by_type.items()))
+            check(ranges_ok and next_offset == ROWS, "vendor_rows() ranges are contiguous, in source order")
+            check(totals_ok, "index totals and per-expense-type [sum, count] match the source")
+            check(store.vendor_rows('NOBODY') == [] and store.vendor_totals('NOBODY') is None,
+                  "unknown vendor has no rows")
+            check(store.vendor_rows(VENDORS[1], columns=['amount'])
+                  == [{'amount': r['amount']} for r in by_vendor if r['vendor_name'] == VENDORS[1]],
+                  "vendor_rows() projects columns")
+
+            # 4. Predicates on codes vs the CSV loader
+            cases = [
+                ('NGO grants', [equals('expense_type', 'Grnt-Nongovernmental Org')]),
+                ('two predicates', [equals('expense_type', 'Grnt-Local Govt', 'Contractual Svcs'),
+                                    equals('agency', 'VDH')]),
+                ('substring, any case', [contains('vendor_name', 'inc', ignore_case=True)]),
+                ('quote in value', [contains('vendor_name', '5" PIPE')]),
+                ('non-ASCII, any case', [contains('vendor_name', 'café', ignore_case=True)]),
+                ('no match', [equals('agency', 'NOPE')]),
+            ]
+            projection = ['vendor_name', 'agency', 'amount']
+            for label, where in cases:
+                want = sorted((normalized(r) for r in transfer_payments.iter_rows(csv_path, projection, where)),
+                              key=lambda r: r['vendor_name'])
+                got = list(store.iter_rows(projection, where))
+                check(got == want, f"{label}: {len(got)} of {len(want)} rows")
+
+            try:
+                list(store.iter_rows(where=[equals('amount', '0')]))
+                check(False, "predicate on the float column is rejected")
+            except ValueError:
+                check(True, "predicate on the float column is rejected")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print()
+    return ok
+
+
+if __name__ == '__main__':
+    success = test_transfer_payments_store()
+    sys.exit(0 if success else 1)
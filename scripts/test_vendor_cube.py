@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test the vendor rollup cube against grouping transactions directly.
+
+Builds the cube from a generated fixture CSV in a temporary directory, from
+the CSV and from the column store, and reloads it from disk. No real
+CARDINAL data is needed.
+
+Checks:
+1. vendor_rollups(load_cube()) gives the same per-vendor totals, counts,
+   expense-type sets and first/last dates as grouping
+   transfer_payments.iter_rows()
+2. The same holds with an expense-type filter (the NGO grant rollups)
+3. Reloading the written cube, and building it from the column store, give
+   the same rollups
+"""
+
+import csv
+import random
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to import from vendor_cube
+sys.path.insert(0, str(Path(__file__).parent))
+
+import vendor_cube
+from transfer_payments import NGO_GRANT_EXPENSE_TYPE, iter_rows
+from transfer_payments_store import build_store
+from vendor_cube import load_cube, parse_trans_date, vendor_rollups
+
+COLUMNS = ['vendor_name', 'fiscal_year', 'expense_type', 'agency', 'amount', 'trans_date']
+VENDORS = ['Big Homies Inc', 'JOHN 5" PIPE, INC', 'CAFÉ ÉTOILE', 'ACME FOOD BANK', 'CITY OF NORFOLK']
+EXPENSE_TYPES = [NGO_GRANT_EXPENSE_TYPE, 'Grnt-Local Govt', 'Contractual Svcs']
+
+
+def fixture_rows():
+    """Transactions over two fiscal years, with blank amounts and unparseable dates."""
+    rng = random.Random(11)
+    rows = []
+    for _ in range(400):
+        month, day, year = rng.randrange(1, 13), rng.randrange(1, 29), rng.choice([24, 25])
+        rows.append({
+            'vendor_name': rng.choice(VENDORS),
+            'fiscal_year': str(2000 + year + (month > 6)),
+            'expense_type': rng.choice(EXPENSE_TYPES),
+            'agency': rng.choice(['DSS', 'VDH', 'DOE']),
+            'amount': rng.choice([f"{rng.uniform(-100, 25000):.2f}", '']),
+            'trans_date': rng.choice([f"{month:02d}-{day:02d}-{year:02d}", f"{month}/{day}/20{year}", '', 'bad']),
+        })
+    return rows
+
+
+def direct_rollups(csv_path, expense_types=None):
+    """Group transactions per vendor without the cube."""
+    rollups = {}
+    for row in iter_rows(csv_path):
+        if expense_types is not None and row['expense_type'] not in expense_types:
+            continue
+        entry = rollups.setdefault(row['vendor_name'], {
+            'total': 0.0, 'count': 0, 'expense_types': set(), 'dates': [],
+        })
+        entry['total'] += float(row['amount']) if row['amount'] else 0.0
+        entry['count'] += 1
+        entry['expense_types'].add(row['expense_type'])
+        date = parse_trans_date(row['trans_date'])
+        if date:
+            entry['dates'].append(date)
+    return {
+        vendor: {
+            'total': entry['total'], 'count': entry['count'], 'expense_types': entry['expense_types'],
+            'first_date': min(entry['dates'], default=''), 'last_date': max(entry['dates'], default=''),
+        }
+        for vendor, entry in rollups.items()
+    }
+
+
+def same_rollups(got, want):
+    """Equal vendors, counts, expense types and dates; totals within a cent per cube cell."""
+    if set(got) != set(want):
+        return False
+    for vendor, expected in want.items():
+        actual = got[vendor]
+        if abs(actual['total'] - expected['total']) > 0.01 * max(actual['count'], 1):
+            return False
+        if any(actual[k] != expected[k] for k in ('count', 'expense_types', 'first_date', 'last_date')):
+            return False
+    return True
+
+
+def test_vendor_cube():
+    """Compare cube rollups with direct grouping of the fixture transactions"""
+    print("=" * 70)
+    print("Testing vendor rollup cube against direct grouping")
+    print("=" * 70)
+    print()
+
+    ok = True
+
+    def check(condition, message):
+        nonlocal ok
+        print(f"{'✅' if condition else '❌'} {message}")
+        ok = ok and condition
+
+    workdir = Path(tempfile.mkdtemp(prefix='vendor_cube_'))
+    saved = (vendor_cube.TRANSFER_PAYMENTS_CSV, vendor_cube.COLUMNAR_FILE, vendor_cube.VENDOR_INDEX_FILE)
+    try:
+        csv_path = workdir / 'transfer_payments_full.csv'
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(fixture_rows())
+        cube_path = workdir / 'transfer_payments_vendor_cube.csv'
+
+        # 1. Built from the CSV
+        built = load_cube(cube_path, csv_path)
+        want = direct_rollups(csv_path)
+        check(cube_path.exists(), f"cube written ({len(built)} cells)")
+        check(same_rollups(vendor_rollups(built), want),
+              f"{len(want)} vendors: totals, counts, expense types and dates match")
+
+        # 2. NGO grants only
+        ngo = {NGO_GRANT_EXPENSE_TYPE}
+        check(same_rollups(vendor_rollups(built, expense_types=ngo), direct_rollups(csv_path, ngo)),
+              "NGO grant rollups match")
+
+        # 3. Reloaded from disk, and built from the column store
+        reloaded = load_cube(cube_path, csv_path)
+        check(same_rollups(vendor_rollups(reloaded), want), "reloaded cube gives the same rollups")
+
+        vendor_cube.TRANSFER_PAYMENTS_CSV = csv_path
+        vendor_cube.COLUMNAR_FILE = workdir / 'transfer_payments_full.cols'
+        vendor_cube.VENDOR_INDEX_FILE = workdir / 'transfer_payments_full.vendors.json'
+        build_store(csv_path, vendor_cube.COLUMNAR_FILE, vendor_cube.VENDOR_INDEX_FILE)
+        from_store = vendor_cube.build_cube(csv_path, workdir / 'from_store.csv')
+        check(same_rollups(vendor_rollups(from_store), want), "cube built from the column store matches")
+    finally:
+        vendor_cube.TRANSFER_PAYMENTS_CSV, vendor_cube.COLUMNAR_FILE, vendor_cube.VENDOR_INDEX_FILE = saved
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print()
+    return ok
+
+
+if __name__ == '__main__':
+    success = test_vendor_cube()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Shared loaders for CARDINAL transfer payment CSVs.
+
+Readers accept a column projection and a list of row predicates. Predicates are
+checked against the raw, undecoded bytes of each record first, so records that
+cannot match are dropped before UTF-8 decoding, CSV parsing or dict building.
+Records that survive the raw check are confirmed against the parsed field, so
+results are identical to filtering fully materialized rows. Where bytes and
+decoded text can disagree (case-insensitive or lenient decoding on non-ASCII
+records) the raw check never rejects a record.
+
+Usage:
+    from transfer_payments import iter_rows, equals, contains
+
+    rows = iter_rows(columns=['vendor_name', 'amount'],
+                     where=[equals('expense_type', NGO_GRANT_EXPENSE_TYPE)])
+"""
+
+import csv
+import gzip
+import io
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+# Paths
+REPO_ROOT = Path(__file__).parent.parent
+TRANSFER_PAYMENTS_CSV = REPO_ROOT / 'frontend' / 'public' / 'decoder' / 'transfer_payments_full.csv.gz'
+
+# Expense types used by the NGO tracker analyses
+NGO_GRANT_EXPENSE_TYPE = 'Grnt-Nongovernmental Org'
+
+READ_BUFFER_SIZE = 1 << 20
+
+
+class Predicate(NamedTuple):
+    """A filter on one column: exact match against, or substring of, any of `values`."""
+    column: str
+    values: Tuple[str, ...]
+    substring: bool
+    ignore_case: bool
+
+    def raw_pattern(self, encoding: str) -> Optional['re.Pattern']:
+        """
+        Bytes regex that must occur somewhere in a record for it to possibly match.
+
+        A value with a quote also matches its "" escaped form (quoted fields).
+        None if there is no safe pattern: bytes regexes fold only ASCII case,
+        while matches() uses str.upper() ('café' matches 'CAFÉ').
+        """
+        if self.ignore_case and not all(v.isascii() for v in self.values):
+            return None
+        forms = set()
+        for value in self.values:
+            forms.add(value)
+            if '"' in value:
+                forms.add(value.replace('"', '""'))
+        alternatives = b'|'.join(re.escape(v.encode(encoding)) for v in sorted(forms))
+        return re.compile(alternatives, re.IGNORECASE if self.ignore_case else 0)
+
+    def matches(self, field: str) -> bool:
+        """Confirm the predicate on a decoded field value."""
+        if self.substring:
+            if self.ignore_case:
+                field = field.upper()
+                return any(v.upper() in field for v in self.values)
+            return any(v in field for v in self.values)
+        if self.ignore_case:
+            return field.upper() in {v.upper() for v in self.values}
+        return field in self.values
+
+
+def equals(column: str, *values: str, ignore_case: bool = False) -> Predicate:
+    """Keep rows whose `column` equals one of `values`."""
+    return Predicate(column, tuple(values), False, ignore_case)
+
+
+def contains(column: str, *needles: str, ignore_case: bool = False) -> Predicate:
+    """Keep rows whose `column` contains one of `needles`."""
+    return Predicate(column, tuple(needles), True, ignore_case)
+
+
+def _open_binary(path: Path):
+    """Open a plain or gzip-compressed CSV for buffered binary reading."""
+    if Path(path).suffix == '.gz':
+        return io.BufferedReader(gzip.open(path, 'rb'), buffer_size=READ_BUFFER_SIZE)
+    return open(path, 'rb', buffering=READ_BUFFER_SIZE)
+
+
+# A quote opens a quoted field only at the start of a field; elsewhere it is a
+# literal character (csv's default dialect). Inside a quoted field "" is an
+# escaped quote and any other quote closes the field.
+_QUOTED_FIELD_START = re.compile(rb'(?:^|,)"')
+_QUOTED_FIELD_REST = re.compile(rb'[^"]*(?:""[^"]*)*"(?!")')
+
+
+def _ends_in_quoted_field(line: bytes, in_quotes: bool) -> bool:
+    """Whether a quoted field is still open at the end of `line`."""
+    pos = 0
+    while True:
+        if in_quotes:
+            match = _QUOTED_FIELD_REST.match(line, pos)
+            if match is None:
+                return True
+            pos = match.end()
+        match = _QUOTED_FIELD_START.search(line, pos)
+        if match is None:
+            return False
+        pos = match.end()
+        in_quotes = True
+
+
+def _iter_raw_records(f) -> Iterator[List[bytes]]:
+    """
+    Yield raw CSV records as lists of physical lines.
+
+    A record continues onto the next line while a quoted field is open (a
+    quoted field containing a newline). Quotes inside unquoted fields, such
+    as `JOHN 5" PIPE CO`, are literal and do not open a field, matching
+    how csv.reader splits the same lines.
+    """
+    pending: List[bytes] = []
+    in_quotes = False
+    for line in f:
+        pending.append(line)
+        if in_quotes or b'"' in line:
+            in_quotes = _ends_in_quoted_field(line, in_quotes)
+        if not in_quotes:
+            yield pending
+            pending = []
+    if pending:
+        yield pending
+
+
+def iter_rows(path: Path = TRANSFER_PAYMENTS_CSV,
+              columns: Optional[Sequence[str]] = None,
+              where: Sequence[Predicate] = (),
+              encoding: str = 'utf-8',
+              errors: str = 'strict') -> Iterator[Dict[str, str]]:
+    """
+    Stream rows from a transfer payments CSV (plain or .gz).
+
+    Args:
+        path: CSV file to read
+        columns: Column projection; only these keys are built per row.
+                 Columns missing from the header come back as ''.
+                 None keeps every column.
+        where: Predicates that must all hold (AND); see equals()/contains()
+        encoding: Text encoding of the file
+        errors: Decode error handling ('strict', 'ignore', ...)
+
+    Yields:
+        One dict per matching row, keyed by the projected column names
+    """
+    with _open_binary(path) as f:
+        records = _iter_raw_records(f)
+
+        header_lines = next(records, None)
+        if header_lines is None:
+            return
+        header_text = [line.decode(encoding, errors) for line in header_lines]
+        header = next(csv.reader(header_text))
+        if header:
+            header[0] = header[0].lstrip('\ufeff')
+        positions = {name: i for i, name in enumerate(header)}
+
+        for predicate in where:
+            if predicate.column not in positions:
+                raise ValueError(f"Predicate column '{predicate.column}' not in {path}")
+
+        if columns is None:
+            columns = header
+        projection = [(name, positions.get(name)) for name in columns]
+        checks = [(positions[p.column], p) for p in where]
+        # (pattern, ascii_only): an ASCII-only pattern may reject only ASCII
+        # records. str.upper() folds non-ASCII letters to ASCII ones ('ſ' -> 'S'),
+        # and lenient decoding can drop bytes from the middle of a value.
+        raw_patterns = [
+            (pattern, p.ignore_case or errors != 'strict')
+            for p in where
+            for pattern in [p.raw_pattern(encoding)] if pattern is not None
+        ]
+
+        for raw_lines in records:
+            # Pushdown: reject on the raw bytes before decoding or parsing
+            if raw_patterns:
+                raw = raw_lines[0] if len(raw_lines) == 1 else b''.join(raw_lines)
+                if not all(pattern.search(raw) or (ascii_only and not raw.isascii())
+                           for pattern, ascii_only in raw_patterns):
+                    continue
+
+            text_lines = [line.decode(encoding, errors) for line in raw_lines]
+            fields = next(csv.reader(text_lines), None)
+            if not fields:
+                continue
+            width = len(fields)
+
+            if not all(idx < width and p.matches(fields[idx]) for idx, p in checks):
+                continue
+
+            yield {
+                name: (fields[idx] if idx is not None and idx < width else '')
+                for name, idx in projection
+            }
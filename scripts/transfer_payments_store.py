@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Columnar, vendor-sorted transfer payments store.
+
+Builds a local, derived copy of transfer_payments_full.csv.gz in
+data/transfer_payments/ (not deployed; rebuilt from the CSV and gitignored):
+
+- transfer_payments_full.cols: uncompressed columnar file. Rows are sorted by
+  vendor name. Text columns are dictionary-encoded as fixed-width integer
+  codes; `amount` is stored as float64. Because every column is fixed-width,
+  row N of any column is a single slice of a memory-mapped file.
+- transfer_payments_full.vendors.json: side index of
+  vendor -> {offset, length} (row range) plus precomputed totals per
+  expense type.
+
+A per-vendor lookup is then a dict lookup plus one slice per column, and
+per-vendor aggregates come straight from the index without decompressing or
+grouping the CSV.
+
+Usage:
+    python scripts/transfer_payments_store.py    # rebuild from the CSV.gz
+
+    from transfer_payments_store import TransferPaymentStore
+    with TransferPaymentStore() as store:
+        rows = store.vendor_rows('Big Homies Inc')
+        totals = store.vendor_totals('Big Homies Inc')
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from transfer_payments import REPO_ROOT, TRANSFER_PAYMENTS_CSV, Predicate, iter_rows
+
+# Paths (derived artifacts stay out of the deployed frontend/public/decoder)
+DERIVED_DIR = REPO_ROOT / 'data' / 'transfer_payments'
+COLUMNAR_FILE = DERIVED_DIR / 'transfer_payments_full.cols'
+VENDOR_INDEX_FILE = DERIVED_DIR / 'transfer_payments_full.vendors.json'
+
+MAGIC = b'TPCOL1\n'
+FORMAT_VERSION = 1
+ALIGNMENT = 8
+
+# Columns stored as float64 instead of dictionary codes
+NUMERIC_COLUMNS = {'amount'}
+
+
+def parse_amount(value: str) -> float:
+    """Parse an amount field; empty or malformed values count as 0."""
+    try:
+        return float(value) if value else 0.0
+    except ValueError:
+        return 0.0
+
+
+def _aligned(offset: int) -> int:
+    return offset + (-offset % ALIGNMENT)
+
+
+def code_typecode(cardinality: int) -> str:
+    """Smallest unsigned array typecode that can hold `cardinality` codes."""
+    if cardinality <= 1 << 8:
+        return 'B'
+    if cardinality <= 1 << 16:
+        return 'H'
+    return 'I'
+
+
+# ============================================================================
+# Build
+# ============================================================================
+
+def build_store(csv_path: Path = TRANSFER_PAYMENTS_CSV,
+                columns_path: Path = COLUMNAR_FILE,
+                index_path: Path = VENDOR_INDEX_FILE) -> Dict:
+    """
+    Convert the transfer payments CSV into the columnar store and vendor index.
+
+    Returns:
+        Summary dict with row, vendor and column counts
+    """
+    names: Optional[List[str]] = None
+    dictionaries: Dict[str, Dict[str, int]] = {}
+    codes: Dict[str, array] = {}
+    amounts = array('d')
+
+    for row in iter_rows(csv_path):
+        if names is None:
+            names = list(row.keys())
+            for name in names:
+                if name not in NUMERIC_COLUMNS:
+                    dictionaries[name] = {}
+                    codes[name] = array('I')
+        for name in names:
+            value = row[name]
+            if name in NUMERIC_COLUMNS:
+                amounts.append(parse_amount(value))
+            else:
+                dictionary = dictionaries[name]
+                code = dictionary.get(value)
+                if code is None:
+                    code = dictionary[value] = len(dictionary)
+                codes[name].append(code)
+
+    names = names or []
+    if 'vendor_name' not in codes:
+        raise ValueError(f"{csv_path} has no vendor_name column")
+    row_count = len(codes['vendor_name'])
+
+    # Re-code vendors alphabetically so sorting rows by vendor is a counting sort
+    vendor_values = list(dictionaries['vendor_name'])
+    vendor_order = sorted(range(len(vendor_values)), key=vendor_values.__getitem__)
+    recode = array('I', [0]) * len(vendor_values)
+    for new_code, old_code in enumerate(vendor_order):
+        recode[old_code] = new_code
+    vendor_codes = array('I', (recode[c] for c in codes['vendor_name']))
+    codes['vendor_name'] = vendor_codes
+    sorted_vendors = [vendor_values[old] for old in vendor_order]
+
+    counts = [0] * len(sorted_vendors)
+    for code in vendor_codes:
+        counts[code] += 1
+    offsets = [0] * len(sorted_vendors)
+    running = 0
+    for code, count in enumerate(counts):
+        offsets[code] = running
+        running += count
+
+    # Stable placement keeps each vendor's rows in source order
+    order = array('I', [0]) * row_count
+    cursor = list(offsets)
+    for row_idx, code in enumerate(vendor_codes):
+        order[cursor[code]] = row_idx
+        cursor[code] += 1
+
+    # Per-vendor totals by expense type
+    expense_codes = codes.get('expense_type')
+    expense_values = list(dictionaries['expense_type']) if expense_codes is not None else []
+    vendors_index = {}
+    for code, vendor in enumerate(sorted_vendors):
+        start, length = offsets[code], counts[code]
+        by_expense_type: Dict[str, List[float]] = {}
+        total = 0.0
+        for pos in range(start, start + length):
+            row_idx = order[pos]
+            amount = amounts[row_idx] if 'amount' in names else 0.0
+            total += amount
+            if expense_codes is not None:
+                bucket = by_expense_type.setdefault(expense_values[expense_codes[row_idx]], [0.0, 0])
+                bucket[0] += amount
+                bucket[1] += 1
+        vendors_index[vendor] = {
+            'offset': start,
+            'length': length,
+            'total': round(total, 2),
+            'by_expense_type': {k: [round(v[0], 2), v[1]] for k, v in by_expense_type.items()},
+        }
+
+    # Columnar file layout: magic, header length, JSON header, then column
+    # blocks. Block offsets are relative to the (aligned) end of the header.
+    blocks = []
+    column_meta = []
+    offset = 0
+    for name in names:
+        if name in NUMERIC_COLUMNS:
+            data = array('d', (amounts[i] for i in order))
+            meta = {'name': name, 'kind': 'float64', 'typecode': 'd'}
+        else:
+            values = sorted_vendors if name == 'vendor_name' else list(dictionaries[name])
+            typecode = code_typecode(len(values))
+            source = codes[name]
+            data = array(typecode, (source[i] for i in order))
+            meta = {'name': name, 'kind': 'dict', 'typecode': typecode, 'dictionary': values}
+        block = data.tobytes()
+        offset = _aligned(offset)
+        meta['offset'] = offset
+        meta['length'] = len(block)
+        offset += len(block)
+        blocks.append(block)
+        column_meta.append(meta)
+
+    header = json.dumps({
+        'version': FORMAT_VERSION,
+        'byteorder': sys.byteorder,
+        'rows': row_count,
+        'source': csv_path.name,
+        'built_at': datetime.now().astimezone().isoformat(),
+        'columns': column_meta,
+    }, separators=(',', ':')).encode('utf-8')
+
+    columns_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(columns_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        data_start = _aligned(f.tell())
+        for meta, block in zip(column_meta, blocks):
+            f.write(b'\0' * (data_start + meta['offset'] - f.tell()))
+            f.write(block)
+
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': FORMAT_VERSION,
+            'columns_file': columns_path.name,
+            'rows': row_count,
+            'vendors': vendors_index,
+        }, f, separators=(',', ':'))
+
+    return {'rows': row_count, 'vendors': len(sorted_vendors), 'columns': len(names)}
+
+
+# ============================================================================
+# Read
+# ============================================================================
+
+class TransferPaymentStore:
+    """Memory-mapped reader for the columnar store and its vendor index."""
+
+    def __init__(self, columns_path: Path = COLUMNAR_FILE, index_path: Path = VENDOR_INDEX_FILE):
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        self.vendors: Dict[str, Dict] = index['vendors']
+
+        self._file = open(columns_path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{columns_path} is not a transfer payments column store")
+        (header_len,) = struct.unpack_from('<Q', self._mmap, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(self._mmap[start:start + header_len])
+        if header['byteorder'] != sys.byteorder:
+            self.close()
+            raise ValueError(f"{columns_path} was built on a {header['byteorder']}-endian machine")
+
+        self.rows: int = header['rows']
+        self.columns: Dict[str, Dict] = {meta['name']: meta for meta in header['columns']}
+        data_start = _aligned(start + header_len)
+        view = memoryview(self._mmap)
+        self._data = {}
+        for meta in header['columns']:
+            begin = data_start + meta['offset']
+            self._data[meta['name']] = view[begin:begin + meta['length']].cast(meta['typecode'])
+        view.release()
+
+    def __enter__(self) -> 'TransferPaymentStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the memory map and file handle."""
+        data = getattr(self, '_data', {})
+        for column in data.values():
+            column.release()
+        self._data = {}
+        if getattr(self, '_mmap', None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def _value(self, name: str, row: int):
+        meta = self.columns[name]
+        raw = self._data[name][row]
+        return raw if meta['kind'] == 'float64' else meta['dictionary'][raw]
+
+    def _build_rows(self, positions: Iterator[int], columns: Optional[Sequence[str]]) -> Iterator[Dict]:
+        names = list(columns) if columns is not None else list(self.columns)
+        for name in names:
+            if name not in self.columns:
+                raise KeyError(f"Unknown column '{name}'")
+        for row in positions:
+            yield {name: self._value(name, row) for name in names}
+
+    def vendor_totals(self, vendor_name: str) -> Optional[Dict]:
+        """Precomputed total and per-expense-type [sum, count] for a vendor."""
+        return self.vendors.get(vendor_name)
+
+    def vendor_rows(self, vendor_name: str, columns: Optional[Sequence[str]] = None) -> List[Dict]:
+        """All rows for one vendor, read from its contiguous row range."""
+        entry = self.vendors.get(vendor_name)
+        if entry is None:
+            return []
+        start = entry['offset']
+        return list(self._build_rows(iter(range(start, start + entry['length'])), columns))
+
+    def iter_rows(self, columns: Optional[Sequence[str]] = None,
+                  where: Sequence[Predicate] = ()) -> Iterator[Dict]:
+        """
+        Stream rows in vendor order, filtered by predicates on dictionary codes.
+
+        Each predicate is evaluated once per distinct dictionary value; rows are
+        then selected by integer code membership without decoding other fields.
+        """
+        code_filters = []
+        for predicate in where:
+            meta = self.columns.get(predicate.column)
+            if meta is None or meta['kind'] != 'dict':
+                raise ValueError(f"Predicate column '{predicate.column}' is not dictionary-encoded")
+            allowed = {code for code, value in enumerate(meta['dictionary']) if predicate.matches(value)}
+            if not allowed:
+                return
+            code_filters.append((self._data[predicate.column], allowed))
+
+        if not code_filters:
+            positions = iter(range(self.rows))
+        else:
+            # Drive the scan from the most selective column
+            code_filters.sort(key=lambda f: len(f[1]))
+            first, rest = code_filters[0], code_filters[1:]
+            positions = (
+                row for row, code in enumerate(first[0])
+                if code in first[1] and all(data[row] in allowed for data, allowed in rest)
+            )
+        yield from self._build_rows(positions, columns)
+
+
+# ============================================================================
+# Main Execution
+# ============================================================================
+
+def main():
+    """Rebuild the columnar store from transfer_payments_full.csv.gz."""
+    print("=" * 80)
+    print("BUILDING TRANSFER PAYMENTS COLUMN STORE")
+    print("=" * 80)
+
+    if not TRANSFER_PAYMENTS_CSV.exists():
+        print(f"❌ Error: source CSV not found: {TRANSFER_PAYMENTS_CSV}")
+        return 1
+
+    print(f"📂 Reading {TRANSFER_PAYMENTS_CSV.name}...")
+    summary = build_store()
+
+    print(f"✅ Rows: {summary['rows']:,}")
+    print(f"✅ Vendors: {summary['vendors']:,}")
+    print(f"✅ Columns: {summary['columns']}")
+    print(f"   {COLUMNAR_FILE.name}: {COLUMNAR_FILE.stat().st_size / 1024 / 1024:.2f} MB")
+    print(f"   {VENDOR_INDEX_FILE.name}: {VENDOR_INDEX_FILE.stat().st_size / 1024 / 1024:.2f} MB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Vendor classification shared by the NGO tracker scripts.
+
+Single Python definition of the frontend rules in
+frontend/src/sections/budget-decoder/view/budget-decoder-view.tsx:
+
+- should_exclude_from_ngo(): quasi-governmental / institutional exclusions
+- classify_entity_type(): 'nonprofit', 'for-profit' or 'unknown'
+
+Each keyword family is compiled once into a single alternation regex with the
+frontend's word-boundary semantics, so a vendor name is scanned once per
+family instead of once per keyword. Results are memoized by vendor name, and
+classify_vendors()/exclude_vendors() classify whole vendor lists in one call.
+exclusion_reason() reports the first rule in list order that matches, as
+the scripts did before, so reports group vendors by the same keywords.
+"""
+
+import re
+from functools import lru_cache
+from typing import Container, Dict, Iterable, List, Optional, Tuple
+
+# ============================================================================
+# Keyword lists (keep in sync with budget-decoder-view.tsx)
+# ============================================================================
+
+# Quasi-governmental entities that aren't true community nonprofits
+EXCLUDE_KEYWORDS = [
+    # Authorities and Commissions
+    'AUTHORITY', 'AUTH', 'COMMISSION', 'AIRPORT', 'RAILROAD',
+    'REDEVELOPMENT', 'HOUSING AUTHORITY', 'REDEVELOPMENT AND HOUSING',
+    'PLANNING DISTRICT', 'PLANNING DISTR', 'PDC',
+    'ECONOMIC DEVELOPMENT', 'INDUSTRIAL DEVELOPMENT', 'WORKFORCE DEVELOPMENT',
+    'INDUSTRIAL',
+    'TOURISM AUTHORITY', 'TOURISM',
+    'RAIL AUTHORITY', 'COMMERCIAL SPACE',
+    'FORT MONROE AUTHORITY', 'INNOVATION AND ENTREPRENEUR',
+
+    # Insurance/Health Plans
+    'INSURANCE', 'HEALTH PLAN', 'HMO', 'CIGNA', 'SENTARA', 'KAISER', 'HEALTHKEEPERS', 'OPTIMA', 'OPTIMUM',
+    'CAREFIRST', 'BLUECHOICE', 'GROUP HOSPITALIZATION',
+
+    # Universities and Colleges
+    'UNIVERSITY', 'COLLEGE', 'INSTITUTE OF TECHNOLOGY',
+    'VIRGINIA TECH', 'VA TECH', 'VPI', 'VIRGINIA POLYTECHNIC',
+    'VIRGINIA COMMONWEALTH UNIVERSITY', 'VCU',
+    'GEORGE MASON UNIVERSITY', 'GMU',
+    'JAMES MADISON UNIVERSITY', 'JMU',
+    'OLD DOMINION UNIVERSITY', 'ODU',
+    'WILLIAM & MARY', 'WILLIAM AND MARY',
+    'RADFORD UNIVERSITY', 'LONGWOOD UNIVERSITY',
+    'CHRISTOPHER NEWPORT UNIVERSITY', 'CNU',
+    'VIRGINIA STATE UNIVERSITY', 'VSU',
+    'NORFOLK STATE UNIVERSITY', 'NSU',
+    'UNIVERSITY OF VIRGINIA', 'UVA',
+    'VIRGINIA MILITARY INSTITUTE', 'VMI',
+    'LIBERTY UNIVERSITY', 'HAMPTON UNIVERSITY', 'VIRGINIA UNION UNIVERSITY',
+    'SHENANDOAH UNIVERSITY', 'UNIVERSITY OF LYNCHBURG', 'MARYMOUNT UNIVERSITY',
+    'MARY BALDWIN UNIVERSITY', 'VIRGINIA WESLEYAN UNIVERSITY', 'REGENT UNIVERSITY',
+    'AVERETT UNIVERSITY', 'UNIVERSITY OF RICHMOND', 'HAMPDEN-SYDNEY',
+    'RANDOLPH MACON', 'ROANOKE COLLEGE', 'BRIDGEWATER COLLEGE',
+    'EMORY & HENRY', 'FERRUM COLLEGE',
+
+    # Law Enforcement
+    'SHERIFF', "SHERIFF'S OFFICE", 'POLICE DEPARTMENT',
+
+    # Correctional/Detention Facilities
+    'DETENTION', 'CORRECTIONAL', 'JAIL', 'PRISON',
+    'JUVENILE DETENTION', 'DETENTION CENTER',
+
+    # Libraries (often government-run)
+    'LIBRARY SYSTEM', 'REGIONAL LIBRARY', 'PUBLIC LIBRARY',
+
+    # State/Local Government Departments
+    'DEPARTMENT OF', 'DEPT OF', 'DEPARTMENT FOR',
+    'DIVISION OF', 'OFFICE OF',
+
+    # Regional/District Entities
+    'REGIONAL', 'DISTRICT OF', 'GOVERNMENTAL COOPERATIVE',
+    'WATERSHED DISTRICT', 'SCHOOL DISTRICT',
+    'PLANNING DISTRICT COMM', 'GOVERNMENTAL DISTRICT',
+    'JUDICIAL DISTRICT',
+
+    # Councils (specific types)
+    'GRAINS COUNCIL', 'EGG COUNCIL', 'BEEF COUNCIL', 'HORSE COUNCIL',
+    'REGIONAL COUNCIL',
+
+    # Hospitals and Healthcare Systems
+    'HOSPITAL', 'MEDICAL CENTER', 'HEALTH SYSTEM',
+
+    # Centers (government-run or large institutions)
+    'SPACE CENTER', 'AIR & SPACE',
+
+    # Large Foundations (not community nonprofits)
+    'VIRGINIA EARLY CHILDHOOD FOUNDATION',
+    'VIRGINIA RESOURCES AUTHORITY',
+    'GROW CAPITAL JOBS FOUNDATION',
+
+    # Associations (often trade/industry groups)
+    'HOSPITAL & HEALTHCARE ASSOCIATI', 'HOSPITAL RESEARCH',
+    'PHARMACISTS ASSOCIATION', 'TRANSIT ASSOCIATION',
+    'DRIVER EDUCATION', 'VOLUNTEER RESCUE',
+
+    # Financial Institutions
+    'CREDIT UNION', 'FEDERAL CREDIT UNION',
+
+    # Railroads
+    'BELT LINE RR', 'RAILROAD',
+
+    # Research Institutions
+    'RESEARCH ASSOC', 'UNIVERSITIES RESEARCH',
+
+    # Other
+    'DETAILED DATA NOT YET AVAILABLE',
+    'MISCELLANEOUS ADJUSTMENT',
+    'HUNTINGTON INGALLS',
+    'HITACHI',
+    'BOARD OF CONTROL',
+    'CITY SCHOOLS', 'TOWN SCHOOLS'
+]
+
+LOCAL_GOVT_PATTERNS = [
+    'CITY OF', 'TOWN OF', 'COUNTY OF',
+    'BOARD OF SUPERVISORS', 'CIRCUIT COURT', 'PUBLIC SCHOOLS',
+    'COMMUNITY SERVICES BOARD',
+    'DIRECTOR OF FINANCE',
+    'MISCELLANEOUS ADJUSTMENT',
+    '** CONTACT AGENCY FOR MORE INFO **'
+]
+
+# Legal entity keywords
+FOR_PROFIT_KEYWORDS = [
+    'LLC', 'L.L.C.', 'L L C',
+    'INC.', 'INC', 'INCORPORATED',
+    'CORP.', 'CORP', 'CORPORATION',
+    'COMPANY', 'CO.', 'CO ',
+    'LTD', 'LIMITED',
+    'LP', 'L.P.', 'L P',
+    'PLLC', 'P.L.L.C.',
+    'PC', 'P.C.',
+    'LLP', 'L.L.P.',
+    'PA', 'P.A.',
+]
+
+# Business name patterns (strong indicators of for-profit)
+BUSINESS_PATTERNS = [
+    'CONSULTING', 'CONSULTANTS',
+    'SOLUTIONS', 'SERVICES',
+    'GROUP', 'PARTNERS', 'ASSOCIATES',
+    'TECHNOLOGIES', 'TECHNOLOGY',
+    'SYSTEMS', 'SOFTWARE',
+    'ENTERPRISES', 'INDUSTRIES',
+    'HOLDINGS', 'INVESTMENTS',
+    '& SONS', '& DAUGHTERS', '& BROS',
+    'CONSTRUCTION', 'CONTRACTORS',
+    'MANAGEMENT',
+    'ELECTRIC', 'GAS & ELECTRIC', 'POWER COMPANY', 'ENERGY COMPANY',
+    'INSURANCE CO', 'LIFE INSURANCE', 'HEALTH INSURANCE',
+    'HEALTHKEEPERS', 'CIGNA', 'AETNA', 'ANTHEM', 'OPTIMA', 'OPTIMUM',
+    'BANK ', ' BANK', 'FINANCIAL SERVICES', 'FINANCIAL MANAGEMENT',
+    'REALTY', 'PROPERTIES LLC', 'PROPERTIES INC', 'REAL ESTATE',
+    'BUILDERS INC',
+    'MERCK', 'PFIZER', 'PHARMACEUTICAL'
+]
+
+# Nonprofit name indicators, checked after the for-profit indicators
+NONPROFIT_INDICATORS = [
+    'FOUNDATION',
+    'CHARITY', 'CHARITABLE',
+    'NONPROFIT', 'NON-PROFIT', 'NOT-FOR-PROFIT',
+    'CHURCH', 'CHURCHES', 'MINISTRY', 'MINISTRIES', 'PARISH', 'DIOCESE',
+    'SYNAGOGUE', 'MOSQUE', 'TEMPLE', 'CONGREGATION',
+    'COMMUNITY SERVICES', 'COMMUNITY ACTION', 'COMMUNITY CENTER', 'COMMUNITY FOUNDATION',
+    'FOOD BANK', 'FOOD PANTRY', 'SHELTER', 'HOUSING SERVICES', 'YOUTH SERVICES',
+    'SENIOR SERVICES', 'SENIOR CENTER', 'FAMILY SERVICES', 'CHILD CARE CENTER',
+    'DAYCARE CENTER', 'RESCUE MISSION', 'RESCUE SQUAD', 'VOLUNTEER FIRE', 'FIRE DEPARTMENT',
+    'HEALTH CENTER', 'WELLNESS CENTER', 'MENTAL HEALTH', 'COUNSELING CENTER',
+    'ARTS COUNCIL', 'CULTURAL CENTER', 'MUSEUM', 'THEATER', 'THEATRE',
+    'SYMPHONY', 'ORCHESTRA', 'OPERA', 'BALLET',
+    'HISTORICAL SOCIETY', 'HISTORIC PRESERVATION', 'PRESERVATION SOCIETY', 'HERITAGE',
+    'PRESCHOOL', 'PRE-SCHOOL', 'LEARNING CENTER', 'TUTORING',
+    'CONSERVATION', 'ENVIRONMENTAL', 'NATURE CENTER', 'WILDLIFE',
+    'ADVOCACY', 'CIVIC LEAGUE', 'CITIZENS ASSOCIATION', 'NEIGHBORHOOD ASSOCIATION',
+    'ALLIANCE', 'COALITION', 'FEDERATION', 'LEAGUE',
+    'ASSOCIATION',
+]
+
+# ============================================================================
+# Compiled patterns
+# ============================================================================
+
+def _alternation(keywords: Iterable[str]) -> str:
+    """Regex alternation of literal keywords, longest first so reported matches are specific."""
+    unique = sorted(set(keywords), key=lambda k: (-len(k), k))
+    return '|'.join(re.escape(k) for k in unique)
+
+
+def _word_bounded(keywords: Iterable[str]) -> 're.Pattern':
+    """Match any keyword with \\b on both sides (frontend `\\b${keyword}\\b`)."""
+    return re.compile(r'\b(?:' + _alternation(keywords) + r')\b')
+
+
+# Exclusions: short acronyms (<= 3 chars) need word boundaries, longer
+# keywords and local government patterns are plain substring matches
+_SHORT_EXCLUDE = [k for k in EXCLUDE_KEYWORDS if len(k) <= 3]
+_LONG_EXCLUDE = [k for k in EXCLUDE_KEYWORDS if len(k) > 3] + LOCAL_GOVT_PATTERNS
+EXCLUDE_RE = re.compile(
+    r'\b(?:' + _alternation(_SHORT_EXCLUDE) + r')\b'
+    r'|' + _alternation(_LONG_EXCLUDE) +
+    r'|^[A-Z\s]+ COUNTY:'
+    r'|^CITY '
+)
+
+# Reported for the county/city name patterns (one category for both)
+COUNTY_CITY_REASON = 'county/city pattern'
+
+# Exclusion rules in priority order for exclusion_reason(): keywords in list
+# order, then local government patterns, then the county/city name patterns.
+# A single alternation cannot report these: its leftmost-longest match hides
+# earlier keywords overlapping it ('RAIL AUTHORITY' before 'AUTHORITY').
+_EXCLUDE_RULES: List[Tuple[str, 're.Pattern']] = (
+    [(k, re.compile(r'\b' + re.escape(k) + r'\b' if len(k) <= 3 else re.escape(k))) for k in EXCLUDE_KEYWORDS]
+    + [(p, re.compile(re.escape(p))) for p in LOCAL_GOVT_PATTERNS]
+    + [(COUNTY_CITY_REASON, re.compile(r'^[A-Z\s]+ COUNTY:|^CITY '))]
+)
+
+LEGAL_ENTITY_RE = _word_bounded(FOR_PROFIT_KEYWORDS)
+BUSINESS_PATTERN_RE = _word_bounded(BUSINESS_PATTERNS)
+FOR_PROFIT_RE = _word_bounded(FOR_PROFIT_KEYWORDS + BUSINESS_PATTERNS)
+NONPROFIT_RE = _word_bounded(NONPROFIT_INDICATORS)
+
+# ============================================================================
+# Classification
+# ============================================================================
+
+@lru_cache(maxsize=None)
+def exclusion_reason(vendor_name: str) -> Optional[str]:
+    """
+    Return the rule that excludes a vendor from the NGO tracker, or None.
+
+    The reason is the first exclusion keyword in EXCLUDE_KEYWORDS order that
+    matches, else the first LOCAL_GOVT_PATTERNS entry, else
+    COUNTY_CITY_REASON. The combined regex screens out kept vendors first.
+    """
+    name_upper = vendor_name.upper()
+    if not EXCLUDE_RE.search(name_upper):
+        return None
+    for reason, pattern in _EXCLUDE_RULES:
+        if pattern.search(name_upper):
+            return reason
+    return None
+
+
+def should_exclude_from_ngo(vendor_name: str) -> bool:
+    """Check if vendor should be excluded from NGO classification (matches frontend logic)."""
+    return exclusion_reason(vendor_name) is not None
+
+
+@lru_cache(maxsize=None)
+def has_legal_entity_suffix(vendor_name: str) -> bool:
+    """True if the name carries a legal entity keyword (LLC, INC, CORP, ...)."""
+    return LEGAL_ENTITY_RE.search(vendor_name.upper()) is not None
+
+
+@lru_cache(maxsize=None)
+def has_business_pattern(vendor_name: str) -> bool:
+    """True if the name matches a business name pattern (CONSULTING, SERVICES, ...)."""
+    return BUSINESS_PATTERN_RE.search(vendor_name.upper()) is not None
+
+
+@lru_cache(maxsize=None)
+def _name_entity_type(vendor_name: str) -> str:
+    name_upper = vendor_name.upper()
+    if FOR_PROFIT_RE.search(name_upper):
+        return 'for-profit'
+    if NONPROFIT_RE.search(name_upper):
+        return 'nonprofit'
+    return 'unknown'
+
+
+def classify_entity_type(vendor_name: str, irs_verified: bool = False, has_990_filings: bool = False) -> str:
+    """
+    Classify entity type based on name patterns (matches frontend logic).
+
+    Args:
+        vendor_name: Vendor name as it appears in CARDINAL
+        irs_verified: Vendor is in vendor_irs_matches.json
+        has_990_filings: Vendor has ProPublica Form 990 filings
+
+    Returns:
+        'nonprofit' if IRS verified, filing 990s or the name has a nonprofit indicator,
+        'for-profit' if the name has a legal entity or business indicator,
+        'unknown' otherwise
+    """
+    if irs_verified or has_990_filings:
+        return 'nonprofit'
+    return _name_entity_type(vendor_name)
+
+
+def classify_vendors(vendor_names: Iterable[str], irs_verified: Container[str] = ()) -> Dict[str, str]:
+    """
+    Classify a batch of vendors.
+
+    Args:
+        vendor_names: Vendor names to classify
+        irs_verified: Collection of IRS-verified vendor names (e.g. vendor_irs_matches)
+
+    Returns:
+        vendor_name -> entity type
+    """
+    return {name: classify_entity_type(name, name in irs_verified) for name in vendor_names}
+
+
+def exclude_vendors(vendor_names: Iterable[str]) -> List[str]:
+    """Return the vendors from a batch that the NGO tracker excludes."""
+    return [name for name in vendor_names if should_exclude_from_ngo(name)]
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Vendor rollup cube for the NGO tracker analyses.
+
+Pre-aggregates transfer payments once per refresh into one row per
+vendor x fiscal_year x expense_type x agency, holding the amount sum, the
+transaction count and the first/last transaction dates. The NGO tracker
+scripts then filter and total a few tens of thousands of cube rows instead of
+regrouping millions of transactions.
+
+Usage:
+    python scripts/vendor_cube.py    # rebuild the cube
+
+    from vendor_cube import load_cube, vendor_rollups
+    rollups = vendor_rollups(load_cube(), expense_types={NGO_GRANT_EXPENSE_TYPE})
+"""
+
+import csv
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from transfer_payments import TRANSFER_PAYMENTS_CSV, iter_rows
+from transfer_payments_store import COLUMNAR_FILE, DERIVED_DIR, VENDOR_INDEX_FILE, TransferPaymentStore
+
+# Paths (a local cache next to the column store, not deployed with the decoder)
+VENDOR_CUBE_FILE = DERIVED_DIR / 'transfer_payments_vendor_cube.csv'
+
+CUBE_KEY = ['vendor_name', 'fiscal_year', 'expense_type', 'agency']
+CUBE_FIELDS = CUBE_KEY + ['amount', 'count', 'first_date', 'last_date']
+SOURCE_COLUMNS = CUBE_KEY + ['amount', 'trans_date']
+
+# CARDINAL exports use MM-DD-YY; tolerate the other layouts we have seen
+DATE_FORMATS = ['%m-%d-%y', '%m/%d/%Y', '%m/%d/%y', '%Y-%m-%d']
+
+
+def parse_trans_date(value: str) -> str:
+    """Convert a CARDINAL transaction date to ISO YYYY-MM-DD ('' if unparseable)."""
+    value = value.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return ''
+
+
+def _iter_source_rows(csv_path: Path) -> Iterator[Dict]:
+    """Read transactions, preferring the column store when it is up to date."""
+    if (csv_path == TRANSFER_PAYMENTS_CSV
+            and COLUMNAR_FILE.exists() and VENDOR_INDEX_FILE.exists()
+            and (not csv_path.exists() or COLUMNAR_FILE.stat().st_mtime >= csv_path.stat().st_mtime)):
+        with TransferPaymentStore(COLUMNAR_FILE, VENDOR_INDEX_FILE) as store:
+            columns = [c for c in SOURCE_COLUMNS if c in store.columns]
+            yield from store.iter_rows(columns)
+        return
+
+    yield from iter_rows(csv_path, columns=SOURCE_COLUMNS)
+
+
+def build_cube(csv_path: Path = TRANSFER_PAYMENTS_CSV, output_path: Path = VENDOR_CUBE_FILE) -> List[Dict]:
+    """
+    Aggregate transactions into cube rows and write them to `output_path`.
+
+    Returns:
+        The cube rows, in the same shape load_cube() returns
+    """
+    cells: Dict[tuple, List] = {}
+    parsed_dates: Dict[str, str] = {}
+
+    for row in _iter_source_rows(csv_path):
+        key = tuple(row.get(k, '') for k in CUBE_KEY)
+        raw_amount = row.get('amount', '')
+        if isinstance(raw_amount, float):
+            amount = raw_amount
+        else:
+            try:
+                amount = float(raw_amount) if raw_amount else 0.0
+            except ValueError:
+                amount = 0.0
+
+        raw_date = row.get('trans_date', '')
+        trans_date = parsed_dates.get(raw_date)
+        if trans_date is None:
+            trans_date = parsed_dates[raw_date] = parse_trans_date(raw_date)
+
+        cell = cells.get(key)
+        if cell is None:
+            cells[key] = [amount, 1, trans_date, trans_date]
+            continue
+        cell[0] += amount
+        cell[1] += 1
+        if trans_date:
+            if not cell[2] or trans_date < cell[2]:
+                cell[2] = trans_date
+            if trans_date > cell[3]:
+                cell[3] = trans_date
+
+    cube = [
+        dict(zip(CUBE_KEY, key), amount=round(cell[0], 2), count=cell[1],
+             first_date=cell[2], last_date=cell[3])
+        for key, cell in sorted(cells.items())
+    ]
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CUBE_FIELDS)
+        writer.writeheader()
+        writer.writerows(cube)
+
+    return cube
+
+
+def load_cube(path: Path = VENDOR_CUBE_FILE, source: Path = TRANSFER_PAYMENTS_CSV) -> List[Dict]:
+    """
+    Load the vendor cube, rebuilding it first if it is missing or older than `source`.
+
+    Returns:
+        List of cube rows with `amount` as float and `count` as int
+    """
+    path = Path(path)
+    source = Path(source)
+    if not path.exists() or (source.exists() and path.stat().st_mtime < source.stat().st_mtime):
+        print(f"🔄 Building vendor cube from {source.name}...")
+        return build_cube(source, path)
+
+    cube = []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            row['amount'] = float(row['amount']) if row['amount'] else 0.0
+            row['count'] = int(row['count']) if row['count'] else 0
+            cube.append(row)
+    return cube
+
+
+def vendor_rollups(cube: Iterable[Dict], expense_types: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+    """
+    Roll cube rows up to one entry per vendor.
+
+    Args:
+        cube: Cube rows from load_cube()
+        expense_types: If given, only these expense types are counted
+
+    Returns:
+        vendor_name -> {'total', 'count', 'expense_types', 'first_date', 'last_date'}
+    """
+    wanted = set(expense_types) if expense_types is not None else None
+    rollups: Dict[str, Dict] = {}
+
+    for row in cube:
+        if wanted is not None and row['expense_type'] not in wanted:
+            continue
+        entry = rollups.get(row['vendor_name'])
+        if entry is None:
+            entry = rollups[row['vendor_name']] = {
+                'total': 0.0, 'count': 0, 'expense_types': set(),
+                'first_date': '', 'last_date': '',
+            }
+        entry['total'] += row['amount']
+        entry['count'] += row['count']
+        entry['expense_types'].add(row['expense_type'])
+        if row['first_date'] and (not entry['first_date'] or row['first_date'] < entry['first_date']):
+            entry['first_date'] = row['first_date']
+        if row['last_date'] > entry['last_date']:
+            entry['last_date'] = row['last_date']
+
+    return rollups
+
+
+def main():
+    """Rebuild the vendor cube from the transfer payments data."""
+    print("=" * 80)
+    print("BUILDING VENDOR ROLLUP CUBE")
+    print("=" * 80)
+
+    if not TRANSFER_PAYMENTS_CSV.exists():
+        print(f"❌ Error: source CSV not found: {TRANSFER_PAYMENTS_CSV}")
+        return 1
+
+    cube = build_cube()
+    vendors = len({row['vendor_name'] for row in cube})
+
+    print(f"✅ Cube rows: {len(cube):,}")
+    print(f"✅ Vendors: {vendors:,}")
+    print(f"   Saved to: {VENDOR_CUBE_FILE}")
+    print(f"   File size: {VENDOR_CUBE_FILE.stat().st_size / 1024 / 1024:.2f} MB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
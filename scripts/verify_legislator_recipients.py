@@ -4,33 +4,13 @@ Verify funding recipients for a specific legislator by examining raw amendment d
 This script helps audit the accuracy of the Top 5 Funding Recipients display.
 """
 
-import json
 import sys
 from pathlib import Path
 from collections import defaultdict
 
-# Paths
-REPO_ROOT = Path(__file__).parent.parent
-DATA_2024 = REPO_ROOT / "data" / "amendments" / "member_requests_2024.json"
-DATA_2025 = REPO_ROOT / "data" / "amendments" / "member_requests_2025.json"
+sys.path.insert(0, str(Path(__file__).parent / "amendment_vault"))
 
-
-def normalize_patron_name(name: str) -> str:
-    """Normalize patron name for matching (same logic as frontend)."""
-    return name.lower().strip().replace("  ", " ")
-
-
-def build_fingerprint(record: dict) -> str:
-    """Build deduplication fingerprint (same logic as frontend)."""
-    desc_source = record.get("descriptionShort") or record.get("descriptionFull") or ""
-    normalized_desc = desc_source.lower().strip().replace("  ", " ")[:200]
-    normalized_patron = normalize_patron_name(record.get("patronName", ""))
-    bill = record.get("billNumber", "")
-    item = record.get("itemNumber", "")
-    rounded_gf = round(record.get("deltaGF", 0))
-    rounded_ngf = round(record.get("deltaNGF", 0))
-    
-    return f"{bill}|{item}|{normalized_patron}|{rounded_gf}|{rounded_ngf}|{normalized_desc}"
+from vault_db import open_vault, patron_increases
 
 
 def verify_legislator_recipients(patron_name: str, min_confidence: float = 0.6):
@@ -45,37 +25,12 @@ def verify_legislator_recipients(patron_name: str, min_confidence: float = 0.6):
     print(f"FUNDING RECIPIENT VERIFICATION FOR: {patron_name}")
     print(f"{'='*80}\n")
     
-    # Load both years
-    with open(DATA_2024) as f:
-        records_2024 = json.load(f)
-    with open(DATA_2025) as f:
-        records_2025 = json.load(f)
-    
-    all_records = records_2024 + records_2025
-    
-    # Normalize search name
-    search_name = normalize_patron_name(patron_name)
-    
-    # Filter records for this legislator
-    legislator_records = [
-        r for r in all_records
-        if normalize_patron_name(r.get("patronName", "")) == search_name
-        and r.get("stage") == "member_request"
-        and not r.get("isLanguageOnly", False)
-        and r.get("netAmount", 0) > 0  # Only increases
-    ]
-    
-    print(f"Found {len(legislator_records)} total amendments for {patron_name}")
-    
-    # Deduplicate using fingerprints
-    seen_fingerprints = set()
-    deduped_records = []
-    for record in legislator_records:
-        fp = build_fingerprint(record)
-        if fp not in seen_fingerprints:
-            seen_fingerprints.add(fp)
-            deduped_records.append(record)
+    # Matching records, deduplicated by fingerprint (indexed query on the vault)
+    conn = open_vault()
+    total_count, deduped_records = patron_increases(conn, patron_name)
+    conn.close()
     
+    print(f"Found {total_count} total amendments for {patron_name}")
     print(f"After deduplication: {len(deduped_records)} unique amendments\n")
     
     # Filter for records with recipients